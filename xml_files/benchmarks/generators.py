@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Synthetic Benchmark Corpora
+
+Writes documents of a requested size for the benchmark runner. Each
+generator emits the header of a realistic document for one handler, then
+repeats seeded pseudo-random records (SCAP rules and results, sitemap URLs,
+GPX trackpoints, GraphML edges, ServiceNow journal entries) until the file
+reaches the target size, then closes it. Records are written one at a time,
+so generating a 1 GB corpus takes constant memory.
+
+``scale_sample`` does the same for any file under sample_data by repeating
+the children of its root element.
+
+Usage:
+    python benchmarks/generators.py sitemap 10MB sitemap-10mb.xml
+"""
+
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AnyStr, Callable, Dict, Iterator, Optional
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+
+# Generators flush to disk in blocks of about this many bytes
+_WRITE_BLOCK = 1 << 20
+
+_WORDS = ('system', 'access', 'audit', 'configure', 'network', 'password', 'service',
+          'update', 'kernel', 'policy', 'storage', 'account', 'firewall', 'log',
+          'disk', 'user', 'request', 'restart', 'timeout', 'certificate')
+
+_SIZE_UNITS = {'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Parse '10MB', '1GB', '512KB' or a plain byte count"""
+    text = text.strip().upper()
+    for unit, factor in _SIZE_UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    for unit in ('GB', 'MB', 'KB'):
+        if size >= _SIZE_UNITS[unit] and size % _SIZE_UNITS[unit] == 0:
+            return f"{size // _SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _write_document(path: Path, target_bytes: int, header: AnyStr, footer: AnyStr,
+                    records: Iterator[AnyStr]) -> int:
+    """Write header, records until target_bytes is reached, footer"""
+    binary = isinstance(header, bytes)
+    joiner = b'' if binary else ''
+    written = 0
+    block = [header]
+    block_size = len(header)
+    with open(path, 'wb') if binary else open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            block.append(record)
+            block_size += len(record)
+            if block_size >= _WRITE_BLOCK:
+                f.write(joiner.join(block))
+                written += block_size
+                block, block_size = [], 0
+            if written + block_size + len(footer) >= target_bytes:
+                break
+        block.append(footer)
+        f.write(joiner.join(block))
+    return path.stat().st_size
+
+
+# ---------------------------------------------------------------------------
+# Per-handler generators
+# ---------------------------------------------------------------------------
+
+def _scap_records(rng: random.Random) -> Iterator[str]:
+    severities = ('low', 'medium', 'high')
+    results = ('pass', 'pass', 'pass', 'fail', 'notapplicable')
+    n = 0
+    while True:
+        n += 1
+        rule_id = f"xccdf_org.example_rule_{n}"
+        yield (f'  <xccdf:Rule id="{rule_id}" severity="{rng.choice(severities)}" selected="true">\n'
+               f'    <xccdf:title>{_sentence(rng, 5)}</xccdf:title>\n'
+               f'    <xccdf:description>{_sentence(rng, 24)}.</xccdf:description>\n'
+               f'    <xccdf:ident system="http://cce.mitre.org">CCE-{10000 + n}-{n % 10}</xccdf:ident>\n'
+               f'    <xccdf:check system="http://oval.mitre.org/XMLSchema/oval-definitions-5">\n'
+               f'      <xccdf:check-content-ref href="oval.xml" name="oval:org.example:def:{n}"/>\n'
+               f'    </xccdf:check>\n'
+               f'  </xccdf:Rule>\n'
+               f'  <xccdf:TestResult id="xccdf_org.example_testresult_{n}" start-time="2025-01-01T00:00:00">\n'
+               f'    <xccdf:rule-result idref="{rule_id}" severity="medium">'
+               f'<xccdf:result>{rng.choice(results)}</xccdf:result></xccdf:rule-result>\n'
+               f'  </xccdf:TestResult>\n')
+
+
+def generate_scap(path: Path, target_bytes: int, seed: int = 0) -> int:
+    """XCCDF benchmark with interleaved rules and rule results"""
+    header = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<xccdf:Benchmark xmlns:xccdf="http://checklists.nist.gov/xccdf/1.2" '
+              'id="xccdf_org.example_benchmark_synthetic" resolved="1">\n'
+              '  <xccdf:status>accepted</xccdf:status>\n'
+              '  <xccdf:title>Synthetic Benchmark</xccdf:title>\n'
+              '  <xccdf:version>1.0</xccdf:version>\n')
+    return _write_document(path, target_bytes, header, '</xccdf:Benchmark>\n',
+                           _scap_records(random.Random(seed)))
+
+
+def _sitemap_records(rng: random.Random) -> Iterator[str]:
+    frequencies = ('daily', 'weekly', 'monthly', 'yearly')
+    sections = ('products', 'blog', 'docs', 'support', 'news')
+    start = datetime(2024, 1, 1)
+    n = 0
+    while True:
+        n += 1
+        lastmod = (start + timedelta(minutes=rng.randrange(525600))).strftime('%Y-%m-%d')
+        yield (f'  <url>\n'
+               f'    <loc>https://www.example.com/{rng.choice(sections)}/page-{n}.html</loc>\n'
+               f'    <lastmod>{lastmod}</lastmod>\n'
+               f'    <changefreq>{rng.choice(frequencies)}</changefreq>\n'
+               f'    <priority>{rng.randrange(1, 11) / 10:.1f}</priority>\n'
+               f'  </url>\n')
+
+
+def generate_sitemap(path: Path, target_bytes: int, seed: int = 0) -> int:
+    """URL set sitemap"""
+    header = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+    return _write_document(path, target_bytes, header, '</urlset>\n',
+                           _sitemap_records(random.Random(seed)))
+
+
+def _gpx_records(rng: random.Random) -> Iterator[str]:
+    lat, lon, ele = 37.8, -122.4, 100.0
+    moment = datetime(2024, 6, 1, 8, 0, 0)
+    while True:
+        lat += rng.uniform(-0.0002, 0.0002)
+        lon += rng.uniform(-0.0002, 0.0002)
+        ele = max(0.0, ele + rng.uniform(-1.5, 1.5))
+        moment += timedelta(seconds=5)
+        yield (f'      <trkpt lat="{lat:.6f}" lon="{lon:.6f}"><ele>{ele:.1f}</ele>'
+               f'<time>{moment.strftime("%Y-%m-%dT%H:%M:%SZ")}</time></trkpt>\n')
+
+
+def generate_gpx(path: Path, target_bytes: int, seed: int = 0) -> int:
+    """Single track with one long segment of trackpoints"""
+    header = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<gpx version="1.1" creator="xml-analysis-benchmarks" '
+              'xmlns="http://www.topografix.com/GPX/1/1">\n'
+              '  <metadata><name>Synthetic Activity</name>'
+              '<time>2024-06-01T08:00:00Z</time></metadata>\n'
+              '  <trk>\n    <name>Synthetic Track</name>\n    <type>cycling</type>\n    <trkseg>\n')
+    return _write_document(path, target_bytes, header, '    </trkseg>\n  </trk>\n</gpx>\n',
+                           _gpx_records(random.Random(seed)))
+
+
+def _graphml_records(rng: random.Random, nodes: int) -> Iterator[str]:
+    for n in range(nodes):
+        yield (f'    <node id="n{n}"><data key="label">{_sentence(rng, 2)}</data>'
+               f'<data key="weight">{rng.randrange(1, 100)}</data></node>\n')
+    n = 0
+    while True:
+        n += 1
+        yield (f'    <edge id="e{n}" source="n{rng.randrange(nodes)}" target="n{rng.randrange(nodes)}">'
+               f'<data key="cost">{rng.uniform(0, 10):.3f}</data></edge>\n')
+
+
+def generate_graphml(path: Path, target_bytes: int, seed: int = 0) -> int:
+    """Directed graph whose size grows with its edge count"""
+    nodes = max(10, min(100000, target_bytes // 2000))
+    header = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+              '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+              '  <key id="weight" for="node" attr.name="weight" attr.type="int"/>\n'
+              '  <key id="cost" for="edge" attr.name="cost" attr.type="double"/>\n'
+              '  <graph id="G" edgedefault="directed">\n')
+    return _write_document(path, target_bytes, header, '  </graph>\n</graphml>\n',
+                           _graphml_records(random.Random(seed), nodes))
+
+
+def _servicenow_records(rng: random.Random) -> Iterator[str]:
+    users = ('pat.doe', 'sam.lee', 'alex.kim', 'jordan.roe')
+    moment = datetime(2024, 3, 1, 9, 0, 0)
+    n = 0
+    while True:
+        n += 1
+        moment += timedelta(minutes=rng.randrange(1, 90))
+        element = 'comments' if rng.random() < 0.6 else 'work_notes'
+        yield (f'<sys_journal_field action="INSERT_OR_UPDATE">'
+               f'<element>{element}</element><element_id>a1b2c3</element_id>'
+               f'<name>incident</name><sys_created_by>{rng.choice(users)}</sys_created_by>'
+               f'<sys_created_on>{moment.strftime("%Y-%m-%d %H:%M:%S")}</sys_created_on>'
+               f'<sys_id>j{n:010d}</sys_id><value>{escape(_sentence(rng, 30))}.</value>'
+               f'</sys_journal_field>\n')
+        if n % 50 == 0:
+            yield (f'<sys_attachment action="INSERT_OR_UPDATE"><file_name>log-{n}.txt</file_name>'
+                   f'<content_type>text/plain</content_type><size_bytes>{rng.randrange(100, 100000)}</size_bytes>'
+                   f'<sys_created_by>{rng.choice(users)}</sys_created_by></sys_attachment>\n')
+
+
+def generate_servicenow(path: Path, target_bytes: int, seed: int = 0) -> int:
+    """Incident export followed by a long journal of comments and work notes"""
+    header = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<unload unload_date="2024-03-02 10:00:00">\n'
+              '<incident action="INSERT_OR_UPDATE">'
+              '<number>INC0010001</number><state>6</state><priority>2</priority>'
+              '<short_description>Synthetic incident</short_description>'
+              '<opened_at>2024-03-01 09:00:00</opened_at>'
+              '<assigned_to display_value="Pat Doe">a1b2c3</assigned_to>'
+              '</incident>\n')
+    return _write_document(path, target_bytes, header, '</unload>\n',
+                           _servicenow_records(random.Random(seed)))
+
+
+GENERATORS: Dict[str, Callable[..., int]] = {
+    'scap': generate_scap,
+    'sitemap': generate_sitemap,
+    'gpx': generate_gpx,
+    'graphml': generate_graphml,
+    'servicenow': generate_servicenow,
+}
+
+# Handler each generated corpus is expected to be routed to
+EXPECTED_HANDLERS = {
+    'scap': 'SCAPHandler',
+    'sitemap': 'SitemapHandler',
+    'gpx': 'GPXHandler',
+    'graphml': 'GraphMLHandler',
+    'servicenow': 'ServiceNowHandler',
+}
+
+
+# ---------------------------------------------------------------------------
+# Scaled samples
+# ---------------------------------------------------------------------------
+
+def scale_sample(sample_path: Path, path: Path, target_bytes: int) -> int:
+    """Repeat the root's children of an existing document up to target_bytes"""
+    data = Path(sample_path).read_bytes()
+
+    # Byte offsets of each child of the root and of the root's end tag; the
+    # children are copied verbatim, so prefixes and encoding are preserved
+    starts = []
+    end = [len(data)]
+    depth = [0]
+    parser = expat.ParserCreate()
+
+    def start_element(name, attributes):
+        if depth[0] == 1:
+            starts.append(parser.CurrentByteIndex)
+        depth[0] += 1
+
+    def end_element(name):
+        depth[0] -= 1
+        if depth[0] == 0:
+            end[0] = parser.CurrentByteIndex
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.Parse(data, True)
+
+    if not starts:
+        header, children = data[:end[0]], []
+    else:
+        header = data[:starts[0]]
+        bounds = starts + [end[0]]
+        children = [data[bounds[i]:bounds[i + 1]] for i in range(len(starts))]
+
+    def records() -> Iterator[bytes]:
+        while children:
+            yield from children
+
+    return _write_document(path, target_bytes, header, data[end[0]:], records())
+
+
+def generate(kind: str, path: Path, target_bytes: int, seed: int = 0,
+             sample: Optional[Path] = None) -> int:
+    """Generate a corpus of a known kind, or scale ``sample`` when given"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if sample is not None:
+        return scale_sample(Path(sample), path, target_bytes)
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown corpus type '{kind}'; expected one of {sorted(GENERATORS)}")
+    return GENERATORS[kind](path, target_bytes, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('kind', choices=sorted(GENERATORS))
+    parser.add_argument('size', help='target size, e.g. 10MB or 1GB')
+    parser.add_argument('output', help='file to write')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    size = generate(args.kind, Path(args.output), parse_size(args.size), args.seed)
+    print(f"📄 Wrote {args.output} ({size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
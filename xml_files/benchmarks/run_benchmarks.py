@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+XML Framework Benchmark Runner
+
+Generates synthetic corpora at the requested sizes (see generators.py),
+then measures analysis and each chunking strategy on every corpus. Each
+measurement runs in a fresh process so peak RSS belongs to that
+measurement alone. Results are written as JSON; with ``--baseline`` they
+are compared against an earlier run and the exit status is 1 when
+throughput or peak RSS regressed beyond ``--tolerance``, or when a
+measurement that succeeded in the baseline now fails or times out.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 10MB,100MB,1GB --output results.json
+    python benchmarks/run_benchmarks.py --quick --baseline results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCHMARK_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCHMARK_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+from generators import GENERATORS, format_size, generate, parse_size
+
+SAMPLE_DIR = PROJECT_ROOT / 'sample_data' / 'test_files_synthetic' / 'small'
+DEFAULT_CORPUS_DIR = BENCHMARK_DIR / 'corpora'
+CHUNKING_STRATEGIES = ('hierarchical', 'sliding_window', 'content_aware')
+RESULT_FORMAT_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Measurement (runs in a child process)
+# ---------------------------------------------------------------------------
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _measure(task: Dict[str, Any]) -> Dict[str, Any]:
+    from core.analyzer import XMLDocumentAnalyzer
+    from core.batch import to_record
+    from core.chunking import ChunkingOrchestrator
+    from core.instrumentation import Instrumentation
+
+    analyzer = XMLDocumentAnalyzer(backend=task['backend'],
+                                   streaming_threshold=task['streaming_threshold'],
+                                   instrumentation=Instrumentation())
+    path = task['path']
+    measurement: Dict[str, Any] = {}
+
+    if task['operation'] == 'analyze':
+        start = time.perf_counter()
+        result = analyzer.analyze_document(path)
+        measurement['seconds'] = time.perf_counter() - start
+        if 'error' in result:
+            measurement['error'] = result['error']
+        else:
+            measurement['handler'] = result['handler_used']
+            measurement['analysis_mode'] = result.get('analysis_mode', 'tree')
+            measurement['phases'] = {name: entry['seconds']
+                                     for name, entry in result['timings']['phases'].items()}
+    else:
+        # Strategy selection only needs the document type, which the
+        # prefix detection provides without a full analysis
+        detection = to_record(analyzer.detect_document(path))
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            chunks = ChunkingOrchestrator().chunk_document(path, detection, strategy=task['strategy'])
+        measurement['seconds'] = time.perf_counter() - start
+        measurement['handler'] = detection.get('handler_used')
+        measurement['chunks'] = len(chunks)
+        measurement['tokens'] = sum(chunk.token_estimate for chunk in chunks)
+
+    measurement['peak_rss_bytes'] = _peak_rss_bytes()
+    return measurement
+
+
+def _child(task: Dict[str, Any], connection) -> None:
+    try:
+        connection.send(_measure(task))
+    except Exception as e:
+        connection.send({'error': f"{type(e).__name__}: {e}", 'peak_rss_bytes': _peak_rss_bytes()})
+    finally:
+        connection.close()
+
+
+def run_isolated(task: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+    """Run one measurement in a fresh interpreter"""
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(task, sender))
+    process.start()
+    sender.close()
+    try:
+        if receiver.poll(timeout):
+            return receiver.recv()
+        return {'error': f"Timed out after {timeout}s"}
+    except EOFError:
+        return {'error': f"Benchmark process exited with code {process.exitcode}"}
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+
+
+# ---------------------------------------------------------------------------
+# Corpora
+# ---------------------------------------------------------------------------
+
+def sample_sources() -> Dict[str, Path]:
+    """One representative sample per synthetic sample directory"""
+    sources = {}
+    for directory in sorted(p for p in SAMPLE_DIR.iterdir() if p.is_dir()):
+        files = sorted(p for p in directory.iterdir() if p.is_file())
+        if files:
+            sources[directory.name] = files[0]
+    return sources
+
+
+def build_corpora(kinds: List[str], samples: Dict[str, Path], sizes: List[int],
+                  corpus_dir: Path, seed: int) -> List[Dict[str, Any]]:
+    """Generate (or reuse) every corpus file"""
+    corpora = []
+    jobs = [(kind, 'synthetic', None) for kind in kinds]
+    jobs += [(f"sample-{name}", f"sample:{path.relative_to(PROJECT_ROOT)}", path)
+             for name, path in samples.items()]
+    for name, source, sample in jobs:
+        for size in sizes:
+            label = f"{name}-{format_size(size)}"
+            path = corpus_dir / f"{label}-seed{seed}.xml"
+            if not path.exists():
+                print(f"📄 Generating {label}")
+                generate(name, path, size, seed, sample=sample)
+            corpora.append({'corpus': label, 'kind': name, 'source': source,
+                            'target_bytes': size, 'path': str(path)})
+    return corpora
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def environment(backend: str) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    from core.parser_backend import available_backends
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'backend': backend,
+        'available_backends': available_backends(),
+        'git_commit': commit or None,
+    }
+
+
+def result_key(result: Dict[str, Any]) -> tuple:
+    return (result['corpus'], result['operation'], result.get('strategy'))
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Measurements whose throughput or peak RSS regressed beyond tolerance,
+    or that succeeded in the baseline but now fail or time out
+    """
+    previous = {result_key(r): r for r in baseline if 'error' not in r}
+    regressions = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before is None:
+            continue
+        if 'error' in result:
+            regressions.append({'corpus': result['corpus'], 'operation': result['operation'],
+                                'strategy': result.get('strategy'), 'metric': 'error',
+                                'baseline': before['throughput_mb_s'], 'current': result['error']})
+            continue
+        checks = (
+            ('throughput_mb_s', result['throughput_mb_s'] < before['throughput_mb_s'] * (1 - tolerance)),
+            ('peak_rss_bytes', result['peak_rss_bytes'] > before['peak_rss_bytes'] * (1 + tolerance)),
+        )
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append({'corpus': result['corpus'], 'operation': result['operation'],
+                                    'strategy': result.get('strategy'), 'metric': metric,
+                                    'baseline': before[metric], 'current': result[metric]})
+    return regressions
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    operation = result['operation'] + (f":{result['strategy']}" if result.get('strategy') else '')
+    if 'error' in result:
+        print(f"  ❌ {result['corpus']:<28} {operation:<24} {result['error']}")
+        return
+    print(f"  {result['corpus']:<30} {operation:<24} {result['seconds']:>9.3f}s "
+          f"{result['throughput_mb_s']:>8.2f} MB/s {result['peak_rss_bytes'] / 1e6:>8.1f} MB RSS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10MB',
+                        help='comma-separated corpus sizes, e.g. 10MB,100MB,1GB')
+    parser.add_argument('--types', default=','.join(GENERATORS),
+                        help=f"synthetic corpus types ({', '.join(GENERATORS)}); empty for none")
+    parser.add_argument('--samples', action='store_true',
+                        help='also scale one file from each sample_data directory')
+    parser.add_argument('--strategies', default=','.join(CHUNKING_STRATEGIES),
+                        help='chunking strategies to measure; empty to skip chunking')
+    parser.add_argument('--chunk-max-size', default='100MB',
+                        help='skip chunking for corpora larger than this')
+    parser.add_argument('--backend', default='etree', help='parser backend for analysis')
+    parser.add_argument('--streaming-threshold', default='256MB',
+                        help="analyzer streaming threshold, or 'off'")
+    parser.add_argument('--timeout', type=float, default=1800, help='seconds per measurement')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus-dir', default=str(DEFAULT_CORPUS_DIR),
+                        help='where generated corpora are kept and reused')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', help='results JSON of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative regression before failing')
+    parser.add_argument('--quick', action='store_true',
+                        help='1MB corpora only; a smoke run for CI')
+    args = parser.parse_args()
+
+    sizes = [parse_size('1MB')] if args.quick else [parse_size(s) for s in args.sizes.split(',') if s]
+    kinds = [k for k in args.types.split(',') if k]
+    unknown = set(kinds) - set(GENERATORS)
+    if unknown:
+        parser.error(f"unknown corpus types: {sorted(unknown)}")
+    strategies = [s for s in args.strategies.split(',') if s]
+    chunk_max_size = parse_size(args.chunk_max_size)
+    threshold = None if args.streaming_threshold == 'off' else parse_size(args.streaming_threshold)
+
+    corpora = build_corpora(kinds, sample_sources() if args.samples else {}, sizes,
+                            Path(args.corpus_dir), args.seed)
+
+    results = []
+    print(f"\n⏱️  {len(corpora)} corpora, sizes {', '.join(format_size(s) for s in sizes)}")
+    for corpus in corpora:
+        size_bytes = Path(corpus['path']).stat().st_size
+        operations = [('analyze', None)]
+        if size_bytes <= chunk_max_size:
+            operations += [('chunk', strategy) for strategy in strategies]
+        for operation, strategy in operations:
+            task = {'operation': operation, 'strategy': strategy, 'path': corpus['path'],
+                    'backend': args.backend, 'streaming_threshold': threshold}
+            measurement = run_isolated(task, args.timeout)
+            result = {'corpus': corpus['corpus'], 'kind': corpus['kind'], 'source': corpus['source'],
+                      'size_bytes': size_bytes, 'operation': operation, 'strategy': strategy}
+            result.update(measurement)
+            if 'seconds' in result and 'error' not in result:
+                result['throughput_mb_s'] = size_bytes / 1e6 / max(result['seconds'], 1e-9)
+            results.append(result)
+            print_result(result)
+
+    report = {
+        'format_version': RESULT_FORMAT_VERSION,
+        'environment': environment(args.backend),
+        'settings': {'sizes': sizes, 'streaming_threshold': threshold, 'seed': args.seed},
+        'results': results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        report['regressions'] = compare(results, baseline, args.tolerance)
+        if report['regressions']:
+            status = 1
+            print(f"\n❌ {len(report['regressions'])} regression(s) beyond {args.tolerance:.0%}:")
+            for regression in report['regressions']:
+                if regression['metric'] == 'error':
+                    print(f"  {regression['corpus']} {regression['operation']} "
+                          f"now fails: {regression['current']}")
+                    continue
+                print(f"  {regression['corpus']} {regression['operation']} "
+                      f"{regression['metric']}: {regression['baseline']:.2f} -> {regression['current']:.2f}")
+        else:
+            print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
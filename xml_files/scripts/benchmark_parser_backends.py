@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Parser Backend Benchmark
+
+Times parsing and full analysis of every file under sample_data with each
+available parser backend (stdlib ElementTree, and lxml when installed).
+
+Usage:
+    python scripts/benchmark_parser_backends.py [--repeat N] [--data DIR]
+"""
+
+import argparse
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.parser_backend import available_backends, get_backend
+
+
+def collect_files(data_dir: Path):
+    return sorted(p for p in data_dir.rglob('*')
+                  if p.is_file() and p.suffix.lower() in ('.xml', '.xhtml', '.svg', '.kml',
+                                                          '.gpx', '.xsd', '.wsdl', '.xlf',
+                                                          '.graphml', '.wadl'))
+
+
+def time_parse(backend, files, repeat):
+    parsed = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in files:
+            try:
+                backend.parse(str(path))
+                parsed += 1
+            except ET.ParseError:
+                pass
+    return time.perf_counter() - start, parsed // repeat
+
+
+def time_analyze(backend_name, files, repeat):
+    analyzer = XMLDocumentAnalyzer(backend=backend_name)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in files:
+            analyzer.analyze_document(str(path))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='passes over the data set')
+    parser.add_argument('--data', default=str(PROJECT_ROOT / 'sample_data'),
+                        help='directory of XML files')
+    args = parser.parse_args()
+
+    files = collect_files(Path(args.data))
+    total_bytes = sum(p.stat().st_size for p in files)
+    print(f"📁 {len(files)} files, {total_bytes / 1024:.1f} KB, {args.repeat} passes")
+    print()
+    print(f"{'backend':<8} {'parse s':>9} {'MB/s':>8} {'analyze s':>10} {'files/s':>9}")
+
+    baseline = None
+    for name in available_backends():
+        parse_seconds, parsed = time_parse(get_backend(name), files, args.repeat)
+        analyze_seconds = time_analyze(name, files, args.repeat)
+        mb_per_second = total_bytes * args.repeat / parse_seconds / 1e6
+        files_per_second = len(files) * args.repeat / analyze_seconds
+        print(f"{name:<8} {parse_seconds:>9.3f} {mb_per_second:>8.1f} "
+              f"{analyze_seconds:>10.3f} {files_per_second:>9.1f}")
+        if baseline is None:
+            baseline = (parse_seconds, analyze_seconds)
+        else:
+            print(f"{'':<8} {baseline[0] / parse_seconds:>8.2f}x {'':>8} "
+                  f"{baseline[1] / analyze_seconds:>9.2f}x")
+
+    if 'lxml' not in available_backends():
+        print("\nℹ️  lxml is not installed; only the stdlib backend was measured")
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,9 @@ setup(
         # Only using Python standard library - no external dependencies
     ],
     extras_require={
+        "lxml": [
+            "lxml>=4.6.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "black>=21.0",
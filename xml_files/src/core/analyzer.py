@@ -14,11 +14,30 @@ Key features:
 
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Type, Tuple
-from dataclasses import dataclass, field
+from typing import (Dict, List, Optional, Any, Type, Tuple, Iterable, Iterator, Callable, ContextManager,
+                    TYPE_CHECKING)
+from dataclasses import dataclass, field, fields
 import re
 from pathlib import Path
 import json
+import logging
+
+from core.sniffer import sniff_document, DocumentPrefix, DEFAULT_SNIFF_EVENTS
+from core.dispatch import HandlerDispatchIndex, DetectionStats, timed_can_handle
+from core.document_index import DocumentIndex
+from core.registry import HandlerRegistry, HandlerSpec, HandlerVersions
+
+# Caching, parser backends and instrumentation are imported where they are
+# used, so that `import core.analyzer` (e.g. by every handler) stays cheap
+if TYPE_CHECKING:
+    from core.cache import AnalysisCache
+    from core.instrumentation import Instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Files at least this large are analyzed with the handler's streaming
+# protocol when it has one (XMLHandler.analyze_stream)
+DEFAULT_STREAMING_THRESHOLD = 256 * 1024 * 1024
 
 @dataclass
 class DocumentTypeInfo:
@@ -29,9 +48,34 @@ class DocumentTypeInfo:
     schema_uri: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+class Deferred:
+    """
+    A SpecializedAnalysis section computed on first access.
+    
+    Handlers pass ``Deferred(self.extract_key_data, root)`` instead of the
+    computed value; the call runs when the field is first read and the
+    result replaces the Deferred on the analysis object.
+    """
+    __slots__ = ('func', 'args')
+    
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+    
+    def resolve(self) -> Any:
+        return self.func(*self.args)
+
+def _resolve_within(context: Callable[[], ContextManager], deferred: Deferred) -> Any:
+    with context():
+        return deferred.resolve()
+
 @dataclass
 class SpecializedAnalysis:
-    """Results from specialized handler analysis"""
+    """Results from specialized handler analysis
+    
+    Any field may hold a Deferred; it is computed and memoized the first
+    time the field is read, so callers only pay for the sections they use.
+    """
     document_type: str
     key_findings: Dict[str, Any]
     recommendations: List[str]
@@ -39,10 +83,68 @@ class SpecializedAnalysis:
     ai_use_cases: List[str]  # Potential AI/ML applications
     structured_data: Dict[str, Any]  # Extracted structured data
     quality_metrics: Dict[str, float]  # Data quality indicators
+    
+    def __getattribute__(self, name: str) -> Any:
+        value = object.__getattribute__(self, name)
+        if type(value) is Deferred:
+            value = value.resolve()
+            object.__setattr__(self, name, value)
+        return value
+    
+    def is_computed(self, section: str) -> bool:
+        """True if this section has already been computed"""
+        return type(self.__dict__[section]) is not Deferred
+    
+    def resolve_within(self, context: Callable[[], ContextManager]) -> None:
+        """Compute each pending section inside ``context()``, e.g. with its document index active"""
+        for f in fields(self):
+            if not self.is_computed(f.name):
+                object.__setattr__(self, f.name, Deferred(_resolve_within, context, self.__dict__[f.name]))
+    
+    def materialize(self) -> 'SpecializedAnalysis':
+        """Compute every pending section"""
+        for f in fields(self):
+            getattr(self, f.name)
+        return self
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Deferred sections hold the parsed tree; compute them before pickling
+        self.materialize()
+        return self.__dict__.copy()
+    
+    @classmethod
+    def deferred(cls, compute: Callable[[], 'SpecializedAnalysis']) -> 'SpecializedAnalysis':
+        """An analysis whose handler.analyze() call itself runs on first access"""
+        computed: List['SpecializedAnalysis'] = []
+        
+        def section(name: str) -> Any:
+            if not computed:
+                computed.append(compute())
+            return getattr(computed[0], name)
+        
+        return cls(**{f.name: Deferred(section, f.name) for f in fields(cls)})
+
+# Sections accepted by analyze_document(sections=...)
+ANALYSIS_SECTIONS = [f.name for f in fields(SpecializedAnalysis)]
 
 class XMLHandler(ABC):
     """Abstract base class for XML document handlers"""
     
+    # Dispatch hints used by core.dispatch.HandlerDispatchIndex. A handler
+    # whose can_handle() can only succeed for certain root local names or
+    # namespace URI fragments declares them here; handlers that declare
+    # neither are probed for every document.
+    DETECTION_ROOT_ELEMENTS: List[str] = []
+    DETECTION_NAMESPACES: List[str] = []
+    
+    # Bump when a handler's output changes so cached results it produced
+    # (core.cache.AnalysisCache) are no longer served
+    HANDLER_VERSION: str = "1.0"
+    
+    # Handlers that implement analyze_stream() set this; the analyzer then
+    # streams documents above its streaming threshold instead of parsing them
+    SUPPORTS_STREAMING: bool = False
+    
     @abstractmethod
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         """
@@ -65,6 +167,20 @@ class XMLHandler(ABC):
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
         """Extract the most important data from this document type"""
         pass
+    
+    def document_index(self, root: ET.Element) -> DocumentIndex:
+        """Shared element index for this document, built once per document"""
+        return DocumentIndex.for_root(root)
+    
+    def analyze_stream(self, file_path: str) -> SpecializedAnalysis:
+        """
+        Analyze the document in one streaming pass, without building its tree.
+        
+        Optional; handlers that implement it also set SUPPORTS_STREAMING.
+        Implementations aggregate counters and bounded samples over
+        core.streaming.RecordStream, so memory does not grow with file size.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support streaming analysis")
 
 class SCAPHandler(XMLHandler):
     """Handler for SCAP (Security Content Automation Protocol) documents"""
@@ -149,8 +265,8 @@ class SCAPHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_quality_metrics(root)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_quality_metrics, root)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -243,8 +359,8 @@ class RSSHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory={'articles': len(items), 'categories': len(findings['categories'])},
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_feed_quality(root, items)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_feed_quality, root, items)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -346,8 +462,8 @@ class SVGHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=findings['element_types'],
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_svg_quality(root)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_svg_quality, root)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -460,8 +576,8 @@ class GenericXMLHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=self._inventory_data(root),
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._analyze_quality(root)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._analyze_quality, root)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -559,88 +675,331 @@ class GenericXMLHandler(XMLHandler):
 class XMLDocumentAnalyzer:
     """Main analyzer that uses specialized handlers"""
     
-    def __init__(self):
-        # Use the new centralized handler registry
+    def __init__(self, cache: Optional['AnalysisCache'] = None, backend: Any = None,
+                 streaming_threshold: Optional[int] = DEFAULT_STREAMING_THRESHOLD,
+                 instrumentation: Optional['Instrumentation'] = None):
+        from core.parser_backend import get_backend
+        
+        # Optional on-disk result cache keyed by file content
+        self.cache = cache
+        # Parser backend: 'lxml', 'etree', 'auto' or a backend instance
+        self.backend = get_backend(backend)
+        # File size in bytes from which streaming analysis is used; None disables it
+        self.streaming_threshold = streaming_threshold
+        # Optional per-phase timing (and memory) collection; results then
+        # carry a "timings" dict (see core.instrumentation)
+        self.instrumentation = instrumentation
+        
+        # Use the new centralized handler registry. Handlers are declared by
+        # module path and detection signature and imported on first use
         try:
-            from handlers import ALL_HANDLERS
-            # Instantiate all handlers from the registry
-            self.handlers = [handler_class() for handler_class in ALL_HANDLERS]
-            print(f"🔄 Using new handler registry with {len(self.handlers)} handlers")
+            from handlers import HANDLER_SPECS
+            self.registry = HandlerRegistry(HANDLER_SPECS)
+            logger.debug("Using handler registry with %d handlers", len(self.registry.specs))
         except ImportError:
-            # Fallback to old method if registry not available
-            print("⚠️  Handler registry not available, using legacy handler loading")
-            self.handlers: List[Type[XMLHandler]] = [
-                SCAPHandler(),
-                RSSHandler(),
-                SVGHandler(),
+            # Fallback to the handlers defined in this module
+            logger.warning("Handler registry not available, using legacy handlers")
+            self.registry = HandlerRegistry([
+                HandlerSpec('SCAPHandler', __name__),
+                HandlerSpec('RSSHandler', __name__),
+                HandlerSpec('SVGHandler', __name__),
                 # Add more handlers here as needed
-                GenericXMLHandler()  # Always last as fallback
-            ]
+                HandlerSpec('GenericXMLHandler', __name__)  # Always last as fallback
+            ])
+        
+        # Candidates are instantiated by the registry as dispatch offers them
+        self.dispatch_index = HandlerDispatchIndex(self.registry.specs, resolve=self.registry.handler)
+        self.detection_stats = DetectionStats()
+        self.handler_versions = HandlerVersions(self.registry)
+    
+    @property
+    def handlers(self) -> List[XMLHandler]:
+        """Every registered handler, in registry order (imports them all)"""
+        return self.registry.handlers()
+    
+    def analyze_document(self, file_path: str,
+                         sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Analyze an XML document using the appropriate handler
+        
+        Args:
+            file_path: Document to analyze
+            sections: SpecializedAnalysis fields the caller intends to read
+                (see ANALYSIS_SECTIONS). These are computed before returning
+                and every other section on first access; an empty list
+                defers the handler's analysis entirely. None (the default)
+                computes the full analysis.
+        """
+        if sections is not None:
+            unknown = set(sections) - set(ANALYSIS_SECTIONS)
+            if unknown:
+                raise ValueError(f"Unknown analysis sections: {sorted(unknown)}")
+        
+        if self.instrumentation is None:
+            from core.instrumentation import NULL_TIMER
+            return self._analyze_cached(file_path, sections, NULL_TIMER)
+        
+        timer = self.instrumentation.timer()
+        result = self._analyze_cached(file_path, sections, timer)
+        result["timings"] = self.instrumentation.observe(timer.timings(result.get("handler_used")))
+        return result
+    
+    def _analyze_cached(self, file_path: str, sections: Optional[List[str]],
+                        timer) -> Dict[str, Any]:
+        """Serve the result from the cache when possible, else analyze"""
+        if self.cache is None:
+            return self._analyze_uncached(file_path, sections, timer)
+        
+        from core.cache import content_digest
+        with timer.phase("cache_lookup"):
+            try:
+                digest = content_digest(file_path)
+                # Streamed and tree analyses of the same content differ
+                if self._streams(file_path):
+                    digest = f"{digest}-streaming"
+            except OSError:
+                digest = None
+            cached = self.cache.get(digest, self.handler_versions) if digest else None
+        if digest is None:
+            return self._analyze_uncached(file_path, sections, timer)
+        if cached is not None:
+            # Same content may live at another path
+            cached["file_path"] = file_path
+            return cached
+        
+        result = self._analyze_uncached(file_path, sections, timer)
+        # Storing a partial analysis would force its pending sections
+        if "error" not in result and sections is None:
+            with timer.phase("cache_store"):
+                self.cache.put(digest, result, self.handler_versions[result["handler_used"]])
+        return result
+    
+    def _analyze_uncached(self, file_path: str,
+                          sections: Optional[List[str]], timer) -> Dict[str, Any]:
+        """Parse the document and run detection and specialized analysis"""
+        selected = None
+        if self._streams(file_path):
+            # Choose the handler from the document prefix, as detect_document does
+            try:
+                with timer.phase("sniff"):
+                    prefix = sniff_document(file_path)
+            except ET.ParseError as e:
+                return {
+                    "error": f"Failed to parse XML: {e}",
+                    "file_path": file_path
+                }
+            with timer.phase("detect"):
+                selected = self._select_handler(prefix.root, prefix.namespaces)
+            if selected[0].SUPPORTS_STREAMING:
+                return self._analyze_streaming(file_path, prefix, selected, sections, timer)
+        
+        # Parse the document, collecting namespace declarations on the way
+        try:
+            with timer.phase("parse"):
+                root, namespaces = self._parse_document(file_path)
+        except ET.ParseError as e:
+            return {
+                "error": f"Failed to parse XML: {e}",
+                "file_path": file_path
+            }
+        
+        # Index the tree once; handlers share it through document_index()
+        # while it is active, which is only while this analysis runs
+        with timer.phase("index"):
+            index = DocumentIndex(root)
+        
+        with index.activate():
+            with timer.phase("detect"):
+                # Find the best handler, unless the prefix already chose one
+                best_handler, best_confidence = selected or self._select_handler(root, namespaces)
+                
+                # Detect document type
+                doc_type = best_handler.detect_type(root, namespaces)
             
-            # Try to import additional handlers
+            # Perform specialized analysis
+            if sections == []:
+                analysis = SpecializedAnalysis.deferred(
+                    lambda: best_handler.analyze(root, file_path))
+            else:
+                with timer.phase("analyze"):
+                    analysis = best_handler.analyze(root, file_path)
+                self._compute_sections(analysis, sections, timer)
+        # Sections computed later see the same index; it lives as long as they do
+        analysis.resolve_within(index.activate)
+        
+        # Combine results
+        return {
+            "file_path": file_path,
+            "document_type": doc_type,
+            "handler_used": best_handler.__class__.__name__,
+            "confidence": best_confidence,
+            "analysis": analysis,
+            "namespaces": namespaces,
+            "file_size": Path(file_path).stat().st_size
+        }
+    
+    def _streams(self, file_path: str) -> bool:
+        """Whether the document is large enough to be analyzed without its tree"""
+        return (self.streaming_threshold is not None
+                and Path(file_path).stat().st_size >= self.streaming_threshold)
+    
+    def _analyze_streaming(self, file_path: str, prefix: DocumentPrefix,
+                           selected: Tuple[XMLHandler, float],
+                           sections: Optional[List[str]], timer) -> Dict[str, Any]:
+        """
+        Analyze a large document without building its tree.
+        
+        ``selected`` is the streaming handler and its confidence, chosen
+        from the document ``prefix``. Namespaces are those declared within
+        the prefix.
+        """
+        best_handler, best_confidence = selected
+        with timer.phase("detect"):
+            doc_type = best_handler.detect_type(prefix.root, prefix.namespaces)
+        
+        if sections == []:
+            analysis = SpecializedAnalysis.deferred(
+                lambda: best_handler.analyze_stream(file_path))
+        else:
             try:
-                from additional_xml_handlers import (
-                    MavenPOMHandler, Log4jConfigHandler, SpringConfigHandler,
-                    DocBookHandler, SitemapHandler
-                )
-                # Insert before GenericXMLHandler
-                self.handlers.insert(-1, MavenPOMHandler())
-                self.handlers.insert(-1, Log4jConfigHandler())
-                self.handlers.insert(-1, SpringConfigHandler())
-                self.handlers.insert(-1, DocBookHandler())
-                self.handlers.insert(-1, SitemapHandler())
-            except ImportError:
-                # Additional handlers not available
-                pass
+                with timer.phase("analyze_stream"):
+                    analysis = best_handler.analyze_stream(file_path)
+            except ET.ParseError as e:
+                return {
+                    "error": f"Failed to parse XML: {e}",
+                    "file_path": file_path
+                }
+            self._compute_sections(analysis, sections, timer)
+        
+        return {
+            "file_path": file_path,
+            "document_type": doc_type,
+            "handler_used": best_handler.__class__.__name__,
+            "confidence": best_confidence,
+            "analysis": analysis,
+            "namespaces": prefix.namespaces,
+            "file_size": Path(file_path).stat().st_size,
+            "analysis_mode": "streaming"
+        }
+    
+    def _compute_sections(self, analysis: SpecializedAnalysis,
+                          sections: Optional[List[str]], timer) -> None:
+        """Compute the requested sections (all when None) of a fresh analysis"""
+        for section in (ANALYSIS_SECTIONS if sections is None else sections):
+            if analysis.is_computed(section):
+                continue
+            # Deferred structured_data is the handler's extract_key_data()
+            with timer.phase("extract_key_data" if section == "structured_data" else "sections"):
+                getattr(analysis, section)
     
-    def analyze_document(self, file_path: str) -> Dict[str, Any]:
-        """Analyze an XML document using the appropriate handler"""
+    def analyze_many(self, paths: Iterable[str], workers: Optional[int] = None,
+                     timeout: Optional[float] = None,
+                     output_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze many documents in parallel worker processes.
+        
+        Yields one JSON-serializable record per file as soon as it is
+        finished (completion order, not input order) and optionally appends
+        each record to a JSONL file. Files that fail or exceed ``timeout``
+        seconds yield a record with an ``error`` key. See core.batch.
+        """
+        from core import batch
+        return batch.analyze_many(paths, workers=workers, timeout=timeout,
+                                  output_path=output_path, analyzer=self)
+    
+    def detect_document(self, file_path: str,
+                        max_events: int = DEFAULT_SNIFF_EVENTS) -> Dict[str, Any]:
+        """
+        Detect the document type from the start of the file only.
         
-        # Parse the document
+        Reads the prolog, the root element, its namespace declarations and
+        the first ``max_events`` start events, then runs the detection pass
+        over the handler registry. No analysis is performed, so the cost is
+        independent of the file size.
+        """
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
+            prefix = sniff_document(file_path, max_events=max_events)
         except ET.ParseError as e:
             return {
                 "error": f"Failed to parse XML: {e}",
                 "file_path": file_path
             }
         
-        # Extract namespaces
-        namespaces = self._extract_namespaces(root)
+        best_handler, best_confidence = self._select_handler(prefix.root, prefix.namespaces)
+        doc_type = best_handler.detect_type(prefix.root, prefix.namespaces)
         
-        # Find the best handler
+        return {
+            "file_path": file_path,
+            "document_type": doc_type,
+            "handler_used": best_handler.__class__.__name__,
+            "confidence": best_confidence,
+            "namespaces": prefix.namespaces,
+            "file_size": Path(file_path).stat().st_size,
+            "detection": {
+                "mode": "prefix",
+                "events_read": prefix.events_read,
+                "bytes_read": prefix.bytes_read,
+                "complete": prefix.complete,
+                "xml_declaration": prefix.xml_declaration,
+                "doctype": prefix.doctype
+            }
+        }
+    
+    def _select_handler(self, root: ET.Element,
+                        namespaces: Dict[str, str]) -> Tuple[XMLHandler, float]:
+        """Return the handler with the highest confidence for this document"""
         best_handler = None
         best_confidence = 0.0
+        self.detection_stats.documents += 1
         
-        for handler in self.handlers:
-            can_handle, confidence = handler.can_handle(root, namespaces)
+        # Only handlers indexed under this root/namespace (plus open
+        # detectors) are probed. Candidates come back in registry order, so
+        # the first handler reaching full confidence cannot be beaten.
+        for handler in self.dispatch_index.candidates(root, namespaces):
+            can_handle, confidence = timed_can_handle(handler, root, namespaces,
+                                                      self.detection_stats)
             if can_handle and confidence > best_confidence:
                 best_handler = handler
                 best_confidence = confidence
+                if confidence >= 1.0:
+                    break
         
         if not best_handler:
-            best_handler = self.handlers[-1]  # Use generic handler
+            best_handler = self.registry.fallback()  # Use generic handler
         
-        # Detect document type
-        doc_type = best_handler.detect_type(root, namespaces)
+        return best_handler, best_confidence
+    
+    def detection_cost_report(self) -> List[Dict[str, Any]]:
+        """
+        Per-handler detection cost accumulated by this analyzer.
         
-        # Perform specialized analysis
-        analysis = best_handler.analyze(root, file_path)
+        Each row has calls, matches, total/mean/max seconds and the share
+        of total detection time, most expensive handler first.
+        """
+        report = self.detection_stats.report()
+        for row in report:
+            row['open_detector'] = self.dispatch_index.is_open(self.registry.spec(row['handler']))
+        return report
+    
+    def _parse_document(self, file_path: str) -> Tuple[ET.Element, Dict[str, str]]:
+        """
+        Parse a file and return its root and namespace declarations.
         
-        # Combine results
-        return {
-            "file_path": file_path,
-            "document_type": doc_type,
-            "handler_used": best_handler.__class__.__name__,
-            "confidence": best_confidence,
-            "analysis": analysis,
-            "namespaces": namespaces,
-            "file_size": Path(file_path).stat().st_size
-        }
+        Namespaces come from the parser's ``start-ns`` events, so every
+        declaration is seen (including ones below the root) with its real
+        prefix ('default' for the default namespace), at no extra cost.
+        Parsing goes through the configured backend (core.parser_backend).
+        """
+        return self.backend.parse(file_path)
     
     def _extract_namespaces(self, root: ET.Element) -> Dict[str, str]:
-        """Extract all namespaces from the document"""
+        """
+        Extract namespaces from an already parsed tree.
+        
+        ElementTree drops xmlns attributes, so this can only recover URIs
+        from element tags (under generated ns<N> prefixes). Kept for callers
+        holding a tree; analyze_document uses _parse_document instead.
+        """
         namespaces = {}
         
         # Get namespaces from root element
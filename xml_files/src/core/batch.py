@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Parallel Batch Analysis
+
+Runs ``XMLDocumentAnalyzer.analyze_document`` over many files using a
+process pool. Each worker builds its analyzer (and therefore every handler
+instance) once in the pool initializer and reuses it for all the files it
+receives.
+
+Results are yielded as they complete, in no particular order, and can be
+appended to a JSONL file as they arrive. Only a bounded number of files is
+in flight at any time, so memory stays flat however many paths are given.
+A file that exceeds the per-file timeout produces an error record; the
+worker carries on with the next file. If a worker process dies, the pool
+breaks and every file in flight fails with it; those files are retried one
+at a time in a one-worker pool, so only the file that kills its worker
+again produces an error record. Remaining files go to a new pool.
+"""
+
+import dataclasses
+import json
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# How many files may be queued per worker before we wait for results
+IN_FLIGHT_PER_WORKER = 4
+
+
+class AnalysisTimeout(Exception):
+    """Raised inside a worker when a single file exceeds its time budget"""
+    pass
+
+
+def to_record(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an analyze_document() result to plain dicts and lists"""
+    record = {}
+    for key, value in result.items():
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            value = dataclasses.asdict(value)
+        record[key] = value
+    return record
+
+
+# Per-process state, set up once by _init_worker
+_worker_analyzer = None
+_worker_timeout: Optional[float] = None
+
+
+def _init_worker(timeout: Optional[float], cache_config: Optional[tuple],
+                 analyzer_options: Optional[Dict[str, Any]] = None) -> None:
+    """Pool initializer: build one warm analyzer for this worker process"""
+    global _worker_analyzer, _worker_timeout
+    from core.analyzer import XMLDocumentAnalyzer
+    from core.cache import AnalysisCache
+
+    # Workers open their own handle on the shared cache directory
+    cache = AnalysisCache(*cache_config) if cache_config else None
+    _worker_analyzer = XMLDocumentAnalyzer(cache=cache, **(analyzer_options or {}))
+    _worker_timeout = timeout
+
+
+def _raise_timeout(signum, frame):
+    raise AnalysisTimeout()
+
+
+def _analyze_one(analyzer, file_path: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Analyze a single file, turning failures and timeouts into error records"""
+    use_alarm = bool(timeout) and hasattr(signal, 'setitimer')
+    start = time.perf_counter()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        record = to_record(analyzer.analyze_document(file_path))
+    except AnalysisTimeout:
+        record = {
+            "error": f"Analysis timed out after {timeout}s",
+            "file_path": file_path
+        }
+    except Exception as e:
+        record = {
+            "error": f"Analysis failed: {e}",
+            "file_path": file_path
+        }
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    record["elapsed_seconds"] = time.perf_counter() - start
+    return record
+
+
+def _worker_analyze(file_path: str) -> Dict[str, Any]:
+    return _analyze_one(_worker_analyzer, file_path, _worker_timeout)
+
+
+def analyze_many(paths: Iterable[str], workers: Optional[int] = None,
+                 timeout: Optional[float] = None, output_path: Optional[str] = None,
+                 analyzer=None) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze many files in parallel, yielding one record per file as it completes.
+
+    Args:
+        paths: File paths; may be a lazy iterable
+        workers: Worker processes (defaults to os.cpu_count()). With 1 the
+            files are analyzed in this process using ``analyzer``
+        timeout: Per-file time limit in seconds (worker processes only)
+        output_path: If given, each record is also appended to this JSONL file
+        analyzer: Analyzer to use for in-process analysis; worker processes
+            share its result cache directory, if it has one, and parser backend
+
+    Records are ``analyze_document`` results with dataclasses converted to
+    dicts, plus ``elapsed_seconds``. When ``analyzer`` has instrumentation,
+    records carry ``timings`` and are aggregated on it as they arrive. Failed files yield a record with an
+    ``error`` key instead of raising.
+    """
+    workers = workers or os.cpu_count() or 1
+    sink = open(output_path, 'a', encoding='utf-8') if output_path else None
+    try:
+        for record in _run(paths, workers, timeout, analyzer):
+            if sink:
+                sink.write(json.dumps(record, default=str) + '\n')
+                sink.flush()
+            yield record
+    finally:
+        if sink:
+            sink.close()
+
+
+def _run(paths: Iterable[str], workers: int, timeout: Optional[float],
+         analyzer) -> Iterator[Dict[str, Any]]:
+    if workers == 1:
+        if analyzer is None:
+            from core.analyzer import XMLDocumentAnalyzer
+            analyzer = XMLDocumentAnalyzer()
+        for path in paths:
+            yield _analyze_one(analyzer, str(path))
+        return
+
+    cache = getattr(analyzer, 'cache', None)
+    cache_config = (str(cache.directory), cache.max_bytes) if cache else None
+    # Workers rebuild the analyzer with the same parser backend, streaming
+    # threshold and instrumentation settings as the caller's
+    analyzer_options = {}
+    instrumentation = None
+    if analyzer is not None:
+        instrumentation = analyzer.instrumentation
+        analyzer_options = {'backend': analyzer.backend.name,
+                            'streaming_threshold': analyzer.streaming_threshold,
+                            'instrumentation': instrumentation}
+
+    def new_pool(max_workers):
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                   initargs=(timeout, cache_config, analyzer_options))
+
+    def submit(pool, max_workers, path):
+        """Submit to the pool, replacing it first if a worker died"""
+        try:
+            return pool, pool.submit(_worker_analyze, path)
+        except BrokenProcessPool:
+            pool.shutdown(wait=False)
+            pool = new_pool(max_workers)
+            return pool, pool.submit(_worker_analyze, path)
+
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+    pool = new_pool(workers)
+    # Files lost with a broken pool, retried one at a time on their own
+    retries = deque()
+    isolation = None
+    try:
+        pending = {}  # future -> (path, whether it runs in isolation)
+        path_iter = iter(paths)
+        exhausted = False
+        while pending or retries or not exhausted:
+            # Top up the queue without materializing the whole path list
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    path = str(next(path_iter))
+                except StopIteration:
+                    exhausted = True
+                    break
+                pool, future = submit(pool, workers, path)
+                pending[future] = (path, False)
+            if retries and not any(isolated for _, isolated in pending.values()):
+                path = retries.popleft()
+                isolation, future = submit(isolation or new_pool(1), 1, path)
+                pending[future] = (path, True)
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, isolated = pending.pop(future)
+                try:
+                    record = future.result()
+                except BrokenProcessPool as e:
+                    if not isolated:
+                        # Maybe another file killed the worker: retry alone
+                        retries.append(path)
+                        continue
+                    yield {"error": f"Worker failed: {e}", "file_path": path}
+                    continue
+                except Exception as e:
+                    yield {"error": f"Worker failed: {e}", "file_path": path}
+                    continue
+                # Aggregate worker timings on the caller's instrumentation
+                if instrumentation is not None and 'timings' in record:
+                    instrumentation.observe(record['timings'])
+                yield record
+    finally:
+        pool.shutdown()
+        if isolation is not None:
+            isolation.shutdown()
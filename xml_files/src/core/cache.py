@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+On-Disk Analysis Result Cache
+
+Stores ``analyze_document`` results keyed by the SHA-256 of the file
+content, so an unchanged document is served from disk without parsing.
+Each entry records the handler class that produced it and that handler's
+``HANDLER_VERSION``; an entry whose handler version no longer matches the
+registry is treated as a miss and replaced.
+
+The cache is safe to share between processes:
+
+- entries are written to a temporary file and moved into place with
+  ``os.replace``, so readers never see a partial entry
+- a hit refreshes the entry's mtime, which is the LRU clock
+- when the directory grows past ``max_bytes`` the least recently used
+  entries are removed; one process evicts at a time (``fcntl`` lock where
+  available) and entries vanishing underneath a reader are simply misses
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Bump to invalidate every existing entry when the entry layout changes
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_HASH_CHUNK_SIZE = 1024 * 1024
+_ENTRY_SUFFIX = '.pkl'
+
+
+def content_digest(file_path: str) -> str:
+    """SHA-256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Size-bounded, LRU-evicted cache of analysis results on disk"""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        # Running estimate of the directory size; eviction rescans the
+        # directory, which is the source of truth across processes
+        self._estimated_bytes = self._scan_size()
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}-v{CACHE_FORMAT_VERSION}{_ENTRY_SUFFIX}"
+
+    def get(self, digest: str, handler_versions: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for this content digest, or None.
+
+        ``handler_versions`` maps handler class names to their current
+        ``HANDLER_VERSION``; entries produced by another version are misses.
+        """
+        path = self._entry_path(digest)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # Truncated or unreadable entry - drop it and recompute
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        if handler_versions.get(entry.get('handler')) != entry.get('handler_version'):
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Refresh the LRU clock
+        except OSError:
+            pass
+        self.hits += 1
+        return entry['result']
+
+    def put(self, digest: str, result: Dict[str, Any], handler_version: str) -> bool:
+        """Store a result; returns False if it could not be serialized"""
+        entry = {
+            'handler': result.get('handler_used'),
+            'handler_version': handler_version,
+            'stored_at': time.time(),
+            'result': result
+        }
+        try:
+            payload = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+
+        path = self._entry_path(digest)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(Path(tmp_path))
+            return False
+
+        self._estimated_bytes += len(payload)
+        if self._estimated_bytes > self.max_bytes:
+            self.evict()
+        return True
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under 90% of max_bytes"""
+        lock = self._try_lock()
+        if lock is False:
+            return 0  # Another process is already evicting
+        try:
+            entries = []
+            total = 0
+            for path in self.directory.glob(f'*/*{_ENTRY_SUFFIX}'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            removed = 0
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= target:
+                    break
+                if self._remove(path):
+                    removed += 1
+                total -= size
+            self._estimated_bytes = total
+            return removed
+        finally:
+            if lock:
+                lock.close()
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        for path in self.directory.glob(f'*/*{_ENTRY_SUFFIX}'):
+            self._remove(path)
+        self._estimated_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size_bytes': self._scan_size(),
+            'max_bytes': self.max_bytes
+        }
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self.directory.glob(f'*/*{_ENTRY_SUFFIX}'):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _try_lock(self):
+        """Non-blocking exclusive lock file; None if locking is unsupported"""
+        if fcntl is None:
+            return None
+        handle = open(self.directory / '.evict.lock', 'w')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        return handle
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
@@ -7,21 +7,30 @@ to prepare them for LLM processing while preserving context and structure.
 """
 
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional, Generator, Tuple
+from typing import List, Dict, Any, Optional, Generator, Iterable, Iterator, Tuple
 from dataclasses import dataclass
 import hashlib
 import json
 from pathlib import Path
 
+from core.source_map import Fragment, SourceMap
+from core.tokenizers import TokenCounter, get_tokenizer, _utf8_len
+
 @dataclass
 class ChunkingConfig:
     """Configuration for chunking strategy"""
     max_chunk_size: int = 3000  # tokens (approximate)
-    min_chunk_size: int = 500
+    min_chunk_size: int = 500  # Smaller adjacent chunks under one parent are packed together (see ChunkPacker)
     overlap_size: int = 200
     preserve_hierarchy: bool = True
     include_parent_context: bool = True
+    max_context_depth: int = 6  # Ancestors named in a chunk's parent_context breadcrumb
     semantic_boundaries: List[str] = None  # Element names that are natural boundaries
+    tokenizer: Any = None  # Token counter or its name (see core.tokenizers); None for the default
+    source_positions: bool = True  # Record chunk lines and byte offsets in the file (see core.source_map)
+    source_content: bool = False  # Slice chunk content from the file instead of re-serializing it
+    pack_small_chunks: bool = True  # Let ChunkingOrchestrator merge chunks below min_chunk_size
+    exclusive_content: bool = False  # Content-aware chunking puts each text in exactly one chunk
 
 @dataclass
 class XMLChunk:
@@ -35,16 +44,286 @@ class XMLChunk:
     metadata: Dict[str, Any]
     token_estimate: int
     elements_included: List[str]
-    
+
+@dataclass
+class ElementSize:
+    """Serialized size of one element, including its tail text"""
+    byte_size: int  # UTF-8 bytes of the element within the serialized document
+    words: int  # Whitespace-separated words when the element is serialized on its own
+
+_NO_NAMESPACES = frozenset()
+
+class SubtreeSizes:
+    """
+    Serialized size of every element of a subtree, computed in one
+    bottom-up pass so chunking decisions never serialize an element just to
+    size it.
+
+    The pass mirrors ``ET.tostring``: an element's ``words`` equal
+    ``len(ET.tostring(element, encoding='unicode').split())`` (namespace
+    declarations included) and ``byte_range`` is where the element lies in
+    the UTF-8 serialization of the root. ``standalone_bytes`` adds the
+    declarations an element gets when serialized alone. With ``keep_serialization`` the
+    output is kept, and ``serialized()`` is
+    ``ET.tostring(root, encoding='unicode')``.
+    """
+
+    def __init__(self, root: ET.Element, keep_serialization: bool = True):
+        self.root = root
+        self.keep_serialization = keep_serialization
+        # element -> (start, end, words, bytes of its namespace declarations)
+        self._sizes: Dict[ET.Element, Tuple[int, int, int, int]] = {}
+        self._pieces: Optional[List[str]] = [] if keep_serialization else None
+        self._prefixes: Dict[str, str] = {}  # Namespace URI -> prefix, as ET assigns them
+        self._qnames: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._declaration_sizes: Dict[frozenset, Tuple[int, int]] = {_NO_NAMESPACES: (0, 0)}
+        self._measure(root, 0)
+
+        # ET declares every namespace on the root's start tag, which shifts
+        # every offset after the root's opening '<name'
+        self._declarations = ''
+        if root.tag.__class__ is str:
+            self._declarations = ''.join(
+                f' xmlns:{prefix}="{ET._escape_attrib(uri)}"'
+                for uri, prefix in sorted(self._prefixes.items(), key=lambda item: item[1])
+            )
+        self._shift = _utf8_len(self._declarations)
+
+    def __getitem__(self, element: ET.Element) -> ElementSize:
+        start, end = self.byte_range(element)
+        return ElementSize(byte_size=end - start, words=self._sizes[element][2])
+
+    def __contains__(self, element: ET.Element) -> bool:
+        return element in self._sizes
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def words(self, element: ET.Element) -> int:
+        return self._sizes[element][2]
+
+    def byte_range(self, element: ET.Element) -> Tuple[int, int]:
+        """Start and end of the element (tail included) in the serialized root"""
+        start, end = self._sizes[element][:2]
+        return (start if element is self.root else start + self._shift), end + self._shift
+
+    def standalone_bytes(self, element: ET.Element) -> int:
+        """UTF-8 bytes of ``ET.tostring(element)``, up to namespace prefix lengths"""
+        start, end = self.byte_range(element)
+        return end - start + (0 if element is self.root else self._sizes[element][3])
+
+    def serialized(self) -> str:
+        """The root serialized, as ``ET.tostring(root, encoding='unicode')``"""
+        if self._pieces is None:
+            raise ValueError("SubtreeSizes was built without keep_serialization")
+        if not self._pieces:
+            return ''
+        return self._pieces[0] + self._declarations + ''.join(self._pieces[1:])
+
+    def _qname(self, name: str) -> Tuple[str, Optional[str]]:
+        """Serialized name and namespace URI, registering prefixes in document order"""
+        cached = self._qnames.get(name)
+        if cached is not None:
+            return cached
+        if name[:1] != '{':
+            cached = (name, None)
+        else:
+            uri, local = name[1:].rsplit('}', 1)
+            prefix = self._prefixes.get(uri) or ET._namespace_map.get(uri) or f"ns{len(self._prefixes)}"
+            if prefix == 'xml':
+                cached = (f"xml:{local}", None)
+            else:
+                self._prefixes[uri] = prefix
+                cached = (f"{prefix}:{local}", uri)
+        self._qnames[name] = cached
+        return cached
+
+    def _declaration_sizes_for(self, namespaces: frozenset) -> Tuple[int, int]:
+        """Words and bytes of the ``xmlns:prefix="uri"`` declarations of an element serialized alone"""
+        sizes = self._declaration_sizes.get(namespaces)
+        if sizes is None:
+            declarations = [f' xmlns:{self._prefixes[uri]}="{ET._escape_attrib(uri)}"' for uri in namespaces]
+            sizes = self._declaration_sizes[namespaces] = (
+                sum(len(declaration.split()) for declaration in declarations),
+                sum(_utf8_len(declaration) for declaration in declarations))
+        return sizes
+
+    def _measure(self, element: ET.Element, position: int) -> Tuple[int, Optional[bool], Optional[bool], frozenset, int]:
+        """
+        Words, whether the serialization starts and ends with a word
+        character (None when empty), namespaces used and end offset, of the
+        subtree of an element that starts at ``position``. A word straddles
+        the seam where a piece ending in a word character meets one
+        starting with a word character.
+        """
+        write = self._pieces.append if self._pieces is not None else None
+        start = position
+        tag = element.tag
+        text = element.text
+        namespaces = _NO_NAMESPACES
+        end = None
+
+        if tag.__class__ is str:
+            qname, uri = self._qnames.get(tag) or self._qname(tag)
+            rest = ''
+            if element.attrib:
+                used = [uri] if uri else []
+                attributes = []
+                for key, value in element.items():
+                    key_name, key_uri = self._qnames.get(key) or self._qname(key)
+                    if key_uri:
+                        used.append(key_uri)
+                    attributes.append(f' {key_name}="{ET._escape_attrib(value)}"')
+                rest = ''.join(attributes)
+                if used:
+                    namespaces = frozenset(used)
+            elif uri:
+                namespaces = frozenset((uri,))
+            if text:
+                rest = f"{rest}>{ET._escape_cdata(text)}"
+                end = f"</{qname}>"
+            elif len(element):
+                rest += '>'
+                end = f"</{qname}>"
+            else:
+                rest += ' />'
+            opening = '<' + qname
+            if write:
+                write(opening)
+                write(rest)
+            position += _utf8_len(opening) + _utf8_len(rest)
+            # The opening is one word; rest continues it unless it starts with a space
+            words = len(rest.split()) + (rest[0] == ' ')
+            leading, trailing = True, not rest[-1].isspace()
+        else:
+            if tag is ET.Comment:
+                head = f"<!--{text}-->"
+            elif tag is ET.ProcessingInstruction:
+                head = f"<?{text}?>"
+            else:
+                head = ET._escape_cdata(text) if text else ''
+            if head:
+                if write:
+                    write(head)
+                position += _utf8_len(head)
+                words, leading, trailing = len(head.split()), not head[0].isspace(), not head[-1].isspace()
+            else:
+                words, leading, trailing = 0, None, None
+
+        if end is not None or tag is None:
+            for child in element:
+                child_words, child_leading, child_trailing, child_namespaces, position = self._measure(child, position)
+                if leading is None:
+                    words, leading, trailing = child_words, child_leading, child_trailing
+                elif child_leading is not None:
+                    words += child_words - (trailing and child_leading)
+                    trailing = child_trailing
+                if not child_namespaces <= namespaces:
+                    namespaces = namespaces | child_namespaces
+            if end is not None:
+                # End tags start and end with a word character
+                if write:
+                    write(end)
+                position += _utf8_len(end)
+                words += 1 - trailing
+                trailing = True
+
+        tail = element.tail
+        if tail:
+            tail = ET._escape_cdata(tail)
+            if write:
+                write(tail)
+            position += _utf8_len(tail)
+            tail_words = len(tail.split())
+            if leading is None:
+                words, leading = tail_words, not tail[0].isspace()
+            else:
+                words += tail_words - (trailing and not tail[0].isspace())
+            trailing = not tail[-1].isspace()
+
+        if tag.__class__ is str and namespaces:
+            declaration_words, declaration_bytes = self._declaration_sizes_for(namespaces)
+            self._sizes[element] = (start, position, words + declaration_words, declaration_bytes)
+        else:
+            self._sizes[element] = (start, position, words, 0)
+        return words, leading, trailing, namespaces, position
+
 class XMLChunkingStrategy:
     """Base class for different chunking strategies"""
+
+    packable = True  # Small chunks may be merged by ChunkPacker
     
     def __init__(self, config: ChunkingConfig = None):
         self.config = config or ChunkingConfig()
+        self.source: Optional[SourceMap] = None  # Positions of the document being chunked
         
+    @property
+    def tokenizer(self) -> TokenCounter:
+        """Token counter selected by the config (see core.tokenizers)"""
+        return get_tokenizer(self.config.tokenizer)
+
     def estimate_tokens(self, text: str) -> int:
-        """Rough estimation of tokens (words * 1.3)"""
-        return int(len(text.split()) * 1.3)
+        """Token estimate of a text, memoized by the token counter"""
+        return self.tokenizer.count(text)
+
+    def estimate_element_tokens(self, sizes: SubtreeSizes, element: ET.Element) -> int:
+        """
+        Token estimate of an element serialized on its own. Counters that
+        estimate from sizes use the measured ones; others count the text.
+        """
+        tokenizer = self.tokenizer
+        if tokenizer.sized:
+            return tokenizer.count_sized(sizes.standalone_bytes(element), sizes.words(element))
+        if element is sizes.root and sizes.keep_serialization:
+            return tokenizer.count(sizes.serialized())
+        return tokenizer.count(ET.tostring(element, encoding='unicode'))
+
+    def combined_tokens(self, byte_size: int, words: int, tokens: int) -> int:
+        """
+        Token estimate of texts joined together, from their total bytes,
+        words and token estimates. Counters that estimate from sizes use
+        the totals (words may be overcounted where texts run together);
+        others add up the texts' counts.
+        """
+        tokenizer = self.tokenizer
+        if tokenizer.sized:
+            return tokenizer.count_sized(byte_size, words)
+        return tokens
+    
+    def element_content(self, element: ET.Element) -> str:
+        """An element as chunk content: its source text with source_content, else serialized"""
+        if self.config.source_content and self.source is not None and element in self.source:
+            return self.source.text(element)
+        return ET.tostring(element, encoding='unicode')
+
+    def _parse_document(self, file_path: str) -> ET.Element:
+        """
+        Parse a document, through a SourceMap (kept in self.source until
+        _close_source) when chunks record source positions
+        """
+        if not (self.config.source_positions or self.config.source_content):
+            return ET.parse(file_path).getroot()
+        self.source = SourceMap(file_path)
+        try:
+            return self.source.parse()
+        except BaseException:
+            self._close_source()
+            raise
+
+    def _close_source(self) -> None:
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+    def _locate(self, chunk: XMLChunk, first: ET.Element, last: ET.Element = None) -> XMLChunk:
+        """Set a chunk's lines and source byte range from its first and last element"""
+        source = self.source
+        last = first if last is None else last
+        if source is not None and first in source and last in source:
+            chunk.start_line = source.lines(first)[0]
+            chunk.end_line = source.lines(last)[1]
+            chunk.metadata['source_range'] = (source.span(first)[0], source.span(last)[1])
+        return chunk
     
     def generate_chunk_id(self, content: str, index: int) -> str:
         """Generate unique chunk ID"""
@@ -56,29 +335,199 @@ class XMLChunkingStrategy:
         """Chunk an XML document based on the strategy"""
         raise NotImplementedError
 
+    def chunk_document_iter(self, file_path: str,
+                            specialized_analysis: Dict[str, Any] = None) -> Iterator[XMLChunk]:
+        """
+        Yield the chunks of chunk_document. Strategies that can chunk while
+        parsing override this; the default chunks the whole document first.
+        """
+        yield from self.chunk_document(file_path, specialized_analysis)
+
 class HierarchicalChunking(XMLChunkingStrategy):
     """Chunks based on XML hierarchy, respecting element boundaries"""
+
+    def __init__(self, config: ChunkingConfig = None):
+        super().__init__(config)
+        self.sizes: Optional[SubtreeSizes] = None
+        self.parents: Dict[ET.Element, ET.Element] = {}  # Child -> parent, for parent_context
     
     def chunk_document(self, file_path: str, 
                       specialized_analysis: Dict[str, Any] = None) -> List[XMLChunk]:
         chunks = []
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        root = self._parse_document(file_path)
+        if self.config.include_parent_context:
+            self.parents = {child: parent for parent in root.iter() for child in parent}
         
         # Determine semantic boundaries based on document type
         if specialized_analysis:
             self.config.semantic_boundaries = self._get_semantic_boundaries(
                 specialized_analysis.get('document_type', {}).get('type_name', '')
             )
-        
-        # Start chunking from root
+
+        # Start chunking from root. Boundaries are sized by one SubtreeSizes
+        # pass over their subtree (see _element_tokens), dropped afterwards
         chunk_index = 0
-        for chunk in self._chunk_element(root, "", chunk_index):
-            chunks.append(chunk)
-            chunk_index += 1
+        try:
+            for chunk in self._chunk_element(root, "", chunk_index):
+                chunks.append(chunk)
+                chunk_index += 1
+        finally:
+            self.sizes = None
+            self.parents = {}
+            self._close_source()
             
         return chunks
     
+    def chunk_fragment(self, file_path: str, fragment: Fragment,
+                       specialized_analysis: Dict[str, Any] = None) -> List[XMLChunk]:
+        """
+        Chunks of the root's children in a fragment of the file, numbered
+        from 0. When chunk_document subdivides the root, its chunks are
+        those of consecutive fragments, renumbered (see
+        core.parallel_chunking).
+        """
+        if specialized_analysis:
+            self.config.semantic_boundaries = self._get_semantic_boundaries(
+                specialized_analysis.get('document_type', {}).get('type_name', '')
+            )
+
+        chunks = []
+        self.source = SourceMap(file_path)
+        try:
+            root = self.source.parse(fragment)
+            if not (self.config.source_positions or self.config.source_content):
+                self._close_source()
+            if self.config.include_parent_context:
+                self.parents = {child: parent for parent in root.iter() for child in parent}
+            for child in root:
+                chunks.extend(self._chunk_element(child, root.tag, len(chunks)))
+        finally:
+            self.sizes = None
+            self.parents = {}
+            self._close_source()
+        return chunks
+
+    def subdivides_root(self, root_tag: str, child_tags: Iterable[str]) -> bool:
+        """Whether chunk_document chunks the root's children one by one rather than the root"""
+        root = ET.Element(root_tag)
+        if not self._is_semantic_boundary(root):
+            return True
+        return root_tag.split('}')[-1] not in ['Rule'] and any(
+            self._is_semantic_boundary(ET.Element(tag)) for tag in child_tags)
+
+    # How chunk_document_iter treats an open element
+    _SUBDIVIDE = 0  # Its children are chunked one by one as they close
+    _PENDING = 1  # A boundary with no boundary child (yet): kept whole
+    _LEAF = 2  # A boundary chunked whole (or split) when it closes
+    _HELD = 3  # Inside a kept element
+
+    def chunk_document_iter(self, file_path: str,
+                            specialized_analysis: Dict[str, Any] = None) -> Iterator[XMLChunk]:
+        """
+        Yield the chunks of chunk_document while the file is parsed.
+
+        Runs ``iterparse`` and chunks each leaf boundary as soon as it
+        closes, then clears and detaches it, so memory is bounded by the
+        largest leaf boundary rather than the document. Whether a boundary
+        is subdivided depends on its children: it is kept whole until its
+        first boundary child starts, and only then are its earlier children
+        chunked and released. A closed element is chunked at the next
+        parser event, once its tail text has been parsed. Chunks and their
+        indices are the same as chunk_document's.
+        """
+        if specialized_analysis:
+            self.config.semantic_boundaries = self._get_semantic_boundaries(
+                specialized_analysis.get('document_type', {}).get('type_name', '')
+            )
+
+        # [element, current path, mode] for every open element, root first
+        stack: List[List[Any]] = []
+        # (element, mode, parent) of the last closed element, until its tail is parsed
+        closed = None
+        chunk_index = 0
+        if self.config.source_positions or self.config.source_content:
+            self.source = SourceMap(file_path)
+            events = self.source.iterparse()
+        else:
+            events = ET.iterparse(file_path, events=('start', 'end'))
+        try:
+            for event, element in events:
+                if closed is not None:
+                    for chunk in self._close_element(*closed, chunk_index):
+                        yield chunk
+                        chunk_index += 1
+                    closed = None
+
+                if event == 'start':
+                    parent = stack[-1] if stack else None
+                    if parent is not None and parent[2] == self._PENDING and self._is_semantic_boundary(element):
+                        # The parent is subdivided after all: chunk the children it
+                        # kept. iterparse reads ahead, so later siblings may
+                        # already be attached after this element.
+                        parent[2] = self._SUBDIVIDE
+                        kept = 0
+                        for child in parent[0]:
+                            if child is element:
+                                break
+                            for chunk in self._chunk_element(child, parent[1], chunk_index):
+                                yield chunk
+                                chunk_index += 1
+                            kept += 1
+                        self.sizes = None
+                        for child in parent[0][:kept]:
+                            self._release(child)
+                        del parent[0][:kept]
+
+                    if parent is None or parent[2] == self._SUBDIVIDE:
+                        mode = self._mode(element)
+                    else:
+                        mode = self._HELD
+                    path = f"{parent[1]}/{element.tag}" if parent is not None else element.tag
+                    if parent is not None and self.config.include_parent_context:
+                        self.parents[element] = parent[0]
+                    stack.append([element, path, mode])
+                    continue
+
+                _, _, mode = stack.pop()
+                if mode != self._HELD:
+                    closed = (element, mode, stack[-1] if stack else None)
+
+            if closed is not None:
+                for chunk in self._close_element(*closed, chunk_index):
+                    yield chunk
+                    chunk_index += 1
+        finally:
+            self.sizes = None
+            self.parents = {}
+            self._close_source()
+
+    def _close_element(self, element: ET.Element, mode: int, parent: Optional[List[Any]],
+                       start_index: int) -> Generator[XMLChunk, None, None]:
+        """Chunk a closed element unless its children already were, then release it"""
+        if mode != self._SUBDIVIDE:
+            yield from self._chunk_element(element, parent[1] if parent else "", start_index)
+            self.sizes = None
+        self._release(element)
+        element.clear()
+        if parent:
+            parent[0].remove(element)
+
+    def _release(self, element: ET.Element) -> None:
+        """Drop the source positions and parent links of a streamed subtree"""
+        if self.source is not None:
+            self.source.forget(element)
+        if self.parents:
+            for descendant in element.iter():
+                self.parents.pop(descendant, None)
+
+    def _mode(self, element: ET.Element) -> int:
+        """Streaming mode of an element whose parent is subdivided"""
+        if not self._is_semantic_boundary(element):
+            return self._SUBDIVIDE
+        if element.tag.split('}')[-1] in ['Rule']:  # Rules are never subdivided
+            return self._LEAF
+        return self._PENDING
+    
     def _chunk_element(self, element: ET.Element, path: str, 
                        start_index: int) -> Generator[XMLChunk, None, None]:
         """Recursively chunk an element and its children"""
@@ -97,12 +546,14 @@ class HierarchicalChunking(XMLChunkingStrategy):
                 yield from self._process_children(element, current_path, start_index)
             else:
                 # No boundary children or this is a leaf boundary - create chunk
-                content = ET.tostring(element, encoding='unicode')
-                tokens = self.estimate_tokens(content)
+                tokens = self._element_tokens(element)
                 
                 if tokens <= self.config.max_chunk_size:
-                    # Element fits in one chunk
-                    yield self._create_chunk(element, current_path, start_index, content)
+                    # Element fits in one chunk; the size pass already serialized it
+                    content = None
+                    if self.sizes.root is element and self.sizes.keep_serialization:
+                        content = self.sizes.serialized()
+                    yield self._create_chunk(element, current_path, start_index, content, tokens)
                 else:
                     # Element too large, need to split children
                     yield from self._split_large_element(element, current_path, start_index)
@@ -110,6 +561,15 @@ class HierarchicalChunking(XMLChunkingStrategy):
             # Not a boundary, continue processing children
             yield from self._process_children(element, current_path, start_index)
     
+    def _element_tokens(self, element: ET.Element) -> int:
+        """
+        Token estimate of an element serialized on its own, measuring its
+        subtree once if it is not in the current size table
+        """
+        if self.sizes is None or element not in self.sizes:
+            self.sizes = SubtreeSizes(element, keep_serialization=not self.config.source_content)
+        return self.estimate_element_tokens(self.sizes, element)
+    
     def _is_semantic_boundary(self, element: ET.Element) -> bool:
         """Check if element is a natural chunking boundary"""
         if not self.config.semantic_boundaries:
@@ -119,10 +579,14 @@ class HierarchicalChunking(XMLChunkingStrategy):
         return tag in self.config.semantic_boundaries
     
     def _create_chunk(self, element: ET.Element, path: str, 
-                     index: int, content: str = None) -> XMLChunk:
+                     index: int, content: str = None, tokens: int = None) -> XMLChunk:
         """Create a chunk from an element"""
-        if content is None:
+        if self.config.source_content and self.source is not None and element in self.source:
+            content, tokens = self.source.text(element), None
+        elif content is None:
             content = ET.tostring(element, encoding='unicode')
+        if tokens is None:
+            tokens = self.estimate_tokens(content)
             
         # Get parent context if configured
         parent_context = None
@@ -142,41 +606,45 @@ class HierarchicalChunking(XMLChunkingStrategy):
             for e in element.iter()
         ))
         
-        return XMLChunk(
+        chunk = XMLChunk(
             chunk_id=self.generate_chunk_id(content, index),
             content=content,
             element_path=path,
-            start_line=0,  # Would need line tracking for accurate values
+            start_line=0,  # Set from the source by _locate
             end_line=0,
             parent_context=parent_context,
             metadata=metadata,
-            token_estimate=self.estimate_tokens(content),
+            token_estimate=tokens,
             elements_included=elements_included
         )
+        return self._locate(chunk, element)
     
     def _split_large_element(self, element: ET.Element, path: str, 
                             start_index: int) -> Generator[XMLChunk, None, None]:
         """Split a large element into multiple chunks"""
-        # Strategy: Group children until size limit reached
+        # Strategy: Group children until size limit reached. Sizes are
+        # (bytes, words, tokens), starting from the wrapper's own tags
+        shell_size = self._wrapper_size(element) if len(element) else (0, 0, 0)
         current_chunk_elements = []
-        current_size = 0
+        current_size = shell_size
         chunk_index = start_index
         
         for child in element:
-            child_content = ET.tostring(child, encoding='unicode')
-            child_size = self.estimate_tokens(child_content)
+            child_tokens = self._element_tokens(child)
+            child_size = (self.sizes.standalone_bytes(child), self.sizes.words(child), child_tokens)
+            combined = tuple(map(sum, zip(current_size, child_size)))
             
-            if current_size + child_size > self.config.max_chunk_size and current_chunk_elements:
+            if self.combined_tokens(*combined) > self.config.max_chunk_size and current_chunk_elements:
                 # Create chunk from accumulated elements
                 yield self._create_chunk_from_elements(
                     current_chunk_elements, element, path, chunk_index
                 )
                 chunk_index += 1
                 current_chunk_elements = [child]
-                current_size = child_size
+                current_size = tuple(map(sum, zip(shell_size, child_size)))
             else:
                 current_chunk_elements.append(child)
-                current_size += child_size
+                current_size = combined
         
         # Don't forget the last chunk
         if current_chunk_elements:
@@ -184,6 +652,25 @@ class HierarchicalChunking(XMLChunkingStrategy):
                 current_chunk_elements, element, path, chunk_index
             )
     
+    def _wrapper_size(self, element: ET.Element) -> Tuple[int, int, int]:
+        """
+        Bytes, words and tokens of the start and end tags of the wrapper
+        that holds part of an element's children (see
+        _create_chunk_from_elements)
+        """
+        if not self.tokenizer.sized:
+            shell = ET.tostring(ET.Element(element.tag, element.attrib),
+                                encoding='unicode', short_empty_elements=False)
+            return _utf8_len(shell), len(shell.split()), self.estimate_tokens(shell)
+        # The element's bytes without its text, children and tail
+        start, end = self.sizes.byte_range(element)
+        byte_size = self.sizes.byte_range(element[0])[0] - start + end - self.sizes.byte_range(element[-1])[1]
+        for text in (element.text, element.tail):
+            if text:
+                byte_size -= _utf8_len(ET._escape_cdata(text))
+        # Roughly one word per tag and attribute
+        return byte_size, 2 + len(element.attrib), 0
+
     def _create_chunk_from_elements(self, elements: List[ET.Element], 
                                    parent: ET.Element, path: str, 
                                    index: int) -> XMLChunk:
@@ -192,8 +679,18 @@ class HierarchicalChunking(XMLChunkingStrategy):
         wrapper = ET.Element(parent.tag, parent.attrib)
         for elem in elements:
             wrapper.append(elem)
-            
-        return self._create_chunk(wrapper, path, index)
+
+        content = None
+        source = self.source
+        if self.config.source_content and source is not None and parent in source:
+            # The parent's tags around the children as written, tails between them included
+            content = (source.start_tag(parent) + source.slice(source.span(elements[0])[0], source.span(elements[-1])[1])
+                       + source.end_tag(parent))
+
+        chunk = self._create_chunk(wrapper, path, index, content)
+        if self.config.include_parent_context:
+            chunk.parent_context = self._get_parent_context(parent)  # The wrapper stands in for the parent
+        return self._locate(chunk, elements[0], elements[-1])
     
     def _process_children(self, element: ET.Element, path: str, 
                          start_index: int) -> Generator[XMLChunk, None, None]:
@@ -204,10 +701,40 @@ class HierarchicalChunking(XMLChunkingStrategy):
                 yield chunk
                 chunk_index += 1
     
-    def _get_parent_context(self, element: ET.Element) -> str:
-        """Get context from parent elements"""
-        # This would need access to parent in real implementation
-        return f"Parent: {element.tag}"
+    # Attributes that name an element in a breadcrumb, in order of preference
+    _LABEL_ATTRIBUTES = ('id', '{http://www.w3.org/XML/1998/namespace}id', 'name')
+    _MAX_LABEL_LENGTH = 60
+
+    def _get_parent_context(self, element: ET.Element) -> Optional[str]:
+        """
+        Breadcrumb of the element's ancestors, root first, such as
+        ``Benchmark[id=xccdf_bench] > Group[id=system] > Group[id=accounts]``.
+
+        Ancestors are found through the parent map built once per document,
+        so this is O(depth). Only the nearest max_context_depth ancestors
+        are named; further ones are elided as '...'. None for the root.
+        """
+        crumbs = []
+        parent = self.parents.get(element)
+        while parent is not None and len(crumbs) < self.config.max_context_depth:
+            crumbs.append(self._breadcrumb(parent))
+            parent = self.parents.get(parent)
+        if not crumbs:
+            return None
+        if parent is not None:
+            crumbs.append('...')
+        return ' > '.join(reversed(crumbs))
+
+    def _breadcrumb(self, element: ET.Element) -> str:
+        """An element's local name with its id or name attribute, if any"""
+        tag = element.tag.split('}')[-1]
+        for attribute in self._LABEL_ATTRIBUTES:
+            label = element.get(attribute)
+            if label:
+                if len(label) > self._MAX_LABEL_LENGTH:
+                    label = label[:self._MAX_LABEL_LENGTH - 3] + '...'
+                return f"{tag}[{attribute.split('}')[-1]}={label}]"
+        return tag
     
     def _get_semantic_boundaries(self, doc_type: str) -> List[str]:
         """Get semantic boundaries based on document type"""
@@ -228,151 +755,224 @@ class HierarchicalChunking(XMLChunkingStrategy):
         return boundaries.get(doc_type, default_boundaries)
 
 class SlidingWindowChunking(XMLChunkingStrategy):
-    """Chunks using a sliding window approach with overlap"""
+    """
+    Chunks using a sliding window approach with overlap
+
+    The window slides over a flat stream of segments: the largest subtrees
+    that fit in one chunk, down to single leaves, plus any text of the
+    elements opened up to reach them. Every part of the document is in
+    exactly one segment, so chunks hold each text once (apart from the
+    overlap) instead of an element and again each of its ancestors.
+    """
+
+    packable = False  # Windows are filled to the target size and overlap
     
     def chunk_document(self, file_path: str, 
                       specialized_analysis: Dict[str, Any] = None) -> List[XMLChunk]:
         chunks = []
+        root = self._parse_document(file_path)
         
-        # Read and parse the document
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        
-        # Convert to a list of elements with their content
-        elements = self._flatten_elements(root)
+        try:
+            # Convert to a flat list of segments with their content
+            segments = self._flatten_segments(root)
         
-        # Create chunks with sliding window
-        chunk_index = 0
-        i = 0
+            # Create chunks with sliding window
+            chunk_index = 0
+            i = 0
+            separator = self.estimate_tokens('\n')
         
-        while i < len(elements):
-            chunk_elements = []
-            chunk_size = 0
-            
-            # Build chunk up to max size
-            j = i
-            while j < len(elements) and chunk_size < self.config.max_chunk_size:
-                elem_content = elements[j]['content']
-                elem_size = self.estimate_tokens(elem_content)
-                
-                if chunk_size + elem_size <= self.config.max_chunk_size:
-                    chunk_elements.append(elements[j])
-                    chunk_size += elem_size
+            while i < len(segments):
+                # Build chunk up to max size; a segment larger than that is a chunk on its own
+                totals = (-1, 0, -separator)  # Bytes, words and tokens, joined by newlines
+                j = i
+                while j < len(segments):
+                    segment = segments[j]
+                    candidate = (totals[0] + segment['bytes'] + 1, totals[1] + segment['words'],
+                                 totals[2] + segment['tokens'] + separator)
+                    if self.combined_tokens(*candidate) > self.config.max_chunk_size and j > i:
+                        break
+                    totals = candidate
                     j += 1
-                else:
-                    break
             
-            # Create chunk if we have content
-            if chunk_elements:
-                chunk = self._create_chunk_from_flattened(
-                    chunk_elements, chunk_index
-                )
-                chunks.append(chunk)
+                chunks.append(self._create_chunk_from_segments(
+                    segments[i:j], chunk_index, self.combined_tokens(*totals)))
                 chunk_index += 1
-                
-                # Move window (with overlap)
+                if j == len(segments):
+                    break
+            
+                # Move window back over the trailing segments that fit in the
+                # overlap, always advancing by at least one segment
                 overlap_size = 0
-                overlap_count = 0
-                
-                # Count backwards to find overlap point
-                for k in range(len(chunk_elements) - 1, -1, -1):
-                    overlap_size += self.estimate_tokens(chunk_elements[k]['content'])
-                    overlap_count += 1
-                    if overlap_size >= self.config.overlap_size:
-                        break
-                
-                i = j - overlap_count + 1
-            else:
-                i += 1
+                k = j
+                while k - 1 > i and overlap_size + segments[k - 1]['tokens'] < self.config.overlap_size:
+                    k -= 1
+                    overlap_size += segments[k]['tokens']
+                i = k
+        finally:
+            self._close_source()
         
         return chunks
     
-    def _flatten_elements(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """Flatten XML tree into a list of elements with metadata"""
-        flattened = []
+    def _flatten_segments(self, root: ET.Element) -> List[Dict[str, Any]]:
+        """
+        Cut the tree into segments in document order. An element that fits
+        in one chunk (or has no children) is a segment with its subtree;
+        a larger one is opened up into its own text, its children and its
+        tail. ``byte_range`` locates a segment in the serialized document;
+        with source positions, ``source_range`` and ``lines`` locate it in
+        the file.
+        """
+        sizes = SubtreeSizes(root, keep_serialization=False)
+        source = self.source if self.source is not None and root in self.source else None
+        segments = []
         
-        def traverse(elem, path=""):
+        def text_segment(text, path, depth, end, source_range, lines):
+            content = ET._escape_cdata(text)
+            byte_size = _utf8_len(content)
+            return {
+                'element': None,
+                'path': path,
+                'content': content,
+                'tag': None,
+                'depth': depth,
+                'words': len(content.split()),
+                'bytes': byte_size,
+                'tokens': self.estimate_tokens(content),
+                'byte_range': (end - byte_size, end),
+                # Unknown (None) without source positions
+                'source_range': source_range if source else None,
+                'lines': lines if source else None
+            }
+        
+        def traverse(elem, path="", depth=0, following=(None, None)):
+            # following: source byte and line at which the element's tail ends
             current_path = f"{path}/{elem.tag}" if path else elem.tag
+            tokens = self.estimate_element_tokens(sizes, elem)
+            
+            if tokens <= self.config.max_chunk_size or len(elem) == 0:
+                if self.config.source_content and source:
+                    # As written, tail included like a serialized element
+                    start, end = source.span(elem)
+                    content = source.slice(start, end if following[0] is None else following[0])
+                    byte_size, words, tokens = _utf8_len(content), len(content.split()), self.estimate_tokens(content)
+                else:
+                    content = ET.tostring(elem, encoding='unicode')
+                    byte_size, words = sizes.standalone_bytes(elem), sizes.words(elem)
+                segments.append({
+                    'element': elem,
+                    'path': current_path,
+                    'content': content,
+                    'tag': elem.tag,
+                    'depth': depth,
+                    'words': words,
+                    'bytes': byte_size,
+                    'tokens': tokens,
+                    'byte_range': sizes.byte_range(elem),
+                    'source_range': source.span(elem) if source else None,
+                    'lines': source.lines(elem) if source else None
+                })
+                return
             
-            # Add element info
-            flattened.append({
-                'element': elem,
-                'path': current_path,
-                'content': ET.tostring(elem, encoding='unicode'),
-                'tag': elem.tag,
-                'depth': current_path.count('/')
-            })
+            # Where each child's tail ends: at the next child, or at the end tag
+            inner_start = inner_first = None
+            ends = [(None, None)] * len(elem)
+            if source:
+                inner_start, inner_end = source.inner_span(elem)
+                inner_first, inner_last = source.inner_lines(elem)
+                ends = [(source.span(child)[0], source.lines(child)[0]) for child in elem[1:]]
+                ends.append((inner_end, inner_last))
             
-            # Process children
-            for child in elem:
-                traverse(child, current_path)
+            if elem.text and not elem.text.isspace():
+                first_child = (source.span(elem[0])[0], source.lines(elem[0])[0]) if source else (None, None)
+                segments.append(text_segment(elem.text, current_path, depth, sizes.byte_range(elem[0])[0],
+                                             (inner_start, first_child[0]), (inner_first, first_child[1])))
+            for child, child_following in zip(elem, ends):
+                traverse(child, current_path, depth + 1, child_following)
+            if elem.tail and not elem.tail.isspace():
+                end, last = (source.span(elem)[1], source.lines(elem)[1]) if source else (None, None)
+                segments.append(text_segment(elem.tail, path, depth - 1, sizes.byte_range(elem)[1],
+                                             (end, following[0]), (last, following[1])))
         
         traverse(root)
-        return flattened
+        return segments
     
-    def _create_chunk_from_flattened(self, elements: List[Dict[str, Any]], 
-                                    index: int) -> XMLChunk:
-        """Create chunk from flattened elements"""
+    def _create_chunk_from_segments(self, segments: List[Dict[str, Any]], 
+                                    index: int, tokens: int) -> XMLChunk:
+        """Create chunk from consecutive segments"""
         # Combine content
-        content_parts = []
-        paths = []
-        tags = set()
-        
-        for elem_info in elements:
-            content_parts.append(elem_info['content'])
-            paths.append(elem_info['path'])
-            tags.add(elem_info['tag'].split('}')[-1] if '}' in elem_info['tag'] else elem_info['tag'])
-        
-        content = '\n'.join(content_parts)
+        content = '\n'.join(segment['content'] for segment in segments)
+        paths = [segment['path'] for segment in segments]
+        tags = set(
+            segment['tag'].split('}')[-1] if '}' in segment['tag'] else segment['tag']
+            for segment in segments if isinstance(segment['tag'], str)
+        )
+        first, last = segments[0], segments[-1]
         
-        return XMLChunk(
+        chunk = XMLChunk(
             chunk_id=self.generate_chunk_id(content, index),
             content=content,
-            element_path='; '.join(set(paths[:3])),  # First 3 unique paths
-            start_line=0,
-            end_line=0,
+            element_path='; '.join(dict.fromkeys(paths[:3])),  # First 3 unique paths
+            start_line=first['lines'][0] if first['lines'] else 0,
+            end_line=last['lines'][1] if last['lines'] else 0,
             parent_context=None,
             metadata={
-                'elements_count': len(elements),
+                'elements_count': len(segments),
                 'depth_range': (
-                    min(e['depth'] for e in elements),
-                    max(e['depth'] for e in elements)
-                )
+                    min(s['depth'] for s in segments),
+                    max(s['depth'] for s in segments)
+                ),
+                'byte_range': (segments[0]['byte_range'][0], segments[-1]['byte_range'][1])
             },
-            token_estimate=self.estimate_tokens(content),
+            token_estimate=tokens,
             elements_included=list(tags)
         )
+        if first['source_range']:
+            chunk.metadata['source_range'] = (first['source_range'][0], last['source_range'][1])
+        return chunk
 
 class ContentAwareChunking(XMLChunkingStrategy):
-    """Chunks based on content type and meaning"""
+    """
+    Chunks based on content type and meaning.
+
+    By default every element is classified, so a ``<section>`` and each of
+    its ``<para>`` children land in chunks and the same text is embedded
+    several times. With ``exclusive_content`` the document is walked from
+    the root and each content unit is taken whole with its descendants
+    suppressed: an element whose own tag names a content type, an element
+    with mixed content, or a leaf with text or attributes. Other elements
+    are containers and only their children are visited. "Other" units are
+    then packed up to the target size instead of one chunk each, and
+    narrative chunks do not overlap, so every text is in exactly one chunk.
+    """
     
     def __init__(self, config: ChunkingConfig = None):
         super().__init__(config)
         self.content_patterns = {
             'narrative': ['para', 'p', 'description', 'abstract', 'summary'],
-            'structured': ['table', 'list', 'itemizedlist', 'orderedlist'],
-            'code': ['code', 'programlisting', 'screen', 'computeroutput'],
+            'structured': ['table', 'list', 'itemizedlist', 'orderedlist', 'ul', 'ol', 'dl'],
+            'code': ['code', 'programlisting', 'screen', 'computeroutput', 'pre'],
             'metadata': ['info', 'meta', 'metadata', 'properties']
         }
+        self._paths: Dict[ET.Element, str] = {}  # Element paths recorded by the exclusive walk
     
     def chunk_document(self, file_path: str, 
                       specialized_analysis: Dict[str, Any] = None) -> List[XMLChunk]:
         chunks = []
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        
-        # Group elements by content type
-        content_groups = self._group_by_content_type(root)
+        root = self._parse_document(file_path)
         
-        # Create chunks for each content group
-        chunk_index = 0
-        for content_type, elements in content_groups.items():
-            for chunk in self._chunk_content_group(content_type, elements, chunk_index):
-                chunks.append(chunk)
-                chunk_index += 1
+        try:
+            # Group elements by content type
+            content_groups = self._group_by_content_type(root)
+            
+            # Create chunks for each content group
+            chunk_index = 0
+            for content_type, elements in content_groups.items():
+                for chunk in self._chunk_content_group(content_type, elements, chunk_index):
+                    chunks.append(chunk)
+                    chunk_index += 1
+        finally:
+            self._close_source()
+            self._paths = {}
         
         return chunks
     
@@ -386,12 +986,40 @@ class ContentAwareChunking(XMLChunkingStrategy):
             'other': []
         }
         
-        for elem in root.iter():
-            content_type = self._determine_content_type(elem)
-            groups[content_type].append(elem)
+        if self.config.exclusive_content:
+            for elem, content_type in self._content_units(root):
+                groups[content_type].append(elem)
+        else:
+            for elem in root.iter():
+                content_type = self._determine_content_type(elem)
+                groups[content_type].append(elem)
         
         return {k: v for k, v in groups.items() if v}  # Remove empty groups
     
+    def _content_units(self, root: ET.Element) -> Iterator[Tuple[ET.Element, str]]:
+        """Top-level content units in document order, each with its content type"""
+        stack = [(root, self._local_name(root.tag))]
+        while stack:
+            elem, path = stack.pop()
+            tag = self._local_name(elem.tag).lower()
+            own_type = next((content_type for content_type, patterns in self.content_patterns.items()
+                             if tag in patterns), None)
+            children = list(elem)
+            mixed = bool(elem.text and elem.text.strip()) or any(
+                child.tail and child.tail.strip() for child in children)
+            if own_type or mixed or not children:
+                if own_type or mixed or elem.attrib:
+                    self._paths[elem] = path
+                    yield elem, own_type or self._determine_content_type(elem)
+                continue
+            for child in reversed(children):
+                if isinstance(child.tag, str):
+                    stack.append((child, f"{path}/{self._local_name(child.tag)}"))
+    
+    @staticmethod
+    def _local_name(tag: str) -> str:
+        return tag.split('}')[-1] if '}' in tag else tag
+    
     def _determine_content_type(self, element: ET.Element) -> str:
         """Determine the content type of an element"""
         tag = element.tag.split('}')[-1] if '}' in element.tag else element.tag
@@ -429,39 +1057,42 @@ class ContentAwareChunking(XMLChunkingStrategy):
                         start_index: int) -> Generator[XMLChunk, None, None]:
         """Chunk narrative content, trying to keep paragraphs together"""
         current_content = []
+        current_elements = []
         current_size = 0
         chunk_index = start_index
         
         for elem in elements:
-            elem_text = ET.tostring(elem, encoding='unicode')
+            elem_text = self.element_content(elem)
             elem_size = self.estimate_tokens(elem_text)
             
             if current_size + elem_size > self.config.max_chunk_size and current_content:
                 # Create chunk
-                yield self._create_narrative_chunk(current_content, chunk_index)
+                yield self._create_narrative_chunk(current_content, chunk_index, current_elements)
                 chunk_index += 1
                 
                 # Start new chunk with overlap
-                overlap_elements = self._get_overlap_elements(current_content)
+                overlap_elements = [] if self.config.exclusive_content else self._get_overlap_elements(current_content)
                 current_content = overlap_elements + [elem_text]
+                current_elements = current_elements[len(current_elements) - len(overlap_elements):] + [elem]
                 current_size = sum(self.estimate_tokens(e) for e in current_content)
             else:
                 current_content.append(elem_text)
+                current_elements.append(elem)
                 current_size += elem_size
         
         if current_content:
-            yield self._create_narrative_chunk(current_content, chunk_index)
+            yield self._create_narrative_chunk(current_content, chunk_index, current_elements)
     
     def _chunk_code(self, elements: List[ET.Element], 
                    start_index: int) -> Generator[XMLChunk, None, None]:
         """Chunk code content, trying to keep code blocks intact"""
         for i, elem in enumerate(elements):
-            content = ET.tostring(elem, encoding='unicode')
+            content = self.element_content(elem)
             tokens = self.estimate_tokens(content)
             
             if tokens <= self.config.max_chunk_size:
                 # Single code block fits
-                yield XMLChunk(
+                yield self._locate(XMLChunk(
                     chunk_id=self.generate_chunk_id(content, start_index + i),
                     content=content,
                     element_path=self._get_element_path(elem),
@@ -471,7 +1102,7 @@ class ContentAwareChunking(XMLChunkingStrategy):
                     metadata={'content_type': 'code', 'language': elem.get('language', 'unknown')},
                     token_estimate=tokens,
                     elements_included=['code']
-                )
+                ), elem)
             else:
                 # Split large code block
                 yield from self._split_large_code_block(elem, start_index + i)
@@ -480,9 +1111,9 @@ class ContentAwareChunking(XMLChunkingStrategy):
                          start_index: int) -> Generator[XMLChunk, None, None]:
         """Chunk structured content like tables and lists"""
         for i, elem in enumerate(elements):
-            content = ET.tostring(elem, encoding='unicode')
+            content = self.element_content(elem)
             
-            yield XMLChunk(
+            yield self._locate(XMLChunk(
                 chunk_id=self.generate_chunk_id(content, start_index + i),
                 content=content,
                 element_path=self._get_element_path(elem),
@@ -492,15 +1123,19 @@ class ContentAwareChunking(XMLChunkingStrategy):
                 metadata={'content_type': 'structured', 'structure_type': elem.tag},
                 token_estimate=self.estimate_tokens(content),
                 elements_included=[elem.tag]
-            )
+            ), elem)
     
     def _chunk_generic(self, elements: List[ET.Element], 
                       start_index: int) -> Generator[XMLChunk, None, None]:
         """Generic chunking for other content"""
+        if self.config.exclusive_content:
+            yield from self._pack_generic(elements, start_index)
+            return
+        
         for i, elem in enumerate(elements):
-            content = ET.tostring(elem, encoding='unicode')
+            content = self.element_content(elem)
             
-            yield XMLChunk(
+            yield self._locate(XMLChunk(
                 chunk_id=self.generate_chunk_id(content, start_index + i),
                 content=content,
                 element_path=self._get_element_path(elem),
@@ -510,13 +1145,52 @@ class ContentAwareChunking(XMLChunkingStrategy):
                 metadata={'content_type': 'other'},
                 token_estimate=self.estimate_tokens(content),
                 elements_included=[elem.tag]
-            )
+            ), elem)
+    
+    def _pack_generic(self, elements: List[ET.Element],
+                      start_index: int) -> Generator[XMLChunk, None, None]:
+        """Pack consecutive other units into chunks up to the target size"""
+        chunk_index = start_index
+        run: List[Tuple[ET.Element, str]] = []
+        totals = (0, 0, 0)  # Bytes, words and tokens of the run, joined by newlines
+        separator = self.estimate_tokens('\n')
+        for elem in elements:
+            content = self.element_content(elem)
+            size = (_utf8_len(content), len(content.split()), self.estimate_tokens(content))
+            candidate = (totals[0] + size[0] + 1, totals[1] + size[1], totals[2] + size[2] + separator)
+            if run and self.combined_tokens(*candidate) > self.config.max_chunk_size:
+                yield self._create_generic_chunk(run, chunk_index, self.combined_tokens(*totals))
+                chunk_index += 1
+                run, totals = [], size
+            elif run:
+                totals = candidate
+            else:
+                totals = size
+            run.append((elem, content))
+        if run:
+            yield self._create_generic_chunk(run, chunk_index, self.combined_tokens(*totals))
+    
+    def _create_generic_chunk(self, run: List[Tuple[ET.Element, str]], index: int,
+                              tokens: int) -> XMLChunk:
+        content = '\n'.join(text for _, text in run)
+        return self._locate(XMLChunk(
+            chunk_id=self.generate_chunk_id(content, index),
+            content=content,
+            element_path=self._get_element_path(run[0][0]),
+            start_line=0,
+            end_line=0,
+            parent_context=None,
+            metadata={'content_type': 'other', 'element_count': len(run)},
+            token_estimate=tokens,
+            elements_included=list(dict.fromkeys(elem.tag for elem, _ in run))
+        ), run[0][0], run[-1][0])
     
-    def _create_narrative_chunk(self, content_list: List[str], index: int) -> XMLChunk:
+    def _create_narrative_chunk(self, content_list: List[str], index: int,
+                                elements: List[ET.Element]) -> XMLChunk:
         """Create a chunk from narrative content"""
         content = '\n'.join(content_list)
         
-        return XMLChunk(
+        return self._locate(XMLChunk(
             chunk_id=self.generate_chunk_id(content, index),
             content=content,
             element_path="narrative_section",
@@ -526,7 +1200,7 @@ class ContentAwareChunking(XMLChunkingStrategy):
             metadata={'content_type': 'narrative', 'paragraph_count': len(content_list)},
             token_estimate=self.estimate_tokens(content),
             elements_included=['para', 'p', 'description']
-        )
+        ), elements[0], elements[-1])
     
     def _get_overlap_elements(self, content_list: List[str]) -> List[str]:
         """Get elements for overlap from the end of content list"""
@@ -549,8 +1223,14 @@ class ContentAwareChunking(XMLChunkingStrategy):
         text = elem.text or ""
         lines = text.split('\n')
         
+        # Source line of the text's first line, when known
+        text_line = 0
+        if self.source is not None and elem in self.source:
+            text_line = self.source.lines(elem)[0] + self.source.start_tag(elem).count('\n')
+        
         current_chunk = []
         current_size = 0
+        current_line = text_line
         chunk_num = 0
         
         for line in lines:
@@ -563,8 +1243,8 @@ class ContentAwareChunking(XMLChunkingStrategy):
                     chunk_id=self.generate_chunk_id(content, index + chunk_num),
                     content=f"<code>{content}</code>",
                     element_path=self._get_element_path(elem),
-                    start_line=0,
-                    end_line=0,
+                    start_line=current_line,
+                    end_line=current_line and current_line + len(current_chunk) - 1,
                     parent_context=None,
                     metadata={
                         'content_type': 'code',
@@ -576,6 +1256,7 @@ class ContentAwareChunking(XMLChunkingStrategy):
                 )
                 
                 chunk_num += 1
+                current_line = current_line and current_line + len(current_chunk)
                 current_chunk = [line]
                 current_size = line_size
             else:
@@ -589,8 +1270,8 @@ class ContentAwareChunking(XMLChunkingStrategy):
                 chunk_id=self.generate_chunk_id(content, index + chunk_num),
                 content=f"<code>{content}</code>",
                 element_path=self._get_element_path(elem),
-                start_line=0,
-                end_line=0,
+                start_line=current_line,
+                end_line=current_line and current_line + len(current_chunk) - 1,
                 parent_context=None,
                 metadata={
                     'content_type': 'code',
@@ -603,8 +1284,176 @@ class ContentAwareChunking(XMLChunkingStrategy):
     
     def _get_element_path(self, elem: ET.Element) -> str:
         """Get a simple path representation for an element"""
-        # In real implementation, would track actual path
-        return elem.tag
+        # The exclusive walk records real paths; otherwise only the tag is known
+        return self._paths.get(elem, elem.tag)
+
+class ChunkPacker:
+    """
+    Merges runs of adjacent small chunks under the same parent.
+
+    Hierarchical chunking emits one chunk per boundary element, so a POM
+    or feed yields a chunk of a few dozen tokens per ``<dependency>`` or
+    ``<item>``. Chunks below ``min_chunk_size`` are joined (by newlines)
+    with the small chunks that follow them under the same parent - same
+    parent path and parent context - while the result stays within
+    ``max_chunk_size``. A packed chunk's path is the parent's, and
+    ``metadata['constituents']`` keeps the path, attributes and lines of
+    each chunk in it. Chunks are renumbered, so chunk IDs after the first
+    merge change.
+
+    Packing streams: only the run being merged is held. ``chunks_in`` and
+    ``chunks_out`` count the chunks seen and produced.
+    """
+
+    def __init__(self, strategy: XMLChunkingStrategy):
+        self.strategy = strategy
+        self.config = strategy.config
+        self.chunks_in = 0
+        self.chunks_out = 0
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the chunks removed by packing"""
+        return 1 - self.chunks_out / self.chunks_in if self.chunks_in else 0.0
+
+    def pack(self, chunks: Iterable[XMLChunk]) -> Iterator[XMLChunk]:
+        strategy = self.strategy
+        separator = strategy.estimate_tokens('\n')
+        run: List[Tuple[XMLChunk, int]] = []  # Small chunks to merge, with their input positions
+        totals = (0, 0, 0)  # Bytes, words and tokens of the run, joined by newlines
+        for chunk in chunks:
+            position = self.chunks_in
+            self.chunks_in += 1
+            key = self._parent_key(chunk)
+            if key is not None and chunk.token_estimate < self.config.min_chunk_size:
+                size = (_utf8_len(chunk.content), len(chunk.content.split()), chunk.token_estimate)
+                if run and self._parent_key(run[0][0]) == key:
+                    candidate = (totals[0] + size[0] + 1, totals[1] + size[1], totals[2] + size[2] + separator)
+                    if strategy.combined_tokens(*candidate) <= self.config.max_chunk_size:
+                        run.append((chunk, position))
+                        totals = candidate
+                        continue
+                if run:
+                    yield self._emit(run, totals)
+                run, totals = [(chunk, position)], size
+                continue
+
+            if run:
+                yield self._emit(run, totals)
+                run = []
+            yield self._number(chunk, position)
+        if run:
+            yield self._emit(run, totals)
+
+    @staticmethod
+    def _parent_key(chunk: XMLChunk) -> Optional[Tuple[str, Optional[str]]]:
+        """The parent a chunk is under, or None if its path does not say"""
+        parent_path, separator, _ = chunk.element_path.rpartition('/')
+        if not separator:
+            return None
+        return parent_path, chunk.parent_context
+
+    def _emit(self, run: List[Tuple[XMLChunk, int]], totals: Tuple[int, int, int]) -> XMLChunk:
+        if len(run) == 1:
+            return self._number(*run[0])
+        chunks = [chunk for chunk, _ in run]
+        first, last = chunks[0], chunks[-1]
+
+        # Metadata all the chunks agree on, and each one's own
+        metadata = {key: value for key, value in first.metadata.items()
+                    if key != 'source_range' and all(chunk.metadata.get(key) == value for chunk in chunks[1:])}
+        metadata['constituents'] = [
+            {'element_path': chunk.element_path,
+             'attributes': chunk.metadata.get('attributes'),
+             'start_line': chunk.start_line,
+             'end_line': chunk.end_line}
+            for chunk in chunks
+        ]
+        if 'source_range' in first.metadata and 'source_range' in last.metadata:
+            metadata['source_range'] = (first.metadata['source_range'][0], last.metadata['source_range'][1])
+
+        content = '\n'.join(chunk.content for chunk in chunks)
+        packed = XMLChunk(
+            chunk_id='',
+            content=content,
+            element_path=self._parent_key(first)[0],
+            start_line=first.start_line,
+            end_line=last.end_line,
+            parent_context=first.parent_context,
+            metadata=metadata,
+            token_estimate=self.strategy.combined_tokens(*totals),
+            elements_included=list(dict.fromkeys(tag for chunk in chunks for tag in chunk.elements_included))
+        )
+        return self._number(packed, None)
+
+    def _number(self, chunk: XMLChunk, position: Optional[int]) -> XMLChunk:
+        """Give a chunk the next index, renaming it if that moved it"""
+        if position != self.chunks_out:
+            chunk.chunk_id = self.strategy.generate_chunk_id(chunk.content, self.chunks_out)
+        self.chunks_out += 1
+        return chunk
+
+class ChunkStream:
+    """
+    Chunks of one document, yielded while it is being chunked
+    (see ChunkingOrchestrator.chunk_document_iter).
+
+    Chunks get the navigation metadata chunk_document adds, except
+    ``total_chunks``: one chunk is held back so its ``next_chunk`` can be
+    set, but the total is only known at the end. It is then available as
+    ``total_chunks``, and with ``sidecar_path`` a JSON Lines file holds one
+    navigation record per chunk followed by a totals record, so stored
+    chunks can be patched without keeping them in memory. Iterate once.
+    """
+
+    def __init__(self, chunks: Iterator[XMLChunk], document_type: str,
+                 file_path: Optional[str] = None, sidecar_path: Optional[str] = None,
+                 packer: Optional[ChunkPacker] = None):
+        self._chunks = chunks
+        self.document_type = document_type
+        self.file_path = file_path
+        self.sidecar_path = sidecar_path
+        self.packer = packer  # Packing counts, if small chunks were packed
+        self.total_chunks: Optional[int] = None  # Set once iteration finishes
+
+    def __iter__(self) -> Iterator[XMLChunk]:
+        sidecar = open(self.sidecar_path, 'w', encoding='utf-8') if self.sidecar_path else None
+        try:
+            previous = None
+            count = 0
+            for chunk in self._chunks:
+                chunk.metadata['document_type'] = self.document_type
+                chunk.metadata['chunk_index'] = count
+                if previous is not None:
+                    chunk.metadata['previous_chunk'] = previous.chunk_id
+                    previous.metadata['next_chunk'] = chunk.chunk_id
+                    self._record(sidecar, previous)
+                    yield previous
+                previous = chunk
+                count += 1
+            if previous is not None:
+                self._record(sidecar, previous)
+                yield previous
+
+            self.total_chunks = count
+            if sidecar:
+                sidecar.write(json.dumps({'document': self.file_path,
+                                          'document_type': self.document_type,
+                                          'total_chunks': count}) + '\n')
+        finally:
+            if sidecar:
+                sidecar.close()
+
+    @staticmethod
+    def _record(sidecar, chunk: XMLChunk) -> None:
+        if sidecar:
+            sidecar.write(json.dumps({
+                'chunk_id': chunk.chunk_id,
+                'chunk_index': chunk.metadata['chunk_index'],
+                'element_path': chunk.element_path,
+                'previous_chunk': chunk.metadata.get('previous_chunk'),
+                'next_chunk': chunk.metadata.get('next_chunk'),
+            }) + '\n')
 
 class ChunkingOrchestrator:
     """Orchestrates the chunking process using appropriate strategies"""
@@ -615,13 +1464,58 @@ class ChunkingOrchestrator:
             'sliding_window': SlidingWindowChunking,
             'content_aware': ContentAwareChunking
         }
+        self.last_packer: Optional[ChunkPacker] = None  # Packing counts of the last chunk_document
     
     def chunk_document(self, file_path: str, 
                       specialized_analysis: Dict[str, Any],
                       strategy: str = 'auto',
                       config: ChunkingConfig = None) -> List[XMLChunk]:
         """Chunk a document using the appropriate strategy"""
+        chunker = self._create_chunker(specialized_analysis, strategy, config)
+        
+        # Perform chunking
+        chunks = chunker.chunk_document(file_path, specialized_analysis)
+        
+        # Merge small chunks
+        self.last_packer = self._create_packer(chunker)
+        if self.last_packer:
+            chunks = list(self.last_packer.pack(chunks))
+        
+        # Post-process chunks
+        chunks = self._post_process_chunks(chunks, specialized_analysis)
         
+        return chunks
+
+    def chunk_document_iter(self, file_path: str,
+                            specialized_analysis: Dict[str, Any],
+                            strategy: str = 'auto',
+                            config: ChunkingConfig = None,
+                            sidecar_path: Optional[str] = None) -> 'ChunkStream':
+        """
+        Chunk a document while it is parsed, yielding chunks as they are
+        ready. Hierarchical chunking runs in bounded memory; other
+        strategies chunk the whole document first. See ChunkStream for the
+        navigation metadata and the optional sidecar.
+        """
+        chunker = self._create_chunker(specialized_analysis, strategy, config)
+        doc_type = specialized_analysis.get('document_type', {}).get('type_name', '')
+        chunks = chunker.chunk_document_iter(file_path, specialized_analysis)
+        packer = self._create_packer(chunker)
+        if packer:
+            chunks = packer.pack(chunks)
+        return ChunkStream(chunks, doc_type, file_path=file_path,
+                           sidecar_path=sidecar_path, packer=packer)
+
+    @staticmethod
+    def _create_packer(chunker: XMLChunkingStrategy) -> Optional[ChunkPacker]:
+        """Packer for the chunker's small chunks, or None if they are kept"""
+        if chunker.packable and chunker.config.pack_small_chunks and chunker.config.min_chunk_size > 0:
+            return ChunkPacker(chunker)
+        return None
+
+    def _create_chunker(self, specialized_analysis: Dict[str, Any], strategy: str,
+                        config: Optional[ChunkingConfig]) -> XMLChunkingStrategy:
+        """Strategy instance configured for the document"""
         if strategy == 'auto':
             strategy = self._select_strategy(specialized_analysis)
         
@@ -637,13 +1531,7 @@ class ChunkingOrchestrator:
             config = self._create_config_for_document(specialized_analysis)
             chunker.config = config
         
-        # Perform chunking
-        chunks = chunker.chunk_document(file_path, specialized_analysis)
-        
-        # Post-process chunks
-        chunks = self._post_process_chunks(chunks, specialized_analysis)
-        
-        return chunks
+        return chunker
     
     def _select_strategy(self, analysis: Dict[str, Any]) -> str:
         """Select the best chunking strategy based on document analysis"""
@@ -659,6 +1547,7 @@ class ChunkingOrchestrator:
             'Maven POM': 'hierarchical',
             'Spring Configuration': 'hierarchical',
             'DocBook Documentation': 'content_aware',
+            'XHTML Document': 'content_aware',
             'Log4j Configuration': 'hierarchical',
             'SVG Graphics': 'hierarchical'
         }
@@ -677,6 +1566,9 @@ class ChunkingOrchestrator:
             config.max_chunk_size = 4000  # Larger chunks for documentation
             config.preserve_hierarchy = True
             config.include_parent_context = True
+            config.exclusive_content = True  # Sections would repeat their paragraphs
+        elif doc_type == 'XHTML Document':
+            config.exclusive_content = True
         elif 'Configuration' in doc_type:
             config.max_chunk_size = 2000  # Smaller chunks for configs
             config.preserve_hierarchy = True
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Handler Dispatch Index
+
+Indexes handlers by the root local names and namespace URI fragments they
+declare (``DETECTION_ROOT_ELEMENTS`` / ``DETECTION_NAMESPACES`` on
+``XMLHandler``), so that only handlers which could possibly accept a
+document run their ``can_handle`` checks.
+
+Handlers that declare nothing are "open" detectors: their detection looks
+at document content rather than the root, so they are probed for every
+document. Candidates are always returned in registry order, which keeps the
+tie-breaking behaviour of the original linear scan.
+
+Entries only need the two detection attributes, so the index can be built
+from handler specs (core.registry) and ``resolve`` turns the candidates
+into handler instances, importing only the handlers that are probed.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, List, Optional
+import time
+
+
+class HandlerDispatchIndex:
+    """Maps root local names and namespace fragments to candidate handlers"""
+
+    def __init__(self, handlers: List[Any], resolve: Optional[Callable[[Any], Any]] = None):
+        self.handlers = list(handlers)
+        self.resolve = resolve
+        self._by_root: Dict[str, List[int]] = {}
+        self._by_namespace: Dict[str, List[int]] = {}
+        self._open: List[int] = []
+
+        for position, handler in enumerate(self.handlers):
+            roots = getattr(handler, 'DETECTION_ROOT_ELEMENTS', None) or []
+            namespaces = getattr(handler, 'DETECTION_NAMESPACES', None) or []
+            if not roots and not namespaces:
+                self._open.append(position)
+                continue
+            for name in roots:
+                self._by_root.setdefault(name.lower(), []).append(position)
+            for fragment in namespaces:
+                self._by_namespace.setdefault(fragment.lower(), []).append(position)
+
+    def candidates(self, root: ET.Element, namespaces: Dict[str, str]) -> List[Any]:
+        """Return the handlers that may accept this document, in registry order"""
+        tag = root.tag
+        local_name = tag.split('}')[-1] if '}' in tag else tag
+
+        positions = set(self._open)
+        positions.update(self._by_root.get(local_name.lower(), ()))
+
+        # Namespace fragments are matched against every declared URI and
+        # the root tag itself (which carries the root namespace)
+        haystack = ' '.join(list(namespaces.values()) + [tag]).lower()
+        for fragment, handler_positions in self._by_namespace.items():
+            if fragment in haystack:
+                positions.update(handler_positions)
+
+        candidates = [self.handlers[position] for position in sorted(positions)]
+        if self.resolve is not None:
+            candidates = [self.resolve(entry) for entry in candidates]
+        return candidates
+
+    def is_open(self, handler: Any) -> bool:
+        """True if the handler (an indexed entry) is probed for every document"""
+        return self.handlers.index(handler) in self._open
+
+
+class DetectionStats:
+    """Accumulates per-handler detection cost across analyzed documents"""
+
+    def __init__(self):
+        self.documents = 0
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, handler_name: str, elapsed: float, matched: bool) -> None:
+        stats = self._stats.setdefault(handler_name, {
+            'calls': 0, 'matches': 0, 'total_seconds': 0.0, 'max_seconds': 0.0
+        })
+        stats['calls'] += 1
+        stats['matches'] += 1 if matched else 0
+        stats['total_seconds'] += elapsed
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-handler detection cost, most expensive first"""
+        grand_total = sum(s['total_seconds'] for s in self._stats.values()) or 1.0
+        rows = []
+        for name, stats in self._stats.items():
+            rows.append({
+                'handler': name,
+                'calls': stats['calls'],
+                'matches': stats['matches'],
+                'total_seconds': stats['total_seconds'],
+                'mean_seconds': stats['total_seconds'] / stats['calls'],
+                'max_seconds': stats['max_seconds'],
+                'share': stats['total_seconds'] / grand_total
+            })
+        return sorted(rows, key=lambda row: row['total_seconds'], reverse=True)
+
+    def reset(self) -> None:
+        self.documents = 0
+        self._stats.clear()
+
+
+def timed_can_handle(handler: Any, root: ET.Element, namespaces: Dict[str, str],
+                     stats: DetectionStats):
+    """Run handler.can_handle and record its cost"""
+    start = time.perf_counter()
+    can_handle, confidence = handler.can_handle(root, namespaces)
+    stats.record(handler.__class__.__name__, time.perf_counter() - start, can_handle)
+    return can_handle, confidence
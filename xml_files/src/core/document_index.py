@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Shared Per-Document Element Index
+
+Handlers repeatedly run ``root.findall('.//{ns}name')`` and
+``len(list(root.iter()))`` over the same tree. ``DocumentIndex`` walks the
+tree once and answers those queries from dictionaries, turning O(k*N)
+handler analysis into O(N) for large documents.
+
+The analyzer builds the index for each parsed document and activates it
+while the handler runs, including when deferred sections are computed
+later; handlers obtain it through ``XMLHandler.document_index``. The active
+index is a context variable, so analyses in other threads do not see or
+replace it, and it is held only as long as the analysis needs it. A
+handler used standalone gets an index built on first use, which stays
+active in its context until another root is indexed or ``release()``.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import xml.etree.ElementTree as ET
+from collections import defaultdict, Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def split_tag(tag: str) -> Tuple[Optional[str], str]:
+    """Split a Clark-notation tag into (namespace, local name)"""
+    if tag[:1] == '{':
+        namespace, _, local_name = tag[1:].partition('}')
+        return namespace, local_name
+    return None, tag
+
+
+class DocumentIndex:
+    """Element lookups for one parsed document, built in a single traversal"""
+
+    def __init__(self, root: ET.Element):
+        self.root = root
+        self.elements: List[ET.Element] = []  # Document order, root first
+        self.by_local_name: Dict[str, List[ET.Element]] = defaultdict(list)
+        self.by_qualified_name: Dict[Tuple[Optional[str], str], List[ET.Element]] = defaultdict(list)
+        self.parent_map: Dict[ET.Element, ET.Element] = {}
+        self.depths: Dict[ET.Element, int] = {}
+        self.local_name_counts: Counter = Counter()
+        self.max_depth = 0
+
+        stack = [(root, 0)]
+        while stack:
+            elem, depth = stack.pop()
+            tag = elem.tag
+            if not isinstance(tag, str):
+                # Comments and processing instructions (lxml trees)
+                continue
+            namespace, local_name = split_tag(tag)
+            self.elements.append(elem)
+            self.by_local_name[local_name].append(elem)
+            self.by_qualified_name[(namespace, local_name)].append(elem)
+            self.depths[elem] = depth
+            if depth > self.max_depth:
+                self.max_depth = depth
+            children = list(elem)
+            for child in children:
+                self.parent_map[child] = elem
+            stack.extend((child, depth + 1) for child in reversed(children))
+
+        for local_name, elements in self.by_local_name.items():
+            self.local_name_counts[local_name] = len(elements)
+
+    @property
+    def root_namespace(self) -> Optional[str]:
+        """Namespace URI of the root element, or None if un-namespaced"""
+        return split_tag(self.root.tag)[0]
+
+    @property
+    def total_elements(self) -> int:
+        """Number of elements in the document, root included"""
+        return len(self.elements)
+
+    def find_all(self, local_name: str, namespace: Optional[str] = '*') -> List[ET.Element]:
+        """
+        Descendants of the root with this local name, in document order.
+
+        Equivalent to ``root.findall('.//{namespace}local_name')``; pass
+        ``namespace=None`` for un-namespaced elements and leave the default
+        ``'*'`` to match any namespace.
+        """
+        if namespace == '*':
+            elements = self.by_local_name.get(local_name, [])
+        else:
+            elements = self.by_qualified_name.get((namespace, local_name), [])
+        if elements and elements[0] is self.root:
+            return elements[1:]
+        return list(elements)
+
+    def find_first(self, local_name: str, namespace: Optional[str] = '*') -> Optional[ET.Element]:
+        """First descendant with this local name, like ``root.find('.//...')``"""
+        elements = self.find_all(local_name, namespace)
+        return elements[0] if elements else None
+
+    def count(self, local_name: str, namespace: Optional[str] = '*') -> int:
+        """Number of descendants of the root with this local name"""
+        return len(self.find_all(local_name, namespace))
+
+    def parent(self, elem: ET.Element) -> Optional[ET.Element]:
+        return self.parent_map.get(elem)
+
+    def depth(self, elem: ET.Element) -> int:
+        return self.depths[elem]
+
+    def ancestors(self, elem: ET.Element) -> List[ET.Element]:
+        """Ancestors of an element, nearest first"""
+        ancestors = []
+        parent = self.parent_map.get(elem)
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self.parent_map.get(parent)
+        return ancestors
+
+    @contextmanager
+    def activate(self) -> Iterator['DocumentIndex']:
+        """Make this the index handlers get for its root, within the block"""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    @classmethod
+    def for_root(cls, root: ET.Element) -> 'DocumentIndex':
+        """Return the active index for this root, building (and activating) one if needed"""
+        index = cls.cached(root)
+        if index is None:
+            index = cls(root)
+            _active.set(index)
+        return index
+
+    @classmethod
+    def cached(cls, root: ET.Element) -> Optional['DocumentIndex']:
+        """Return the active index if it was built for this root, else None"""
+        index = _active.get()
+        if index is not None and index.root is root:
+            return index
+        return None
+
+    @classmethod
+    def release(cls, root: ET.Element) -> None:
+        """Deactivate the index of a root indexed by for_root outside an analysis"""
+        if cls.cached(root) is not None:
+            _active.set(None)
+
+
+# The DocumentIndex of the document being analyzed in this context, or None
+_active = ContextVar('document_index', default=None)
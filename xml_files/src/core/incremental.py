@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Incremental Re-Chunking Between Document Versions
+
+Re-ingesting a new revision of a document used to re-chunk it and send
+every chunk to the embedding API again, although most chunks of a revised
+benchmark or configuration file are unchanged. ``IncrementalChunker``
+takes the manifest of the previous run and reports which chunks were
+added, removed or left unchanged, so only added chunks are embedded and
+stored and only removed ones are deleted.
+
+Chunks of hierarchical chunking are semantic-boundary subtrees (or parts
+of one), so they are compared by a digest of what is embedded: content,
+element path and parent context. The digest does not depend on the
+chunk's position, so a chunk that only moved because something was
+inserted before it is unchanged. Unchanged chunks keep their previous
+``chunk_id`` - the ID the vector store already has - and added chunks get
+IDs that none of the previous chunks used. Unchanged chunks whose
+positional metadata (chunk_index, total_chunks, previous_chunk,
+next_chunk) differs from the previous run are returned as well, so the
+stored metadata can be updated without embedding them again.
+
+When the file and the chunking settings are the same as in the manifest,
+the document is not parsed at all.
+
+Small chunks are not packed (see ``ChunkPacker``): a packed chunk would
+change whenever any of the subtrees in it does.
+
+A manifest is plain JSON::
+
+    {"version": 1, "document": "...", "source_digest": "<sha256>",
+     "settings": "<digest of strategy, document type and config>",
+     "chunks": [["<chunk_id>", "<digest>"], ...]}    # document order
+"""
+
+import dataclasses
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from core.cache import content_digest
+from core.chunking import ChunkingConfig, ChunkingOrchestrator, XMLChunk
+
+# Bump when the manifest layout or the chunk digest changes
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ChunkDiff:
+    """Chunks of a new document version compared with the previous run"""
+    added: List[str]  # IDs of chunks to embed and store
+    removed: List[str]  # IDs of previous chunks to delete
+    unchanged: List[str]  # IDs of previous chunks that are kept as stored
+    chunks: List[XMLChunk]  # The added chunks, in document order
+    metadata_changed: List[XMLChunk]  # Unchanged chunks whose position or neighbours changed
+    manifest: Dict[str, Any]  # Manifest of this version, for the next run
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.metadata_changed)
+
+
+def chunk_digest(chunk: XMLChunk) -> str:
+    """Digest of what identifies a chunk regardless of its position"""
+    digest = hashlib.sha256()
+    for part in (chunk.content, chunk.element_path, chunk.parent_context or ''):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """Read a manifest written by save_manifest, or None if there is none"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None  # Written by another version: treat every chunk as new
+    return manifest
+
+
+def save_manifest(manifest: Dict[str, Any], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+class IncrementalChunker:
+    """Chunks document versions, reporting the difference to the previous run"""
+
+    def __init__(self, orchestrator: ChunkingOrchestrator = None):
+        self.orchestrator = orchestrator or ChunkingOrchestrator()
+
+    def chunk_document(self, file_path: str,
+                       specialized_analysis: Dict[str, Any],
+                       previous_manifest: Optional[Dict[str, Any]] = None,
+                       strategy: str = 'auto',
+                       config: ChunkingConfig = None) -> ChunkDiff:
+        """
+        Chunk a document and diff its chunks against ``previous_manifest``
+        (None on the first run: every chunk is added). Chunk metadata
+        (navigation, chunk_index) of the returned chunks reflects the new
+        version; ``manifest['chunks']`` lists every chunk ID in order.
+        """
+        source_digest = content_digest(file_path)
+        settings = self._settings_digest(specialized_analysis, strategy, config)
+        previous = previous_manifest or {'chunks': []}
+
+        if previous.get('source_digest') == source_digest and previous.get('settings') == settings:
+            ids = [chunk_id for chunk_id, _ in previous['chunks']]
+            return ChunkDiff(added=[], removed=[], unchanged=ids, chunks=[], metadata_changed=[],
+                             manifest=dict(previous, document=file_path))
+
+        # Previous IDs by digest, in document order, so that repeated chunks
+        # are matched in order
+        available = defaultdict(list)
+        for chunk_id, digest in reversed(previous['chunks']):
+            available[digest].append(chunk_id)
+        previous_ids = {chunk_id for chunk_id, _ in previous['chunks']}
+
+        chunker = self.orchestrator._create_chunker(specialized_analysis, strategy, config)
+        chunks = chunker.chunk_document(file_path, specialized_analysis)
+        digests = [chunk_digest(chunk) for chunk in chunks]
+        unchanged, fresh = [], []
+        for chunk, digest in zip(chunks, digests):
+            if available.get(digest):
+                chunk.chunk_id = available[digest].pop()
+                unchanged.append(chunk.chunk_id)
+            else:
+                fresh.append(chunk)
+
+        # An added chunk must not take the ID of a previous chunk, or
+        # deleting the removed chunks could delete it
+        for chunk in fresh:
+            if chunk.chunk_id in previous_ids:
+                base, suffix = chunk.chunk_id, 1
+                while f"{base}_{suffix}" in previous_ids:
+                    suffix += 1
+                chunk.chunk_id = f"{base}_{suffix}"
+
+        chunks = self.orchestrator._post_process_chunks(chunks, specialized_analysis)
+        kept = set(unchanged)
+        previous_positions = self._positions([chunk_id for chunk_id, _ in previous['chunks']])
+        positions = self._positions([chunk.chunk_id for chunk in chunks])
+        return ChunkDiff(
+            added=[chunk.chunk_id for chunk in fresh],
+            removed=[chunk_id for chunk_id, _ in previous['chunks'] if chunk_id not in kept],
+            unchanged=unchanged,
+            chunks=fresh,
+            metadata_changed=[chunk for chunk in chunks if chunk.chunk_id in kept
+                              and positions[chunk.chunk_id] != previous_positions[chunk.chunk_id]],
+            manifest={
+                'version': MANIFEST_VERSION,
+                'document': file_path,
+                'source_digest': source_digest,
+                'settings': settings,
+                'chunks': [[chunk.chunk_id, digest] for chunk, digest in zip(chunks, digests)],
+            })
+
+    @staticmethod
+    def _positions(ids: List[str]) -> Dict[str, tuple]:
+        """(chunk_index, total_chunks, previous_chunk, next_chunk) of each ID, as _post_process_chunks sets them"""
+        return {chunk_id: (i, len(ids), ids[i - 1] if i > 0 else None, ids[i + 1] if i < len(ids) - 1 else None)
+                for i, chunk_id in enumerate(ids)}
+
+    @staticmethod
+    def _settings_digest(specialized_analysis: Dict[str, Any], strategy: str,
+                         config: Optional[ChunkingConfig]) -> str:
+        """Digest of everything besides the file that decides the chunks"""
+        settings = {
+            'strategy': strategy,
+            'document_type': specialized_analysis.get('document_type', {}).get('type_name', ''),
+            'config': None if config is None else
+                      {field.name: getattr(config, field.name) for field in dataclasses.fields(config)},
+        }
+        # Token counter instances are identified by name
+        encoded = json.dumps(settings, sort_keys=True, default=lambda value: getattr(value, 'name', None) or repr(value))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Analysis Instrumentation
+
+Records where analysis time (and optionally memory) goes, per document and
+per phase - parsing, handler detection, indexing, ``analyze`` and
+``extract_key_data`` - so slow or memory-hungry handlers can be found in
+production without attaching a profiler.
+
+Pass an ``Instrumentation`` to ``XMLDocumentAnalyzer``; every result then
+carries a ``timings`` dict::
+
+    {"handler": "SCAPHandler", "total_seconds": 0.012,
+     "phases": {"parse": {"seconds": 0.004, "peak_bytes": 183204}, ...}}
+
+``peak_bytes`` is only present with ``track_memory=True``; it is the
+tracemalloc peak above the allocations live when the phase started. Phases
+do not nest. Timings are also aggregated on the Instrumentation (see
+``report()``), passed to any registered hooks, and can be aggregated after
+the fact from batch JSONL records with ``aggregate_timings()``.
+"""
+
+import math
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# Receives each document's timings dict as it is recorded
+TimingHook = Callable[[Dict[str, Any]], None]
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Linearly interpolated percentile of a non-empty sequence"""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _reset_peak() -> int:
+    """Restart tracemalloc's peak at the current traced memory, which is returned"""
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+    # Python < 3.9: forgetting the current traces restarts both counters at 0
+    tracemalloc.clear_traces()
+    return 0
+
+
+class PhaseTimer:
+    """Times the phases of a single document's analysis"""
+
+    def __init__(self, track_memory: bool = False):
+        self.track_memory = track_memory
+        self.phases: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block; repeated phases accumulate"""
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            baseline = _reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, {'seconds': 0.0})
+            entry['seconds'] += time.perf_counter() - start
+            if self.track_memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                entry['peak_bytes'] = max(entry.get('peak_bytes', 0), peak)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def timings(self, handler: Optional[str]) -> Dict[str, Any]:
+        return {
+            'handler': handler,
+            'total_seconds': sum(entry['seconds'] for entry in self.phases.values()),
+            'phases': self.phases
+        }
+
+
+class _NullTimer:
+    """Stand-in used when instrumentation is off; phases cost nothing"""
+
+    _context = nullcontext()
+
+    def phase(self, name: str):
+        return self._context
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Instrumentation:
+    """Collects per-document phase timings and aggregates them by handler"""
+
+    def __init__(self, track_memory: bool = False,
+                 hooks: Optional[Iterable[TimingHook]] = None):
+        self.track_memory = track_memory
+        self.hooks: List[TimingHook] = list(hooks or [])
+        self.documents = 0
+        # (handler, phase) -> {'seconds': [...], 'peak_bytes': [...]}
+        self._samples: Dict[Tuple[str, str], Dict[str, List[float]]] = {}
+
+    def add_hook(self, hook: TimingHook) -> None:
+        self.hooks.append(hook)
+
+    def timer(self) -> PhaseTimer:
+        return PhaseTimer(self.track_memory)
+
+    def observe(self, timings: Dict[str, Any]) -> Dict[str, Any]:
+        """Add one document's timings to the aggregate and run the hooks"""
+        self.documents += 1
+        handler = timings.get('handler') or 'unknown'
+        phases = dict(timings.get('phases', {}))
+        phases['total'] = {'seconds': timings.get('total_seconds', 0.0)}
+        for name, entry in phases.items():
+            samples = self._samples.setdefault((handler, name), {'seconds': [], 'peak_bytes': []})
+            samples['seconds'].append(entry['seconds'])
+            if 'peak_bytes' in entry:
+                samples['peak_bytes'].append(entry['peak_bytes'])
+        for hook in self.hooks:
+            hook(timings)
+        return timings
+
+    def report(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[Dict[str, Any]]:
+        """
+        Aggregated timings, one row per handler and phase.
+
+        Rows have count, total/mean/max seconds and a ``p<N>_seconds``
+        column per requested percentile (plus ``p<N>_peak_bytes`` and
+        ``max_peak_bytes`` when memory was tracked). Each handler has a
+        ``total`` phase covering whole documents. Most expensive first.
+        """
+        rows = []
+        for (handler, name), samples in self._samples.items():
+            seconds = samples['seconds']
+            row = {
+                'handler': handler,
+                'phase': name,
+                'count': len(seconds),
+                'total_seconds': sum(seconds),
+                'mean_seconds': sum(seconds) / len(seconds),
+                'max_seconds': max(seconds)
+            }
+            for pct in percentiles:
+                row[f'p{pct:g}_seconds'] = percentile(seconds, pct)
+            peaks = samples['peak_bytes']
+            if peaks:
+                for pct in percentiles:
+                    row[f'p{pct:g}_peak_bytes'] = percentile(peaks, pct)
+                row['max_peak_bytes'] = max(peaks)
+            rows.append(row)
+        rows.sort(key=lambda row: row['total_seconds'], reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        self.documents = 0
+        self._samples.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Batch workers get the settings only; hooks and samples stay here
+        return {'track_memory': self.track_memory}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(track_memory=state['track_memory'])
+
+
+def aggregate_timings(records: Iterable[Dict[str, Any]],
+                      percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[Dict[str, Any]]:
+    """Aggregate the ``timings`` of analysis results or batch records"""
+    instrumentation = Instrumentation()
+    for record in records:
+        if 'timings' in record:
+            instrumentation.observe(record['timings'])
+    return instrumentation.report(percentiles)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Parallel Chunking Across Documents and Subtrees
+
+``ChunkingOrchestrator`` chunks one file at a time on one core. The
+``ParallelChunkingOrchestrator`` runs chunking in a process pool, across
+files and, within a large file, across the children of the root: the
+``Group``s of an XCCDF benchmark or the ``chapter``s of a DocBook book are
+chunked independently when hierarchical chunking subdivides the root.
+
+The parent scans the file once with expat for the spans of the root's
+children (``SourceMap.root_children``) and cuts them into fragments of at
+least ``fragment_bytes``. Each worker parses only its fragment, with the
+same source positions as a full parse, and chunks it. Chunks are put back
+in document order and renumbered, so chunk IDs and metadata are the same
+as ``ChunkingOrchestrator.chunk_document``'s. Other strategies, small
+files and roots that are chunked whole are chunked as one task.
+
+Only ``workers * IN_FLIGHT_PER_WORKER`` tasks are in flight at a time, and
+documents are yielded in input order as soon as all their tasks are done.
+"""
+
+import dataclasses
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.chunking import ChunkingConfig, ChunkingOrchestrator, HierarchicalChunking, XMLChunk, XMLChunkingStrategy
+from core.source_map import Fragment, SourceMap
+
+# How many tasks may be queued per worker before we wait for results
+IN_FLIGHT_PER_WORKER = 4
+
+# Smallest fragment of a file chunked as a task of its own
+FRAGMENT_BYTES = 1024 * 1024
+
+
+def _chunk_task(strategy_class: type, config: ChunkingConfig, file_path: str,
+                specialized_analysis: Dict[str, Any], fragment: Optional[Fragment]) -> List[XMLChunk]:
+    """Worker: chunk a whole file, or the root's children in a fragment of it"""
+    chunker = strategy_class(config)
+    if fragment is None:
+        return chunker.chunk_document(file_path, specialized_analysis)
+    return chunker.chunk_fragment(file_path, fragment, specialized_analysis)
+
+
+class ParallelChunkingOrchestrator(ChunkingOrchestrator):
+    """Chunks documents, and the subtrees of large documents, in worker processes"""
+
+    def __init__(self, workers: Optional[int] = None, fragment_bytes: int = FRAGMENT_BYTES):
+        super().__init__()
+        self.workers = workers or os.cpu_count() or 1
+        self.fragment_bytes = fragment_bytes
+
+    def chunk_document(self, file_path: str,
+                       specialized_analysis: Dict[str, Any],
+                       strategy: str = 'auto',
+                       config: ChunkingConfig = None) -> List[XMLChunk]:
+        """Chunk one document, its top-level subtrees in parallel"""
+        for _, chunks in self.chunk_many([(file_path, specialized_analysis)], strategy, config):
+            return chunks
+
+    def chunk_many(self, documents: Iterable[Tuple[str, Dict[str, Any]]],
+                   strategy: str = 'auto',
+                   config: ChunkingConfig = None) -> Iterator[Tuple[str, List[XMLChunk]]]:
+        """
+        Chunk (file path, specialized analysis) pairs in parallel, yielding
+        (file path, chunks) in input order. Chunks are those of
+        ``ChunkingOrchestrator.chunk_document``. With one worker, documents
+        are chunked in this process. Errors are raised as from
+        chunk_document.
+        """
+        if self.workers == 1:
+            for file_path, analysis in documents:
+                yield file_path, super().chunk_document(file_path, analysis, strategy, config)
+            return
+
+        max_in_flight = self.workers * IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Documents in input order: [file path, analysis, chunker, futures of their tasks]
+            queued: List[List[Any]] = []
+            tasks = self._tasks(documents, queued, strategy, config)
+            in_flight = set()
+            exhausted = False
+            while queued or not exhausted:
+                # Top up the queue without planning every document up front
+                while not exhausted and len(in_flight) < max_in_flight:
+                    try:
+                        document, task = next(tasks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = pool.submit(_chunk_task, *task)
+                    document[3].append(future)
+                    in_flight.add(future)
+
+                # Yield the documents at the front whose tasks are all done
+                while queued and (len(queued) > 1 or exhausted) and all(future.done() for future in queued[0][3]):
+                    file_path, analysis, chunker, futures = queued.pop(0)
+                    yield file_path, self._assemble(chunker, analysis, [future.result() for future in futures])
+                if in_flight:
+                    _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+    def _tasks(self, documents: Iterable[Tuple[str, Dict[str, Any]]], queued: List[List[Any]],
+               strategy: str = 'auto', config: ChunkingConfig = None) -> Iterator[Tuple[List[Any], tuple]]:
+        """Tasks of each document, registering the document in ``queued`` first"""
+        for file_path, analysis in documents:
+            chunker = self._create_chunker(analysis, strategy, config)
+            document = [file_path, analysis, chunker, []]
+            queued.append(document)
+            for fragment in self._plan(file_path, analysis, chunker) or [None]:
+                yield document, (type(chunker), chunker.config, file_path, analysis, fragment)
+
+    def _plan(self, file_path: str, analysis: Dict[str, Any],
+              chunker: XMLChunkingStrategy) -> Optional[List[Fragment]]:
+        """Fragments to chunk in parallel, or None to chunk the file as one task"""
+        if not isinstance(chunker, HierarchicalChunking) or os.path.getsize(file_path) < 2 * self.fragment_bytes:
+            return None
+        with SourceMap(file_path) as source:
+            if not source.has_positions:
+                return None
+            children = source.root_children()
+            root_tag = source.root_tag
+            root_start, root_end = source.root_start, source.root_end
+
+        # Boundaries as chunk_document would set them
+        planner = HierarchicalChunking(dataclasses.replace(chunker.config))
+        if analysis:
+            planner.config.semantic_boundaries = planner._get_semantic_boundaries(
+                analysis.get('document_type', {}).get('type_name', ''))
+        if not children or not planner.subdivides_root(root_tag, (child.tag for child in children)):
+            return None
+
+        # Each fragment runs to the start of the next, so children keep their tails
+        fragments = []
+        first = None
+        for child, following in zip(children, children[1:]):
+            first = first or child
+            if following.start - first.start >= self.fragment_bytes:
+                fragments.append(Fragment(root_start, first.start, following.start, first.line))
+                first = None
+        first = first or children[-1]
+        fragments.append(Fragment(root_start, first.start, root_end, first.line))
+        return fragments if len(fragments) > 1 else None
+
+    def _assemble(self, chunker: XMLChunkingStrategy, analysis: Dict[str, Any],
+                  parts: List[List[XMLChunk]]) -> List[XMLChunk]:
+        """One document's chunks from its tasks, numbered and post-processed as chunk_document's"""
+        chunks = []
+        for part in parts:
+            for chunk in part:
+                if len(parts) > 1:
+                    chunk.chunk_id = chunker.generate_chunk_id(chunk.content, len(chunks))
+                chunks.append(chunk)
+        self.last_packer = self._create_packer(chunker)
+        if self.last_packer:
+            chunks = list(self.last_packer.pack(chunks))
+        return self._post_process_chunks(chunks, analysis)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Pluggable XML Parser Backends
+
+Documents are parsed through a backend so that lxml can be used when it is
+installed, while the framework itself stays stdlib-only. Both backends
+return ElementTree-compatible elements, so handlers are unaffected:
+
+- ``EtreeBackend`` - ``xml.etree.ElementTree`` (always available)
+- ``LxmlBackend`` - ``lxml.etree``: faster parsing, ``sourceline`` on every
+  element and ``getparent()``. Comments and processing instructions are
+  dropped at parse time so every element has a string tag, as with the
+  stdlib, and entity resolution and network access are disabled.
+
+The backend is chosen with ``get_backend()``: an explicit name, else the
+``XML_ANALYSIS_BACKEND`` environment variable, else ``etree``. ``auto``
+selects lxml when it is importable. lxml parses faster, but handlers walk
+the tree in Python and lxml creates an element proxy on every access, so
+full analysis is currently faster on the stdlib tree (see
+scripts/benchmark_parser_backends.py); hence lxml is opt-in.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+from typing import Dict, Optional, Tuple, Union
+
+from core.sniffer import add_namespace
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+BACKEND_ENV_VAR = 'XML_ANALYSIS_BACKEND'
+DEFAULT_BACKEND = 'etree'
+
+
+class EtreeBackend:
+    """Standard library ElementTree backend"""
+
+    name = 'etree'
+    supports_sourceline = False
+    supports_parent = False
+
+    def parse(self, file_path: str) -> Tuple[ET.Element, Dict[str, str]]:
+        """Parse a file, returning the root and its namespace declarations"""
+        namespaces: Dict[str, str] = {}
+        events = ET.iterparse(file_path, events=('start-ns',))
+        for _, (prefix, uri) in events:
+            add_namespace(namespaces, prefix or 'default', uri)
+        return events.root, namespaces
+
+    def tostring(self, element) -> str:
+        return ET.tostring(element, encoding='unicode')
+
+    def parent(self, element) -> Optional[ET.Element]:
+        """Parent element, or None when the backend has no parent pointers"""
+        return None
+
+
+class LxmlBackend:
+    """lxml backend, available when lxml is installed"""
+
+    name = 'lxml'
+    supports_sourceline = True
+    supports_parent = True
+
+    def __init__(self, huge_tree: bool = False):
+        if lxml_etree is None:
+            raise ImportError("The lxml backend requires the 'lxml' package")
+        self.huge_tree = huge_tree
+
+    def parse(self, file_path: str):
+        namespaces: Dict[str, str] = {}
+        try:
+            events = lxml_etree.iterparse(
+                file_path, events=('start-ns',),
+                remove_comments=True, remove_pis=True,
+                resolve_entities=False, no_network=True,
+                huge_tree=self.huge_tree
+            )
+            for _, (prefix, uri) in events:
+                add_namespace(namespaces, prefix or 'default', uri)
+        except lxml_etree.XMLSyntaxError as e:
+            # Callers handle parse failures as ET.ParseError for either backend
+            raise ET.ParseError(str(e)) from e
+        return events.root, namespaces
+
+    def tostring(self, element) -> str:
+        return lxml_etree.tostring(element, encoding='unicode')
+
+    def parent(self, element):
+        return element.getparent()
+
+
+BACKENDS = {
+    'etree': EtreeBackend,
+    'lxml': LxmlBackend,
+}
+
+
+def available_backends():
+    """Names of the backends that can be used in this environment"""
+    return [name for name in BACKENDS if name != 'lxml' or lxml_etree is not None]
+
+
+def get_backend(backend: Union[str, EtreeBackend, LxmlBackend, None] = None):
+    """
+    Return a parser backend.
+
+    Accepts a backend instance (returned unchanged), a name ('etree',
+    'lxml' or 'auto'), or None to use $XML_ANALYSIS_BACKEND, falling back
+    to DEFAULT_BACKEND.
+    """
+    if backend is not None and not isinstance(backend, str):
+        return backend
+    name = (backend or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND).lower()
+    if name == 'auto':
+        name = 'lxml' if lxml_etree is not None else 'etree'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}'; expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+def element_to_string(element) -> str:
+    """Serialize an element from either backend"""
+    if lxml_etree is not None and isinstance(element, lxml_etree._Element):
+        return lxml_etree.tostring(element, encoding='unicode')
+    return ET.tostring(element, encoding='unicode')
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Lazy Handler Registry
+
+Handlers are declared as ``HandlerSpec`` entries - class name, module path
+and the same detection signature the class declares
+(``DETECTION_ROOT_ELEMENTS`` / ``DETECTION_NAMESPACES``) - so the dispatch
+index can be built without importing any handler module. A handler is
+imported and instantiated the first time dispatch offers it as a candidate
+(or something asks for it by name), and reused after that.
+
+Open detectors (handlers that declare no signature) are candidates for
+every document, so they are loaded by the first detection; handlers with a
+signature are only loaded for documents that match it.
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class HandlerSpec:
+    """Declaration of a handler class that is imported on first use"""
+    name: str  # Handler class name
+    module: str  # Module defining the class, e.g. 'handlers.scap_handler'
+    category: str = ''
+    root_elements: Tuple[str, ...] = ()
+    namespaces: Tuple[str, ...] = ()
+
+    # Read by core.dispatch.HandlerDispatchIndex, as on handler classes
+    @property
+    def DETECTION_ROOT_ELEMENTS(self) -> List[str]:
+        return list(self.root_elements)
+
+    @property
+    def DETECTION_NAMESPACES(self) -> List[str]:
+        return list(self.namespaces)
+
+    def load(self) -> type:
+        """Import the module and return the handler class"""
+        return getattr(importlib.import_module(self.module), self.name)
+
+
+class HandlerVersions(MutableMapping):
+    """
+    ``HANDLER_VERSION`` by handler name, importing only the handlers asked
+    about. Assigned values override the class attribute.
+    """
+
+    def __init__(self, registry: 'HandlerRegistry'):
+        self._registry = registry
+        self._overrides: Dict[str, str] = {}
+
+    def __getitem__(self, name: str) -> str:
+        if name in self._overrides:
+            return self._overrides[name]
+        spec = self._registry.spec(name)
+        if spec is None:
+            raise KeyError(name)
+        return self._registry.handler(spec).HANDLER_VERSION
+
+    def __setitem__(self, name: str, version: str) -> None:
+        self._overrides[name] = version
+
+    def __delitem__(self, name: str) -> None:
+        del self._overrides[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return (spec.name for spec in self._registry.specs)
+
+    def __len__(self) -> int:
+        return len(self._registry.specs)
+
+
+class HandlerRegistry:
+    """Handler instances created on demand from their specs"""
+
+    def __init__(self, specs: Sequence[HandlerSpec]):
+        self.specs: List[HandlerSpec] = list(specs)
+        self._by_name: Dict[str, HandlerSpec] = {spec.name: spec for spec in self.specs}
+        self._instances: Dict[str, Any] = {}
+
+    def spec(self, name: str) -> Optional[HandlerSpec]:
+        return self._by_name.get(name)
+
+    def handler(self, spec: HandlerSpec) -> Any:
+        """The shared instance of a handler, importing it on first use"""
+        instance = self._instances.get(spec.name)
+        if instance is None:
+            instance = self._instances[spec.name] = spec.load()()
+        return instance
+
+    def fallback(self) -> Any:
+        """The last registered handler, used when no other accepts a document"""
+        return self.handler(self.specs[-1])
+
+    def loaded(self) -> List[str]:
+        """Names of the handlers instantiated so far, in registry order"""
+        return [spec.name for spec in self.specs if spec.name in self._instances]
+
+    def handlers(self) -> List[Any]:
+        """Every handler instance, in registry order (imports them all)"""
+        return [self.handler(spec) for spec in self.specs]
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Source Positions of Parsed Elements
+
+ElementTree does not record where an element came from, so chunks had no
+line numbers and their content could only be produced by re-serializing
+elements. ``SourceMap`` parses a file with expat into the same ElementTree
+elements (through ``ET.TreeBuilder``) and records, for every element, the
+byte span of its markup - start tag to end tag, tail excluded - and its
+first and last line, from expat's ``CurrentByteIndex`` and
+``CurrentLineNumber``.
+
+The file is memory-mapped, so ``text(element)`` returns an element exactly
+as written (original formatting, comments, CDATA sections and entity
+references included) by decoding a slice of the map, without serializing
+it. Unlike ``ET.tostring`` the slice has no tail and does not redeclare
+namespaces inherited from ancestors.
+
+Offsets need an ASCII-compatible encoding (UTF-8, ISO-8859-1, ...). UTF-16
+and UTF-32 files are parsed with ElementTree and have no positions
+(``has_positions`` is False).
+
+A run of the root's children can be parsed on its own: ``root_children()``
+scans the file for their spans without building a tree, and parsing a
+``Fragment`` feeds expat the prolog and root start tag, then only the
+fragment's bytes, so elements get the same positions as in a full parse.
+This is how the document is divided between processes (see
+core.parallel_chunking).
+"""
+
+import codecs
+import mmap
+import re
+import xml.etree.ElementTree as ET
+import xml.parsers.expat as expat
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Bytes fed to expat between events of iterparse()
+BLOCK_SIZE = 64 * 1024
+
+# A start tag from its '<' to its '>', skipping quoted attribute values
+_START_TAG = re.compile(rb'<(?:[^>"\']|"[^"]*"|\'[^\']*\')*>')
+
+# Leading bytes of files that are not in an ASCII-compatible encoding
+_WIDE_PREFIXES = (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE,
+                  b'\x00\x00\x00<', b'<\x00\x00\x00', b'\x00<', b'<\x00')
+
+# The name in a start tag
+_TAG_NAME = re.compile(rb'<([^\s/>]+)')
+
+
+class Fragment(NamedTuple):
+    """Consecutive children of the root, as a byte range of the file"""
+    root_start: int  # Byte at which the root start tag begins
+    start: int  # Start of the first child's markup
+    end: int  # Start of the next child, or of the root end tag, so the last child keeps its tail
+    line: int  # Line of ``start``
+
+
+class ChildSpan(NamedTuple):
+    """Where a child of the root is in the file"""
+    tag: str
+    start: int
+    end: int
+    line: int
+
+
+class SourceMap:
+    """
+    One parsed file with the source span of every element. Parse it with
+    ``parse()`` or ``iterparse()``, then query positions and slices until
+    ``close()`` (also a context manager).
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.root: Optional[ET.Element] = None
+        self.root_tag: Optional[str] = None  # Set by root_children()
+        self.root_start: Optional[int] = None
+        self.root_end: Optional[int] = None
+        self.encoding = 'utf-8'
+        self.has_positions = True
+        # element -> (start byte, end byte, first line, last line)
+        self._positions: Dict[ET.Element, Tuple[int, int, int, int]] = {}
+        self._file = open(file_path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._data = b''  # Empty file: nothing to map, expat reports the error
+        if self._data[:4].startswith(_WIDE_PREFIXES):
+            self.has_positions = False
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+        self._positions.clear()
+
+    def __enter__(self) -> 'SourceMap':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def parse(self, fragment: Optional[Fragment] = None) -> ET.Element:
+        """Parse the whole file, or only a fragment of it, and return its root"""
+        for _ in self.iterparse(events=(), fragment=fragment):
+            pass
+        return self.root
+
+    def iterparse(self, events: Tuple[str, ...] = ('start', 'end'),
+                  fragment: Optional[Fragment] = None) -> Iterator[Tuple[str, ET.Element]]:
+        """
+        Parse the file, yielding (event, element) pairs like ``ET.iterparse``
+        for 'start' and 'end' events. As with iterparse, the tree is read
+        ahead, so later elements may already be attached when an event is
+        seen. Elements keep their positions until ``forget()``.
+
+        With a ``fragment`` only the root and the children in it are
+        parsed; the root has no position then.
+        """
+        if fragment is not None and not self.has_positions:
+            raise ValueError(f"{self.file_path} has no byte positions to parse a fragment by")
+        if not self.has_positions:
+            parser = ET.iterparse(self._file, events=events or ('end',))
+            for event in parser:
+                if events:
+                    yield event
+            self.root = parser.root
+            return
+
+        data = self._data
+        builder = ET.TreeBuilder()
+        parser = expat.ParserCreate(namespace_separator='}')
+        parser.buffer_text = True
+        positions = self._positions
+        pending = []  # Events since the last block
+        open_elements = []  # (start byte, first line) of each open element
+        names: Dict[str, str] = {}
+        last_started = [None]
+        want_start, want_end = 'start' in events, 'end' in events
+
+        # Bytes fed to expat: the file, or for a fragment its prolog and
+        # root start tag, the fragment, and an end tag for the root. Fed
+        # offsets from shift_at on are shifted back to file offsets.
+        shift_at, shift, line_shift = len(data) + 1, 0, 0
+        blocks = (data[offset:offset + BLOCK_SIZE] for offset in range(0, len(data), BLOCK_SIZE))
+        if fragment is not None:
+            shift_at = self._start_tag_end(fragment.root_start)
+            shift = fragment.start - shift_at
+            line_shift = fragment.line - 1 - data[:shift_at].count(b'\n')
+            end_tag = b'</' + _TAG_NAME.match(data, fragment.root_start).group(1) + b'>'
+            blocks = [data[:shift_at]] + [data[offset:min(offset + BLOCK_SIZE, fragment.end)]
+                                           for offset in range(fragment.start, fragment.end, BLOCK_SIZE)] + [end_tag]
+
+        def fixname(name):
+            fixed = names.get(name)
+            if fixed is None:
+                fixed = names[name] = '{' + name if '}' in name else name
+            return fixed
+
+        def start(tag, attrib):
+            if attrib:
+                attrib = {fixname(key): value for key, value in attrib.items()}
+            element = builder.start(fixname(tag), attrib)
+            index = parser.CurrentByteIndex
+            if index < shift_at:
+                open_elements.append((index, parser.CurrentLineNumber))
+            else:
+                open_elements.append((index + shift, parser.CurrentLineNumber + line_shift))
+            last_started[0] = element
+            if want_start:
+                pending.append(('start', element))
+
+        def end(tag):
+            element = builder.end(fixname(tag))
+            start_byte, first_line = open_elements.pop()
+            index = parser.CurrentByteIndex
+            if fragment is None or open_elements:  # The root of a fragment has no position
+                end_byte = self._end_byte(start_byte, index + shift, last_started[0] is element)
+                positions[element] = (start_byte, end_byte, first_line,
+                                      self._last_line(parser.CurrentLineNumber + line_shift, index + shift, end_byte))
+            if want_end:
+                pending.append(('end', element))
+
+        def declaration(version, encoding, standalone):
+            if encoding:
+                try:
+                    self.encoding = codecs.lookup(encoding).name
+                except LookupError:
+                    pass
+
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = builder.data
+        parser.XmlDeclHandler = declaration
+
+        try:
+            for block in blocks:
+                parser.Parse(block, False)
+                if pending:
+                    yield from pending
+                    pending.clear()
+            parser.Parse(b'', True)
+        except expat.ExpatError as e:
+            error = ET.ParseError(str(e))
+            error.code, error.position = e.code, (e.lineno, e.offset)
+            raise error from None
+        yield from pending
+        self.root = builder.close()
+
+    def root_children(self) -> List[ChildSpan]:
+        """
+        Spans of the root's children, found by a scan with expat that builds
+        no elements. ``root_tag``, ``root_start`` and ``root_end``, the bytes
+        at which the root start and end tags begin, are set.
+        """
+        if not self.has_positions:
+            raise ValueError(f"{self.file_path} has no byte positions to scan")
+        data = self._data
+        parser = expat.ParserCreate(namespace_separator='}')
+        children: List[ChildSpan] = []
+        depth = 0
+        child = [None, 0, 0, True]  # Tag, start byte and line of the open child, and whether it is childless
+
+        def start(tag, attrib):
+            nonlocal depth
+            depth += 1
+            if depth == 1:
+                self.root_tag = '{' + tag if '}' in tag else tag
+                self.root_start = parser.CurrentByteIndex
+            elif depth == 2:
+                child[:] = ['{' + tag if '}' in tag else tag, parser.CurrentByteIndex,
+                            parser.CurrentLineNumber, True]
+            else:
+                child[3] = False
+
+        def end(tag):
+            nonlocal depth
+            if depth == 2:
+                index = parser.CurrentByteIndex
+                end_byte = self._end_byte(child[1], index, child[3])
+                children.append(ChildSpan(child[0], child[1], end_byte, child[2]))
+            elif depth == 1:
+                self.root_end = parser.CurrentByteIndex
+            depth -= 1
+
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        try:
+            for offset in range(0, len(data), BLOCK_SIZE):
+                parser.Parse(data[offset:offset + BLOCK_SIZE], False)
+            parser.Parse(b'', True)
+        except expat.ExpatError as e:
+            error = ET.ParseError(str(e))
+            error.code, error.position = e.code, (e.lineno, e.offset)
+            raise error from None
+        return children
+
+    def __contains__(self, element: ET.Element) -> bool:
+        return element in self._positions
+
+    def span(self, element: ET.Element) -> Tuple[int, int]:
+        """Start and end byte of the element's markup in the file"""
+        start, end, _, _ = self._positions[element]
+        return start, end
+
+    def lines(self, element: ET.Element) -> Tuple[int, int]:
+        """First and last line (1-based) of the element's markup"""
+        _, _, first, last = self._positions[element]
+        return first, last
+
+    def start_tag(self, element: ET.Element) -> str:
+        """The element's start tag as written"""
+        start = self._positions[element][0]
+        return self.slice(start, self._start_tag_end(start))
+
+    def end_tag(self, element: ET.Element) -> str:
+        """The element's end tag as written, or '' for an empty-element tag"""
+        start, end, _, _ = self._positions[element]
+        if self._start_tag_end(start) == end:
+            return ''
+        return self.slice(self._data.rfind(b'</', start, end), end)
+
+    def inner_span(self, element: ET.Element) -> Tuple[int, int]:
+        """Bytes between the element's start and end tags: its text and children"""
+        start, end, _, _ = self._positions[element]
+        inner_start = self._start_tag_end(start)
+        if inner_start == end:
+            return end, end
+        return inner_start, self._data.rfind(b'</', start, end)
+
+    def inner_lines(self, element: ET.Element) -> Tuple[int, int]:
+        """Lines on which the element's start tag ends and its end tag starts"""
+        start, end, first, last = self._positions[element]
+        inner_start, inner_end = self.inner_span(element)
+        return (first + self._data[start:inner_start].count(b'\n'),
+                last - self._data[inner_end:end].count(b'\n'))
+
+    def text(self, element: ET.Element) -> str:
+        """The element's markup as written in the file"""
+        start, end, _, _ = self._positions[element]
+        return self.slice(start, end)
+
+    def slice(self, start: int, end: int) -> str:
+        return self._data[start:end].decode(self.encoding)
+
+    def forget(self, element: ET.Element) -> None:
+        """Drop the positions of an element's subtree (when streaming)"""
+        positions = self._positions
+        for descendant in element.iter():
+            positions.pop(descendant, None)
+
+    def _end_byte(self, start: int, index: int, childless: bool) -> int:
+        """End of the markup of an element that starts at start and whose end expat reported at index"""
+        # An empty-element tag ends its element as soon as it starts, and
+        # expat reports the end just after it. Otherwise the end tag
+        # starts at index and runs to the next '>'.
+        data = self._data
+        if (childless and data[index - 2:index] == b'/>'
+                and (data[index:index + 2] != b'</' or self._start_tag_end(start) == index)):
+            return index
+        return data.find(b'>', index) + 1
+
+    def _last_line(self, line: int, index: int, end: int) -> int:
+        """Line of the end byte, from the line of index"""
+        if self._data.find(b'\n', index, end) != -1:
+            line += self._data[index:end].count(b'\n')
+        return line
+
+    def _start_tag_end(self, start: int) -> int:
+        return _START_TAG.match(self._data, start).end()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Streaming Record Iteration
+
+``XMLHandler.analyze`` needs the whole tree in memory, which rules out
+multi-gigabyte SCAP results, sitemaps or test reports on small workers.
+Record-oriented documents can instead be analyzed one record at a time:
+``RecordStream`` runs ``iterparse`` over the file and yields each *record*
+element (a ``<url>``, a ``<trkpt>``, a ``<testcase>``...) once its subtree is
+complete, then frees it. Memory use is bounded by the largest record rather
+than the document.
+
+Streaming handlers set ``SUPPORTS_STREAMING`` and implement
+``analyze_stream(file_path)``; the analyzer uses it for files above its
+streaming threshold (see XMLDocumentAnalyzer).
+"""
+
+import xml.etree.ElementTree as ET
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.document_index import split_tag
+from core.sniffer import add_namespace
+
+# Default cap on per-record samples (details, failures...) kept by
+# streaming handlers, so output size does not grow with the document
+STREAM_SAMPLE_LIMIT = 1000
+
+
+class RecordStream:
+    """
+    Iterate over the record elements of a document without building the tree.
+
+    An element is a record when its local name is in ``record_names`` and/or
+    it sits at ``record_depth`` (the root is depth 0), and it is not inside
+    another record - matches within a record are part of that record. Each
+    record is yielded on its end event with its complete subtree (its depth
+    in ``depth``), and cleared and detached from its parent once the
+    consumer moves on. Elements outside any record are released when they
+    end, so only the root and the current record path stay in memory.
+
+    ``on_start(elem, depth)`` is called for every element on its start
+    event, when its tag and attributes (but not its children or text) are
+    available - enough for container elements such as ``<testsuite>``.
+
+    Document-wide statistics are updated as the stream is consumed and are
+    complete once iteration finishes.
+    """
+
+    def __init__(self, file_path: str, record_names: Optional[Iterable[str]] = None,
+                 record_depth: Optional[int] = None,
+                 on_start: Optional[Callable[[ET.Element, int], None]] = None):
+        if record_names is None and record_depth is None:
+            raise ValueError("RecordStream needs record_names and/or record_depth")
+        self.file_path = file_path
+        self.record_names = frozenset(record_names) if record_names is not None else None
+        self.record_depth = record_depth
+        self.on_start = on_start
+
+        self.root: Optional[ET.Element] = None
+        self.namespaces: Dict[str, str] = {}
+        self.element_counts: Counter = Counter()  # By local name
+        self.total_elements = 0
+        self.max_depth = 0
+        self.records = 0
+        self.depth = 0  # Depth of the record last yielded
+
+    def _is_record(self, local_name: str, depth: int) -> bool:
+        if self.record_names is not None and local_name not in self.record_names:
+            return False
+        return self.record_depth is None or depth == self.record_depth
+
+    def __iter__(self) -> Iterator[ET.Element]:
+        # (element, is_record) for every open element, root first
+        stack: List[Tuple[ET.Element, bool]] = []
+        in_record = False
+
+        for event, item in ET.iterparse(self.file_path, events=('start', 'end', 'start-ns')):
+            if event == 'start-ns':
+                prefix, uri = item
+                add_namespace(self.namespaces, prefix or 'default', uri)
+                continue
+
+            if event == 'start':
+                depth = len(stack)
+                if self.root is None:
+                    self.root = item
+                local_name = split_tag(item.tag)[1]
+                self.element_counts[local_name] += 1
+                self.total_elements += 1
+                if depth > self.max_depth:
+                    self.max_depth = depth
+                is_record = not in_record and self._is_record(local_name, depth)
+                if is_record:
+                    in_record = True
+                stack.append((item, is_record))
+                if self.on_start is not None:
+                    self.on_start(item, depth)
+                continue
+
+            _, is_record = stack.pop()
+            if is_record:
+                in_record = False
+                self.records += 1
+                self.depth = len(stack)
+                yield item
+            elif in_record:
+                # Part of an enclosing record; kept until that record ends
+                continue
+            if stack:
+                item.clear()
+                stack[-1][0].remove(item)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pluggable Token Counters for Chunk Sizing
+
+Chunking strategies size chunks through a token counter, so the estimate
+can be swapped without touching the strategies:
+
+- ``WordTokenCounter`` - ``words * 1.3``, the original estimate. It
+  undercounts markup: a tag with a few attributes is one or two "words"
+  but a dozen tokens.
+- ``HeuristicTokenCounter`` - the default. The larger of the word estimate
+  and one token per 4 UTF-8 bytes, so prose is sized about as before and
+  tag-heavy XML no longer overflows the model context.
+- ``TiktokenCounter`` - exact counts with a tiktoken encoding, available
+  when the ``tiktoken`` package is installed. It is imported on first use.
+
+Word and byte counts of every element are already known from the
+``SubtreeSizes`` pass, so counters that can estimate from them
+(``sized = True``) size elements without serializing them. Counts of text
+are memoized: the chunkers count the same strings again (per element, per
+accumulated chunk, for overlap), and strings cache their hash, so a repeat
+costs a dictionary lookup.
+
+The counter is chosen with ``get_tokenizer()``: a counter instance, a name
+('heuristic', 'words', 'tiktoken' or 'auto'), or None for
+DEFAULT_TOKENIZER. ``auto`` selects tiktoken when it is importable.
+"""
+
+import importlib.util
+from functools import lru_cache
+from typing import Dict, Union
+
+DEFAULT_TOKENIZER = 'heuristic'
+
+# Bounded so that streaming chunking keeps constant memory
+COUNT_CACHE_SIZE = 256
+
+
+def _utf8_len(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+class TokenCounter:
+    """Base class for token counters"""
+
+    name = ''
+    sized = True  # count_sized() is available
+
+    def __init__(self, cache_size: int = COUNT_CACHE_SIZE):
+        self.cache_size = cache_size
+        # count(text): tokens in a text, memoized per instance
+        self.count = lru_cache(maxsize=cache_size)(self._count)
+
+    def __getstate__(self):
+        # The memoized count is rebuilt, so counters can be sent to worker processes
+        state = self.__dict__.copy()
+        del state['count']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.count = lru_cache(maxsize=self.cache_size)(self._count)
+
+    def count_sized(self, byte_size: int, words: int) -> int:
+        """Tokens in a text of this many UTF-8 bytes and whitespace-separated words"""
+        raise NotImplementedError
+
+    def _count(self, text: str) -> int:
+        return self.count_sized(_utf8_len(text), len(text.split()))
+
+
+class WordTokenCounter(TokenCounter):
+    """Rough estimation of tokens (words * 1.3)"""
+
+    name = 'words'
+
+    def count_sized(self, byte_size: int, words: int) -> int:
+        return int(words * 1.3)
+
+
+class HeuristicTokenCounter(TokenCounter):
+    """Words * 1.3 or bytes / 4, whichever is larger"""
+
+    name = 'heuristic'
+
+    def __init__(self, cache_size: int = COUNT_CACHE_SIZE, bytes_per_token: float = 4.0):
+        super().__init__(cache_size)
+        self.bytes_per_token = bytes_per_token
+
+    def count_sized(self, byte_size: int, words: int) -> int:
+        return int(max(words * 1.3, byte_size / self.bytes_per_token))
+
+
+class TiktokenCounter(TokenCounter):
+    """Exact token counts from a tiktoken encoding, when tiktoken is installed"""
+
+    name = 'tiktoken'
+    sized = False
+
+    def __init__(self, cache_size: int = COUNT_CACHE_SIZE, encoding: str = 'cl100k_base'):
+        if importlib.util.find_spec('tiktoken') is None:
+            raise ImportError("The tiktoken tokenizer requires the 'tiktoken' package")
+        import tiktoken
+        super().__init__(cache_size)
+        self.encoding = tiktoken.get_encoding(encoding)
+
+    def count_sized(self, byte_size: int, words: int) -> int:
+        raise NotImplementedError("tiktoken counts text; check TokenCounter.sized")
+
+    def _count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+TOKENIZERS = {
+    'heuristic': HeuristicTokenCounter,
+    'words': WordTokenCounter,
+    'tiktoken': TiktokenCounter,
+}
+
+# Named counters are shared, so their memoized counts are too
+_shared: Dict[str, TokenCounter] = {}
+
+
+def available_tokenizers():
+    """Names of the token counters that can be used in this environment"""
+    return [name for name in TOKENIZERS
+            if name != 'tiktoken' or importlib.util.find_spec('tiktoken') is not None]
+
+
+def get_tokenizer(tokenizer: Union[str, TokenCounter, None] = None) -> TokenCounter:
+    """
+    Return a token counter.
+
+    Accepts a counter instance (returned unchanged), a name ('heuristic',
+    'words', 'tiktoken' or 'auto'), or None for DEFAULT_TOKENIZER.
+    """
+    if tokenizer is not None and not isinstance(tokenizer, str):
+        return tokenizer
+    counter = _shared.get(tokenizer)
+    if counter is not None:
+        return counter
+    name = (tokenizer or DEFAULT_TOKENIZER).lower()
+    if name == 'auto':
+        name = 'tiktoken' if 'tiktoken' in available_tokenizers() else 'heuristic'
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer '{name}'; expected one of {sorted(TOKENIZERS)}")
+    counter = _shared[tokenizer] = _shared.get(name) or TOKENIZERS[name]()
+    _shared[name] = counter
+    return counter
@@ -4,133 +4,142 @@ XML Handlers Registry
 Centralized registry for all XML document handlers.
 This module provides a single import point for all handlers and maintains
 the handler registry used by the main analyzer.
-"""
-
-# Core handlers (moved from main files) - only import what exists
-from .scap_handler import SCAPHandler
-from .rss_handler import RSSHandler
-from .maven_pom_handler import MavenPOMHandler
-from .spring_config_handler import SpringConfigHandler
-from .generic_xml_handler import GenericXMLHandler
-
-# New handlers
-from .ant_build_handler import AntBuildHandler
-from .soap_envelope_handler import SOAPEnvelopeHandler
-from .saml_handler import SAMLHandler
-from .hibernate_handler import HibernateHandler
-from .ivy_handler import IvyHandler
 
-# Migrated handlers
-from .log4j_config_handler import Log4jConfigHandler
-from .svg_handler import SVGHandler
-from .docbook_handler import DocBookHandler
-from .sitemap_handler import SitemapHandler
-from .kml_handler import KMLHandler
-from .gpx_handler import GPXHandler
-from .xhtml_handler import XHTMLHandler
-from .wadl_handler import WADLHandler
-from .struts_config_handler import StrutsConfigHandler
-from .graphml_handler import GraphMLHandler
-from .xliff_handler import XLIFFHandler
-
-# IT Service Management
-from .servicenow_handler import ServiceNowHandler
+Handlers are declared by module path and detection signature
+(``HANDLER_SPECS``) and only imported when first used - by dispatch (see
+core.registry) or by importing a handler class from this package.
+``ALL_HANDLERS`` and ``HANDLER_CATEGORIES`` import every handler.
+"""
 
-# Existing handlers (already in individual files)
-from .bpmn_handler import BPMNHandler
-from .enterprise_config_handler import EnterpriseConfigHandler
-from .openapi_xml_handler import OpenAPIXMLHandler
-from .properties_xml_handler import PropertiesXMLHandler
-from .test_report_handler import TestReportHandler
-from .wsdl_handler import WSDLHandler
-from .xsd_handler import XSDSchemaHandler
+from core.registry import HandlerSpec
 
-# Registry of all available handlers (order matters - most specific first)
-ALL_HANDLERS = [
+# Registry of all available handlers (order matters - most specific first).
+# Detection signatures mirror each class's DETECTION_ROOT_ELEMENTS and
+# DETECTION_NAMESPACES; handlers without one are probed for every document.
+HANDLER_SPECS = [
     # Security and compliance
-    SCAPHandler,
-    SAMLHandler,
+    HandlerSpec('SCAPHandler', 'handlers.scap_handler', 'security',
+                root_elements=('Benchmark', 'TestResult', 'Profile', 'asset-report-collection',
+                               'oval_definitions'),
+                namespaces=('scap.nist.gov/schema/', 'checklists.nist.gov/xccdf/',
+                            'oval.mitre.org/XMLSchema/', 'asset-report-collection',
+                            'data-stream-collection', 'xccdf', 'oval')),
+    HandlerSpec('SAMLHandler', 'handlers.saml_handler', 'security',
+                root_elements=('Assertion', 'Response', 'AuthnRequest', 'LogoutRequest',
+                               'LogoutResponse')),
     
     # Build tools and frameworks
-    MavenPOMHandler,
-    SpringConfigHandler,
-    AntBuildHandler,
-    IvyHandler,
-    Log4jConfigHandler,
-    StrutsConfigHandler,
+    HandlerSpec('MavenPOMHandler', 'handlers.maven_pom_handler', 'build_tools',
+                root_elements=('project',)),
+    HandlerSpec('SpringConfigHandler', 'handlers.spring_config_handler', 'frameworks',
+                root_elements=('beans',),
+                namespaces=('springframework.org/schema/beans', 'springframework.org/schema/context',
+                            'springframework.org/schema/mvc')),
+    HandlerSpec('AntBuildHandler', 'handlers.ant_build_handler', 'build_tools',
+                root_elements=('project',)),
+    HandlerSpec('IvyHandler', 'handlers.ivy_handler', 'build_tools'),
+    HandlerSpec('Log4jConfigHandler', 'handlers.log4j_config_handler', 'frameworks',
+                root_elements=('configuration', 'log4j:configuration')),
+    HandlerSpec('StrutsConfigHandler', 'handlers.struts_config_handler', 'frameworks'),
     
     # Enterprise configuration
-    EnterpriseConfigHandler,
-    PropertiesXMLHandler,
-    HibernateHandler,
+    HandlerSpec('EnterpriseConfigHandler', 'handlers.enterprise_config_handler', 'enterprise_config'),
+    HandlerSpec('PropertiesXMLHandler', 'handlers.properties_xml_handler', 'enterprise_config',
+                root_elements=('properties',)),
+    HandlerSpec('HibernateHandler', 'handlers.hibernate_handler', 'enterprise_config'),
     
     # IT Service Management
-    ServiceNowHandler,
+    HandlerSpec('ServiceNowHandler', 'handlers.servicenow_handler', 'it_service_management'),
     
     # Business process and workflow
-    BPMNHandler,
+    HandlerSpec('BPMNHandler', 'handlers.bpmn_handler', 'business_process',
+                root_elements=('definitions',), namespaces=('bpmn',)),
     
     # Web services and APIs
-    WSDLHandler,
-    OpenAPIXMLHandler,
-    SOAPEnvelopeHandler,
-    WADLHandler,
+    HandlerSpec('WSDLHandler', 'handlers.wsdl_handler', 'web_services'),
+    HandlerSpec('OpenAPIXMLHandler', 'handlers.openapi_xml_handler', 'web_services'),
+    HandlerSpec('SOAPEnvelopeHandler', 'handlers.soap_envelope_handler', 'web_services',
+                root_elements=('Envelope',)),
+    HandlerSpec('WADLHandler', 'handlers.wadl_handler', 'web_services',
+                root_elements=('application',),
+                namespaces=('wadl.dev.java.net', 'research.sun.com/wadl', 'java.net/wadl')),
     
     # Content and documentation
-    RSSHandler,
-    DocBookHandler,
-    SitemapHandler,
+    HandlerSpec('RSSHandler', 'handlers.rss_handler', 'content',
+                root_elements=('rss', 'feed')),
+    HandlerSpec('DocBookHandler', 'handlers.docbook_handler', 'content',
+                root_elements=('book', 'article', 'chapter', 'section', 'para'),
+                namespaces=('docbook.org',)),
+    HandlerSpec('SitemapHandler', 'handlers.sitemap_handler', 'content',
+                root_elements=('urlset', 'sitemapindex'),
+                namespaces=('sitemaps.org/schemas/sitemap',)),
     
     # Web content
-    XHTMLHandler,
+    HandlerSpec('XHTMLHandler', 'handlers.xhtml_handler', 'web_content',
+                root_elements=('html',), namespaces=('w3.org/1999/xhtml',)),
     
     # Geographic and mapping
-    KMLHandler,
-    GPXHandler,
+    HandlerSpec('KMLHandler', 'handlers.kml_handler', 'geographic',
+                root_elements=('kml',), namespaces=('opengis.net/kml', 'earth.google.com/kml')),
+    HandlerSpec('GPXHandler', 'handlers.gpx_handler', 'geographic',
+                root_elements=('gpx',), namespaces=('topografix.com/GPX',)),
     
     # Graphics and media
-    SVGHandler,
+    HandlerSpec('SVGHandler', 'handlers.svg_handler', 'graphics',
+                root_elements=('svg',), namespaces=('http://www.w3.org/2000/svg',)),
     
     # Network and graph data
-    GraphMLHandler,
+    HandlerSpec('GraphMLHandler', 'handlers.graphml_handler', 'network_data'),
     
     # Translation/localization
-    XLIFFHandler,
+    HandlerSpec('XLIFFHandler', 'handlers.xliff_handler', 'localization'),
     
     # Testing
-    TestReportHandler,
+    HandlerSpec('TestReportHandler', 'handlers.test_report_handler', 'testing'),
     
     # Schemas and definitions
-    XSDSchemaHandler,
+    HandlerSpec('XSDSchemaHandler', 'handlers.xsd_handler', 'schemas'),
     
     # Fallback (always last)
-    GenericXMLHandler,
+    HandlerSpec('GenericXMLHandler', 'handlers.generic_xml_handler', 'fallback'),
+]
+
+# Category order of HANDLER_CATEGORIES
+CATEGORIES = [
+    'security', 'build_tools', 'frameworks', 'web_services', 'business_process',
+    'enterprise_config', 'it_service_management', 'content', 'web_content',
+    'geographic', 'graphics', 'network_data', 'localization', 'schemas',
+    'testing', 'fallback'
 ]
 
-# Categorized handlers for easier management
-HANDLER_CATEGORIES = {
-    'security': [SCAPHandler, SAMLHandler],
-    'build_tools': [MavenPOMHandler, AntBuildHandler, IvyHandler],
-    'frameworks': [SpringConfigHandler, Log4jConfigHandler, StrutsConfigHandler],
-    'web_services': [WSDLHandler, OpenAPIXMLHandler, SOAPEnvelopeHandler, WADLHandler],
-    'business_process': [BPMNHandler],
-    'enterprise_config': [EnterpriseConfigHandler, PropertiesXMLHandler, HibernateHandler],
-    'it_service_management': [ServiceNowHandler],
-    'content': [RSSHandler, DocBookHandler, SitemapHandler],
-    'web_content': [XHTMLHandler],
-    'geographic': [KMLHandler, GPXHandler],
-    'graphics': [SVGHandler],
-    'network_data': [GraphMLHandler],
-    'localization': [XLIFFHandler],
-    'schemas': [XSDSchemaHandler],
-    'testing': [TestReportHandler],
-    'fallback': [GenericXMLHandler]
-}
+_SPECS_BY_NAME = {spec.name: spec for spec in HANDLER_SPECS}
+
+
+def __getattr__(name):
+    # PEP 562: handler classes and the class lists are imported on first access
+    if name in _SPECS_BY_NAME:
+        handler_class = _SPECS_BY_NAME[name].load()
+        globals()[name] = handler_class
+        return handler_class
+    if name == 'ALL_HANDLERS':
+        return [__getattr__(spec.name) for spec in HANDLER_SPECS]
+    if name == 'HANDLER_CATEGORIES':
+        # Categorized handlers for easier management
+        return {category: [__getattr__(spec.name) for spec in HANDLER_SPECS
+                           if spec.category == category]
+                for category in CATEGORIES}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 # Export handler classes for backward compatibility
 __all__ = [
     'ALL_HANDLERS',
     'HANDLER_CATEGORIES',
+    'HANDLER_SPECS',
     'SCAPHandler',
     'RSSHandler',
     'MavenPOMHandler',
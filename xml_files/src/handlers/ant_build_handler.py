@@ -15,12 +15,14 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class AntBuildHandler(XMLHandler):
     """Handler for Apache Ant build.xml files"""
     
+    DETECTION_ROOT_ELEMENTS = ['project']
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check for Ant project root element
         if root.tag == 'project' or root.tag.endswith('}project'):
@@ -131,8 +133,8 @@ class AntBuildHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_build_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_build_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -18,12 +18,15 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class BPMNHandler(XMLHandler):
     """Handler for BPMN 2.0 process definition files"""
     
+    DETECTION_ROOT_ELEMENTS = ['definitions']
+    DETECTION_NAMESPACES = ['bpmn']
+    
     def _find_elements_by_local_name(self, root: ET.Element, local_name: str) -> List[ET.Element]:
         """Find elements by local name, ignoring namespace prefixes"""
         elements = []
@@ -124,8 +127,8 @@ class BPMNHandler(XMLHandler):
                 'flows': len(findings['flows'])
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_process_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_process_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
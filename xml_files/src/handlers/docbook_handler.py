@@ -14,12 +14,15 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class DocBookHandler(XMLHandler):
     """Handler for DocBook XML documentation files"""
     
+    DETECTION_ROOT_ELEMENTS = ['book', 'article', 'chapter', 'section', 'para']
+    DETECTION_NAMESPACES = ['docbook.org']
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check for DocBook elements
         docbook_roots = ['book', 'article', 'chapter', 'section', 'para']
@@ -116,8 +119,8 @@ class DocBookHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_documentation_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_documentation_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -18,7 +18,7 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class GenericXMLHandler(XMLHandler):
@@ -67,8 +67,8 @@ class GenericXMLHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=self._inventory_data(root),
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._analyze_quality(root)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._analyze_quality, root)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -9,6 +9,7 @@ elevation profiling, and fitness metrics calculation.
 
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Optional, Any, Tuple
+import copy
 import math
 import sys
 import os
@@ -17,7 +18,8 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
+from core.streaming import RecordStream
 
 
 class GPXHandler(XMLHandler):
@@ -25,6 +27,15 @@ class GPXHandler(XMLHandler):
     
     GPX_NAMESPACE_10 = "http://www.topografix.com/GPX/1/0"
     GPX_NAMESPACE_11 = "http://www.topografix.com/GPX/1/1"
+    DETECTION_ROOT_ELEMENTS = ['gpx']
+    DETECTION_NAMESPACES = ['topografix.com/GPX']
+    SUPPORTS_STREAMING = True
+    
+    # trk children captured while streaming, with their key in the track summary
+    STREAM_TRACK_FIELDS = {'name': 'name', 'desc': 'description', 'cmt': 'comment',
+                           'src': 'source', 'number': 'number', 'type': 'type'}
+    # The streamed elevation profile keeps between this and twice this many points
+    STREAM_PROFILE_POINTS = 500
     
     def _get_namespace(self, root: ET.Element) -> str:
         """Extract namespace prefix from root element"""
@@ -32,6 +43,19 @@ class GPXHandler(XMLHandler):
             return root.tag.split('}')[0] + '}'
         return ''
     
+    def _track_points(self, root: ET.Element) -> List[ET.Element]:
+        """All trk/trkseg/trkpt points in document order, from the shared index"""
+        ns = self._get_namespace(root)
+        index = self.document_index(root)
+        points = []
+        for trkpt in index.find_all('trkpt', index.root_namespace):
+            trkseg = index.parent(trkpt)
+            trk = index.parent(trkseg)
+            if (trkseg.tag == f'{ns}trkseg' and trk is not None and trk.tag == f'{ns}trk'
+                    and index.parent(trk) is root):
+                points.append(trkpt)
+        return points
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check for GPX namespace
         if any('topografix.com/GPX' in uri for uri in namespaces.values()):
@@ -92,6 +116,325 @@ class GPXHandler(XMLHandler):
             'geographic_bounds': self._calculate_bounds(root)
         }
         
+        return self._build_analysis(findings, Deferred(self.extract_key_data, root))
+    
+    def analyze_stream(self, file_path: str) -> SpecializedAnalysis:
+        """
+        Analyze the GPX file one point at a time.
+        
+        Track, elevation, temporal and bounds statistics accumulate over
+        every point. Metadata and the waypoints and routes analyze() would
+        look at are copied into a small sample tree and analyzed as usual.
+        Time gaps are measured in document order, track summaries omit the
+        per-point lists and the elevation profile is decimated as it grows.
+        """
+        ns = ''
+        sample_root = None
+        waypoint_count = route_count = 0
+        
+        track_count = 0
+        tracks = []      # Summaries of the first 50 tracks
+        track_data = []  # Coordinates of the first 10 tracks, as extract_key_data()
+        current = {'track': None, 'segment': None, 'coordinates': None}
+        
+        def on_start(elem: ET.Element, depth: int):
+            nonlocal track_count
+            local_name = elem.tag.split('}')[-1]
+            if depth == 1:
+                current['track'] = current['segment'] = current['coordinates'] = None
+                if local_name == 'trk':
+                    track = {key: None for key in self.STREAM_TRACK_FIELDS.values()}
+                    track['segments'] = []
+                    current['track'] = track
+                    if track_count < 50:
+                        tracks.append(track)
+                    if track_count < 10:
+                        track_data.append({'name': None, 'segments': []})
+                    track_count += 1
+            elif depth == 2 and local_name == 'trkseg' and current['track'] is not None:
+                segment = {'point_count': 0, 'distance_km': 0.0, 'duration_minutes': 0,
+                           'first_time': None, 'last_time': None, 'last_point': None}
+                current['track']['segments'].append(segment)
+                current['segment'] = segment
+                if track_count <= 10:
+                    current['coordinates'] = []
+                    track_data[-1]['segments'].append(current['coordinates'])
+        
+        stats = {'total_points': 0, 'total_distance_km': 0.0, 'max_speed': None,
+                 'first_time': None, 'last_time': None, 'last_point': None}
+        elevation = {'count': 0, 'min': None, 'max': None, 'sum': 0.0, 'gain': 0.0, 'loss': 0.0,
+                     'last': None, 'distance': 0.0, 'profile': [], 'stride': 1,
+                     'gradients': 0, 'gradient_sum': 0.0, 'gradient_min': None,
+                     'gradient_max': None, 'steep_sections': 0}
+        temporal = {'start': None, 'end': None, 'previous': None, 'gaps': []}
+        bounds = {'north': -90.0, 'south': 90.0, 'east': -180.0, 'west': 180.0}
+        found_points = False
+        
+        def update_bounds(point: ET.Element):
+            nonlocal found_points
+            lat = float(point.get('lat', 0))
+            lon = float(point.get('lon', 0))
+            bounds['north'] = max(bounds['north'], lat)
+            bounds['south'] = min(bounds['south'], lat)
+            bounds['east'] = max(bounds['east'], lon)
+            bounds['west'] = min(bounds['west'], lon)
+            found_points = True
+        
+        records = ['metadata', 'wpt', 'rte', 'trkpt'] + list(self.STREAM_TRACK_FIELDS)
+        stream = RecordStream(file_path, records, on_start=on_start)
+        for record in stream:
+            if sample_root is None:
+                ns = self._get_namespace(stream.root)
+                sample_root = ET.Element(stream.root.tag, dict(stream.root.attrib))
+            local_name = record.tag.split('}')[-1]
+            depth = stream.depth
+            
+            if local_name in self.STREAM_TRACK_FIELDS:
+                if depth == 2 and current['track'] is not None:
+                    key = self.STREAM_TRACK_FIELDS[local_name]
+                    text = record.text.strip() if record.text else None
+                    if key == 'number' and text is not None:
+                        try:
+                            text = int(text)
+                        except ValueError:
+                            text = None
+                    current['track'][key] = text
+                    if key == 'name' and track_count <= 10:
+                        track_data[-1]['name'] = text
+                continue
+            
+            if local_name == 'metadata':
+                if depth == 1 and sample_root.find(f'{ns}metadata') is None:
+                    sample_root.append(copy.deepcopy(record))
+                continue
+            
+            if local_name == 'wpt':
+                update_bounds(record)
+                if depth == 1 and waypoint_count < 200:
+                    sample_root.append(copy.deepcopy(record))
+                    waypoint_count += 1
+                continue
+            
+            if local_name == 'rte':
+                for rtept in record.iter(f'{ns}rtept'):
+                    update_bounds(rtept)
+                if depth == 1 and route_count < 50:
+                    sample_root.append(copy.deepcopy(record))
+                    route_count += 1
+                continue
+            
+            # Track points; only trk/trkseg/trkpt points count towards the statistics
+            update_bounds(record)
+            segment = current['segment']
+            if depth != 3 or segment is None:
+                continue
+            
+            point = {
+                'lat': float(record.get('lat', 0)),
+                'lon': float(record.get('lon', 0)),
+                'elevation': self._get_element_float(record, f'{ns}ele'),
+                'time': self._get_element_text(record, f'{ns}time'),
+                'speed': self._get_element_float(record, f'{ns}speed')
+            }
+            
+            for totals in (stats, segment):
+                if totals['last_point'] is not None:
+                    totals['total_distance_km' if totals is stats else 'distance_km'] += self._haversine_distance(
+                        totals['last_point']['lat'], totals['last_point']['lon'], point['lat'], point['lon'])
+                totals['last_point'] = point
+                if point['time']:
+                    totals['first_time'] = totals['first_time'] or point['time']
+                    totals['last_time'] = point['time']
+            stats['total_points'] += 1
+            segment['point_count'] += 1
+            if point['speed'] is not None:
+                stats['max_speed'] = point['speed'] if stats['max_speed'] is None else max(stats['max_speed'], point['speed'])
+            
+            coordinates = current['coordinates']
+            if coordinates is not None and len(coordinates) < 1000:
+                coordinates.append({key: point[key] for key in ('lat', 'lon', 'elevation', 'time')})
+            
+            if point['elevation'] is not None:
+                self._stream_elevation(elevation, point)
+            
+            if point['time']:
+                try:
+                    timestamp = datetime.fromisoformat(point['time'].replace('Z', '+00:00'))
+                except ValueError:
+                    timestamp = None
+                if timestamp is not None:
+                    self._stream_timestamp(temporal, timestamp)
+        
+        if sample_root is None:
+            sample_root = ET.Element(stream.root.tag, dict(stream.root.attrib))
+        
+        for track in tracks:
+            for segment in track['segments']:
+                segment['duration_minutes'] = self._calculate_duration(
+                    [{'time': segment['first_time']}, {'time': segment['last_time']}]) if segment['first_time'] else 0
+                for key in ('first_time', 'last_time', 'last_point'):
+                    del segment[key]
+            track['total_points'] = sum(seg['point_count'] for seg in track['segments'])
+            track['total_distance_km'] = sum(seg['distance_km'] for seg in track['segments'])
+            track['total_duration_minutes'] = sum(seg['duration_minutes'] for seg in track['segments'])
+        
+        findings = {
+            'metadata': self._analyze_metadata(sample_root),
+            'waypoints': self._analyze_waypoints(sample_root),
+            'routes': self._analyze_routes(sample_root),
+            'tracks': {'count': track_count, 'tracks': tracks},
+            'statistics': self._stream_statistics(stats, elevation),
+            'elevation_profile': self._stream_elevation_profile(elevation),
+            'temporal_analysis': self._stream_temporal(temporal),
+            'geographic_bounds': bounds if found_points else {'north': 0, 'south': 0, 'east': 0, 'west': 0}
+        }
+        
+        structured_data = {
+            'track_data': [
+                {'name': track['name'], 'segments': [seg for seg in track['segments'] if seg]}
+                for track in track_data if any(track['segments'])
+            ],
+            'waypoint_data': self._extract_waypoint_data(sample_root),
+            'route_data': self._extract_route_data(sample_root),
+            'activity_summary': self._activity_summary(findings['metadata'], findings['statistics']),
+            'device_info': self._extract_device_info(sample_root)
+        }
+        
+        return self._build_analysis(findings, structured_data)
+    
+    def _stream_elevation(self, elevation: Dict[str, Any], point: Dict[str, Any]):
+        """Fold one track point with an elevation into the streamed elevation totals"""
+        value = point['elevation']
+        last = elevation['last']
+        if last is not None:
+            diff = value - last['elevation']
+            if diff > 0:
+                elevation['gain'] += diff
+            else:
+                elevation['loss'] += abs(diff)
+            distance_diff = self._haversine_distance(last['lat'], last['lon'], point['lat'], point['lon'])
+            elevation['distance'] += distance_diff
+            if distance_diff > 0:
+                gradient = (diff / (distance_diff * 1000)) * 100  # Percentage
+                elevation['gradients'] += 1
+                elevation['gradient_sum'] += gradient
+                elevation['gradient_min'] = gradient if elevation['gradient_min'] is None else min(elevation['gradient_min'], gradient)
+                elevation['gradient_max'] = gradient if elevation['gradient_max'] is None else max(elevation['gradient_max'], gradient)
+                if abs(gradient) > 10:  # >10% grade
+                    elevation['steep_sections'] += 1
+        
+        elevation['min'] = value if elevation['min'] is None else min(elevation['min'], value)
+        elevation['max'] = value if elevation['max'] is None else max(elevation['max'], value)
+        elevation['sum'] += value
+        elevation['last'] = point
+        
+        # Keep every stride-th point; halve the profile when it doubles
+        if elevation['count'] % elevation['stride'] == 0:
+            elevation['profile'].append({'lat': point['lat'], 'lon': point['lon'],
+                                         'elevation': value, 'distance': elevation['distance']})
+            if len(elevation['profile']) >= 2 * self.STREAM_PROFILE_POINTS:
+                elevation['profile'] = elevation['profile'][::2]
+                elevation['stride'] *= 2
+        elevation['count'] += 1
+    
+    def _stream_timestamp(self, temporal: Dict[str, Any], timestamp: datetime):
+        """Fold one track point timestamp into the streamed temporal totals"""
+        previous = temporal['previous']
+        if previous is not None and len(temporal['gaps']) < 20:
+            gap_seconds = (timestamp - previous).total_seconds()
+            if gap_seconds > 300:  # 5 minutes
+                temporal['gaps'].append({
+                    'start': previous.isoformat(),
+                    'end': timestamp.isoformat(),
+                    'duration_minutes': gap_seconds / 60
+                })
+        temporal['previous'] = timestamp
+        temporal['start'] = timestamp if temporal['start'] is None else min(temporal['start'], timestamp)
+        temporal['end'] = timestamp if temporal['end'] is None else max(temporal['end'], timestamp)
+    
+    def _stream_statistics(self, stats: Dict[str, Any], elevation: Dict[str, Any]) -> Dict[str, Any]:
+        """_calculate_statistics() output from streamed totals"""
+        result = {
+            'total_points': 0,
+            'total_distance_km': 0.0,
+            'total_duration_hours': 0.0,
+            'max_speed_kmh': 0.0,
+            'avg_speed_kmh': 0.0,
+            'elevation_gain_m': 0.0,
+            'elevation_loss_m': 0.0,
+            'max_elevation_m': float('-inf'),
+            'min_elevation_m': float('inf')
+        }
+        if not stats['total_points']:
+            return result
+        
+        result['total_points'] = stats['total_points']
+        result['total_distance_km'] = stats['total_distance_km']
+        if stats['first_time']:
+            result['total_duration_hours'] = self._calculate_duration(
+                [{'time': stats['first_time']}, {'time': stats['last_time']}]) / 60.0
+        if stats['max_speed'] is not None:
+            result['max_speed_kmh'] = stats['max_speed'] * 3.6  # Convert m/s to km/h
+        if result['total_duration_hours'] > 0:
+            result['avg_speed_kmh'] = result['total_distance_km'] / result['total_duration_hours']
+        result['max_elevation_m'] = elevation['max']
+        result['min_elevation_m'] = elevation['min']
+        result['elevation_gain_m'] = elevation['gain']
+        result['elevation_loss_m'] = elevation['loss']
+        return result
+    
+    def _stream_elevation_profile(self, elevation: Dict[str, Any]) -> Dict[str, Any]:
+        """_analyze_elevation() output from streamed totals"""
+        elevation_data = {
+            'has_elevation': False,
+            'profile_points': [],
+            'statistics': {},
+            'gradient_analysis': {}
+        }
+        if not elevation['count']:
+            return elevation_data
+        
+        elevation_data['has_elevation'] = True
+        elevation_data['profile_points'] = elevation['profile']
+        elevation_data['statistics'] = {
+            'min': elevation['min'],
+            'max': elevation['max'],
+            'range': elevation['max'] - elevation['min'],
+            'mean': elevation['sum'] / elevation['count'],
+            'gain': elevation['gain'],
+            'loss': elevation['loss']
+        }
+        if elevation['gradients']:
+            elevation_data['gradient_analysis'] = {
+                'max_gradient': elevation['gradient_max'],
+                'min_gradient': elevation['gradient_min'],
+                'avg_gradient': elevation['gradient_sum'] / elevation['gradients'],
+                'steep_sections': elevation['steep_sections']
+            }
+        return elevation_data
+    
+    def _stream_temporal(self, temporal: Dict[str, Any]) -> Dict[str, Any]:
+        """_analyze_temporal_data() output from streamed totals"""
+        result = {
+            'has_timestamps': False,
+            'start_time': None,
+            'end_time': None,
+            'duration_hours': 0,
+            'time_gaps': [],
+            'activity_periods': []
+        }
+        if temporal['start'] is None:
+            return result
+        
+        result['has_timestamps'] = True
+        result['start_time'] = temporal['start'].isoformat()
+        result['end_time'] = temporal['end'].isoformat()
+        result['duration_hours'] = (temporal['end'] - temporal['start']).total_seconds() / 3600
+        result['time_gaps'] = temporal['gaps']
+        return result
+    
+    def _build_analysis(self, findings: Dict[str, Any], structured_data: Any) -> SpecializedAnalysis:
+        """Assemble the SpecializedAnalysis shared by tree and streaming analysis"""
         recommendations = [
             "Visualize GPS tracks on interactive maps",
             "Calculate fitness metrics and performance statistics",
@@ -128,8 +471,8 @@ class GPXHandler(XMLHandler):
                 'time_span_hours': findings['temporal_analysis'].get('duration_hours', 0)
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_data_quality(findings)
+            structured_data=structured_data,
+            quality_metrics=Deferred(self._assess_data_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -330,17 +673,15 @@ class GPXHandler(XMLHandler):
         all_points = []
         
         # Collect all track points
-        for trk in root.findall(f'{ns}trk'):
-            for trkseg in trk.findall(f'{ns}trkseg'):
-                for trkpt in trkseg.findall(f'{ns}trkpt'):
-                    point_data = {
-                        'lat': float(trkpt.get('lat', 0)),
-                        'lon': float(trkpt.get('lon', 0)),
-                        'elevation': self._get_element_float(trkpt, f'{ns}ele'),
-                        'time': self._get_element_text(trkpt, f'{ns}time'),
-                        'speed': self._get_element_float(trkpt, f'{ns}speed')
-                    }
-                    all_points.append(point_data)
+        for trkpt in self._track_points(root):
+            point_data = {
+                'lat': float(trkpt.get('lat', 0)),
+                'lon': float(trkpt.get('lon', 0)),
+                'elevation': self._get_element_float(trkpt, f'{ns}ele'),
+                'time': self._get_element_text(trkpt, f'{ns}time'),
+                'speed': self._get_element_float(trkpt, f'{ns}speed')
+            }
+            all_points.append(point_data)
         
         if not all_points:
             return stats
@@ -385,17 +726,15 @@ class GPXHandler(XMLHandler):
         
         # Collect elevation points from tracks
         all_points = []
-        for trk in root.findall(f'{ns}trk'):
-            for trkseg in trk.findall(f'{ns}trkseg'):
-                for trkpt in trkseg.findall(f'{ns}trkpt'):
-                    elevation = self._get_element_float(trkpt, f'{ns}ele')
-                    if elevation is not None:
-                        all_points.append({
-                            'lat': float(trkpt.get('lat', 0)),
-                            'lon': float(trkpt.get('lon', 0)),
-                            'elevation': elevation,
-                            'distance': 0  # Will be calculated
-                        })
+        for trkpt in self._track_points(root):
+            elevation = self._get_element_float(trkpt, f'{ns}ele')
+            if elevation is not None:
+                all_points.append({
+                    'lat': float(trkpt.get('lat', 0)),
+                    'lon': float(trkpt.get('lon', 0)),
+                    'elevation': elevation,
+                    'distance': 0  # Will be calculated
+                })
         
         if not all_points:
             return elevation_data
@@ -468,17 +807,15 @@ class GPXHandler(XMLHandler):
         
         # Collect timestamps from tracks
         timestamps = []
-        for trk in root.findall(f'{ns}trk'):
-            for trkseg in trk.findall(f'{ns}trkseg'):
-                for trkpt in trkseg.findall(f'{ns}trkpt'):
-                    time_str = self._get_element_text(trkpt, f'{ns}time')
-                    if time_str:
-                        try:
-                            # Parse ISO format timestamp
-                            timestamp = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-                            timestamps.append(timestamp)
-                        except ValueError:
-                            continue
+        for trkpt in self._track_points(root):
+            time_str = self._get_element_text(trkpt, f'{ns}time')
+            if time_str:
+                try:
+                    # Parse ISO format timestamp
+                    timestamp = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+                    timestamps.append(timestamp)
+                except ValueError:
+                    continue
         
         if not timestamps:
             return temporal
@@ -518,8 +855,9 @@ class GPXHandler(XMLHandler):
         found_points = False
         
         # Check all points (waypoints, route points, track points)
+        index = self.document_index(root)
         for element_type in ['wpt', 'rtept', 'trkpt']:
-            for point in root.findall(f'.//{ns}{element_type}'):
+            for point in index.find_all(element_type, index.root_namespace):
                 lat = float(point.get('lat', 0))
                 lon = float(point.get('lon', 0))
                 
@@ -610,9 +948,10 @@ class GPXHandler(XMLHandler):
     
     def _extract_activity_summary(self, root: ET.Element) -> Dict[str, Any]:
         """Extract activity summary"""
-        metadata = self._analyze_metadata(root)
-        stats = self._calculate_statistics(root)
-        
+        return self._activity_summary(self._analyze_metadata(root), self._calculate_statistics(root))
+    
+    def _activity_summary(self, metadata: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Activity summary from analyzed metadata and track statistics"""
         return {
             'activity_name': metadata.get('name'),
             'activity_type': 'GPS Track',
@@ -17,7 +17,7 @@ import math
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class GraphMLHandler(XMLHandler):
@@ -68,6 +68,7 @@ class GraphMLHandler(XMLHandler):
         return False, 0.0
     
     def detect_type(self, root: ET.Element, namespaces: Dict[str, str]) -> DocumentTypeInfo:
+        index = self.document_index(root)
         # Detect GraphML version
         version = "1.0"  # Default
         if 'version' in root.attrib:
@@ -78,7 +79,7 @@ class GraphMLHandler(XMLHandler):
         graph_type = "generic"
         
         # Analyze graph structure
-        graphs = root.findall(f'.//{ns}graph')
+        graphs = index.find_all('graph', index.root_namespace)
         if graphs:
             graph = graphs[0]  # Analyze first graph
             
@@ -105,15 +106,15 @@ class GraphMLHandler(XMLHandler):
                 graph_type = "node_only"
             
             # Check for specific patterns
-            if any('tree' in str(data.text).lower() for data in root.findall('.//data') if data.text):
+            if any('tree' in str(data.text).lower() for data in index.find_all('data', None) if data.text):
                 graph_type = "tree_structure"
-            elif any('social' in str(data.text).lower() for data in root.findall('.//data') if data.text):
+            elif any('social' in str(data.text).lower() for data in index.find_all('data', None) if data.text):
                 graph_type = "social_network"
-            elif any('neural' in str(data.text).lower() for data in root.findall('.//data') if data.text):
+            elif any('neural' in str(data.text).lower() for data in index.find_all('data', None) if data.text):
                 graph_type = "neural_network"
         
         # Determine complexity
-        total_elements = len(root.findall('.//node')) + len(root.findall('.//edge'))
+        total_elements = index.count('node', None) + index.count('edge', None)
         complexity = "simple" if total_elements < 50 else "medium" if total_elements < 500 else "complex"
         
         return DocumentTypeInfo(
@@ -125,8 +126,8 @@ class GraphMLHandler(XMLHandler):
                 "category": "network_data",
                 "graph_type": graph_type,
                 "complexity": complexity,
-                "node_count": len(root.findall('.//node')),
-                "edge_count": len(root.findall('.//edge'))
+                "node_count": index.count('node', None),
+                "edge_count": index.count('edge', None)
             }
         )
     
@@ -181,8 +182,8 @@ class GraphMLHandler(XMLHandler):
                 'data_elements': findings['data_properties']['data_count']
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_graph_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_graph_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -260,6 +261,7 @@ class GraphMLHandler(XMLHandler):
     
     def _analyze_nodes(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze node information"""
+        index = self.document_index(root)
         ns = self._get_namespace(root)
         node_info = {
             'node_count': 0,
@@ -269,12 +271,12 @@ class GraphMLHandler(XMLHandler):
             'max_degree': 0
         }
         
-        nodes = root.findall(f'.//{ns}node')
+        nodes = index.find_all('node', index.root_namespace)
         node_info['node_count'] = len(nodes)
         
         # Build edge reference map for degree calculation
         edge_map = {}
-        edges = root.findall(f'.//{ns}edge')
+        edges = index.find_all('edge', index.root_namespace)
         for edge in edges:
             source = edge.get('source')
             target = edge.get('target')
@@ -323,7 +325,8 @@ class GraphMLHandler(XMLHandler):
             'parallel_edges': 0
         }
         
-        edges = root.findall(f'.//{ns}edge')
+        index = self.document_index(root)
+        edges = index.find_all('edge', index.root_namespace)
         edge_info['edge_count'] = len(edges)
         
         # Track parallel edges
@@ -426,17 +429,12 @@ class GraphMLHandler(XMLHandler):
             'empty_data': 0
         }
         
-        data_elements = root.findall(f'.//{ns}data')
+        index = self.document_index(root)
+        data_elements = index.find_all('data', index.root_namespace)
         data_info['data_count'] = len(data_elements)
         
-        # Build parent mapping for data elements
-        parent_map = {}
-        for elem in root.iter():
-            for child in elem:
-                parent_map[child] = elem
-        
         for data in data_elements[:200]:  # Limit for performance
-            parent = parent_map.get(data)
+            parent = index.parent(data)
             parent_type = parent.tag.split('}')[-1] if parent is not None else None
             
             data_data = {
@@ -467,6 +465,7 @@ class GraphMLHandler(XMLHandler):
     
     def _analyze_layout_information(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze layout and visual information"""
+        index = self.document_index(root)
         layout_info = {
             'has_coordinates': False,
             'coordinate_keys': [],
@@ -478,7 +477,7 @@ class GraphMLHandler(XMLHandler):
         coordinate_indicators = ['x', 'y', 'z', 'pos', 'position', 'coord', 'layout']
         visual_indicators = ['color', 'size', 'width', 'height', 'shape', 'style', 'label']
         
-        for key in root.findall('.//key'):
+        for key in index.find_all('key', None):
             attr_name = key.get('attr.name', '').lower()
             key_id = key.get('id', '').lower()
             
@@ -492,7 +491,7 @@ class GraphMLHandler(XMLHandler):
                 layout_info['visual_attributes'].append(key.get('id'))
         
         # Check for geometric data in values
-        for data in root.findall('.//data'):
+        for data in index.find_all('data', None):
             if data.text:
                 # Look for numeric coordinates or geometric data
                 if re.search(r'-?\d+\.?\d*,-?\d+\.?\d*', data.text):
@@ -503,6 +502,7 @@ class GraphMLHandler(XMLHandler):
     
     def _analyze_connectivity(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze graph connectivity patterns"""
+        index = self.document_index(root)
         ns = self._get_namespace(root)
         connectivity_info = {
             'total_components': 0,
@@ -516,12 +516,12 @@ class GraphMLHandler(XMLHandler):
         nodes = set()
         edges = []
         
-        for node in root.findall(f'.//{ns}node'):
+        for node in index.find_all('node', index.root_namespace):
             node_id = node.get('id')
             if node_id:
                 nodes.add(node_id)
         
-        for edge in root.findall(f'.//{ns}edge'):
+        for edge in index.find_all('edge', index.root_namespace):
             source = edge.get('source')
             target = edge.get('target')
             if source and target:
@@ -551,6 +551,7 @@ class GraphMLHandler(XMLHandler):
     
     def _calculate_network_metrics(self, root: ET.Element) -> Dict[str, Any]:
         """Calculate basic network metrics"""
+        index = self.document_index(root)
         metrics = {
             'density': 0.0,
             'avg_clustering': 0.0,
@@ -559,8 +560,8 @@ class GraphMLHandler(XMLHandler):
             'modularity_estimate': 0.0
         }
         
-        node_count = len(root.findall('.//node'))
-        edge_count = len(root.findall('.//edge'))
+        node_count = index.count('node', None)
+        edge_count = index.count('edge', None)
         
         # Calculate density
         if node_count > 1:
@@ -614,13 +615,14 @@ class GraphMLHandler(XMLHandler):
     
     def _extract_graph_metadata(self, root: ET.Element) -> Dict[str, Any]:
         """Extract high-level graph metadata"""
+        index = self.document_index(root)
         metadata = {
             'file_version': root.get('version'),
             'namespace': root.get('xmlns'),
-            'graph_count': len(root.findall('.//graph')),
-            'total_nodes': len(root.findall('.//node')),
-            'total_edges': len(root.findall('.//edge')),
-            'attribute_keys': len(root.findall('.//key')),
+            'graph_count': index.count('graph', None),
+            'total_nodes': index.count('node', None),
+            'total_edges': index.count('edge', None),
+            'attribute_keys': index.count('key', None),
             'has_hierarchy': len(root.findall('.//graph//graph')) > 0
         }
         
@@ -630,7 +632,7 @@ class GraphMLHandler(XMLHandler):
         """Extract node catalog with attributes"""
         nodes = []
         
-        for node in root.findall('.//node')[:50]:  # Limit for performance
+        for node in self.document_index(root).find_all('node', None)[:50]:  # Limit for performance
             node_data = {
                 'id': node.get('id'),
                 'attributes': {},
@@ -652,7 +654,7 @@ class GraphMLHandler(XMLHandler):
         """Extract edge catalog with attributes"""
         edges = []
         
-        for edge in root.findall('.//edge')[:50]:  # Limit for performance
+        for edge in self.document_index(root).find_all('edge', None)[:50]:  # Limit for performance
             edge_data = {
                 'id': edge.get('id'),
                 'source': edge.get('source'),
@@ -681,7 +683,7 @@ class GraphMLHandler(XMLHandler):
             'all_attributes': {}
         }
         
-        for key in root.findall('.//key'):
+        for key in self.document_index(root).find_all('key', None):
             key_info = {
                 'id': key.get('id'),
                 'name': key.get('attr.name'),
@@ -716,14 +718,15 @@ class GraphMLHandler(XMLHandler):
     
     def _extract_network_statistics(self, root: ET.Element) -> Dict[str, Any]:
         """Extract network statistics"""
+        index = self.document_index(root)
         stats = {
-            'node_count': len(root.findall('.//node')),
-            'edge_count': len(root.findall('.//edge')),
-            'graph_count': len(root.findall('.//graph')),
-            'data_elements': len(root.findall('.//data')),
-            'attribute_keys': len(root.findall('.//key')),
-            'hyperedge_count': len(root.findall('.//hyperedge')),
-            'port_count': len(root.findall('.//port'))
+            'node_count': index.count('node', None),
+            'edge_count': index.count('edge', None),
+            'graph_count': index.count('graph', None),
+            'data_elements': index.count('data', None),
+            'attribute_keys': index.count('key', None),
+            'hyperedge_count': index.count('hyperedge', None),
+            'port_count': index.count('port', None)
         }
         
         # Calculate derived statistics
@@ -16,7 +16,7 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class KMLHandler(XMLHandler):
@@ -24,6 +24,8 @@ class KMLHandler(XMLHandler):
     
     KML_NAMESPACE = "http://www.opengis.net/kml/2.2"
     EARTH_NAMESPACE = "http://earth.google.com/kml/2.2"
+    DETECTION_ROOT_ELEMENTS = ['kml']
+    DETECTION_NAMESPACES = ['opengis.net/kml', 'earth.google.com/kml']
     
     def _get_namespace(self, root: ET.Element) -> str:
         """Extract namespace prefix from root element"""
@@ -123,8 +125,8 @@ class KMLHandler(XMLHandler):
                 'overlays': findings['overlays']['total']
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_quality_metrics(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_quality_metrics, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -15,12 +15,14 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class Log4jConfigHandler(XMLHandler):
     """Handler for Log4j XML configuration files"""
     
+    DETECTION_ROOT_ELEMENTS = ['configuration', 'log4j:configuration']
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Log4j 1.x uses 'log4j:configuration'
         if root.tag == 'log4j:configuration' or root.tag.endswith('}configuration'):
@@ -116,8 +118,8 @@ class Log4jConfigHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_logging_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_logging_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
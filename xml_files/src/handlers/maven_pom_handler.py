@@ -17,12 +17,14 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class MavenPOMHandler(XMLHandler):
     """Handler for Maven Project Object Model (POM) files"""
     
+    DETECTION_ROOT_ELEMENTS = ['project']
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check if root is 'project' and has Maven namespace
         if root.tag == 'project' or root.tag.endswith('}project'):
@@ -84,8 +86,8 @@ class MavenPOMHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_pom_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_pom_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -16,7 +16,7 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class OpenAPIXMLHandler(XMLHandler):
@@ -123,8 +123,8 @@ class OpenAPIXMLHandler(XMLHandler):
                 'security_schemes': len(findings['security'].get('schemes', []))
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_api_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_api_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -17,12 +17,14 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class PropertiesXMLHandler(XMLHandler):
     """Handler for Java Properties XML files"""
     
+    DETECTION_ROOT_ELEMENTS = ['properties']
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Java Properties XML files have specific DTD
         if root.tag == 'properties' or root.tag.endswith('}properties'):
@@ -100,8 +102,8 @@ class PropertiesXMLHandler(XMLHandler):
                 'placeholders': len(findings['placeholders'])
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_property_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_property_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -14,12 +14,14 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class RSSHandler(XMLHandler):
     """Handler for RSS feed documents"""
     
+    DETECTION_ROOT_ELEMENTS = ['rss', 'feed']
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         if root.tag == 'rss' or root.tag.endswith('}rss'):
             return True, 1.0
@@ -72,8 +74,8 @@ class RSSHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory={'articles': len(items), 'categories': len(findings['categories'])},
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_feed_quality(root, items)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_feed_quality, root, items)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
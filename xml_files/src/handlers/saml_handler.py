@@ -16,12 +16,20 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class SAMLHandler(XMLHandler):
     """Handler for SAML assertions, responses, and requests"""
     
+    DETECTION_ROOT_ELEMENTS = [
+        'Assertion',
+        'Response',
+        'AuthnRequest',
+        'LogoutRequest',
+        'LogoutResponse'
+    ]
+    
     # SAML namespace URIs
     SAML_20_ASSERTION_NS = "urn:oasis:names:tc:SAML:2.0:assertion"
     SAML_20_PROTOCOL_NS = "urn:oasis:names:tc:SAML:2.0:protocol"
@@ -149,8 +157,8 @@ class SAMLHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_saml_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_saml_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -16,12 +16,34 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
+from core.streaming import RecordStream
 
 
 class SCAPHandler(XMLHandler):
     """Handler for SCAP (Security Content Automation Protocol) documents"""
     
+    DETECTION_ROOT_ELEMENTS = [
+        'Benchmark',
+        'TestResult',
+        'Profile',
+        'asset-report-collection',
+        'oval_definitions'
+    ]
+    DETECTION_NAMESPACES = [
+        'scap.nist.gov/schema/',
+        'checklists.nist.gov/xccdf/',
+        'oval.mitre.org/XMLSchema/',
+        'asset-report-collection',
+        'data-stream-collection',
+        'xccdf',
+        'oval'
+    ]
+    SUPPORTS_STREAMING = True
+    
+    # Rule-level elements released one at a time when streaming
+    STREAM_RECORDS = ['Rule', 'rule-result', 'Value', 'definition', 'test', 'object', 'state']
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check for SCAP-specific namespaces and elements
         scap_namespace_patterns = [
@@ -118,6 +140,32 @@ class SCAPHandler(XMLHandler):
         # Extract compliance status
         findings['compliance_summary'] = self._extract_compliance_summary(root)
         
+        return self._build_analysis(findings, data_inventory, root)
+    
+    def analyze_stream(self, file_path: str) -> SpecializedAnalysis:
+        """Count rules in a single pass without building the tree"""
+        rule_count = 0
+        
+        def count_rule(elem: ET.Element, depth: int):
+            nonlocal rule_count
+            if depth > 0 and elem.get('id') is not None:
+                rule_count += 1
+        
+        stream = RecordStream(file_path, self.STREAM_RECORDS, on_start=count_rule)
+        for _ in stream:
+            pass
+        
+        # The root is kept (emptied of its records) for the summary helpers
+        root = stream.root
+        findings = {
+            'total_rules': rule_count,
+            'vulnerabilities': self._count_vulnerabilities(root),
+            'compliance_summary': self._extract_compliance_summary(root)
+        }
+        return self._build_analysis(findings, {}, root)
+    
+    def _build_analysis(self, findings: Dict[str, Any], data_inventory: Dict[str, Any],
+                        root: ET.Element) -> SpecializedAnalysis:
         recommendations = [
             "Use for automated compliance monitoring",
             "Extract failed rules for remediation workflows",
@@ -139,8 +187,8 @@ class SCAPHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_quality_metrics(root)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_quality_metrics, root)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -18,6 +18,7 @@ import xml.etree.ElementTree as ET
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import base64
+import copy
 import re
 import sys
 import os
@@ -25,12 +26,15 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
+from core.streaming import RecordStream, STREAM_SAMPLE_LIMIT
 
 
 class ServiceNowHandler(XMLHandler):
     """Handler for ServiceNow export XML documents"""
     
+    SUPPORTS_STREAMING = True
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         """Check if this is a ServiceNow export file"""
         score = 0.0
@@ -69,8 +73,8 @@ class ServiceNowHandler(XMLHandler):
         metadata = {
             'primary_record_type': primary_type,
             'total_records': len(record_types),
-            'has_journal_entries': root.find('.//sys_journal_field') is not None,
-            'has_attachments': root.find('.//sys_attachment') is not None
+            'has_journal_entries': self.document_index(root).find_first('sys_journal_field', None) is not None,
+            'has_attachments': self.document_index(root).find_first('sys_attachment', None) is not None
         }
         
         return DocumentTypeInfo(
@@ -102,6 +106,92 @@ class ServiceNowHandler(XMLHandler):
         # Assignment and workflow analysis
         findings['workflow_analysis'] = self._analyze_workflow(primary_record, root)
         
+        return self._build_analysis(findings, self._create_data_inventory(root), root)
+    
+    def analyze_stream(self, file_path: str) -> SpecializedAnalysis:
+        """
+        Analyze the export one top-level record at a time.
+        
+        Journal and attachment statistics cover every record. The primary
+        record and the first STREAM_SAMPLE_LIMIT journal entries and
+        attachments are copied into a small sample tree, from which the
+        structured data and quality metrics are derived.
+        """
+        sample_root = None
+        primary_record = None
+        journal = {'total_entries': 0, 'comments_count': 0, 'work_notes_count': 0}
+        contributors = set()
+        first_timestamp = last_timestamp = None
+        timestamp_count = 0
+        attachments = {'total_attachments': 0, 'attachment_types': {}, 'total_size_bytes': 0}
+        
+        stream = RecordStream(file_path, record_depth=1)
+        for record in stream:
+            if sample_root is None:
+                sample_root = ET.Element(stream.root.tag, dict(stream.root.attrib))
+            
+            if record.tag == 'sys_journal_field':
+                journal['total_entries'] += 1
+                element_type = self._get_field_value(record, 'element')
+                if element_type == 'comments':
+                    journal['comments_count'] += 1
+                elif element_type == 'work_notes':
+                    journal['work_notes_count'] += 1
+                created_by = self._get_field_value(record, 'sys_created_by')
+                if created_by:
+                    contributors.add(created_by)
+                created_on = self._get_field_value(record, 'sys_created_on')
+                if created_on:
+                    timestamp_count += 1
+                    first_timestamp = min(first_timestamp or created_on, created_on)
+                    last_timestamp = max(last_timestamp or created_on, created_on)
+                keep = journal['total_entries'] <= STREAM_SAMPLE_LIMIT
+            elif record.tag == 'sys_attachment':
+                attachments['total_attachments'] += 1
+                content_type = self._get_field_value(record, 'content_type')
+                if content_type:
+                    attachments['attachment_types'][content_type] = attachments['attachment_types'].get(content_type, 0) + 1
+                size = self._get_field_value(record, 'size_bytes')
+                if size and size.isdigit():
+                    attachments['total_size_bytes'] += int(size)
+                keep = attachments['total_attachments'] <= STREAM_SAMPLE_LIMIT
+            else:
+                keep = primary_record is None and record.tag != 'sys_attachment_doc'
+            
+            if keep:
+                kept = copy.deepcopy(record)
+                sample_root.append(kept)
+                if record.tag not in ('sys_journal_field', 'sys_attachment'):
+                    primary_record = kept
+        
+        if sample_root is None:
+            sample_root = ET.Element(stream.root.tag, dict(stream.root.attrib))
+        
+        findings = {}
+        if primary_record is not None:
+            findings.update(self._analyze_primary_record(primary_record))
+        journal['unique_contributors'] = len(contributors)
+        journal['conversation_duration'] = (self._timestamp_span(first_timestamp, last_timestamp)
+                                            if timestamp_count >= 2 else None)
+        findings['journal_analysis'] = journal
+        findings['attachment_analysis'] = attachments
+        findings['sla_metrics'] = self._extract_sla_metrics(primary_record)
+        findings['workflow_analysis'] = self._analyze_workflow(primary_record, sample_root)
+        
+        data_inventory = {
+            'incidents': stream.element_counts['incident'],
+            'problems': stream.element_counts['problem'],
+            'changes': stream.element_counts['change'],
+            'journal_entries': stream.element_counts['sys_journal_field'],
+            'attachments': stream.element_counts['sys_attachment'],
+            'total_fields': len(primary_record) if primary_record is not None else 0
+        }
+        
+        return self._build_analysis(findings, data_inventory, sample_root)
+    
+    def _build_analysis(self, findings: Dict[str, Any], data_inventory: Dict[str, int],
+                        root: ET.Element) -> SpecializedAnalysis:
+        """Assemble the SpecializedAnalysis shared by tree and streaming analysis"""
         recommendations = self._generate_recommendations(findings)
         ai_use_cases = self._identify_ai_use_cases(findings)
         
@@ -109,10 +199,10 @@ class ServiceNowHandler(XMLHandler):
             document_type=f"ServiceNow Export",
             key_findings=findings,
             recommendations=recommendations,
-            data_inventory=self._create_data_inventory(root),
+            data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._calculate_quality_metrics(root)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._calculate_quality_metrics, root)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -164,7 +254,7 @@ class ServiceNowHandler(XMLHandler):
     
     def _analyze_journal_entries(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze journal entries (comments and work notes)"""
-        entries = root.findall('.//sys_journal_field')
+        entries = self.document_index(root).find_all('sys_journal_field', None)
         
         comments = []
         work_notes = []
@@ -186,7 +276,7 @@ class ServiceNowHandler(XMLHandler):
     
     def _analyze_attachments(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze attachments in the export"""
-        attachments = root.findall('.//sys_attachment')
+        attachments = self.document_index(root).find_all('sys_attachment', None)
         
         analysis = {
             'total_attachments': len(attachments),
@@ -256,7 +346,7 @@ class ServiceNowHandler(XMLHandler):
     
     def _extract_conversation_thread(self, root: ET.Element) -> List[Dict[str, Any]]:
         """Extract and structure the conversation thread"""
-        entries = root.findall('.//sys_journal_field')
+        entries = self.document_index(root).find_all('sys_journal_field', None)
         
         thread = []
         for entry in entries:
@@ -275,7 +365,7 @@ class ServiceNowHandler(XMLHandler):
     
     def _extract_attachment_info(self, root: ET.Element) -> List[Dict[str, Any]]:
         """Extract attachment information"""
-        attachments = root.findall('.//sys_attachment')
+        attachments = self.document_index(root).find_all('sys_attachment', None)
         
         attachment_list = []
         for attachment in attachments:
@@ -321,7 +411,7 @@ class ServiceNowHandler(XMLHandler):
                 })
         
         # Add journal entries
-        for entry in root.findall('.//sys_journal_field'):
+        for entry in self.document_index(root).find_all('sys_journal_field', None):
             timestamp = self._get_field_value(entry, 'sys_created_on')
             if timestamp:
                 events.append({
@@ -367,7 +457,7 @@ class ServiceNowHandler(XMLHandler):
                 people['resolvers'].append(closed_by)
         
         # Commenters
-        for entry in root.findall('.//sys_journal_field'):
+        for entry in self.document_index(root).find_all('sys_journal_field', None):
             commenter = self._get_field_value(entry, 'sys_created_by')
             if commenter and commenter not in people['commenters']:
                 people['commenters'].append(commenter)
@@ -437,16 +527,19 @@ class ServiceNowHandler(XMLHandler):
         
         if len(timestamps) >= 2:
             timestamps.sort()
-            try:
-                first = datetime.fromisoformat(timestamps[0].replace(' ', 'T'))
-                last = datetime.fromisoformat(timestamps[-1].replace(' ', 'T'))
-                duration = last - first
-                return str(duration)
-            except:
-                pass
+            return self._timestamp_span(timestamps[0], timestamps[-1])
         
         return None
     
+    def _timestamp_span(self, first: str, last: str) -> Optional[str]:
+        """Duration between two ServiceNow timestamps"""
+        try:
+            first_dt = datetime.fromisoformat(first.replace(' ', 'T'))
+            last_dt = datetime.fromisoformat(last.replace(' ', 'T'))
+            return str(last_dt - first_dt)
+        except:
+            return None
+    
     def _analyze_state_transitions(self, record: ET.Element, root: ET.Element) -> List[str]:
         """Analyze state transitions from journal entries"""
         # This would require parsing work notes for state changes
@@ -462,12 +555,13 @@ class ServiceNowHandler(XMLHandler):
     
     def _create_data_inventory(self, root: ET.Element) -> Dict[str, int]:
         """Create inventory of data types found"""
+        index = self.document_index(root)
         inventory = {
-            'incidents': len(root.findall('.//incident')),
-            'problems': len(root.findall('.//problem')),
-            'changes': len(root.findall('.//change')),
-            'journal_entries': len(root.findall('.//sys_journal_field')),
-            'attachments': len(root.findall('.//sys_attachment')),
+            'incidents': index.count('incident', None),
+            'problems': index.count('problem', None),
+            'changes': index.count('change', None),
+            'journal_entries': index.count('sys_journal_field', None),
+            'attachments': index.count('sys_attachment', None),
             'total_fields': 0
         }
         
@@ -554,8 +648,9 @@ class ServiceNowHandler(XMLHandler):
                 consistency_score -= 0.1
         
         # Richness - amount of supplementary data
-        journal_count = len(root.findall('.//sys_journal_field'))
-        attachment_count = len(root.findall('.//sys_attachment'))
+        index = self.document_index(root)
+        journal_count = index.count('sys_journal_field', None)
+        attachment_count = index.count('sys_attachment', None)
         custom_fields = len([f for f in primary if f.tag.startswith('u_')])
         
         richness = min(1.0, (journal_count * 0.1 + attachment_count * 0.05 + custom_fields * 0.02))
@@ -15,13 +15,18 @@ from urllib.parse import urlparse
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
+from core.streaming import RecordStream, STREAM_SAMPLE_LIMIT
 
 
 class SitemapHandler(XMLHandler):
     """Handler for XML sitemap files"""
     
     SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+    DETECTION_ROOT_ELEMENTS = ['urlset', 'sitemapindex']
+    DETECTION_NAMESPACES = ['sitemaps.org/schemas/sitemap']
+    SUPPORTS_STREAMING = True
+    URL_ELEMENTS = ['loc', 'lastmod', 'changefreq', 'priority']
     
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check for sitemap namespace
@@ -44,7 +49,7 @@ class SitemapHandler(XMLHandler):
             "category": "seo_indexing",
             "sitemap_type": "index" if is_index else "urlset",
             "namespace_uri": self.SITEMAP_NAMESPACE,
-            "element_count": len(list(root.iter()))
+            "element_count": self.document_index(root).total_elements
         }
         
         return DocumentTypeInfo(
@@ -76,6 +81,215 @@ class SitemapHandler(XMLHandler):
             'optimization_opportunities': self._identify_optimization_opportunities(root, is_index)
         }
         
+        return self._build_analysis(findings, is_index, self.document_index(root).total_elements,
+                                    Deferred(self.extract_key_data, root))
+    
+    def analyze_stream(self, file_path: str) -> SpecializedAnalysis:
+        """
+        Aggregate sitemap entries in a single pass without building the tree.
+        Findings have the sections of analyze(): counts cover every entry,
+        while URL details, patterns and per-URL checks use the first
+        STREAM_SAMPLE_LIMIT entries, as the tree path samples its first 1000.
+        """
+        ns = f'{{{self.SITEMAP_NAMESPACE}}}'
+        entry_count = 0
+        details = []
+        locs = []  # Sample for URL pattern analysis
+        priorities = {}
+        priority_values = []
+        changefreqs = {}
+        https_count = 0
+        usage = dict.fromkeys(self.URL_ELEMENTS, 0)  # Entries with each element
+        lastmod_count = 0
+        oldest = latest = None
+        
+        stream = RecordStream(file_path, ['url', 'sitemap'], record_depth=1)
+        for entry in stream:
+            entry_count += 1
+            is_url = entry.tag.endswith('url')
+            
+            if len(details) < STREAM_SAMPLE_LIMIT:
+                details.extend(self._extract_url_details([entry]) if is_url
+                               else self._extract_sitemap_details([entry]))
+            
+            for name in self.URL_ELEMENTS:
+                if entry.find(f'{ns}{name}') is not None:
+                    usage[name] += 1
+            
+            loc = entry.findtext(f'{ns}loc')
+            if loc:
+                if loc.startswith('https://'):
+                    https_count += 1
+                if len(locs) < STREAM_SAMPLE_LIMIT:
+                    locs.append(loc)
+            
+            lastmod = entry.findtext(f'{ns}lastmod')
+            if lastmod:
+                lastmod_count += 1
+                oldest = lastmod if oldest is None else min(oldest, lastmod)
+                latest = lastmod if latest is None else max(latest, lastmod)
+            
+            priority = entry.findtext(f'{ns}priority')
+            if priority:
+                priorities[priority] = priorities.get(priority, 0) + 1
+                try:
+                    priority_values.append(float(priority))
+                except ValueError:
+                    pass
+            
+            changefreq = entry.findtext(f'{ns}changefreq')
+            if changefreq:
+                changefreqs[changefreq] = changefreqs.get(changefreq, 0) + 1
+        
+        root = stream.root
+        tag = root.tag.split('}')[-1] if '}' in root.tag else root.tag
+        is_index = tag == 'sitemapindex'
+        file_size = os.path.getsize(file_path)
+        
+        if is_index:
+            dates = {'count': lastmod_count, 'latest': latest, 'oldest': oldest} if lastmod_count else {'count': 0}
+            content_analysis = {
+                'sitemap_count': entry_count,
+                'sitemap_details': details,
+                'last_modified': dates,
+                'size_distribution': self._analyze_index_size_distribution(entry_count)
+            }
+            seo_analysis = {
+                'priority_distribution': {},
+                'changefreq_distribution': {},
+                'content_freshness': {},
+                'url_structure_seo': {},
+                'crawl_optimization': {}
+            }
+        else:
+            dates = {'count': 0}
+            if lastmod_count:
+                dates = {
+                    'count': lastmod_count,
+                    'latest': latest,
+                    'oldest': oldest,
+                    'coverage_percentage': lastmod_count / entry_count * 100
+                }
+            url_patterns = self._url_patterns(locs)
+            content_analysis = {
+                'url_count': entry_count,
+                'url_details': details,
+                'priorities': priorities,
+                'change_frequencies': changefreqs,
+                'last_modified': dates,
+                'url_patterns': url_patterns,
+                'size_analysis': {
+                    'url_count': entry_count,
+                    'total_elements': stream.total_elements,
+                    'estimated_file_size': file_size,
+                    'size_limit_compliance': entry_count <= 50000,
+                    'compression_recommended': file_size > 10000
+                }
+            }
+            seo_analysis = {
+                'priority_distribution': {
+                    'distribution': priorities,
+                    'average_priority': sum(priority_values) / len(priority_values) if priority_values else 0.5,
+                    'high_priority_count': sum(v for k, v in priorities.items() if float(k) >= 0.8),
+                    'low_priority_count': sum(v for k, v in priorities.items() if float(k) <= 0.3)
+                },
+                'changefreq_distribution': {
+                    'distribution': changefreqs,
+                    'most_common': max(changefreqs.items(), key=lambda x: x[1])[0] if changefreqs else None,
+                    'update_pattern_consistency': self._analyze_update_patterns(changefreqs)
+                },
+                'content_freshness': {
+                    'urls_with_lastmod': lastmod_count,
+                    'freshness_percentage': (lastmod_count / entry_count * 100) if entry_count > 0 else 0,
+                    'date_range': {'oldest': oldest, 'newest': latest}
+                },
+                'url_structure_seo': {
+                    'domain_consistency': len(url_patterns['domains']) == 1,
+                    'depth_distribution': url_patterns['depth_levels'],
+                    'seo_friendly_structure': self._assess_url_seo_friendliness(locs)
+                },
+                'crawl_optimization': {}
+            }
+        
+        findings = {
+            'sitemap_info': {
+                'type': 'index' if is_index else 'urlset',
+                'namespace': self._extract_namespace_info(root),
+                'file_path': file_path
+            },
+            'content_analysis': content_analysis,
+            'seo_analysis': seo_analysis,
+            'technical_analysis': {
+                'file_size': file_size,
+                'compression_recommended': file_size > 10000,
+                'namespace_compliance': self._validate_namespace_usage(root),
+                'schema_validation': {
+                    'required_elements_present': entry_count > 0,
+                    'valid_element_structure': True,
+                    'namespace_correct': self._validate_namespace_usage(root)
+                },
+                'encoding_analysis': {}
+            }
+        }
+        # The remaining sections as the tree path computes them, from the
+        # counters of every entry and the first STREAM_SAMPLE_LIMIT locs
+        if is_index:
+            findings.update({
+                'quality_indicators': self._quality_indicators(0, {}, {}, {}, 0),
+                'accessibility_analysis': {'protocol_analysis': {}, 'url_validity': {}, 'potential_issues': []},
+                'performance_analysis': self._performance_aspects(stream.total_elements, None, {}, {}),
+                'compliance_analysis': self._compliance(self._validate_namespace_usage(root), None, {}),
+                'security_analysis': self._security_aspects([], 0, 0),
+                'optimization_opportunities': self._optimization_opportunities(None, {}, {}, 0)
+            })
+        else:
+            findings.update({
+                'quality_indicators': self._quality_indicators(entry_count, usage, priorities, changefreqs,
+                                                               https_count),
+                'accessibility_analysis': self._accessibility(locs),
+                'performance_analysis': self._performance_aspects(stream.total_elements, entry_count,
+                                                                  priorities, changefreqs),
+                'compliance_analysis': self._compliance(self._validate_namespace_usage(root), entry_count, usage),
+                'security_analysis': self._security_aspects(locs, https_count, entry_count),
+                'optimization_opportunities': self._optimization_opportunities(entry_count, priorities,
+                                                                               changefreqs, lastmod_count)
+            })
+        
+        if is_index:
+            content_summary = {'type': 'sitemap_index', 'sitemap_count': entry_count,
+                               'has_lastmod': lastmod_count}
+            seo_summary = {'sitemap_organization': 'hierarchical', 'crawl_optimization': 'index_based'}
+        else:
+            content_summary = {'type': 'url_sitemap', 'url_count': entry_count,
+                               'unique_domains': len(url_patterns['domains'])}
+            seo_summary = {
+                'priority_coverage': len(priorities) > 0,
+                'changefreq_coverage': len(changefreqs) > 0,
+                'https_adoption': https_count / entry_count if entry_count else 0,
+                'average_priority': seo_analysis['priority_distribution']['average_priority']
+            }
+        structured_data = {
+            'sitemap_metadata': {
+                'type': 'index' if is_index else 'urlset',
+                'namespace': self.SITEMAP_NAMESPACE,
+                'total_entries': entry_count
+            },
+            'content_summary': content_summary,
+            'seo_summary': seo_summary,
+            'technical_summary': {
+                'namespace': self.SITEMAP_NAMESPACE,
+                'total_elements': stream.total_elements,
+                'estimated_size': file_size,
+                'compression_recommended': file_size > 10000,
+                'schema_compliant': self._validate_namespace_usage(root)
+            }
+        }
+        
+        return self._build_analysis(findings, is_index, stream.total_elements, structured_data)
+    
+    def _build_analysis(self, findings: Dict[str, Any], is_index: bool, total_elements: int,
+                        structured_data: Any) -> SpecializedAnalysis:
+        """Assemble the SpecializedAnalysis shared by tree and streaming analysis"""
         recommendations = [
             "Validate all URLs for accessibility and response codes",
             "Check for outdated or broken links regularly",
@@ -105,8 +319,8 @@ class SitemapHandler(XMLHandler):
         if is_index:
             data_inventory = {
                 'sitemaps': findings['content_analysis'].get('sitemap_count', 0),
-                'total_elements': len(list(root.iter())),
-                'last_modified_entries': len([s for s in findings['content_analysis'].get('sitemap_details', []) if s.get('lastmod')])
+                'total_elements': total_elements,
+                'last_modified_entries': findings['content_analysis'].get('last_modified', {}).get('count', 0)
             }
         else:
             data_inventory = {
@@ -123,8 +337,8 @@ class SitemapHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_sitemap_quality(findings)
+            structured_data=structured_data,
+            quality_metrics=Deferred(self._assess_sitemap_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -135,7 +349,7 @@ class SitemapHandler(XMLHandler):
             'sitemap_metadata': {
                 'type': 'index' if is_index else 'urlset',
                 'namespace': self.SITEMAP_NAMESPACE,
-                'total_entries': len(root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}{"sitemap" if is_index else "url"}'))
+                'total_entries': self.document_index(root).count("sitemap" if is_index else "url", self.SITEMAP_NAMESPACE)
             },
             'content_summary': self._extract_content_summary(root, is_index),
             'seo_summary': self._extract_seo_summary(root, is_index),
@@ -158,7 +372,7 @@ class SitemapHandler(XMLHandler):
     
     def _analyze_url_sitemap(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze URL sitemap content"""
-        urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
+        urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
         
         findings = {
             'url_count': len(urls),
@@ -174,13 +388,13 @@ class SitemapHandler(XMLHandler):
     
     def _analyze_sitemap_index(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze sitemap index content"""
-        sitemaps = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}sitemap')
+        sitemaps = self.document_index(root).find_all('sitemap', self.SITEMAP_NAMESPACE)
         
         findings = {
             'sitemap_count': len(sitemaps),
             'sitemap_details': self._extract_sitemap_details(sitemaps),
             'last_modified': self._analyze_sitemap_dates(sitemaps),
-            'size_distribution': self._analyze_index_size_distribution(sitemaps)
+            'size_distribution': self._analyze_index_size_distribution(len(sitemaps))
         }
         
         return findings
@@ -196,7 +410,7 @@ class SitemapHandler(XMLHandler):
         }
         
         if not is_index:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
+            urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
             
             # Priority distribution analysis
             priorities = self._analyze_priorities(urls)
@@ -213,7 +427,7 @@ class SitemapHandler(XMLHandler):
             seo_analysis['changefreq_distribution'] = {
                 'distribution': changefreqs,
                 'most_common': max(changefreqs.items(), key=lambda x: x[1])[0] if changefreqs else None,
-                'update_pattern_consistency': self._analyze_update_patterns(urls)
+                'update_pattern_consistency': self._analyze_update_patterns(changefreqs)
             }
             
             # Content freshness analysis
@@ -232,7 +446,7 @@ class SitemapHandler(XMLHandler):
             seo_analysis['url_structure_seo'] = {
                 'domain_consistency': len(url_patterns.get('domains', [])) == 1,
                 'depth_distribution': url_patterns.get('depth_levels', {}),
-                'seo_friendly_structure': self._assess_url_seo_friendliness(urls)
+                'seo_friendly_structure': self._assess_url_seo_friendliness(self._locs(urls[:100]))
             }
         
         return seo_analysis
@@ -260,6 +474,15 @@ class SitemapHandler(XMLHandler):
     
     def _analyze_quality_indicators(self, root: ET.Element, is_index: bool) -> Dict[str, Any]:
         """Analyze quality indicators"""
+        if is_index:
+            return self._quality_indicators(0, {}, {}, {}, 0)
+        urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
+        return self._quality_indicators(len(urls), self._element_usage(urls), self._analyze_priorities(urls),
+                                        self._analyze_changefreqs(urls), self._count_https_urls(urls))
+    
+    def _quality_indicators(self, total_urls: int, usage: Dict[str, int], priorities: Dict[str, int],
+                            changefreqs: Dict[str, int], https_count: int) -> Dict[str, Any]:
+        """Quality indicators from URL counts"""
         quality = {
             'completeness_score': 0.0,
             'consistency_score': 0.0,
@@ -267,27 +490,20 @@ class SitemapHandler(XMLHandler):
             'recommendations': []
         }
         
-        if not is_index:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
-            total_urls = len(urls)
+        if total_urls > 0:
+            # Completeness score
+            quality['completeness_score'] = (
+                (usage['priority'] / total_urls * 0.3) +
+                (usage['changefreq'] / total_urls * 0.3) +
+                (usage['lastmod'] / total_urls * 0.4)
+            )
             
-            if total_urls > 0:
-                # Completeness score
-                urls_with_priority = sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}priority') is not None)
-                urls_with_changefreq = sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}changefreq') is not None)
-                urls_with_lastmod = sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}lastmod') is not None)
-                
-                quality['completeness_score'] = (
-                    (urls_with_priority / total_urls * 0.3) +
-                    (urls_with_changefreq / total_urls * 0.3) +
-                    (urls_with_lastmod / total_urls * 0.4)
-                )
-                
-                # Consistency score
-                quality['consistency_score'] = self._calculate_consistency_score(urls)
-                
-                # Best practices score
-                quality['best_practices_score'] = self._calculate_best_practices_score(urls, total_urls)
+            # Consistency score
+            quality['consistency_score'] = self._calculate_consistency_score(priorities, changefreqs)
+            
+            # Best practices score
+            quality['best_practices_score'] = self._calculate_best_practices_score(
+                total_urls, usage['priority'], https_count)
         
         # Generate recommendations
         if quality['completeness_score'] < 0.7:
@@ -299,66 +515,75 @@ class SitemapHandler(XMLHandler):
     
     def _analyze_accessibility(self, root: ET.Element, is_index: bool) -> Dict[str, Any]:
         """Analyze accessibility of URLs in sitemap"""
+        if is_index:
+            return {'protocol_analysis': {}, 'url_validity': {}, 'potential_issues': []}
+        urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
+        return self._accessibility(self._locs(urls[:1000]))  # Analyze first 1000
+    
+    def _accessibility(self, locs: List[str]) -> Dict[str, Any]:
+        """Protocol and validity analysis of a sample of URLs"""
         accessibility = {
             'protocol_analysis': {},
             'url_validity': {},
             'potential_issues': []
         }
         
-        if not is_index:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
-            
-            # Protocol analysis
-            protocols = {}
-            for url in urls[:1000]:  # Analyze first 1000
-                loc_elem = url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc')
-                if loc_elem is not None and loc_elem.text:
-                    protocol = urlparse(loc_elem.text).scheme
-                    protocols[protocol] = protocols.get(protocol, 0) + 1
-            
-            accessibility['protocol_analysis'] = {
-                'protocols_used': protocols,
-                'https_percentage': (protocols.get('https', 0) / sum(protocols.values()) * 100) if protocols else 0,
-                'mixed_protocols': len(protocols) > 1
-            }
-            
-            # URL validity checks
-            accessibility['url_validity'] = self._check_url_validity(urls[:100])  # Check first 100
-            
-            # Identify potential issues
-            if protocols.get('http', 0) > 0:
-                accessibility['potential_issues'].append('Contains non-HTTPS URLs')
-            if accessibility['url_validity']['invalid_urls'] > 0:
-                accessibility['potential_issues'].append('Contains potentially invalid URLs')
+        # Protocol analysis
+        protocols = {}
+        for loc in locs:
+            protocol = urlparse(loc).scheme
+            protocols[protocol] = protocols.get(protocol, 0) + 1
+        
+        accessibility['protocol_analysis'] = {
+            'protocols_used': protocols,
+            'https_percentage': (protocols.get('https', 0) / sum(protocols.values()) * 100) if protocols else 0,
+            'mixed_protocols': len(protocols) > 1
+        }
+        
+        # URL validity checks
+        accessibility['url_validity'] = self._check_url_validity(locs[:100])  # Check first 100
+        
+        # Identify potential issues
+        if protocols.get('http', 0) > 0:
+            accessibility['potential_issues'].append('Contains non-HTTPS URLs')
+        if accessibility['url_validity']['invalid_urls'] > 0:
+            accessibility['potential_issues'].append('Contains potentially invalid URLs')
         
         return accessibility
     
     def _analyze_performance_aspects(self, root: ET.Element, is_index: bool) -> Dict[str, Any]:
         """Analyze performance-related aspects"""
+        total_elements = self.document_index(root).total_elements
+        if is_index:
+            return self._performance_aspects(total_elements, None, {}, {})
+        urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
+        return self._performance_aspects(total_elements, len(urls), self._analyze_priorities(urls),
+                                         self._analyze_changefreqs(urls))
+    
+    def _performance_aspects(self, total_elements: int, url_count: Optional[int],
+                             priorities: Dict[str, int], changefreqs: Dict[str, int]) -> Dict[str, Any]:
+        """Performance aspects from element and URL counts; url_count is None for an index"""
         performance = {
             'size_optimization': {},
             'crawl_efficiency': {},
             'recommendations': []
         }
         
-        total_elements = len(list(root.iter()))
-        
         # Size optimization
+        estimated_size = self._estimate_size(total_elements)
         performance['size_optimization'] = {
             'total_elements': total_elements,
-            'estimated_size': self._estimate_file_size(root),
-            'compression_savings': self._estimate_compression_savings(root),
+            'estimated_size': estimated_size,
+            'compression_savings': self._estimate_compression_savings(estimated_size),
             'size_limit_compliance': total_elements <= 50000  # Standard sitemap limit
         }
         
-        if not is_index:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
-            
+        if url_count is not None:
             # Crawl efficiency
             performance['crawl_efficiency'] = {
-                'url_density': len(urls) / total_elements,
-                'priority_optimization': self._analyze_priority_optimization(urls),
-                'changefreq_accuracy': self._analyze_changefreq_accuracy(urls)
+                'url_density': url_count / total_elements,
+                'priority_optimization': self._analyze_priority_optimization(priorities),
+                'changefreq_accuracy': self._analyze_changefreq_accuracy(changefreqs)
             }
         
         # Generate recommendations
@@ -371,32 +596,35 @@ class SitemapHandler(XMLHandler):
     
     def _analyze_compliance(self, root: ET.Element, is_index: bool) -> Dict[str, Any]:
         """Analyze compliance with sitemap protocol"""
+        namespace_compliance = self._validate_namespace_usage(root)
+        if is_index:
+            return self._compliance(namespace_compliance, None, {})
+        urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
+        return self._compliance(namespace_compliance, len(urls), self._element_usage(urls))
+    
+    def _compliance(self, namespace_compliance: bool, url_count: Optional[int],
+                    usage: Dict[str, int]) -> Dict[str, Any]:
+        """Protocol compliance from URL element usage; url_count is None for an index"""
         compliance = {
             'protocol_version': '0.9',
-            'namespace_compliance': True,
+            'namespace_compliance': namespace_compliance,
             'required_elements': {},
             'optional_elements': {},
             'violations': []
         }
         
-        # Check namespace compliance
-        compliance['namespace_compliance'] = self._validate_namespace_usage(root)
-        
-        if not is_index:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
-            
+        if url_count is not None:
             # Check required elements
-            urls_with_loc = sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc') is not None)
             compliance['required_elements'] = {
-                'loc_present': urls_with_loc,
-                'loc_compliance': urls_with_loc == len(urls)
+                'loc_present': usage['loc'],
+                'loc_compliance': usage['loc'] == url_count
             }
             
             # Check optional elements
             compliance['optional_elements'] = {
-                'lastmod_usage': sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}lastmod') is not None),
-                'changefreq_usage': sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}changefreq') is not None),
-                'priority_usage': sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}priority') is not None)
+                'lastmod_usage': usage['lastmod'],
+                'changefreq_usage': usage['changefreq'],
+                'priority_usage': usage['priority']
             }
             
             # Check for violations
@@ -407,6 +635,11 @@ class SitemapHandler(XMLHandler):
     
     def _analyze_security_aspects(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze security aspects"""
+        urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
+        return self._security_aspects(self._locs(urls[:100]), self._count_https_urls(urls), len(urls))
+    
+    def _security_aspects(self, locs: List[str], https_count: int, total_urls: int) -> Dict[str, Any]:
+        """Security aspects from a sample of URLs and the HTTPS count of all"""
         security = {
             'exposed_information': [],
             'url_security': {},
@@ -414,19 +647,16 @@ class SitemapHandler(XMLHandler):
         }
         
         # Check for potentially sensitive information in URLs
-        urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
-        for url in urls[:100]:  # Check first 100
-            loc_elem = url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc')
-            if loc_elem is not None and loc_elem.text:
-                url_text = loc_elem.text.lower()
-                if any(pattern in url_text for pattern in ['admin', 'private', 'test', 'staging', 'dev']):
-                    security['exposed_information'].append('Potentially sensitive URLs detected')
-                    break
+        for loc in locs[:100]:  # Check first 100
+            url_text = loc.lower()
+            if any(pattern in url_text for pattern in ['admin', 'private', 'test', 'staging', 'dev']):
+                security['exposed_information'].append('Potentially sensitive URLs detected')
+                break
         
         # URL security analysis
         security['url_security'] = {
-            'https_usage': self._count_https_urls(urls),
-            'total_urls': len(urls)
+            'https_usage': https_count,
+            'total_urls': total_urls
         }
         
         # Generate recommendations
@@ -442,27 +672,31 @@ class SitemapHandler(XMLHandler):
     
     def _identify_optimization_opportunities(self, root: ET.Element, is_index: bool) -> Dict[str, Any]:
         """Identify optimization opportunities"""
+        if is_index:
+            return self._optimization_opportunities(None, {}, {}, 0)
+        urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
+        return self._optimization_opportunities(len(urls), self._analyze_priorities(urls),
+                                                self._analyze_changefreqs(urls),
+                                                self._analyze_lastmod(urls).get('count', 0))
+    
+    def _optimization_opportunities(self, total_urls: Optional[int], priorities: Dict[str, int],
+                                    changefreqs: Dict[str, int], lastmod_count: int) -> Dict[str, Any]:
+        """Optimization opportunities from URL counts; total_urls is None for an index"""
         opportunities = {
             'seo_opportunities': [],
             'technical_opportunities': [],
             'maintenance_opportunities': []
         }
         
-        if not is_index:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
-            total_urls = len(urls)
-            
+        if total_urls is not None:
             # SEO opportunities
-            priorities = self._analyze_priorities(urls)
             if not priorities:
                 opportunities['seo_opportunities'].append('Add priority values to guide search engine crawling')
             
-            changefreqs = self._analyze_changefreqs(urls)
             if not changefreqs:
                 opportunities['seo_opportunities'].append('Add changefreq values to optimize crawl frequency')
             
-            lastmod_data = self._analyze_lastmod(urls)
-            if lastmod_data.get('count', 0) < total_urls * 0.5:
+            if lastmod_count < total_urls * 0.5:
                 opportunities['seo_opportunities'].append('Add lastmod dates to improve crawl efficiency')
             
             # Technical opportunities
@@ -470,7 +704,7 @@ class SitemapHandler(XMLHandler):
                 opportunities['technical_opportunities'].append('Consider splitting into multiple sitemaps for better performance')
             
             # Maintenance opportunities
-            if lastmod_data.get('count', 0) > 0:
+            if lastmod_count > 0:
                 opportunities['maintenance_opportunities'].append('Implement automated lastmod date updates')
         
         return opportunities
@@ -573,6 +807,15 @@ class SitemapHandler(XMLHandler):
     
     def _analyze_url_patterns(self, urls: List[ET.Element]) -> Dict[str, Any]:
         """Analyze URL patterns and structure"""
+        locs = []
+        for url in urls[:1000]:  # Analyze first 1000 URLs for performance
+            loc = url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc')
+            if loc is not None and loc.text:
+                locs.append(loc.text)
+        return self._url_patterns(locs)
+    
+    def _url_patterns(self, locs: List[str]) -> Dict[str, Any]:
+        """Domain, depth, extension and first-segment distribution of URLs"""
         patterns = {
             'domains': set(),
             'extensions': {},
@@ -580,29 +823,27 @@ class SitemapHandler(XMLHandler):
             'path_patterns': {}
         }
         
-        for url in urls[:1000]:  # Analyze first 1000 URLs for performance
-            loc = url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc')
-            if loc is not None and loc.text:
-                parsed = urlparse(loc.text)
-                
-                # Extract domain
-                patterns['domains'].add(parsed.netloc)
-                
-                # Count depth
-                path_parts = [p for p in parsed.path.split('/') if p]
-                depth = len(path_parts)
-                patterns['depth_levels'][depth] = patterns['depth_levels'].get(depth, 0) + 1
-                
-                # Analyze extensions
-                if '.' in parsed.path:
-                    ext = parsed.path.split('.')[-1].lower()
-                    if len(ext) <= 4:  # Reasonable extension length
-                        patterns['extensions'][ext] = patterns['extensions'].get(ext, 0) + 1
-                
-                # Analyze path patterns
-                if path_parts:
-                    first_segment = path_parts[0]
-                    patterns['path_patterns'][first_segment] = patterns['path_patterns'].get(first_segment, 0) + 1
+        for loc in locs:
+            parsed = urlparse(loc)
+            
+            # Extract domain
+            patterns['domains'].add(parsed.netloc)
+            
+            # Count depth
+            path_parts = [p for p in parsed.path.split('/') if p]
+            depth = len(path_parts)
+            patterns['depth_levels'][depth] = patterns['depth_levels'].get(depth, 0) + 1
+            
+            # Analyze extensions
+            if '.' in parsed.path:
+                ext = parsed.path.split('.')[-1].lower()
+                if len(ext) <= 4:  # Reasonable extension length
+                    patterns['extensions'][ext] = patterns['extensions'].get(ext, 0) + 1
+            
+            # Analyze path patterns
+            if path_parts:
+                first_segment = path_parts[0]
+                patterns['path_patterns'][first_segment] = patterns['path_patterns'].get(first_segment, 0) + 1
         
         patterns['domains'] = list(patterns['domains'])
         return patterns
@@ -629,18 +870,18 @@ class SitemapHandler(XMLHandler):
         """Analyze sitemap size characteristics"""
         return {
             'url_count': len(urls),
-            'total_elements': len(list(root.iter())),
+            'total_elements': self.document_index(root).total_elements,
             'estimated_file_size': self._estimate_file_size(root),
             'size_limit_compliance': len(urls) <= 50000,
             'compression_recommended': self._estimate_file_size(root) > 10000
         }
     
-    def _analyze_index_size_distribution(self, sitemaps: List[ET.Element]) -> Dict[str, Any]:
+    def _analyze_index_size_distribution(self, sitemap_count: int) -> Dict[str, Any]:
         """Analyze size distribution in sitemap index"""
         return {
-            'sitemap_count': len(sitemaps),
-            'estimated_total_size': len(sitemaps) * 1000,  # Rough estimate
-            'index_efficiency': min(len(sitemaps) / 1000, 1.0)  # Efficiency score
+            'sitemap_count': sitemap_count,
+            'estimated_total_size': sitemap_count * 1000,  # Rough estimate
+            'index_efficiency': min(sitemap_count / 1000, 1.0)  # Efficiency score
         }
     
     def _calculate_average_priority(self, urls: List[ET.Element]) -> float:
@@ -656,10 +897,9 @@ class SitemapHandler(XMLHandler):
         
         return sum(priorities) / len(priorities) if priorities else 0.5
     
-    def _analyze_update_patterns(self, urls: List[ET.Element]) -> float:
+    def _analyze_update_patterns(self, changefreqs: Dict[str, int]) -> float:
         """Analyze consistency of update patterns"""
         # Simplified consistency score based on changefreq distribution
-        changefreqs = self._analyze_changefreqs(urls)
         if not changefreqs:
             return 0.0
         
@@ -667,7 +907,7 @@ class SitemapHandler(XMLHandler):
         # More consistent if fewer different frequencies are used
         return 1.0 - (len(changefreqs) - 1) / 6  # 6 is max reasonable changefreq types
     
-    def _assess_url_seo_friendliness(self, urls: List[ET.Element]) -> Dict[str, Any]:
+    def _assess_url_seo_friendliness(self, locs: List[str]) -> Dict[str, Any]:
         """Assess SEO friendliness of URL structure"""
         seo_analysis = {
             'readable_urls': 0,
@@ -676,30 +916,30 @@ class SitemapHandler(XMLHandler):
             'total_analyzed': 0
         }
         
-        for url in urls[:100]:  # Analyze first 100
-            loc = url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc')
-            if loc is not None and loc.text:
-                url_text = loc.text
-                seo_analysis['total_analyzed'] += 1
-                
-                # Check if URL is readable (no excessive parameters)
-                if '?' not in url_text or url_text.count('&') <= 2:
-                    seo_analysis['readable_urls'] += 1
-                
-                # Check URL length
-                if len(url_text) <= 100:
-                    seo_analysis['short_urls'] += 1
-                
-                # Count parameterized URLs
-                if '?' in url_text:
-                    seo_analysis['parameterized_urls'] += 1
+        for url_text in locs[:100]:  # Analyze first 100
+            seo_analysis['total_analyzed'] += 1
+            
+            # Check if URL is readable (no excessive parameters)
+            if '?' not in url_text or url_text.count('&') <= 2:
+                seo_analysis['readable_urls'] += 1
+            
+            # Check URL length
+            if len(url_text) <= 100:
+                seo_analysis['short_urls'] += 1
+            
+            # Count parameterized URLs
+            if '?' in url_text:
+                seo_analysis['parameterized_urls'] += 1
         
         return seo_analysis
     
     def _estimate_file_size(self, root: ET.Element) -> int:
         """Estimate file size in bytes"""
+        return self._estimate_size(self.document_index(root).total_elements)
+    
+    def _estimate_size(self, element_count: int) -> int:
+        """Estimate file size in bytes from the element count"""
         # Rough estimation based on element count and average element size
-        element_count = len(list(root.iter()))
         return element_count * 150  # Average 150 bytes per element
     
     def _validate_namespace_usage(self, root: ET.Element) -> bool:
@@ -715,52 +955,45 @@ class SitemapHandler(XMLHandler):
         }
         
         expected_child = 'sitemap' if is_index else 'url'
-        children = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}{expected_child}')
+        children = self.document_index(root).find_all(expected_child, self.SITEMAP_NAMESPACE)
         
         compliance['required_elements_present'] = len(children) > 0
         
         return compliance
     
-    def _estimate_compression_savings(self, root: ET.Element) -> Dict[str, Any]:
+    def _estimate_compression_savings(self, estimated_size: int) -> Dict[str, Any]:
         """Estimate compression savings"""
-        estimated_size = self._estimate_file_size(root)
         return {
             'uncompressed_size': estimated_size,
             'estimated_compressed_size': int(estimated_size * 0.1),  # XML compresses well
             'estimated_savings': int(estimated_size * 0.9)
         }
     
-    def _analyze_priority_optimization(self, urls: List[ET.Element]) -> Dict[str, Any]:
+    def _analyze_priority_optimization(self, priorities: Dict[str, int]) -> Dict[str, Any]:
         """Analyze priority optimization"""
-        priorities = self._analyze_priorities(urls)
         return {
             'distribution': priorities,
             'optimization_score': len(priorities) / 11 if priorities else 0,  # 0.0-1.0 range
             'needs_optimization': len(set(priorities.keys())) <= 2
         }
     
-    def _analyze_changefreq_accuracy(self, urls: List[ET.Element]) -> Dict[str, Any]:
+    def _analyze_changefreq_accuracy(self, changefreqs: Dict[str, int]) -> Dict[str, Any]:
         """Analyze changefreq accuracy"""
-        changefreqs = self._analyze_changefreqs(urls)
         return {
             'distribution': changefreqs,
             'diversity_score': min(len(changefreqs) / 6, 1.0),  # Max 6 standard frequencies
             'most_common': max(changefreqs.items(), key=lambda x: x[1])[0] if changefreqs else None
         }
     
-    def _calculate_consistency_score(self, urls: List[ET.Element]) -> float:
+    def _calculate_consistency_score(self, priorities: Dict[str, int], changefreqs: Dict[str, int]) -> float:
         """Calculate consistency score"""
-        # Check consistency of priority values and changefreq values
-        priorities = self._analyze_priorities(urls)
-        changefreqs = self._analyze_changefreqs(urls)
-        
-        # Simple consistency score based on distribution
+        # Simple consistency score based on the priority and changefreq distributions
         priority_consistency = 1.0 - (len(priorities) - 1) / 10 if priorities else 0.5
         changefreq_consistency = 1.0 - (len(changefreqs) - 1) / 6 if changefreqs else 0.5
         
         return (priority_consistency + changefreq_consistency) / 2
     
-    def _calculate_best_practices_score(self, urls: List[ET.Element], total_urls: int) -> float:
+    def _calculate_best_practices_score(self, total_urls: int, urls_with_priority: int, https_count: int) -> float:
         """Calculate best practices compliance score"""
         score = 0.0
         
@@ -769,18 +1002,16 @@ class SitemapHandler(XMLHandler):
             score += 0.3
         
         # Check if URLs have proper elements
-        urls_with_priority = sum(1 for url in urls if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}priority') is not None)
         if urls_with_priority / total_urls > 0.8:
             score += 0.3
         
         # Check HTTPS usage
-        https_count = self._count_https_urls(urls)
         if https_count / total_urls > 0.9:
             score += 0.4
         
         return score
     
-    def _check_url_validity(self, urls: List[ET.Element]) -> Dict[str, Any]:
+    def _check_url_validity(self, locs: List[str]) -> Dict[str, Any]:
         """Check URL validity"""
         validity = {
             'valid_urls': 0,
@@ -788,41 +1019,50 @@ class SitemapHandler(XMLHandler):
             'issues': []
         }
         
-        for url in urls:
-            loc = url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc')
-            if loc is not None and loc.text:
-                url_text = loc.text
-                parsed = urlparse(url_text)
-                
-                if parsed.scheme and parsed.netloc:
-                    validity['valid_urls'] += 1
-                else:
-                    validity['invalid_urls'] += 1
-                    validity['issues'].append(f'Invalid URL structure: {url_text[:50]}...')
+        for url_text in locs:
+            parsed = urlparse(url_text)
+            
+            if parsed.scheme and parsed.netloc:
+                validity['valid_urls'] += 1
+            else:
+                validity['invalid_urls'] += 1
+                validity['issues'].append(f'Invalid URL structure: {url_text[:50]}...')
         
         return validity
     
     def _count_https_urls(self, urls: List[ET.Element]) -> int:
         """Count HTTPS URLs"""
-        https_count = 0
+        return sum(1 for loc in self._locs(urls) if loc.startswith('https://'))
+    
+    def _locs(self, urls: List[ET.Element]) -> List[str]:
+        """Non-empty <loc> values of URL entries"""
+        locs = []
         for url in urls:
             loc = url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}loc')
             if loc is not None and loc.text:
-                if loc.text.startswith('https://'):
-                    https_count += 1
-        return https_count
+                locs.append(loc.text)
+        return locs
+    
+    def _element_usage(self, urls: List[ET.Element]) -> Dict[str, int]:
+        """Number of URL entries with each of loc, lastmod, changefreq and priority"""
+        usage = dict.fromkeys(self.URL_ELEMENTS, 0)
+        for url in urls:
+            for name in self.URL_ELEMENTS:
+                if url.find(f'.//{{{self.SITEMAP_NAMESPACE}}}{name}') is not None:
+                    usage[name] += 1
+        return usage
     
     def _extract_content_summary(self, root: ET.Element, is_index: bool) -> Dict[str, Any]:
         """Extract content summary"""
         if is_index:
-            sitemaps = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}sitemap')
+            sitemaps = self.document_index(root).find_all('sitemap', self.SITEMAP_NAMESPACE)
             return {
                 'type': 'sitemap_index',
                 'sitemap_count': len(sitemaps),
                 'has_lastmod': sum(1 for s in sitemaps if s.find(f'.//{{{self.SITEMAP_NAMESPACE}}}lastmod') is not None)
             }
         else:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
+            urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
             return {
                 'type': 'url_sitemap',
                 'url_count': len(urls),
@@ -839,7 +1079,7 @@ class SitemapHandler(XMLHandler):
                 'crawl_optimization': 'index_based'
             }
         else:
-            urls = root.findall(f'.//{{{self.SITEMAP_NAMESPACE}}}url')
+            urls = self.document_index(root).find_all('url', self.SITEMAP_NAMESPACE)
             priorities = self._analyze_priorities(urls)
             changefreqs = self._analyze_changefreqs(urls)
             
@@ -852,7 +1092,7 @@ class SitemapHandler(XMLHandler):
     
     def _extract_technical_summary(self, root: ET.Element, is_index: bool) -> Dict[str, Any]:
         """Extract technical summary"""
-        total_elements = len(list(root.iter()))
+        total_elements = self.document_index(root).total_elements
         
         return {
             'namespace': self.SITEMAP_NAMESPACE,
@@ -15,12 +15,15 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
+from core.parser_backend import element_to_string
 
 
 class SOAPEnvelopeHandler(XMLHandler):
     """Handler for SOAP 1.1 and 1.2 message envelopes"""
     
+    DETECTION_ROOT_ELEMENTS = ['Envelope']
+    
     # SOAP namespace URIs
     SOAP_11_NS = "http://schemas.xmlsoap.org/soap/envelope/"
     SOAP_12_NS = "http://www.w3.org/2003/05/soap-envelope"
@@ -148,8 +151,8 @@ class SOAPEnvelopeHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_message_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_message_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -301,7 +304,7 @@ class SOAPEnvelopeHandler(XMLHandler):
         body = self._find_element_by_local_name(root, 'Body')
         if body is not None:
             body_info['has_body'] = True
-            body_info['body_size_estimate'] = len(ET.tostring(body, encoding='unicode'))
+            body_info['body_size_estimate'] = len(element_to_string(body))
             
             for child in body:
                 child_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
@@ -542,7 +545,7 @@ class SOAPEnvelopeHandler(XMLHandler):
         
         # Estimate message size
         try:
-            metrics['message_size_estimate'] = len(ET.tostring(root, encoding='unicode'))
+            metrics['message_size_estimate'] = len(element_to_string(root))
         except:
             metrics['message_size_estimate'] = 0
         
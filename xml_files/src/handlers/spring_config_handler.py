@@ -17,12 +17,19 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class SpringConfigHandler(XMLHandler):
     """Handler for Spring Framework XML configuration files"""
     
+    DETECTION_ROOT_ELEMENTS = ['beans']
+    DETECTION_NAMESPACES = [
+        'springframework.org/schema/beans',
+        'springframework.org/schema/context',
+        'springframework.org/schema/mvc'
+    ]
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check for Spring namespaces
         spring_indicators = [
@@ -95,8 +102,8 @@ class SpringConfigHandler(XMLHandler):
                 'property_sources': len(findings['property_sources'])
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_spring_config_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_spring_config_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -16,7 +16,7 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class StrutsConfigHandler(XMLHandler):
@@ -168,8 +168,8 @@ class StrutsConfigHandler(XMLHandler):
                 'message_resources': findings['message_resources']['resource_count']
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_configuration_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_configuration_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
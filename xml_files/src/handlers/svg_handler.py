@@ -15,13 +15,15 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class SVGHandler(XMLHandler):
     """Handler for SVG (Scalable Vector Graphics) documents"""
     
     SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+    DETECTION_ROOT_ELEMENTS = ['svg']
+    DETECTION_NAMESPACES = ['http://www.w3.org/2000/svg']
     
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         # Check for SVG root element
@@ -114,8 +116,8 @@ class SVGHandler(XMLHandler):
             recommendations=recommendations,
             data_inventory=data_inventory,
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_svg_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_svg_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
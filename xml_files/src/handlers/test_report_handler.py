@@ -16,12 +16,15 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
+from core.streaming import RecordStream, STREAM_SAMPLE_LIMIT
 
 
 class TestReportHandler(XMLHandler):
     """Handler for JUnit and TestNG test report XML files"""
     
+    SUPPORTS_STREAMING = True
+    
     def can_handle(self, root: ET.Element, namespaces: Dict[str, str]) -> Tuple[bool, float]:
         root_tag = root.tag.split('}')[-1] if '}' in root.tag else root.tag
         
@@ -81,6 +84,146 @@ class TestReportHandler(XMLHandler):
         else:
             findings = self._analyze_junit(root)
         
+        return self._build_analysis(findings, framework, Deferred(self.extract_key_data, root))
+    
+    def analyze_stream(self, file_path: str) -> SpecializedAnalysis:
+        """
+        Analyze the report one testcase/test-method at a time.
+        
+        Suite and test attributes are read from start events and every test
+        is counted; failed and skipped test lists keep the first
+        STREAM_SAMPLE_LIMIT entries and slow tests the slowest
+        STREAM_SAMPLE_LIMIT. Suites report testcase_count/method_count
+        instead of listing their tests.
+        """
+        state = {'framework': None, 'findings': None, 'container': False,
+                 'suite': None, 'test': None, 'suite_stats': None}
+        summary = self._new_junit_summary()
+        duration_ms = 0.0
+        method_count = 0
+        method_time = 0.0
+        failure_rate_totals = {}  # Suite name -> [tests, failed]
+        failed_entries = []
+        slow_entries = []
+        error_categories = self._new_error_categories()
+        
+        def on_start(elem: ET.Element, depth: int):
+            nonlocal duration_ms
+            local_name = elem.tag.split('}')[-1]
+            if depth == 0:
+                state['framework'] = self._determine_framework(elem)
+                state['findings'] = self._new_findings(elem, state['framework'])
+                state['container'] = local_name == 'testsuites'
+            findings = state['findings']
+            
+            if state['framework'] == "TestNG":
+                if local_name == 'suite':
+                    duration_ms += float(elem.get('duration-ms', 0))
+                    suite_info = self._testng_suite_info(elem)
+                    findings['suites'].append(suite_info)
+                    state['suite'] = suite_info
+                    state['suite_stats'] = failure_rate_totals.setdefault(suite_info['name'], [0, 0])
+                elif local_name == 'test' and state['suite'] is not None:
+                    test_info = self._testng_test_info(elem)
+                    test_info['method_count'] = 0
+                    state['suite']['tests'].append(test_info)
+                    state['test'] = test_info
+                    findings['summary']['time'] += test_info['duration']
+                return
+            
+            # JUnit: a testsuites container lists its testsuites, otherwise
+            # the root is the only suite (as in _analyze_junit)
+            if depth == 0 and not state['container'] or depth > 0 and state['container'] and local_name == 'testsuite':
+                suite_info = self._junit_suite_info(elem)
+                suite_info['testcase_count'] = 0
+                self._add_junit_suite(findings, suite_info)
+                state['suite'] = suite_info
+            if depth > 0 and local_name == 'testsuite':
+                # Structured summary counts non-root suites, as _extract_test_summary()
+                self._add_to_junit_summary(summary, elem)
+                tests = int(elem.get('tests', 0))
+                if tests > 0:
+                    failure_rate_totals[elem.get('name')] = [
+                        tests, int(elem.get('failures', 0)) + int(elem.get('errors', 0))]
+        
+        stream = RecordStream(file_path, ['testcase', 'test-method'], on_start=on_start)
+        for test in stream:
+            framework = state['framework']
+            findings = state['findings']
+            
+            if framework == "TestNG":
+                method_info = self._testng_method_info(test)
+                self._record_testng_method(findings, method_info, STREAM_SAMPLE_LIMIT)
+                if state['test'] is not None:
+                    state['test']['method_count'] += 1
+                method_count += 1
+                method_time += method_info['duration']
+                if state['suite_stats'] is not None:
+                    state['suite_stats'][0] += 1
+                    state['suite_stats'][1] += method_info['status'] == 'FAIL'
+            else:
+                test_info = self._junit_testcase_info(test)
+                self._record_junit_testcase(findings, test_info, STREAM_SAMPLE_LIMIT)
+                if state['suite'] is not None:
+                    state['suite']['testcase_count'] += 1
+            
+            if len(findings['slow_tests']) > 2 * STREAM_SAMPLE_LIMIT:
+                findings['slow_tests'].sort(key=lambda x: x['time'], reverse=True)
+                del findings['slow_tests'][STREAM_SAMPLE_LIMIT:]
+            
+            if len(failed_entries) < 50:
+                entry = self._failed_test_entry(test, framework)
+                if entry is not None:
+                    failed_entries.append(entry)
+            
+            entry = self._slow_test_entry(test, framework)
+            if entry is not None:
+                slow_entries.append(entry)
+                if len(slow_entries) > 40:
+                    slow_entries.sort(key=lambda x: x['duration_seconds'], reverse=True)
+                    del slow_entries[20:]
+            
+            error_info = self._error_info(test, framework)
+            if error_info is not None:
+                self._categorize_single_error(error_info, error_categories)
+                for category in error_categories:
+                    del error_categories[category][10:]
+        
+        framework = state['framework']
+        findings = state['findings']
+        self._finish_findings(findings, framework, STREAM_SAMPLE_LIMIT)
+        
+        root = stream.root
+        if framework == "TestNG":
+            test_summary = {
+                'total': int(root.get('total', 0)),
+                'passed': int(root.get('passed', 0)),
+                'failed': int(root.get('failed', 0)),
+                'skipped': int(root.get('skipped', 0)),
+                'duration_ms': duration_ms
+            }
+        else:
+            test_summary = summary
+            summary['passed'] = summary['total'] - summary['failed'] - summary['errors'] - summary['skipped']
+        
+        failure_rate_by_suite = {name: failed / total for name, (total, failed)
+                                 in failure_rate_totals.items() if total > 0}
+        
+        slow_entries.sort(key=lambda x: x['duration_seconds'], reverse=True)
+        structured_data = {
+            'test_summary': test_summary,
+            'failed_tests': failed_entries,
+            'slow_tests': slow_entries[:20],
+            'test_metrics': self._test_metrics(test_summary, framework, method_count,
+                                               method_time, failure_rate_by_suite),
+            'error_categories': error_categories
+        }
+        
+        return self._build_analysis(findings, framework, structured_data)
+    
+    def _build_analysis(self, findings: Dict[str, Any], framework: str,
+                        structured_data: Any) -> SpecializedAnalysis:
+        """Assemble the SpecializedAnalysis shared by tree and streaming analysis"""
         recommendations = [
             "Analyze failure patterns for flaky tests",
             "Track test execution time trends",
@@ -113,8 +256,8 @@ class TestReportHandler(XMLHandler):
                 'test_suites': len(findings.get('suites', []))
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_test_quality(findings)
+            structured_data=structured_data,
+            quality_metrics=Deferred(self._assess_test_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -128,6 +271,11 @@ class TestReportHandler(XMLHandler):
             'error_categories': self._categorize_errors(root, framework)
         }
     
+    def _failed_methods(self, root: ET.Element) -> List[ET.Element]:
+        """TestNG test-method elements with status FAIL, from the shared index"""
+        return [method for method in self.document_index(root).find_all('test-method', None)
+                if method.get('status') == 'FAIL']
+    
     def _determine_framework(self, root: ET.Element) -> str:
         """Determine which test framework generated the report"""
         root_tag = root.tag.split('}')[-1] if '}' in root.tag else root.tag
@@ -139,8 +287,8 @@ class TestReportHandler(XMLHandler):
         else:
             return "Unknown"
     
-    def _analyze_junit(self, root: ET.Element) -> Dict[str, Any]:
-        """Analyze JUnit test report"""
+    def _new_findings(self, root: ET.Element, framework: str) -> Dict[str, Any]:
+        """Empty findings for a report, with TestNG totals from the root attributes"""
         findings = {
             'summary': {
                 'total': 0,
@@ -153,179 +301,142 @@ class TestReportHandler(XMLHandler):
             'suites': [],
             'failed_tests': [],
             'skipped_tests': [],
-            'slow_tests': [],
-            'execution_time': {}
+            'slow_tests': []
         }
         
+        if framework == "TestNG":
+            findings['summary'].update({
+                'total': int(root.get('total', 0)),
+                'passed': int(root.get('passed', 0)),
+                'failed': int(root.get('failed', 0)),
+                'skipped': int(root.get('skipped', 0)),
+                'error': 0  # TestNG doesn't separate errors
+            })
+            findings['test_groups'] = {}
+        else:
+            findings['execution_time'] = {}
+        
+        return findings
+    
+    def _analyze_junit(self, root: ET.Element) -> Dict[str, Any]:
+        """Analyze JUnit test report"""
+        findings = self._new_findings(root, "JUnit")
+        
         # Handle both single testsuite and testsuites container
         if root.tag == 'testsuites' or root.tag.endswith('}testsuites'):
-            testsuites = root.findall('.//testsuite')
+            testsuites = self.document_index(root).find_all('testsuite', None)
         else:
             testsuites = [root]
         
         for suite in testsuites:
-            suite_info = {
-                'name': suite.get('name'),
-                'tests': int(suite.get('tests', 0)),
-                'failures': int(suite.get('failures', 0)),
-                'errors': int(suite.get('errors', 0)),
-                'skipped': int(suite.get('skipped', 0)),
-                'time': float(suite.get('time', 0)),
-                'timestamp': suite.get('timestamp'),
-                'testcases': []
-            }
+            suite_info = self._junit_suite_info(suite)
+            suite_info['testcases'] = []
             
             # Analyze test cases
             for testcase in suite.findall('.//testcase'):
-                test_info = {
-                    'name': testcase.get('name'),
-                    'classname': testcase.get('classname'),
-                    'time': float(testcase.get('time', 0)),
-                    'status': 'passed'  # Default
-                }
-                
-                # Check for failures
-                failure = testcase.find('.//failure')
-                if failure is not None:
-                    test_info['status'] = 'failed'
-                    test_info['failure'] = {
-                        'message': failure.get('message'),
-                        'type': failure.get('type'),
-                        'text': failure.text[:500] if failure.text else None
-                    }
-                    findings['failed_tests'].append(test_info)
-                
-                # Check for errors
-                error = testcase.find('.//error')
-                if error is not None:
-                    test_info['status'] = 'error'
-                    test_info['error'] = {
-                        'message': error.get('message'),
-                        'type': error.get('type'),
-                        'text': error.text[:500] if error.text else None
-                    }
-                    findings['failed_tests'].append(test_info)
-                
-                # Check for skipped
-                skipped = testcase.find('.//skipped')
-                if skipped is not None:
-                    test_info['status'] = 'skipped'
-                    test_info['skip_message'] = skipped.get('message')
-                    findings['skipped_tests'].append(test_info)
-                
+                test_info = self._junit_testcase_info(testcase)
+                self._record_junit_testcase(findings, test_info)
                 suite_info['testcases'].append(test_info)
-                
-                # Track slow tests
-                if test_info['time'] > 1.0:  # Tests taking more than 1 second
-                    findings['slow_tests'].append({
-                        'name': test_info['name'],
-                        'class': test_info['classname'],
-                        'time': test_info['time']
-                    })
-            
-            findings['suites'].append(suite_info)
             
-            # Update summary
-            findings['summary']['total'] += suite_info['tests']
-            findings['summary']['failed'] += suite_info['failures']
-            findings['summary']['error'] += suite_info['errors']
-            findings['summary']['skipped'] += suite_info['skipped']
-            findings['summary']['time'] += suite_info['time']
-        
-        findings['summary']['passed'] = (findings['summary']['total'] - 
-                                        findings['summary']['failed'] - 
-                                        findings['summary']['error'] - 
-                                        findings['summary']['skipped'])
-        
-        # Sort slow tests by time
-        findings['slow_tests'].sort(key=lambda x: x['time'], reverse=True)
+            self._add_junit_suite(findings, suite_info)
         
+        self._finish_findings(findings, "JUnit")
         return findings
     
+    def _junit_suite_info(self, suite: ET.Element) -> Dict[str, Any]:
+        """Attributes of a JUnit testsuite element"""
+        return {
+            'name': suite.get('name'),
+            'tests': int(suite.get('tests', 0)),
+            'failures': int(suite.get('failures', 0)),
+            'errors': int(suite.get('errors', 0)),
+            'skipped': int(suite.get('skipped', 0)),
+            'time': float(suite.get('time', 0)),
+            'timestamp': suite.get('timestamp')
+        }
+    
+    def _add_junit_suite(self, findings: Dict[str, Any], suite_info: Dict[str, Any]):
+        """Add a JUnit suite to the findings and its counts to the summary"""
+        findings['suites'].append(suite_info)
+        
+        findings['summary']['total'] += suite_info['tests']
+        findings['summary']['failed'] += suite_info['failures']
+        findings['summary']['error'] += suite_info['errors']
+        findings['summary']['skipped'] += suite_info['skipped']
+        findings['summary']['time'] += suite_info['time']
+    
+    def _junit_testcase_info(self, testcase: ET.Element) -> Dict[str, Any]:
+        """Outcome and timing of a JUnit testcase element"""
+        test_info = {
+            'name': testcase.get('name'),
+            'classname': testcase.get('classname'),
+            'time': float(testcase.get('time', 0)),
+            'status': 'passed'  # Default
+        }
+        
+        # Check for failures
+        failure = testcase.find('.//failure')
+        if failure is not None:
+            test_info['status'] = 'failed'
+            test_info['failure'] = {
+                'message': failure.get('message'),
+                'type': failure.get('type'),
+                'text': failure.text[:500] if failure.text else None
+            }
+        
+        # Check for errors
+        error = testcase.find('.//error')
+        if error is not None:
+            test_info['status'] = 'error'
+            test_info['error'] = {
+                'message': error.get('message'),
+                'type': error.get('type'),
+                'text': error.text[:500] if error.text else None
+            }
+        
+        # Check for skipped
+        skipped = testcase.find('.//skipped')
+        if skipped is not None:
+            test_info['status'] = 'skipped'
+            test_info['skip_message'] = skipped.get('message')
+        
+        return test_info
+    
+    def _record_junit_testcase(self, findings: Dict[str, Any], test_info: Dict[str, Any],
+                               limit: Optional[int] = None):
+        """Add a testcase to the failed/skipped/slow lists (each capped at limit)"""
+        if 'failure' in test_info and (limit is None or len(findings['failed_tests']) < limit):
+            findings['failed_tests'].append(test_info)
+        if 'error' in test_info and (limit is None or len(findings['failed_tests']) < limit):
+            findings['failed_tests'].append(test_info)
+        if test_info['status'] == 'skipped' and (limit is None or len(findings['skipped_tests']) < limit):
+            findings['skipped_tests'].append(test_info)
+        
+        # Track slow tests
+        if test_info['time'] > 1.0:  # Tests taking more than 1 second
+            findings['slow_tests'].append({
+                'name': test_info['name'],
+                'class': test_info['classname'],
+                'time': test_info['time']
+            })
+    
     def _analyze_testng(self, root: ET.Element) -> Dict[str, Any]:
         """Analyze TestNG test report"""
-        findings = {
-            'summary': {
-                'total': int(root.get('total', 0)),
-                'passed': int(root.get('passed', 0)),
-                'failed': int(root.get('failed', 0)),
-                'skipped': int(root.get('skipped', 0)),
-                'error': 0,  # TestNG doesn't separate errors
-                'time': 0.0
-            },
-            'suites': [],
-            'failed_tests': [],
-            'skipped_tests': [],
-            'slow_tests': [],
-            'test_groups': {}
-        }
+        findings = self._new_findings(root, "TestNG")
         
         # Analyze suites
-        for suite in root.findall('.//suite'):
-            suite_info = {
-                'name': suite.get('name'),
-                'duration': float(suite.get('duration-ms', 0)) / 1000,  # Convert to seconds
-                'started_at': suite.get('started-at'),
-                'finished_at': suite.get('finished-at'),
-                'tests': []
-            }
+        for suite in self.document_index(root).find_all('suite', None):
+            suite_info = self._testng_suite_info(suite)
             
             # Analyze tests within suite
             for test in suite.findall('.//test'):
-                test_info = {
-                    'name': test.get('name'),
-                    'duration': float(test.get('duration-ms', 0)) / 1000,
-                    'test_methods': []
-                }
+                test_info = self._testng_test_info(test)
+                test_info['test_methods'] = []
                 
                 # Analyze test methods
                 for method in test.findall('.//test-method'):
-                    method_info = {
-                        'name': method.get('name'),
-                        'signature': method.get('signature'),
-                        'status': method.get('status'),
-                        'duration': float(method.get('duration-ms', 0)) / 1000,
-                        'started_at': method.get('started-at'),
-                        'finished_at': method.get('finished-at')
-                    }
-                    
-                    # Extract groups
-                    groups = method.find('.//groups')
-                    if groups is not None:
-                        method_info['groups'] = [g.get('name') for g in groups.findall('.//group')]
-                        # Track group statistics
-                        for group_name in method_info['groups']:
-                            if group_name not in findings['test_groups']:
-                                findings['test_groups'][group_name] = {'total': 0, 'passed': 0, 'failed': 0}
-                            findings['test_groups'][group_name]['total'] += 1
-                            if method_info['status'] == 'PASS':
-                                findings['test_groups'][group_name]['passed'] += 1
-                            elif method_info['status'] == 'FAIL':
-                                findings['test_groups'][group_name]['failed'] += 1
-                    
-                    # Track failures
-                    if method_info['status'] == 'FAIL':
-                        exception = method.find('.//exception')
-                        if exception is not None:
-                            method_info['exception'] = {
-                                'class': exception.get('class'),
-                                'message': self._get_child_text(exception, 'message'),
-                                'stacktrace': self._get_child_text(exception, 'full-stacktrace', '')[:500]
-                            }
-                        findings['failed_tests'].append(method_info)
-                    
-                    # Track skipped
-                    elif method_info['status'] == 'SKIP':
-                        findings['skipped_tests'].append(method_info)
-                    
-                    # Track slow tests
-                    if method_info['duration'] > 1.0:
-                        findings['slow_tests'].append({
-                            'name': method_info['name'],
-                            'signature': method_info['signature'],
-                            'time': method_info['duration']
-                        })
-                    
+                    method_info = self._testng_method_info(method)
+                    self._record_testng_method(findings, method_info)
                     test_info['test_methods'].append(method_info)
                 
                 suite_info['tests'].append(test_info)
@@ -333,11 +444,97 @@ class TestReportHandler(XMLHandler):
             
             findings['suites'].append(suite_info)
         
-        # Sort slow tests
-        findings['slow_tests'].sort(key=lambda x: x['time'], reverse=True)
-        
+        self._finish_findings(findings, "TestNG")
         return findings
     
+    def _testng_suite_info(self, suite: ET.Element) -> Dict[str, Any]:
+        """Attributes of a TestNG suite element"""
+        return {
+            'name': suite.get('name'),
+            'duration': float(suite.get('duration-ms', 0)) / 1000,  # Convert to seconds
+            'started_at': suite.get('started-at'),
+            'finished_at': suite.get('finished-at'),
+            'tests': []
+        }
+    
+    def _testng_test_info(self, test: ET.Element) -> Dict[str, Any]:
+        """Attributes of a TestNG test element"""
+        return {
+            'name': test.get('name'),
+            'duration': float(test.get('duration-ms', 0)) / 1000
+        }
+    
+    def _testng_method_info(self, method: ET.Element) -> Dict[str, Any]:
+        """Outcome, timing, groups and exception of a TestNG test-method element"""
+        method_info = {
+            'name': method.get('name'),
+            'signature': method.get('signature'),
+            'status': method.get('status'),
+            'duration': float(method.get('duration-ms', 0)) / 1000,
+            'started_at': method.get('started-at'),
+            'finished_at': method.get('finished-at')
+        }
+        
+        # Extract groups
+        groups = method.find('.//groups')
+        if groups is not None:
+            method_info['groups'] = [g.get('name') for g in groups.findall('.//group')]
+        
+        if method_info['status'] == 'FAIL':
+            exception = method.find('.//exception')
+            if exception is not None:
+                method_info['exception'] = {
+                    'class': exception.get('class'),
+                    'message': self._get_child_text(exception, 'message'),
+                    'stacktrace': self._get_child_text(exception, 'full-stacktrace', '')[:500]
+                }
+        
+        return method_info
+    
+    def _record_testng_method(self, findings: Dict[str, Any], method_info: Dict[str, Any],
+                              limit: Optional[int] = None):
+        """Add a test method to the group statistics and failed/skipped/slow lists"""
+        # Track group statistics
+        for group_name in method_info.get('groups', []):
+            if group_name not in findings['test_groups']:
+                findings['test_groups'][group_name] = {'total': 0, 'passed': 0, 'failed': 0}
+            findings['test_groups'][group_name]['total'] += 1
+            if method_info['status'] == 'PASS':
+                findings['test_groups'][group_name]['passed'] += 1
+            elif method_info['status'] == 'FAIL':
+                findings['test_groups'][group_name]['failed'] += 1
+        
+        # Track failures
+        if method_info['status'] == 'FAIL':
+            if limit is None or len(findings['failed_tests']) < limit:
+                findings['failed_tests'].append(method_info)
+        
+        # Track skipped
+        elif method_info['status'] == 'SKIP':
+            if limit is None or len(findings['skipped_tests']) < limit:
+                findings['skipped_tests'].append(method_info)
+        
+        # Track slow tests
+        if method_info['duration'] > 1.0:
+            findings['slow_tests'].append({
+                'name': method_info['name'],
+                'signature': method_info['signature'],
+                'time': method_info['duration']
+            })
+    
+    def _finish_findings(self, findings: Dict[str, Any], framework: str, limit: Optional[int] = None):
+        """Derive the JUnit pass count and rank the slow tests"""
+        if framework != "TestNG":
+            findings['summary']['passed'] = (findings['summary']['total'] - 
+                                            findings['summary']['failed'] - 
+                                            findings['summary']['error'] - 
+                                            findings['summary']['skipped'])
+        
+        # Sort slow tests by time
+        findings['slow_tests'].sort(key=lambda x: x['time'], reverse=True)
+        if limit is not None:
+            del findings['slow_tests'][limit:]
+    
     def _extract_test_summary(self, root: ET.Element, framework: str) -> Dict[str, Any]:
         """Extract test execution summary"""
         if framework == "TestNG":
@@ -346,125 +543,163 @@ class TestReportHandler(XMLHandler):
                 'passed': int(root.get('passed', 0)),
                 'failed': int(root.get('failed', 0)),
                 'skipped': int(root.get('skipped', 0)),
-                'duration_ms': sum(float(s.get('duration-ms', 0)) for s in root.findall('.//suite'))
+                'duration_ms': sum(float(s.get('duration-ms', 0))
+                                   for s in self.document_index(root).find_all('suite', None))
             }
         else:  # JUnit
-            summary = {
-                'total': 0,
-                'passed': 0,
-                'failed': 0,
-                'errors': 0,
-                'skipped': 0,
-                'duration_seconds': 0.0
-            }
-            
-            for suite in root.findall('.//testsuite'):
-                summary['total'] += int(suite.get('tests', 0))
-                summary['failed'] += int(suite.get('failures', 0))
-                summary['errors'] += int(suite.get('errors', 0))
-                summary['skipped'] += int(suite.get('skipped', 0))
-                summary['duration_seconds'] += float(suite.get('time', 0))
-            
+            summary = self._new_junit_summary()
+            for suite in self.document_index(root).find_all('testsuite', None):
+                self._add_to_junit_summary(summary, suite)
             summary['passed'] = summary['total'] - summary['failed'] - summary['errors'] - summary['skipped']
             
             return summary
     
+    def _new_junit_summary(self) -> Dict[str, Any]:
+        return {
+            'total': 0,
+            'passed': 0,
+            'failed': 0,
+            'errors': 0,
+            'skipped': 0,
+            'duration_seconds': 0.0
+        }
+    
+    def _add_to_junit_summary(self, summary: Dict[str, Any], suite: ET.Element):
+        summary['total'] += int(suite.get('tests', 0))
+        summary['failed'] += int(suite.get('failures', 0))
+        summary['errors'] += int(suite.get('errors', 0))
+        summary['skipped'] += int(suite.get('skipped', 0))
+        summary['duration_seconds'] += float(suite.get('time', 0))
+    
     def _extract_failed_tests(self, root: ET.Element, framework: str) -> List[Dict[str, Any]]:
         """Extract details of failed tests"""
-        failed_tests = []
-        
         if framework == "TestNG":
-            for method in root.findall('.//test-method[@status="FAIL"]'):
-                exception = method.find('.//exception')
-                failed_tests.append({
-                    'name': method.get('name'),
-                    'signature': method.get('signature'),
-                    'duration_ms': float(method.get('duration-ms', 0)),
-                    'exception_class': exception.get('class') if exception is not None else None,
-                    'message': self._get_child_text(exception, 'message') if exception is not None else None
-                })
+            tests = self._failed_methods(root)
         else:  # JUnit
-            for testcase in root.findall('.//testcase'):
-                failure = testcase.find('.//failure')
-                error = testcase.find('.//error')
-                
-                if failure is not None or error is not None:
-                    fail_elem = failure if failure is not None else error
-                    failed_tests.append({
-                        'name': testcase.get('name'),
-                        'classname': testcase.get('classname'),
-                        'time': float(testcase.get('time', 0)),
-                        'failure_type': fail_elem.get('type'),
-                        'message': fail_elem.get('message'),
-                        'text': fail_elem.text[:200] if fail_elem.text else None
-                    })
+            tests = self.document_index(root).find_all('testcase', None)
+        
+        failed_tests = [entry for entry in (self._failed_test_entry(test, framework) for test in tests)
+                        if entry is not None]
         
         return failed_tests[:50]  # Limit to first 50
     
+    def _failed_test_entry(self, test: ET.Element, framework: str) -> Optional[Dict[str, Any]]:
+        """Failure details for a test-method/testcase, or None if it did not fail"""
+        if framework == "TestNG":
+            if test.get('status') != 'FAIL':
+                return None
+            exception = test.find('.//exception')
+            return {
+                'name': test.get('name'),
+                'signature': test.get('signature'),
+                'duration_ms': float(test.get('duration-ms', 0)),
+                'exception_class': exception.get('class') if exception is not None else None,
+                'message': self._get_child_text(exception, 'message') if exception is not None else None
+            }
+        
+        failure = test.find('.//failure')
+        error = test.find('.//error')
+        if failure is None and error is None:
+            return None
+        fail_elem = failure if failure is not None else error
+        return {
+            'name': test.get('name'),
+            'classname': test.get('classname'),
+            'time': float(test.get('time', 0)),
+            'failure_type': fail_elem.get('type'),
+            'message': fail_elem.get('message'),
+            'text': fail_elem.text[:200] if fail_elem.text else None
+        }
+    
     def _extract_slow_tests(self, root: ET.Element, framework: str, threshold: float = 1.0) -> List[Dict[str, Any]]:
         """Extract slow-running tests"""
-        slow_tests = []
-        
-        if framework == "TestNG":
-            for method in root.findall('.//test-method'):
-                duration = float(method.get('duration-ms', 0)) / 1000  # Convert to seconds
-                if duration > threshold:
-                    slow_tests.append({
-                        'name': method.get('name'),
-                        'signature': method.get('signature'),
-                        'duration_seconds': duration,
-                        'status': method.get('status')
-                    })
-        else:  # JUnit
-            for testcase in root.findall('.//testcase'):
-                time = float(testcase.get('time', 0))
-                if time > threshold:
-                    slow_tests.append({
-                        'name': testcase.get('name'),
-                        'classname': testcase.get('classname'),
-                        'duration_seconds': time
-                    })
+        tag = 'test-method' if framework == "TestNG" else 'testcase'
+        slow_tests = [entry for entry in (self._slow_test_entry(test, framework, threshold)
+                                          for test in self.document_index(root).find_all(tag, None))
+                      if entry is not None]
         
         # Sort by duration descending
         slow_tests.sort(key=lambda x: x['duration_seconds'], reverse=True)
         
         return slow_tests[:20]  # Top 20 slowest
     
+    def _slow_test_entry(self, test: ET.Element, framework: str,
+                         threshold: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Timing entry for a test-method/testcase slower than threshold seconds"""
+        if framework == "TestNG":
+            duration = float(test.get('duration-ms', 0)) / 1000  # Convert to seconds
+            if duration > threshold:
+                return {
+                    'name': test.get('name'),
+                    'signature': test.get('signature'),
+                    'duration_seconds': duration,
+                    'status': test.get('status')
+                }
+        else:  # JUnit
+            time = float(test.get('time', 0))
+            if time > threshold:
+                return {
+                    'name': test.get('name'),
+                    'classname': test.get('classname'),
+                    'duration_seconds': time
+                }
+        return None
+    
     def _calculate_test_metrics(self, root: ET.Element, framework: str) -> Dict[str, Any]:
         """Calculate various test metrics"""
+        # Get summary stats
+        summary = self._extract_test_summary(root, framework)
+        
+        method_count = 0
+        method_time = 0
+        failure_rate_by_suite = {}
+        
+        if framework == "TestNG":
+            for method in self.document_index(root).find_all('test-method', None):
+                method_count += 1
+                method_time += float(method.get('duration-ms', 0)) / 1000
+            
+            for suite in self.document_index(root).find_all('suite', None):
+                methods = suite.findall('.//test-method')
+                failed = sum(1 for method in methods if method.get('status') == 'FAIL')
+                if methods:
+                    failure_rate_by_suite[suite.get('name')] = failed / len(methods)
+        else:  # JUnit
+            for suite in self.document_index(root).find_all('testsuite', None):
+                total = int(suite.get('tests', 0))
+                failed = int(suite.get('failures', 0)) + int(suite.get('errors', 0))
+                
+                if total > 0:
+                    failure_rate_by_suite[suite.get('name')] = failed / total
+        
+        return self._test_metrics(summary, framework, method_count, method_time, failure_rate_by_suite)
+    
+    def _test_metrics(self, summary: Dict[str, Any], framework: str, method_count: int,
+                      method_time: float, failure_rate_by_suite: Dict[str, float]) -> Dict[str, Any]:
+        """Test metrics from the summary, TestNG method totals and per-suite failure rates"""
         metrics = {
             'success_rate': 0.0,
             'average_test_time': 0.0,
             'total_execution_time': 0.0,
             'test_distribution': {},
-            'failure_rate_by_suite': {}
+            'failure_rate_by_suite': failure_rate_by_suite
         }
         
-        # Get summary stats
-        summary = self._extract_test_summary(root, framework)
-        
         # Calculate success rate
         if summary['total'] > 0:
             metrics['success_rate'] = summary['passed'] / summary['total']
         
         # Calculate average test time
         if framework == "TestNG":
-            test_count = 0
-            total_time = 0
-            for method in root.findall('.//test-method'):
-                test_count += 1
-                total_time += float(method.get('duration-ms', 0)) / 1000
-            
-            if test_count > 0:
-                metrics['average_test_time'] = total_time / test_count
-            metrics['total_execution_time'] = total_time
+            test_count = method_count
+            total_time = method_time
         else:  # JUnit
             test_count = summary['total']
             total_time = summary['duration_seconds']
-            
-            if test_count > 0:
-                metrics['average_test_time'] = total_time / test_count
-            metrics['total_execution_time'] = total_time
+        
+        if test_count > 0:
+            metrics['average_test_time'] = total_time / test_count
+        metrics['total_execution_time'] = total_time
         
         # Test distribution by status
         metrics['test_distribution'] = {
@@ -474,69 +709,21 @@ class TestReportHandler(XMLHandler):
             'error': summary.get('errors', 0)
         }
         
-        # Failure rate by suite
-        if framework == "TestNG":
-            for suite in root.findall('.//suite'):
-                suite_name = suite.get('name')
-                suite_stats = {
-                    'total': 0,
-                    'failed': 0
-                }
-                
-                for method in suite.findall('.//test-method'):
-                    suite_stats['total'] += 1
-                    if method.get('status') == 'FAIL':
-                        suite_stats['failed'] += 1
-                
-                if suite_stats['total'] > 0:
-                    metrics['failure_rate_by_suite'][suite_name] = suite_stats['failed'] / suite_stats['total']
-        else:  # JUnit
-            for suite in root.findall('.//testsuite'):
-                suite_name = suite.get('name')
-                total = int(suite.get('tests', 0))
-                failed = int(suite.get('failures', 0)) + int(suite.get('errors', 0))
-                
-                if total > 0:
-                    metrics['failure_rate_by_suite'][suite_name] = failed / total
-        
         return metrics
     
     def _categorize_errors(self, root: ET.Element, framework: str) -> Dict[str, List[Dict[str, Any]]]:
         """Categorize test failures by error type"""
-        error_categories = {
-            'assertion_errors': [],
-            'null_pointer': [],
-            'timeout': [],
-            'setup_errors': [],
-            'other': []
-        }
+        error_categories = self._new_error_categories()
         
         if framework == "TestNG":
-            for method in root.findall('.//test-method[@status="FAIL"]'):
-                exception = method.find('.//exception')
-                if exception is not None:
-                    error_info = {
-                        'test': method.get('name'),
-                        'exception_class': exception.get('class'),
-                        'message': self._get_child_text(exception, 'message')
-                    }
-                    
-                    self._categorize_single_error(error_info, error_categories)
+            tests = self._failed_methods(root)
         else:  # JUnit
-            for testcase in root.findall('.//testcase'):
-                failure = testcase.find('.//failure')
-                error = testcase.find('.//error')
-                
-                if failure is not None or error is not None:
-                    fail_elem = failure if failure is not None else error
-                    error_info = {
-                        'test': testcase.get('name'),
-                        'class': testcase.get('classname'),
-                        'exception_class': fail_elem.get('type'),
-                        'message': fail_elem.get('message')
-                    }
-                    
-                    self._categorize_single_error(error_info, error_categories)
+            tests = self.document_index(root).find_all('testcase', None)
+        
+        for test in tests:
+            error_info = self._error_info(test, framework)
+            if error_info is not None:
+                self._categorize_single_error(error_info, error_categories)
         
         # Limit each category
         for category in error_categories:
@@ -544,6 +731,39 @@ class TestReportHandler(XMLHandler):
         
         return error_categories
     
+    def _new_error_categories(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            'assertion_errors': [],
+            'null_pointer': [],
+            'timeout': [],
+            'setup_errors': [],
+            'other': []
+        }
+    
+    def _error_info(self, test: ET.Element, framework: str) -> Optional[Dict[str, Any]]:
+        """Exception summary of a failed test-method/testcase, or None"""
+        if framework == "TestNG":
+            exception = test.find('.//exception') if test.get('status') == 'FAIL' else None
+            if exception is None:
+                return None
+            return {
+                'test': test.get('name'),
+                'exception_class': exception.get('class'),
+                'message': self._get_child_text(exception, 'message')
+            }
+        
+        failure = test.find('.//failure')
+        error = test.find('.//error')
+        if failure is None and error is None:
+            return None
+        fail_elem = failure if failure is not None else error
+        return {
+            'test': test.get('name'),
+            'class': test.get('classname'),
+            'exception_class': fail_elem.get('type'),
+            'message': fail_elem.get('message')
+        }
+    
     def _categorize_single_error(self, error_info: Dict[str, Any], categories: Dict[str, List]):
         """Categorize a single error"""
         exception_class = error_info.get('exception_class', '').lower()
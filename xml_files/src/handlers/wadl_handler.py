@@ -17,7 +17,7 @@ from urllib.parse import urljoin, urlparse
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class WADLHandler(XMLHandler):
@@ -25,6 +25,8 @@ class WADLHandler(XMLHandler):
     
     WADL_NAMESPACE = "http://wadl.dev.java.net/2009/02"
     WADL_NAMESPACE_ALT = "http://research.sun.com/wadl/2006/10"
+    DETECTION_ROOT_ELEMENTS = ['application']
+    DETECTION_NAMESPACES = ['wadl.dev.java.net', 'research.sun.com/wadl', 'java.net/wadl']
     
     def _get_namespace(self, root: ET.Element) -> str:
         """Extract namespace prefix from root element"""
@@ -143,8 +145,8 @@ class WADLHandler(XMLHandler):
                 'documentation_coverage': findings['documentation']['coverage_score']
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_api_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_api_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -15,7 +15,7 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class WSDLHandler(XMLHandler):
@@ -97,8 +97,8 @@ class WSDLHandler(XMLHandler):
                 'bindings': len(findings.get('bindings', []))
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_wsdl_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_wsdl_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
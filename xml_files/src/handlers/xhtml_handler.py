@@ -17,13 +17,15 @@ from urllib.parse import urlparse
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class XHTMLHandler(XMLHandler):
     """Handler for XHTML documents"""
     
     XHTML_NAMESPACE = "http://www.w3.org/1999/xhtml"
+    DETECTION_ROOT_ELEMENTS = ['html']
+    DETECTION_NAMESPACES = ['w3.org/1999/xhtml']
     
     def _get_namespace(self, root: ET.Element) -> str:
         """Extract namespace prefix from root element"""
@@ -154,8 +156,8 @@ class XHTMLHandler(XMLHandler):
                 'images': findings['links_and_media']['images']
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
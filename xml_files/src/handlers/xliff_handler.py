@@ -17,7 +17,8 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
+from core.document_index import DocumentIndex
 
 
 class XLIFFHandler(XMLHandler):
@@ -44,10 +45,19 @@ class XLIFFHandler(XMLHandler):
     
     def _find_elements_by_local_name(self, root: ET.Element, local_name: str) -> List[ET.Element]:
         """Find elements by local name, ignoring namespace prefixes"""
+        # Document-level lookups are served by the shared index; subtrees
+        # (a single trans-unit or file) are small enough to scan directly
+        index = DocumentIndex.cached(root)
+        if index is not None:
+            return list(index.by_local_name.get(local_name, ()))
         return [elem for elem in root.iter() if elem.tag.split('}')[-1] == local_name]
     
     def _find_element_by_local_name(self, root: ET.Element, local_name: str) -> Optional[ET.Element]:
         """Find first element by local name, ignoring namespace prefixes"""
+        index = DocumentIndex.cached(root)
+        if index is not None:
+            elements = index.by_local_name.get(local_name)
+            return elements[0] if elements else None
         for elem in root.iter():
             if elem.tag.split('}')[-1] == local_name:
                 return elem
@@ -204,8 +214,8 @@ class XLIFFHandler(XMLHandler):
                 'completion_rate': findings['quality_metrics']['completion_rate']
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_translation_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_translation_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -15,7 +15,7 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis
+from core.analyzer import XMLHandler, DocumentTypeInfo, SpecializedAnalysis, Deferred
 
 
 class XSDSchemaHandler(XMLHandler):
@@ -100,8 +100,8 @@ class XSDSchemaHandler(XMLHandler):
                 'validation_rules': len(findings['validation_rules'])
             },
             ai_use_cases=ai_use_cases,
-            structured_data=self.extract_key_data(root),
-            quality_metrics=self._assess_schema_quality(findings)
+            structured_data=Deferred(self.extract_key_data, root),
+            quality_metrics=Deferred(self._assess_schema_quality, findings)
         )
     
     def extract_key_data(self, root: ET.Element) -> Dict[str, Any]:
@@ -24,11 +24,16 @@ from collections import defaultdict, Counter
 import json
 import re
 import hashlib
+import mmap
+import random
+from array import array
 from typing import Dict, List, Set, Any, Optional, Generator, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
 
+from core.source_map import SourceMap
+
 @dataclass
 class XMLElement:
     """Represents an XML element with all its metadata"""
@@ -41,7 +46,7 @@ class XMLElement:
     parent_elements: Set[str]
     child_elements: Set[str]
     paths: Set[str]
-    line_numbers: List[int]
+    line_numbers: List[int]  # A sample of the lines the element starts on
 
 @dataclass
 class DocumentSchema:
@@ -66,9 +71,17 @@ class DocumentChunk:
     summary: str
 
 class XMLStreamHandler(ContentHandler):
-    """SAX handler for memory-efficient XML analysis"""
+    """
+    SAX handler for memory-efficient XML analysis
+
+    Memory depends on the number of distinct elements and paths, not on
+    the size of the document: text is buffered in a list and only up to
+    the sample length, each element keeps a fixed-size reservoir of the
+    lines it starts on (from the parser's Locator), and paths are interned
+    as IDs so a path string is built once, when it is first seen.
+    """
     
-    def __init__(self, max_samples=5, max_text_length=200):
+    def __init__(self, max_samples=5, max_text_length=200, max_line_samples=20, seed=0):
         super().__init__()
         self.elements = defaultdict(lambda: XMLElement(
             tag="", namespace=None, count=0, depths=set(), attributes=defaultdict(set),
@@ -77,11 +90,19 @@ class XMLStreamHandler(ContentHandler):
         ))
         self.namespaces = {}
         self.element_stack = []
-        self.path_stack = []
-        self.current_text = ""
+        self.path_stack = []  # Interned IDs of the open elements' paths
+        self.path_ids: Dict[Tuple[int, str], int] = {}  # (parent path ID, local name) -> path ID
+        self.path_names: List[str] = []  # Path of each ID
+        self.text_parts: List[str] = []  # Text since the last tag, leading whitespace dropped
+        self.text_length = 0
         self.max_samples = max_samples
         self.max_text_length = max_text_length
-        self.line_number = 1
+        self.max_line_samples = max_line_samples
+        self.random = random.Random(seed)  # Reservoir sampling, reproducible per document
+        self.locator = None
+    
+    def setDocumentLocator(self, locator):
+        self.locator = locator
         
     def startNamespace(self, prefix, uri):
         if prefix:
@@ -89,24 +110,42 @@ class XMLStreamHandler(ContentHandler):
         else:
             self.namespaces['default'] = uri
     
+    def startPrefixMapping(self, prefix, uri):
+        self.startNamespace(prefix, uri)
+    
     def startElement(self, name, attrs):
         # Parse namespace and local name
         if ':' in name:
             namespace, local_name = name.split(':', 1)
         else:
             namespace, local_name = None, name
-            
+        self._start_element(local_name, namespace,
+                            ((attr_name.split(':')[-1], attrs.getValue(attr_name))  # Remove namespace prefix
+                             for attr_name in attrs.getNames()))
+    
+    def startElementNS(self, name, qname, attrs):
+        namespace, local_name = name
+        self._start_element(local_name, namespace,
+                            ((attr_name[1], attrs.getValue(attr_name)) for attr_name in attrs.getNames()))
+    
+    def _start_element(self, local_name, namespace, attributes):
         # Update element info
         element_info = self.elements[local_name]
         element_info.tag = local_name
         element_info.namespace = namespace
         element_info.count += 1
         element_info.depths.add(len(self.element_stack))
-        element_info.line_numbers.append(self.line_number)
-        
-        # Track path
-        current_path = '/'.join(self.path_stack + [local_name])
-        element_info.paths.add(current_path)
+        if self.locator is not None:
+            self._sample_line(element_info, self.locator.getLineNumber())
+        
+        # Track path; only a path not seen before is joined into a string
+        parent_id = self.path_stack[-1] if self.path_stack else -1
+        path_id = self.path_ids.get((parent_id, local_name))
+        if path_id is None:
+            path_id = self.path_ids[(parent_id, local_name)] = len(self.path_names)
+            path = f"{self.path_names[parent_id]}/{local_name}" if parent_id >= 0 else local_name
+            self.path_names.append(path)
+            element_info.paths.add(path)
         
         # Parent-child relationships
         if self.element_stack:
@@ -115,35 +154,59 @@ class XMLStreamHandler(ContentHandler):
             self.elements[parent_tag].child_elements.add(local_name)
         
         # Store attributes
-        for attr_name in attrs.getNames():
-            attr_value = attrs.getValue(attr_name)
-            clean_attr = attr_name.split(':')[-1]  # Remove namespace prefix
-            element_info.attributes[clean_attr].add(attr_value[:50])  # Limit length
+        for attr_name, attr_value in attributes:
+            element_info.attributes[attr_name].add(attr_value[:50])  # Limit length
         
         self.element_stack.append(local_name)
-        self.path_stack.append(local_name)
-        self.current_text = ""
+        self.path_stack.append(path_id)
+        self._clear_text()
+    
+    def _sample_line(self, element_info, line):
+        """Keep a uniform sample of max_line_samples start lines (reservoir sampling)"""
+        lines = element_info.line_numbers
+        if len(lines) < self.max_line_samples:
+            lines.append(line)
+        else:
+            slot = self.random.randrange(element_info.count)
+            if slot < self.max_line_samples:
+                lines[slot] = line
     
     def endElement(self, name):
         local_name = name.split(':', 1)[-1] if ':' in name else name
-        
+        self._end_element(local_name)
+    
+    def endElementNS(self, name, qname):
+        self._end_element(name[1])
+    
+    def _end_element(self, local_name):
         # Store text content if any
-        if self.current_text.strip() and local_name in self.elements:
+        if self.text_parts and local_name in self.elements:
             element_info = self.elements[local_name]
             if len(element_info.text_samples) < self.max_samples:
-                text = self.current_text.strip()[:self.max_text_length]
+                text = ''.join(self.text_parts).strip()[:self.max_text_length]
                 element_info.text_samples.append(text)
         
         if self.element_stack:
             self.element_stack.pop()
         if self.path_stack:
             self.path_stack.pop()
-        self.current_text = ""
+        self._clear_text()
     
     def characters(self, content):
-        self.current_text += content
-        # Count line numbers
-        self.line_number += content.count('\n')
+        # Text past the sample length would be cut off anyway
+        if self.text_length >= self.max_text_length:
+            return
+        if not self.text_parts:
+            content = content.lstrip()
+            if not content:
+                return
+        self.text_parts.append(content)
+        self.text_length += len(content)
+    
+    def _clear_text(self):
+        if self.text_parts:
+            self.text_parts.clear()
+            self.text_length = 0
 
 class DocumentTypeDetector:
     """Detects and classifies XML document types"""
@@ -207,6 +270,32 @@ class DocumentTypeDetector:
         
         return 'GENERIC_XML'
 
+class NewlineIndex:
+    """
+    Line numbers of byte offsets in a buffer, from newline counts taken
+    once per block
+
+    Building the index counts newlines block by block in a single pass.
+    A lookup adds the newlines before the offset's block to those between
+    the block start and the offset, so it scans at most one block instead
+    of the whole prefix, and the index holds one integer per block rather
+    than one per line.
+    """
+    
+    BLOCK_SIZE = 64 * 1024
+    
+    def __init__(self, data):
+        self.data = data
+        self.lines_before = array('q', [0])  # Newlines before each block
+        for offset in range(0, len(data), self.BLOCK_SIZE):
+            self.lines_before.append(self.lines_before[-1] + data[offset:offset + self.BLOCK_SIZE].count(b'\n'))
+    
+    def line(self, offset: int) -> int:
+        """1-based line of the byte at offset"""
+        block = offset // self.BLOCK_SIZE
+        block_start = block * self.BLOCK_SIZE
+        return self.lines_before[block] + self.data[block_start:offset].count(b'\n') + 1
+
 class XMLChunker:
     """Chunks XML documents for LLM processing"""
     
@@ -215,7 +304,20 @@ class XMLChunker:
         self.overlap_size = overlap_size
     
     def chunk_by_elements(self, file_path: str, schema: DocumentSchema) -> List[DocumentChunk]:
-        """Chunk document by major structural elements"""
+        """
+        Chunk document by major structural elements
+
+        The document is streamed through a SourceMap. Each outermost major
+        element is taken once, when it ends; consecutive ones are grouped
+        while the chunk stays within max_chunk_size bytes (a larger element
+        is a chunk of its own). A chunk is the file's text from the end of
+        the previous chunk to the end of its last major element, so markup
+        between major elements is kept and nothing is in two chunks. Ended
+        elements are cleared and detached, so only the open major element
+        and its ancestors are held. Lines come from the parser's line
+        numbers. As in chunk_by_size, content has its newlines normalized
+        to \\n and size_bytes is the UTF-8 size of that content.
+        """
         chunks = []
         
         # Identify major structural elements (low frequency, high child count)
@@ -229,92 +331,155 @@ class XMLChunker:
             # Fallback to size-based chunking
             return self.chunk_by_size(file_path)
         
-        # Parse and chunk by major elements
-        current_chunk = ""
-        chunk_elements = []
-        line_start = 1
-        
-        context = ET.iterparse(file_path, events=('start', 'end'))
-        
-        for event, elem in context:
-            tag_name = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
+        with SourceMap(file_path) as source:
+            if not source.has_positions:
+                return self.chunk_by_size(file_path)
+            
+            stack = []  # Open elements
+            path = []  # Their local names
+            open_major = 0  # Open major elements
+            first_path = None  # Path of the chunk's first major element
+            cut, cut_line = 0, 1  # Where the current chunk starts
+            run_end, run_line = 0, 1  # End of its last major element
+            chunk_elements = []
+            root_end, root_line = 0, 1
             
-            if event == 'start' and tag_name in major_elements:
-                if current_chunk and len(current_chunk) > 1000:  # Minimum chunk size
-                    chunk_id = hashlib.md5(current_chunk.encode()).hexdigest()[:8]
-                    chunks.append(DocumentChunk(
-                        chunk_id=chunk_id,
-                        content=current_chunk,
-                        element_path=f"/{'/'.join(chunk_elements)}",
-                        line_range=(line_start, line_start + current_chunk.count('\n')),
-                        size_bytes=len(current_chunk.encode()),
-                        elements_contained=chunk_elements.copy(),
-                        summary=f"Contains {len(chunk_elements)} elements including {tag_name}"
-                    ))
-                    current_chunk = ""
-                    chunk_elements = []
-                    line_start += current_chunk.count('\n')
+            for event, elem in source.iterparse():
+                tag_name = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
                 
-                chunk_elements.append(tag_name)
+                if event == 'start':
+                    stack.append(elem)
+                    path.append(tag_name)
+                    if tag_name in major_elements:
+                        open_major += 1
+                        if open_major == 1 and first_path is None:
+                            first_path = '/' + '/'.join(path)
+                    continue
+                
+                stack.pop()
+                path.pop()
+                if tag_name in major_elements:
+                    open_major -= 1
+                    if open_major == 0:
+                        start, end = source.span(elem)
+                        if chunk_elements and end - cut > self.max_chunk_size:
+                            chunks.append(self._element_chunk(source, cut, run_end, (cut_line, run_line),
+                                                              first_path, chunk_elements))
+                            cut, cut_line = run_end, run_line
+                            first_path = '/' + '/'.join(path + [tag_name])
+                            chunk_elements = []
+                        chunk_elements.append(tag_name)
+                        run_end, run_line = end, source.lines(elem)[1]
+                
+                if open_major == 0:
+                    # Its text is in the chunks as a slice of the file
+                    if not stack:
+                        root_end, root_line = source.span(elem)[1], source.lines(elem)[1]
+                    source.forget(elem)
+                    elem.clear()
+                    if stack:
+                        stack[-1].remove(elem)
             
-            if len(current_chunk) < self.max_chunk_size:
-                current_chunk += ET.tostring(elem, encoding='unicode') if event == 'end' else ""
-        
-        # Add final chunk
-        if current_chunk:
-            chunk_id = hashlib.md5(current_chunk.encode()).hexdigest()[:8]
-            chunks.append(DocumentChunk(
-                chunk_id=chunk_id,
-                content=current_chunk,
-                element_path=f"/{'/'.join(chunk_elements)}",
-                line_range=(line_start, line_start + current_chunk.count('\n')),
-                size_bytes=len(current_chunk.encode()),
-                elements_contained=chunk_elements,
-                summary=f"Final chunk with {len(chunk_elements)} elements"
-            ))
+            # Add final chunk, with whatever follows the root
+            size = Path(file_path).stat().st_size
+            if cut < size:
+                end_line = root_line + source.slice(root_end, size).count('\n')
+                chunks.append(self._element_chunk(source, cut, size, (cut_line, end_line),
+                                                  first_path or '/', chunk_elements))
         
         return chunks
     
+    def _element_chunk(self, source: SourceMap, start: int, end: int, line_range: Tuple[int, int],
+                       element_path: str, chunk_elements: List[str]) -> DocumentChunk:
+        content = source.slice(start, end).replace('\r\n', '\n').replace('\r', '\n')
+        return DocumentChunk(
+            chunk_id=hashlib.md5(content.encode()).hexdigest()[:8],
+            content=content,
+            element_path=element_path,
+            line_range=line_range,
+            size_bytes=len(content.encode('utf-8')),
+            elements_contained=chunk_elements,
+            summary=f"Contains {len(chunk_elements)} elements" + (
+                f" including {chunk_elements[0]}" if chunk_elements else "")
+        )
+    
     def chunk_by_size(self, file_path: str) -> List[DocumentChunk]:
         """Fallback chunking by size with XML awareness"""
-        chunks = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Simple size-based chunking with element boundary awareness
-        start = 0
-        chunk_num = 0
-        
-        while start < len(content):
-            end = min(start + self.max_chunk_size, len(content))
-            
-            # Try to end at element boundary
-            if end < len(content):
-                # Find last complete element
-                last_element_end = content.rfind('</', start, end)
-                if last_element_end > start + self.max_chunk_size // 2:
-                    element_end = content.find('>', last_element_end)
-                    if element_end != -1:
-                        end = element_end + 1
-            
-            chunk_content = content[start:end]
-            chunk_id = f"chunk_{chunk_num:03d}"
+        return list(self.iter_chunks_by_size(file_path))
+    
+    def iter_chunks_by_size(self, file_path: str) -> Generator[DocumentChunk, None, None]:
+        """
+        Yield the chunks of chunk_by_size one at a time
+
+        The file is memory-mapped and cut into windows of max_chunk_size
+        bytes (UTF-8, a CRLF counting as two), so only the current chunk is
+        decoded, never the whole file. Windows never split a character or
+        a CRLF, and chunk content has its newlines normalized to \\n as
+        when reading the file as text. Line ranges come from a NewlineIndex
+        built once.
+        """
+        with open(file_path, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                return
+        
+        try:
+            lines = NewlineIndex(data)
+            size = len(data)
             
-            chunks.append(DocumentChunk(
-                chunk_id=chunk_id,
-                content=chunk_content,
-                element_path="size_based",
-                line_range=(content[:start].count('\n') + 1, content[:end].count('\n') + 1),
-                size_bytes=len(chunk_content.encode()),
-                elements_contained=[],
-                summary=f"Size-based chunk {chunk_num}"
-            ))
+            # Simple size-based chunking with element boundary awareness
+            start = 0
+            chunk_num = 0
             
-            start = end - self.overlap_size if end < len(content) else end
-            chunk_num += 1
-        
-        return chunks
+            while start < size:
+                end = min(start + self.max_chunk_size, size)
+                
+                # Try to end at element boundary
+                if end < size:
+                    # Find last complete element
+                    last_element_end = data.rfind(b'</', start, end)
+                    if last_element_end > start + self.max_chunk_size // 2:
+                        element_end = data.find(b'>', last_element_end)
+                        if element_end != -1:
+                            end = element_end + 1
+                    end = self._char_boundary(data, end, start)
+                
+                chunk_content = data[start:end].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+                chunk_id = f"chunk_{chunk_num:03d}"
+                
+                yield DocumentChunk(
+                    chunk_id=chunk_id,
+                    content=chunk_content,
+                    element_path="size_based",
+                    line_range=(lines.line(start), lines.line(end)),
+                    size_bytes=len(chunk_content.encode('utf-8')),
+                    elements_contained=[],
+                    summary=f"Size-based chunk {chunk_num}"
+                )
+                
+                if end < size and end - self.overlap_size > start:
+                    start = self._char_boundary(data, end - self.overlap_size, start)
+                else:
+                    start = end
+                chunk_num += 1
+        finally:
+            data.close()
+    
+    @staticmethod
+    def _char_boundary(data, offset: int, floor: int) -> int:
+        """Start of the character (UTF-8 sequence or CRLF) at offset, or of the next one if that is not past floor"""
+        def inside(i):
+            return 0x80 <= data[i] < 0xC0 or (data[i] == 0x0A and i > 0 and data[i - 1] == 0x0D)
+        
+        boundary = offset
+        while boundary > floor and inside(boundary):
+            boundary -= 1
+        if boundary > floor:
+            return boundary
+        while offset < len(data) and inside(offset):
+            offset += 1
+        return offset
 
 class LLMPromptGenerator:
     """Generates prompts for LLM analysis of XML documents"""
@@ -493,11 +658,11 @@ class XMLAgentFramework:
                 parent_elements=element.parent_elements,
                 child_elements=element.child_elements,
                 paths=element.paths,
-                line_numbers=element.line_numbers
+                line_numbers=sorted(element.line_numbers)
             )
         
         schema = DocumentSchema(
-            document_type=DocumentTypeDetector.detect_type(None),  # Will be set after creation
+            document_type='',  # Will be set after creation
             root_element=root_element,
             namespaces=handler.namespaces,
             elements=elements_dict,
@@ -541,9 +706,11 @@ class XMLAgentFramework:
         
         return tree
     
-    def _build_subtree(self, tag: str, elements: Dict[str, XMLElement]) -> Dict[str, Any]:
-        """Recursively build structure subtree"""
+    def _build_subtree(self, tag: str, elements: Dict[str, XMLElement],
+                       ancestors: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Recursively build structure subtree, not expanding tags already on the path"""
         element = elements[tag]
+        ancestors = (ancestors or set()) | {tag}
         
         node = {
             "count": element.count,
@@ -554,8 +721,11 @@ class XMLAgentFramework:
         }
         
         for child_tag in element.child_elements:
-            if child_tag in elements:
-                node["children"][child_tag] = self._build_subtree(child_tag, elements)
+            if child_tag in ancestors:
+                # Self-nesting tags (div in div, Group in Group) would recurse forever
+                node["children"][child_tag] = {"recursive": True}
+            elif child_tag in elements:
+                node["children"][child_tag] = self._build_subtree(child_tag, elements, ancestors)
         
         return node
     
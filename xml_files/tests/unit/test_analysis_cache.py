@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk analysis result cache
+Checks content-hash hits, handler version invalidation, LRU eviction and
+sharing one cache directory between batch worker processes.
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.cache import AnalysisCache, content_digest
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def _counting_analyzer(cache):
+    """Analyzer that counts how many documents were actually parsed"""
+    analyzer = XMLDocumentAnalyzer(cache=cache)
+    analyzer.parsed = 0
+    analyze_uncached = analyzer._analyze_uncached
+
+    def counted(file_path, *args):
+        analyzer.parsed += 1
+        return analyze_uncached(file_path, *args)
+
+    analyzer._analyze_uncached = counted
+    return analyzer
+
+
+def _sample_file():
+    return next(p for p in sorted(SYNTHETIC_DIR.rglob("*.xml")))
+
+
+def test_unchanged_file_is_served_from_cache():
+    """A second analysis of the same content skips parsing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = _counting_analyzer(AnalysisCache(tmp))
+        sample = _sample_file()
+
+        first = analyzer.analyze_document(str(sample))
+        second = analyzer.analyze_document(str(sample))
+
+        assert analyzer.parsed == 1
+        assert analyzer.cache.hits == 1
+        assert second['handler_used'] == first['handler_used']
+        assert second['document_type'] == first['document_type']
+
+
+def test_same_content_at_new_path():
+    """Entries are keyed by content, and the result reports the new path"""
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = _counting_analyzer(AnalysisCache(Path(tmp) / "cache"))
+        sample = _sample_file()
+        copy = Path(tmp) / "copy.xml"
+        shutil.copy(sample, copy)
+
+        analyzer.analyze_document(str(sample))
+        result = analyzer.analyze_document(str(copy))
+
+        assert analyzer.parsed == 1
+        assert result['file_path'] == str(copy)
+
+
+def test_changed_content_and_handler_version_miss():
+    """Edited files and bumped handler versions are re-analyzed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = _counting_analyzer(AnalysisCache(Path(tmp) / "cache"))
+        path = Path(tmp) / "doc.xml"
+        path.write_text('<inventory><item id="1"/></inventory>')
+
+        result = analyzer.analyze_document(str(path))
+        path.write_text('<inventory><item id="1"/><item id="2"/></inventory>')
+        analyzer.analyze_document(str(path))
+        assert analyzer.parsed == 2
+
+        analyzer.handler_versions[result['handler_used']] = "999"
+        analyzer.analyze_document(str(path))
+        assert analyzer.parsed == 3
+
+
+def test_analysis_modes_cached_apart():
+    """Streamed and tree results of the same content are separate entries"""
+    sample = SYNTHETIC_DIR / "sitemap" / "urlset.xml"
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = _counting_analyzer(AnalysisCache(tmp))
+        streaming = _counting_analyzer(AnalysisCache(tmp))
+        streaming.streaming_threshold = 0
+
+        assert 'analysis_mode' not in tree.analyze_document(str(sample))
+        assert streaming.analyze_document(str(sample))['analysis_mode'] == 'streaming'
+        assert streaming.analyze_document(str(sample))['analysis_mode'] == 'streaming'
+        assert 'analysis_mode' not in tree.analyze_document(str(sample))
+        assert tree.parsed == 1 and streaming.parsed == 1
+
+
+def test_errors_are_not_cached():
+    """Parse failures are recomputed rather than stored"""
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = _counting_analyzer(AnalysisCache(Path(tmp) / "cache"))
+        path = Path(tmp) / "broken.xml"
+        path.write_text('<root><unclosed></root>')
+
+        assert 'error' in analyzer.analyze_document(str(path))
+        assert 'error' in analyzer.analyze_document(str(path))
+        assert analyzer.parsed == 2
+
+
+def test_lru_eviction():
+    """The least recently used entries are evicted first"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnalysisCache(tmp, max_bytes=10 ** 9)
+        payload = {'handler_used': 'GenericXMLHandler', 'blob': 'x' * 1000}
+        digests = [f"{i:064x}" for i in range(5)]
+        for offset, digest in enumerate(digests):
+            cache.put(digest, payload, "1.0")
+            entry = cache._entry_path(digest)
+            os.utime(entry, (time.time() - 100 + offset, time.time() - 100 + offset))
+
+        # Touch the oldest entry so it becomes the most recently used
+        assert cache.get(digests[0], {'GenericXMLHandler': '1.0'}) is not None
+
+        cache.max_bytes = cache.stats()['size_bytes'] // 2
+        removed = cache.evict()
+
+        assert removed >= 2
+        assert cache.stats()['size_bytes'] <= cache.max_bytes
+        assert cache.get(digests[0], {'GenericXMLHandler': '1.0'}) is not None
+        assert cache.get(digests[1], {'GenericXMLHandler': '1.0'}) is None
+
+
+def test_workers_share_cache_directory():
+    """Batch workers populate and then read the same cache directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnalysisCache(tmp)
+        analyzer = XMLDocumentAnalyzer(cache=cache)
+        files = sorted(str(p) for p in SYNTHETIC_DIR.rglob("*.xml"))[:8]
+
+        first = {r['file_path']: r for r in analyzer.analyze_many(files, workers=2)}
+        entries = list(Path(tmp).glob('*/*.pkl'))
+        second = {r['file_path']: r for r in analyzer.analyze_many(files, workers=2)}
+
+        assert len(entries) == len({content_digest(f) for f in files})
+        for path in files:
+            assert second[path]['handler_used'] == first[path]['handler_used']
+        assert len(list(Path(tmp).glob('*/*.pkl'))) == len(entries)
+
+
+if __name__ == "__main__":
+    print("🧪 Analysis Cache Test Suite")
+    print("=" * 50)
+    test_unchanged_file_is_served_from_cache()
+    test_same_content_at_new_path()
+    test_changed_content_and_handler_version_miss()
+    test_analysis_modes_cached_apart()
+    test_errors_are_not_cached()
+    test_lru_eviction()
+    test_workers_share_cache_directory()
+    print("🎉 All analysis cache tests passed!")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel batch analysis
+Checks that analyze_many() agrees with analyze_document(), streams records
+to JSONL and turns timeouts and failures into error records.
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+import core.batch
+from core.analyzer import XMLDocumentAnalyzer
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def _exit_on_crash_file(file_path):
+    """Worker task that kills its process on a file named crash.xml"""
+    if file_path.endswith('crash.xml'):
+        os._exit(1)
+    return core.batch._analyze_one(core.batch._worker_analyzer, file_path)
+
+
+def _sample_files():
+    return sorted(str(p) for p in SYNTHETIC_DIR.rglob("*.xml"))
+
+
+def test_parallel_matches_serial():
+    """Every file is analyzed once, with the same handler as a serial run"""
+    analyzer = XMLDocumentAnalyzer()
+    files = _sample_files()
+    assert files
+
+    records = list(analyzer.analyze_many(files, workers=2))
+
+    assert sorted(r['file_path'] for r in records) == files
+    for record in records:
+        expected = analyzer.analyze_document(record['file_path'])
+        if 'error' in expected:
+            assert 'error' in record
+            continue
+        assert record['handler_used'] == expected['handler_used']
+        assert record['document_type']['type_name'] == expected['document_type'].type_name
+        assert isinstance(record['analysis'], dict)
+
+
+def test_jsonl_output():
+    """Each record is appended to the JSONL sink as one line"""
+    analyzer = XMLDocumentAnalyzer()
+    files = _sample_files()[:10]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "results.jsonl"
+        records = list(analyzer.analyze_many(files, workers=2, output_path=str(output)))
+        lines = output.read_text(encoding='utf-8').splitlines()
+
+    assert len(lines) == len(records) == len(files)
+    assert {json.loads(line)['file_path'] for line in lines} == set(files)
+
+
+def test_errors_do_not_stop_batch():
+    """Unparseable and missing files yield error records"""
+    analyzer = XMLDocumentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        broken = Path(tmp) / "broken.xml"
+        broken.write_text('<root><unclosed></root>')
+        missing = Path(tmp) / "missing.xml"
+        good = _sample_files()[0]
+
+        records = {r['file_path']: r for r in
+                   analyzer.analyze_many([str(broken), str(missing), good], workers=1)}
+
+    assert 'error' in records[str(broken)]
+    assert 'error' in records[str(missing)]
+    assert 'error' not in records[good]
+
+
+def test_timeout_keeps_pool_alive():
+    """A file over the time limit becomes an error record; others still finish"""
+    analyzer = XMLDocumentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        large = Path(tmp) / "large_sitemap.xml"
+        with open(large, 'w', encoding='utf-8') as f:
+            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            for i in range(100000):
+                f.write(f'<url><loc>https://example.com/{i}</loc></url>\n')
+            f.write('</urlset>\n')
+        files = [str(large)] + _sample_files()[:6]
+
+        records = {r['file_path']: r for r in
+                   analyzer.analyze_many(files, workers=2, timeout=0.05)}
+
+    assert 'timed out' in records[str(large)]['error']
+    assert len(records) == len(files)
+    assert sum('error' not in r for r in records.values()) >= 1
+
+
+def test_dead_worker_does_not_stop_batch():
+    """Only the file that kills its worker gets an error record"""
+    analyzer = XMLDocumentAnalyzer()
+    worker_analyze = core.batch._worker_analyze
+    # Forked workers see the patched task
+    core.batch._worker_analyze = _exit_on_crash_file
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            crash = Path(tmp) / "crash.xml"
+            crash.write_text('<root/>')
+            files = _sample_files()[:6] + [str(crash)] + _sample_files()[6:30]
+            records = {r['file_path']: r for r in analyzer.analyze_many(files, workers=2)}
+            expected = {path: 'error' in analyzer.analyze_document(path) for path in files if path != str(crash)}
+    finally:
+        core.batch._worker_analyze = worker_analyze
+
+    assert set(records) == set(files)
+    assert 'Worker failed' in records[str(crash)]['error']
+    # Files in flight with it are retried rather than reported
+    assert {path: 'error' in records[path] for path in expected} == expected
+
+
+if __name__ == "__main__":
+    print("🧪 Batch Analysis Test Suite")
+    print("=" * 50)
+    test_parallel_matches_serial()
+    test_jsonl_output()
+    test_errors_do_not_stop_batch()
+    test_timeout_keeps_pool_alive()
+    test_dead_worker_does_not_stop_batch()
+    print("🎉 All batch analysis tests passed!")
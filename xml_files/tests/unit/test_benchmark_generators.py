@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the benchmark corpus generators
+Checks that generated and scaled documents reach the requested size, are
+well-formed, are reproducible, and are routed to the intended handlers.
+"""
+
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../benchmarks'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from generators import (GENERATORS, EXPECTED_HANDLERS, generate, scale_sample,
+                        parse_size, format_size)
+from run_benchmarks import compare
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+TARGET = 64 * 1024
+
+
+def test_parse_size():
+    """Sizes accept KB/MB/GB suffixes and round-trip through format_size"""
+    assert parse_size('10MB') == 10 * 1024 * 1024
+    assert parse_size('1gb') == 1 << 30
+    assert parse_size('512') == 512
+    assert format_size(parse_size('100MB')) == '100MB'
+
+
+def test_generators_hit_target_and_route():
+    """Every generator writes a well-formed document its handler accepts"""
+    analyzer = XMLDocumentAnalyzer(streaming_threshold=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind in GENERATORS:
+            path = Path(tmp) / f"{kind}.xml"
+            size = generate(kind, path, TARGET)
+            assert TARGET <= size < TARGET * 1.1, (kind, size)
+            ET.parse(path)
+            result = analyzer.analyze_document(str(path))
+            assert result['handler_used'] == EXPECTED_HANDLERS[kind], (kind, result.get('handler_used'))
+
+
+def test_generators_are_reproducible():
+    """The same seed produces the same document"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first = Path(tmp) / "a.xml"
+        second = Path(tmp) / "b.xml"
+        generate('sitemap', first, TARGET, seed=3)
+        generate('sitemap', second, TARGET, seed=3)
+        assert first.read_bytes() == second.read_bytes()
+
+    try:
+        generate('unknown', Path(tmp) / "c.xml", TARGET)
+    except ValueError:
+        pass
+    else:
+        assert False, "expected ValueError"
+
+
+def test_scale_sample_keeps_handler():
+    """Scaled samples keep their namespaces and handler"""
+    analyzer = XMLDocumentAnalyzer(streaming_threshold=None)
+    samples = [SYNTHETIC_DIR / "xliff", SYNTHETIC_DIR / "xhtml", SYNTHETIC_DIR / "pom"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for directory in samples:
+            sample = sorted(directory.iterdir())[0]
+            path = Path(tmp) / f"{directory.name}.xml"
+            size = scale_sample(sample, path, TARGET)
+            assert size >= TARGET
+            original = analyzer.analyze_document(str(sample))
+            scaled = analyzer.analyze_document(str(path))
+            assert scaled['handler_used'] == original['handler_used'], directory.name
+            assert scaled['namespaces'] == original['namespaces'], directory.name
+
+
+def test_compare_flags_regressions():
+    """Baseline comparison reports throughput drops, RSS growth and new failures only"""
+    baseline = [{'corpus': 'gpx-10MB', 'operation': 'analyze', 'strategy': None,
+                 'throughput_mb_s': 10.0, 'peak_rss_bytes': 100}]
+    steady = [dict(baseline[0], throughput_mb_s=9.0, peak_rss_bytes=110)]
+    slower = [dict(baseline[0], throughput_mb_s=5.0, peak_rss_bytes=200)]
+
+    assert compare(steady, baseline, 0.25) == []
+    assert [r['metric'] for r in compare(slower, baseline, 0.25)] == ['throughput_mb_s', 'peak_rss_bytes']
+
+    timed_out = [{'corpus': 'gpx-10MB', 'operation': 'analyze', 'strategy': None,
+                  'error': 'Timed out after 1800s'}]
+    assert [(r['metric'], r['current']) for r in compare(timed_out, baseline, 0.25)] == [
+        ('error', 'Timed out after 1800s')]
+    # Measurements that already failed in the baseline are not regressions
+    assert compare(timed_out, timed_out, 0.25) == []
+
+
+if __name__ == "__main__":
+    print("🧪 Benchmark Generator Test Suite")
+    print("=" * 50)
+    test_parse_size()
+    test_generators_hit_target_and_route()
+    test_generators_are_reproducible()
+    test_scale_sample_keeps_handler()
+    test_compare_flags_regressions()
+    print("🎉 All benchmark generator tests passed!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for packing small chunks
+Checks that adjacent small chunks under one parent are merged within the
+target size, that each constituent's path is kept, and that packing
+reports its chunk-count reduction.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.chunking import ChunkingOrchestrator, ChunkingConfig
+
+POM = {'document_type': {'type_name': 'Maven POM'}}
+
+
+def _pom(count):
+    dependencies = ''.join(
+        f'<dependency><groupId>org.example</groupId><artifactId>lib-{i}</artifactId>'
+        f'<version>1.{i}</version></dependency>' for i in range(count))
+    return (f'<project><modelVersion>4.0.0</modelVersion>'
+            f'<dependencies>{dependencies}</dependencies></project>')
+
+
+def _chunk(text, stream=False, **options):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "pom.xml"
+        path.write_text(text, encoding='utf-8')
+        orchestrator = ChunkingOrchestrator()
+        config = ChunkingConfig(semantic_boundaries=['dependency'], **options)
+        if stream:
+            result = orchestrator.chunk_document_iter(str(path), POM, strategy='hierarchical', config=config)
+            return list(result), result.packer
+        chunks = orchestrator.chunk_document(str(path), POM, strategy='hierarchical', config=config)
+        return chunks, orchestrator.last_packer
+
+
+def test_small_chunks_are_packed():
+    """Dependencies are merged up to the target size, keeping their paths"""
+    unpacked, packer = _chunk(_pom(40), pack_small_chunks=False)
+    assert packer is None and len(unpacked) == 40
+
+    chunks, packer = _chunk(_pom(40), max_chunk_size=300, min_chunk_size=100)
+    assert 1 < len(chunks) < 40
+    assert packer.chunks_in == 40 and packer.chunks_out == len(chunks)
+    assert packer.reduction == 1 - len(chunks) / 40
+    assert all(chunk.token_estimate <= 300 for chunk in chunks)
+
+    constituents = [c for chunk in chunks for c in chunk.metadata.get('constituents', [chunk.metadata])]
+    assert len(constituents) == 40
+    assert all(c['element_path'] == 'project/dependencies/dependency' for c in constituents)
+    assert chunks[0].element_path == 'project/dependencies'
+    assert '\n'.join(chunk.content for chunk in chunks) == '\n'.join(chunk.content for chunk in unpacked)
+
+    # Chunks are renumbered and navigation follows the packed order
+    assert len({chunk.chunk_id for chunk in chunks}) == len(chunks)
+    assert chunks[1].metadata['previous_chunk'] == chunks[0].chunk_id
+    assert chunks[-1].metadata['chunk_index'] == len(chunks) - 1
+
+
+def test_packing_keeps_parents_apart():
+    """Small chunks under different parents are not merged"""
+    text = ('<project><dependencies><dependency><artifactId>a</artifactId></dependency></dependencies>'
+            '<dependencyManagement><dependency><artifactId>b</artifactId></dependency>'
+            '<dependency><artifactId>c</artifactId></dependency></dependencyManagement></project>')
+    chunks, packer = _chunk(text)
+    assert [chunk.element_path for chunk in chunks] == [
+        'project/dependencies/dependency', 'project/dependencyManagement']
+    assert packer.chunks_in == 3 and packer.chunks_out == 2
+
+
+def test_stream_packs_like_chunk_document():
+    """Streamed chunks are packed the same way"""
+    chunks, packer = _chunk(_pom(40), max_chunk_size=300, min_chunk_size=100)
+    streamed, stream_packer = _chunk(_pom(40), stream=True, max_chunk_size=300, min_chunk_size=100)
+    assert [chunk.chunk_id for chunk in streamed] == [chunk.chunk_id for chunk in chunks]
+    assert stream_packer.reduction == packer.reduction
+
+
+def test_sliding_window_is_not_packed():
+    """Sliding windows are already filled to the target size"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "pom.xml"
+        path.write_text(_pom(40), encoding='utf-8')
+        orchestrator = ChunkingOrchestrator()
+        orchestrator.chunk_document(str(path), POM, strategy='sliding_window')
+    assert orchestrator.last_packer is None
+
+
+if __name__ == "__main__":
+    test_small_chunks_are_packed()
+    test_packing_keeps_parents_apart()
+    test_stream_packs_like_chunk_document()
+    test_sliding_window_is_not_packed()
+    print("All chunk packing tests passed")
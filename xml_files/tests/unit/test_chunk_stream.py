@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming chunk generation
+Checks that chunk_document_iter yields the same chunks as chunk_document,
+writes a navigation sidecar, and keeps memory flat as documents grow.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import tracemalloc
+import dataclasses
+from pathlib import Path
+
+# Add the src and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../benchmarks'))
+
+from core.chunking import ChunkingOrchestrator, ChunkingConfig
+from generators import generate
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+XCCDF = {'document_type': {'type_name': 'SCAP/XCCDF Document'}}
+
+
+def _as_dicts(chunks):
+    return [dataclasses.asdict(chunk) for chunk in chunks]
+
+
+def _compare(paths, analysis):
+    for path in paths:
+        for size in (3000, 40):
+            full = ChunkingOrchestrator().chunk_document(
+                str(path), analysis, strategy='hierarchical', config=ChunkingConfig(max_chunk_size=size))
+            stream = ChunkingOrchestrator().chunk_document_iter(
+                str(path), analysis, strategy='hierarchical', config=ChunkingConfig(max_chunk_size=size))
+            streamed = list(stream)
+            for chunk in full:
+                assert chunk.metadata.pop('total_chunks') == len(full)
+            assert full and _as_dicts(streamed) == _as_dicts(full), (path, size)
+            assert stream.total_chunks == len(full)
+
+
+def test_stream_matches_chunk_document():
+    """Streamed chunks equal chunk_document's, apart from total_chunks"""
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmark = Path(tmp) / "benchmark.xml"
+        generate('scap', benchmark, 64 * 1024)
+        cases = [([benchmark], XCCDF),
+                 (sorted((SYNTHETIC_DIR / "docbook").iterdir())[:2],
+                  {'document_type': {'type_name': 'DocBook Documentation'}}),
+                 (sorted((SYNTHETIC_DIR / "pom").iterdir())[:2], {'document_type': {'type_name': 'Maven POM'}})]
+        for paths, analysis in cases:
+            _compare(paths, analysis)
+
+
+def test_stream_matches_across_blocks():
+    """Elements closing near a parser block boundary keep their tail text"""
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmark = Path(tmp) / "benchmark.xml"
+        generate('scap', benchmark, 1024 * 1024)
+        for config in (ChunkingConfig(), ChunkingConfig(source_content=True)):
+            full = ChunkingOrchestrator().chunk_document(str(benchmark), XCCDF, config=config)
+            streamed = list(ChunkingOrchestrator().chunk_document_iter(
+                str(benchmark), XCCDF, config=dataclasses.replace(config)))
+            for chunk in full:
+                chunk.metadata.pop('total_chunks')
+            assert len(full) > 16 and _as_dicts(streamed) == _as_dicts(full)
+
+
+def test_other_strategies_fall_back():
+    """Strategies without a streaming implementation still stream their chunks"""
+    path = sorted((SYNTHETIC_DIR / "scap").iterdir())[0]
+    full = ChunkingOrchestrator().chunk_document(str(path), XCCDF, strategy='sliding_window')
+    streamed = list(ChunkingOrchestrator().chunk_document_iter(str(path), XCCDF, strategy='sliding_window'))
+    assert [chunk.chunk_id for chunk in streamed] == [chunk.chunk_id for chunk in full]
+
+
+def test_sidecar_records_navigation():
+    """The sidecar has one record per chunk and the totals last"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "benchmark.xml"
+        generate('scap', path, 32 * 1024)
+        sidecar = Path(tmp) / "chunks.jsonl"
+        stream = ChunkingOrchestrator().chunk_document_iter(
+            str(path), XCCDF, config=ChunkingConfig(max_chunk_size=40), sidecar_path=str(sidecar))
+        chunks = list(stream)
+        records = [json.loads(line) for line in sidecar.read_text(encoding='utf-8').splitlines()]
+
+    assert len(chunks) > 2
+    totals = records.pop()
+    assert totals['total_chunks'] == len(chunks) == stream.total_chunks
+    assert totals['document_type'] == 'SCAP/XCCDF Document'
+    assert [r['chunk_id'] for r in records] == [chunk.chunk_id for chunk in chunks]
+    assert records[0]['previous_chunk'] is None and records[-1]['next_chunk'] is None
+    for record, following in zip(records, records[1:]):
+        assert record['next_chunk'] == following['chunk_id']
+        assert following['previous_chunk'] == record['chunk_id']
+
+
+def test_memory_stays_flat():
+    """Peak memory while streaming does not grow with the document"""
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (128 * 1024, 1024 * 1024):
+            path = Path(tmp) / f"benchmark-{size}.xml"
+            generate('scap', path, size)
+            tracemalloc.start()
+            count = sum(1 for _ in ChunkingOrchestrator().chunk_document_iter(str(path), XCCDF))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert count > 0
+    assert peaks[1] < peaks[0] * 2, peaks
+
+
+if __name__ == "__main__":
+    print("🧪 Chunk Stream Test Suite")
+    print("=" * 50)
+    test_stream_matches_chunk_document()
+    test_stream_matches_across_blocks()
+    test_other_strategies_fall_back()
+    test_sidecar_records_navigation()
+    test_memory_stays_flat()
+    print("🎉 All chunk stream tests passed!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for exclusive content-aware chunking
+Checks that each text lands in exactly one chunk, that content units are
+taken whole with real paths, and that "other" units are packed.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.chunking import ContentAwareChunking, ChunkingConfig, ChunkingOrchestrator
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+BOOK = ('<book><info><title>Guide</title></info><chapter><title>Intro</title>'
+        + ''.join(f'<section id="s{i}"><title>Section {i}</title>'
+                  f'<para>Paragraph marker{i} text.</para>'
+                  f'<programlisting>run step{i}</programlisting>'
+                  f'<itemizedlist><listitem><para>Item item{i}</para></listitem></itemizedlist>'
+                  f'</section>' for i in range(5))
+        + '<para>Mixed <emphasis>inline</emphasis> closing.</para></chapter></book>')
+
+
+def _chunk(text, **options):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "book.xml"
+        path.write_text(text, encoding='utf-8')
+        return ContentAwareChunking(ChunkingConfig(**options)).chunk_document(str(path))
+
+
+def test_each_text_in_one_chunk():
+    """Sections and their paragraphs are no longer chunked twice"""
+    chunks = _chunk(BOOK, exclusive_content=True)
+    content = '\n'.join(chunk.content for chunk in chunks)
+    for i in range(5):
+        for marker in (f'marker{i}', f'step{i}', f'item{i}', f'Section {i}<'):
+            assert content.count(marker) == 1, marker
+    assert content.count('Guide') == content.count('Intro') == content.count('inline') == 1
+
+    duplicated = '\n'.join(chunk.content for chunk in _chunk(BOOK))
+    assert duplicated.count('marker0') > 1
+
+
+def test_units_keep_paths_and_types():
+    """Units are typed by their own tag and carry their path"""
+    chunks = _chunk(BOOK, exclusive_content=True, max_chunk_size=3000)
+    by_type = {}
+    for chunk in chunks:
+        by_type.setdefault(chunk.metadata['content_type'], []).append(chunk)
+
+    assert {chunk.element_path for chunk in by_type['code']} == {'book/chapter/section/programlisting'}
+    assert {chunk.element_path for chunk in by_type['structured']} == {'book/chapter/section/itemizedlist'}
+    # The six titles are packed into one chunk instead of one chunk each;
+    # <info> is a metadata unit of its own
+    others = by_type['other']
+    assert sorted(chunk.metadata['element_count'] for chunk in others) == [1, 6]
+    assert all(chunk.token_estimate <= 3000 for chunk in others)
+
+
+def test_other_units_respect_target_size():
+    """Packed other units are split at the target size"""
+    chunks = _chunk(BOOK, exclusive_content=True, max_chunk_size=20)
+    others = [chunk for chunk in chunks if chunk.metadata['content_type'] == 'other']
+    assert len(others) > 1
+    assert sum(chunk.metadata['element_count'] for chunk in others) == 7
+    assert all(chunk.token_estimate <= 20 for chunk in others if chunk.metadata['element_count'] > 1)
+
+
+def test_fewer_chunks_on_samples():
+    """Exclusive chunking cuts the chunk count on DocBook and XHTML"""
+    for kind in ('docbook', 'xhtml'):
+        for sample in sorted((SYNTHETIC_DIR / kind).iterdir())[:2]:
+            full = ContentAwareChunking(ChunkingConfig()).chunk_document(str(sample))
+            exclusive = ContentAwareChunking(ChunkingConfig(exclusive_content=True)).chunk_document(str(sample))
+            assert 0 < len(exclusive) < len(full) / 2, sample
+
+
+def test_orchestrator_enables_exclusive_mode():
+    """Documentation and XHTML get exclusive content-aware chunking"""
+    orchestrator = ChunkingOrchestrator()
+    for type_name in ('DocBook Documentation', 'XHTML Document'):
+        analysis = {'document_type': {'type_name': type_name}}
+        assert orchestrator._select_strategy(analysis) == 'content_aware'
+        assert orchestrator._create_config_for_document(analysis).exclusive_content
+
+
+if __name__ == "__main__":
+    test_each_text_in_one_chunk()
+    test_units_keep_paths_and_types()
+    test_other_units_respect_target_size()
+    test_fewer_chunks_on_samples()
+    test_orchestrator_enables_exclusive_mode()
+    print("All content-aware chunking tests passed")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared DocumentIndex
+Checks that index lookups agree with ElementTree queries and that handlers
+reuse the index built by the analyzer.
+"""
+
+import sys
+import os
+import gc
+import weakref
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.document_index import DocumentIndex
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+SAMPLE = """<feed xmlns="http://example.com/feed" xmlns:m="http://example.com/meta">
+  <entry id="1"><title>One</title><m:tag>a</m:tag></entry>
+  <entry id="2"><title>Two</title><m:tag>b</m:tag>
+    <entry id="3"><title>Nested</title></entry>
+  </entry>
+  <plain><title>No namespace</title></plain>
+</feed>"""
+
+
+def test_find_all_matches_findall():
+    """find_all returns the same elements, in the same order, as findall"""
+    root = ET.fromstring(SAMPLE.replace('<plain>', '<plain xmlns="">'))
+    index = DocumentIndex(root)
+    feed = 'http://example.com/feed'
+
+    assert index.find_all('entry', feed) == root.findall(f'.//{{{feed}}}entry')
+    assert index.find_all('title', feed) == root.findall(f'.//{{{feed}}}title')
+    assert index.find_all('title', None) == root.findall('.//title')
+    assert index.find_all('tag', 'http://example.com/meta') == root.findall('.//{http://example.com/meta}tag')
+    assert index.find_all('title') == root.findall('.//{*}title')
+    assert index.find_all('missing') == []
+
+
+def test_find_all_excludes_root():
+    """Descendant queries do not include the root, like .//name"""
+    root = ET.fromstring('<item><item/><item><item/></item></item>')
+    index = DocumentIndex(root)
+
+    assert len(index.find_all('item', None)) == 3
+    assert index.count('item', None) == len(root.findall('.//item'))
+    assert index.local_name_counts['item'] == 4
+
+
+def test_structure_queries():
+    """Parent, depth and totals come from the same traversal"""
+    root = ET.fromstring(SAMPLE)
+    index = DocumentIndex(root)
+    nested = [e for e in index.find_all('entry') if e.get('id') == '3'][0]
+
+    assert index.total_elements == len(list(root.iter()))
+    assert index.root_namespace == 'http://example.com/feed'
+    assert index.parent(root) is None
+    assert index.parent(nested).get('id') == '2'
+    assert index.depth(root) == 0
+    assert index.depth(nested) == 2
+    assert index.max_depth == 3
+    assert [a.tag.split('}')[-1] for a in index.ancestors(nested)] == ['entry', 'feed']
+
+
+def test_index_cache_is_per_root():
+    """for_root reuses the index for the same root and rebuilds for another"""
+    first = ET.fromstring('<a><b/></a>')
+    second = ET.fromstring('<a><b/><b/></a>')
+
+    index = DocumentIndex.for_root(first)
+    assert DocumentIndex.for_root(first) is index
+    assert DocumentIndex.cached(second) is None
+    assert DocumentIndex.for_root(second).count('b') == 2
+
+    DocumentIndex.release(second)
+    assert DocumentIndex.cached(second) is None
+
+
+def _recording_sitemap_handler(analyzer):
+    """Record (root, index) for every document_index() call of the sitemap handler"""
+    handler = next(h for h in analyzer.handlers if h.__class__.__name__ == 'SitemapHandler')
+    calls = []
+    document_index = handler.document_index
+    handler.document_index = lambda root: calls.append((root, document_index(root))) or calls[-1][1]
+    return calls
+
+
+def test_handlers_share_analyzer_index():
+    """Handlers see one index per document, which does not outlive the analysis"""
+    analyzer = XMLDocumentAnalyzer()
+    calls = _recording_sitemap_handler(analyzer)
+    sitemap = next(p for p in SYNTHETIC_DIR.rglob("*sitemap*.xml"))
+
+    result = analyzer.analyze_document(str(sitemap))
+
+    assert result['handler_used'] == 'SitemapHandler'
+    assert calls and all(index is calls[0][1] for _, index in calls)
+    root = weakref.ref(calls[0][0])
+    assert DocumentIndex.cached(root()) is None
+    del result, calls[:]
+    gc.collect()
+    assert root() is None
+
+
+def test_deferred_sections_keep_their_index():
+    """Sections read after another document was analyzed reuse their own index"""
+    analyzer = XMLDocumentAnalyzer()
+    calls = _recording_sitemap_handler(analyzer)
+    first, second = sorted(SYNTHETIC_DIR.glob("sitemap/*.xml"))[:2]
+
+    deferred = analyzer.analyze_document(str(first), sections=[])['analysis']
+    analyzer.analyze_document(str(second))
+    deferred.materialize()
+
+    roots = {id(root): root for root, _ in calls}
+    assert len(roots) == 2
+    for root in roots.values():
+        indexes = {id(index) for call_root, index in calls if call_root is root}
+        assert len(indexes) == 1
+
+
+if __name__ == "__main__":
+    print("🧪 Document Index Test Suite")
+    print("=" * 50)
+    test_find_all_matches_findall()
+    test_find_all_excludes_root()
+    test_structure_queries()
+    test_index_cache_is_per_root()
+    test_handlers_share_analyzer_index()
+    test_deferred_sections_keep_their_index()
+    print("🎉 All document index tests passed!")
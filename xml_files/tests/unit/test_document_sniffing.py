@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for prefix-sniffing document detection
+Checks that detect_document() routes like analyze_document() while reading
+only the start of the file.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.sniffer import sniff_document
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def _write_large_sitemap(path: Path, url_count: int) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for i in range(url_count):
+            f.write(f'  <url><loc>https://example.com/page/{i}</loc>'
+                    f'<lastmod>2024-01-01</lastmod><priority>0.5</priority></url>\n')
+        f.write('</urlset>\n')
+
+
+def test_sniff_reads_only_prefix():
+    """Sniffing a large document must not consume the whole file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large_sitemap.xml"
+        _write_large_sitemap(path, 50000)
+        file_size = path.stat().st_size
+
+        prefix = sniff_document(str(path), max_events=64)
+
+        assert prefix.root_local_name == 'urlset'
+        assert prefix.root_namespace == 'http://www.sitemaps.org/schemas/sitemap/0.9'
+        assert prefix.namespaces == {'default': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+        assert prefix.xml_declaration.startswith('<?xml')
+        assert prefix.events_read == 64
+        assert not prefix.complete
+        assert prefix.bytes_read < file_size / 10
+
+
+def test_detect_document_large_file():
+    """detect_document() routes a large file without a full parse"""
+    analyzer = XMLDocumentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large_sitemap.xml"
+        _write_large_sitemap(path, 50000)
+
+        result = analyzer.detect_document(str(path))
+
+        assert result['handler_used'] == 'SitemapHandler'
+        assert result['detection']['mode'] == 'prefix'
+        assert result['detection']['bytes_read'] < result['file_size']
+
+
+def test_detect_matches_full_analysis():
+    """Prefix detection agrees with full analysis on the synthetic samples"""
+    analyzer = XMLDocumentAnalyzer()
+    files = sorted(p for p in SYNTHETIC_DIR.rglob("*") if p.is_file() and p.suffix != '.md')
+    assert files, f"No synthetic files found in {SYNTHETIC_DIR}"
+
+    for path in files:
+        full = analyzer.analyze_document(str(path))
+        if 'error' in full:
+            continue
+        sniffed = analyzer.detect_document(str(path))
+        assert sniffed['handler_used'] == full['handler_used'], path.name
+        assert sniffed['document_type'].type_name == full['document_type'].type_name, path.name
+
+
+def test_detect_malformed_document():
+    """A document without a root element is reported as an error"""
+    analyzer = XMLDocumentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "broken.xml"
+        path.write_text('<?xml version="1.0"?>\n')
+
+        result = analyzer.detect_document(str(path))
+
+        assert 'error' in result
+
+
+if __name__ == "__main__":
+    print("🧪 Document Sniffing Test Suite")
+    print("=" * 50)
+    test_sniff_reads_only_prefix()
+    test_detect_document_large_file()
+    test_detect_matches_full_analysis()
+    test_detect_malformed_document()
+    print("🎉 All document sniffing tests passed!")
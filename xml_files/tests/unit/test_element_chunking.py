@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for element-based XMLChunker chunking
+Checks that major elements are chunked once, that chunks cover the file
+without overlap with their lines and sizes, that CRLF files are
+normalized as in size-based chunking, and that memory stays flat as the
+document grows.
+"""
+
+import sys
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from xml_document_analysis_framework import XMLAgentFramework
+
+
+def _book(sections):
+    body = ''.join(f'  <section id="s{i}">\n    <title>Section {i}</title>\n    <para>{"text " * 40}</para>\n'
+                   f'    <note>Note {i}</note>\n    <code>run {i}</code>\n  </section>\n' for i in range(sections))
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<book>\n  <title>Book</title>\n{body}</book>\n'
+
+
+def _chunk(path, max_chunk_size):
+    framework = XMLAgentFramework(max_chunk_size=max_chunk_size)
+    return framework.chunk_document(str(path), framework.analyze_document(str(path)))
+
+
+def test_major_elements_chunked_once():
+    """Chunks partition the file; every section is in exactly one chunk"""
+    text = _book(30)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "book.xml"
+        path.write_text(text, encoding='utf-8')
+        chunks = _chunk(path, 1500)
+
+    assert len(chunks) > 3
+    assert ''.join(chunk.content for chunk in chunks) == text
+    assert sum(len(chunk.elements_contained) for chunk in chunks) == 30
+    for i in range(30):
+        assert sum(chunk.content.count(f'<section id="s{i}">') for chunk in chunks) == 1
+
+    start = 0
+    for chunk in chunks:
+        end = start + len(chunk.content)
+        assert chunk.line_range == (text[:start].count('\n') + 1, text[:end].count('\n') + 1)
+        assert chunk.size_bytes == len(chunk.content.encode('utf-8'))
+        assert chunk.element_path == '/book/section'
+        if len(chunk.elements_contained) > 1:
+            assert chunk.size_bytes <= 1500
+        start = end
+
+
+def test_crlf_content_matches_size_chunking():
+    """CRLF files give \\n-normalized chunks, as chunk_by_size does"""
+    text = _book(30)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "book.xml"
+        path.write_bytes(text.replace('\n', '\r\n').encode('utf-8'))
+        chunks = _chunk(path, 1500)
+        framework = XMLAgentFramework(max_chunk_size=1500)
+        by_size = framework.chunker.chunk_by_size(str(path))
+
+    assert len(chunks) > 3
+    assert ''.join(chunk.content for chunk in chunks) == text
+    assert not any('\r' in chunk.content for chunk in chunks + by_size)
+    for i in range(30):
+        assert sum(chunk.content.count(f'<section id="s{i}">') for chunk in chunks) == 1
+    for chunk in chunks:
+        assert chunk.size_bytes == len(chunk.content.encode('utf-8'))
+    assert chunks[-1].line_range[1] == text.count('\n') + 1
+
+
+def test_memory_is_bounded():
+    """Memory in flight does not grow with the number of major elements"""
+    chapter = ('<chapter><title>Chapter</title><para>Intro</para><note>Note</note>'
+               + _book(20).split('<book>')[1].replace('</book>', '') + '</chapter>\n')
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for chapters in (20, 90):
+            path = Path(tmp) / f"book{chapters}.xml"
+            path.write_text(f'<book>\n{chapter * chapters}</book>\n', encoding='utf-8')
+            framework = XMLAgentFramework(max_chunk_size=1500)
+            schema = framework.analyze_document(str(path))
+            tracemalloc.start()
+            chunks = framework.chunk_document(str(path), schema)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert [chunk.elements_contained for chunk in chunks] == [['chapter']] * chapters
+            # The returned chunks hold the document; measure what was in flight
+            peaks.append(peak - current)
+    assert peaks[1] < peaks[0] * 2
+
+
+if __name__ == "__main__":
+    test_major_elements_chunked_once()
+    test_crlf_content_matches_size_chunking()
+    test_memory_is_bounded()
+    print("All element chunking tests passed")
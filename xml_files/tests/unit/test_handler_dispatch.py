@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for indexed handler dispatch
+Checks that the dispatch index only probes candidate handlers and picks the
+same handler as a probe of every registered handler.
+"""
+
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.dispatch import HandlerDispatchIndex
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def _linear_scan(handlers, root, namespaces):
+    """Reference selection: probe every handler in registry order"""
+    best_handler, best_confidence = None, 0.0
+    for handler in handlers:
+        can_handle, confidence = handler.can_handle(root, namespaces)
+        if can_handle and confidence > best_confidence:
+            best_handler, best_confidence = handler, confidence
+    return best_handler or handlers[-1], best_confidence
+
+
+def test_candidates_are_filtered():
+    """Handlers declaring other roots/namespaces are not probed"""
+    analyzer = XMLDocumentAnalyzer()
+    root = ET.fromstring('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"><url/></urlset>')
+    namespaces = {'default': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+    names = [h.__class__.__name__ for h in analyzer.dispatch_index.candidates(root, namespaces)]
+
+    assert 'SitemapHandler' in names
+    assert 'GenericXMLHandler' in names
+    assert 'SVGHandler' not in names
+    assert 'MavenPOMHandler' not in names
+    assert len(names) < len(analyzer.handlers)
+
+
+def test_candidates_keep_registry_order():
+    """Candidate order follows the registry so tie-breaking is unchanged"""
+    analyzer = XMLDocumentAnalyzer()
+    root = ET.fromstring('<project name="x" default="build"><target name="build"/></project>')
+
+    candidates = analyzer.dispatch_index.candidates(root, {})
+    positions = [analyzer.handlers.index(h) for h in candidates]
+
+    assert positions == sorted(positions)
+    names = [h.__class__.__name__ for h in candidates]
+    assert 'MavenPOMHandler' in names and 'AntBuildHandler' in names
+
+
+def test_dispatch_matches_linear_scan():
+    """Indexed dispatch selects the same handler as probing all handlers"""
+    analyzer = XMLDocumentAnalyzer()
+    files = sorted(p for p in SYNTHETIC_DIR.rglob("*") if p.is_file() and p.suffix != '.md')
+    assert files
+
+    for path in files:
+        try:
+            root = ET.parse(path).getroot()
+        except ET.ParseError:
+            continue
+        namespaces = analyzer._extract_namespaces(root)
+
+        expected_handler, expected_confidence = _linear_scan(analyzer.handlers, root, namespaces)
+        handler, confidence = analyzer._select_handler(root, namespaces)
+
+        assert handler is expected_handler, path.name
+        assert confidence == expected_confidence, path.name
+
+
+def test_detection_cost_report():
+    """The cost report covers every probed handler, most expensive first"""
+    analyzer = XMLDocumentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "inventory.xml"
+        path.write_text('<inventory><record id="1">a</record><record id="2">b</record></inventory>')
+        analyzer.analyze_document(str(path))
+
+    report = analyzer.detection_cost_report()
+
+    assert report
+    assert analyzer.detection_stats.documents == 1
+    totals = [row['total_seconds'] for row in report]
+    assert totals == sorted(totals, reverse=True)
+    assert abs(sum(row['share'] for row in report) - 1.0) < 1e-6
+    generic = next(row for row in report if row['handler'] == 'GenericXMLHandler')
+    assert generic['open_detector']
+
+
+def test_undeclared_handlers_are_open():
+    """Handlers without detection hints are probed for every document"""
+
+    class Declared:
+        DETECTION_ROOT_ELEMENTS = ['alpha']
+        DETECTION_NAMESPACES = []
+
+    class Undeclared:
+        pass
+
+    declared, undeclared = Declared(), Undeclared()
+    index = HandlerDispatchIndex([declared, undeclared])
+
+    assert index.candidates(ET.Element('beta'), {}) == [undeclared]
+    assert index.candidates(ET.Element('ALPHA'), {}) == [declared, undeclared]
+
+
+if __name__ == "__main__":
+    print("🧪 Handler Dispatch Test Suite")
+    print("=" * 50)
+    test_candidates_are_filtered()
+    test_candidates_keep_registry_order()
+    test_dispatch_matches_linear_scan()
+    test_detection_cost_report()
+    test_undeclared_handlers_are_open()
+    print("🎉 All handler dispatch tests passed!")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for the lazy handler registry
+Checks that handler specs match their classes, that constructing the
+analyzer imports no handler modules, that analysis only imports the
+handlers dispatch offers, and that ``import core.analyzer`` stays within
+its import-time budget.
+"""
+
+import sys
+import os
+import json
+import subprocess
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+import handlers
+from handlers import HANDLER_SPECS
+from core.analyzer import XMLDocumentAnalyzer
+
+SRC_DIR = Path(__file__).parent.parent.parent / "src"
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+# Standard-library modules core.analyzer genuinely depends on. They are
+# imported first, in the same interpreter, so their cost is the baseline
+# the analyzer's own import cost is measured against
+IMPORT_BASELINE_MODULES = ('xml.etree.ElementTree', 'typing', 'dataclasses', 're', 'pathlib',
+                           'json', 'logging', 'contextlib', 'contextvars')
+# The analyzer's own modules may cost at most this fraction of the baseline
+# (about 0.4 today; eagerly importing core.cache alone pushes it past 0.7)
+IMPORT_BUDGET_RATIO = 0.5
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args, '-c', code], cwd=SRC_DIR,
+                          capture_output=True, text=True, timeout=60, check=True)
+
+
+def test_specs_match_handler_classes():
+    """Every spec names a class whose detection signature equals the spec's"""
+    assert len({spec.name for spec in HANDLER_SPECS}) == len(HANDLER_SPECS)
+    for spec in HANDLER_SPECS:
+        cls = spec.load()
+        assert cls.__name__ == spec.name
+        assert list(getattr(cls, 'DETECTION_ROOT_ELEMENTS', [])) == spec.DETECTION_ROOT_ELEMENTS, spec.name
+        assert list(getattr(cls, 'DETECTION_NAMESPACES', [])) == spec.DETECTION_NAMESPACES, spec.name
+
+
+def test_package_attributes_stay_compatible():
+    """ALL_HANDLERS and HANDLER_CATEGORIES still resolve, in spec order"""
+    assert [cls.__name__ for cls in handlers.ALL_HANDLERS] == [spec.name for spec in HANDLER_SPECS]
+    categorized = [cls.__name__ for group in handlers.HANDLER_CATEGORIES.values() for cls in group]
+    assert sorted(categorized) == sorted(spec.name for spec in HANDLER_SPECS)
+    assert handlers.GPXHandler.__name__ == 'GPXHandler'
+    try:
+        handlers.NoSuchHandler
+    except AttributeError:
+        pass
+    else:
+        assert False, "expected AttributeError"
+
+
+def test_construction_imports_no_handlers():
+    """Building an analyzer imports no handler module"""
+    output = _run(
+        "import sys, json\n"
+        "from core.analyzer import XMLDocumentAnalyzer\n"
+        "analyzer = XMLDocumentAnalyzer()\n"
+        "print(json.dumps([m for m in sys.modules if m.startswith('handlers.')]))\n"
+    ).stdout
+    assert json.loads(output.splitlines()[-1]) == []
+
+
+def test_analysis_imports_only_candidates():
+    """Analyzing a document imports its handler but not unrelated indexed ones"""
+    sample = sorted((SYNTHETIC_DIR / "gpx").iterdir())[0]
+    output = _run(
+        "import sys, json\n"
+        "from core.analyzer import XMLDocumentAnalyzer\n"
+        "analyzer = XMLDocumentAnalyzer()\n"
+        f"result = analyzer.analyze_document({str(sample)!r})\n"
+        "print(json.dumps({'handler': result['handler_used'], 'loaded': analyzer.registry.loaded(),\n"
+        "                  'modules': [m for m in sys.modules if m.startswith('handlers.')]}))\n"
+    ).stdout
+    report = json.loads(output.splitlines()[-1])
+    assert report['handler'] == 'GPXHandler'
+    assert 'GPXHandler' in report['loaded']
+    assert 'handlers.svg_handler' not in report['modules']
+    assert 'handlers.maven_pom_handler' not in report['modules']
+    assert len(report['loaded']) < len(HANDLER_SPECS)
+
+
+def _import_times() -> dict:
+    """Cumulative import microseconds of the baseline modules and core.analyzer"""
+    code = f"import {', '.join(IMPORT_BASELINE_MODULES)}; import core.analyzer"
+    result = _run(code, '-X', 'importtime')
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        if not fields[1].strip().isdigit():
+            continue
+        # Only the modules imported by the statement itself, not their imports
+        if fields[2].startswith(' ') and not fields[2].startswith('  '):
+            times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def test_import_time_budget():
+    """`import core.analyzer` stays within budget and skips heavy modules"""
+    ratios = []
+    # Best of three, so that one noisy run does not fail the budget
+    for _ in range(3):
+        times = _import_times()
+        baseline = sum(times.get(name, 0) for name in IMPORT_BASELINE_MODULES)
+        ratios.append(times['core.analyzer'] / baseline)
+    assert min(ratios) <= IMPORT_BUDGET_RATIO, \
+        f"import core.analyzer costs {min(ratios):.2f}x its stdlib baseline"
+    
+    result = _run("import sys, json, core.analyzer; print(json.dumps(sorted(sys.modules)))")
+    imported = json.loads(result.stdout.splitlines()[-1])
+    assert not any(name == 'handlers' or name.startswith('handlers.') for name in imported)
+    for name in ('core.cache', 'core.parser_backend', 'core.instrumentation',
+                 'multiprocessing', 'concurrent.futures', 'pickle', 'tempfile'):
+        assert name not in imported, name
+
+
+def test_handler_versions_are_lazy():
+    """Version lookups import only the handler asked about"""
+    analyzer = XMLDocumentAnalyzer()
+    assert analyzer.handler_versions['GPXHandler'] == handlers.GPXHandler.HANDLER_VERSION
+    assert 'GPXHandler' in analyzer.registry.loaded()
+    assert set(analyzer.handler_versions) == {spec.name for spec in HANDLER_SPECS}
+
+
+if __name__ == "__main__":
+    print("🧪 Handler Registry Test Suite")
+    print("=" * 50)
+    test_specs_match_handler_classes()
+    test_package_attributes_stay_compatible()
+    test_construction_imports_no_handlers()
+    test_analysis_imports_only_candidates()
+    test_import_time_budget()
+    test_handler_versions_are_lazy()
+    print("🎉 All handler registry tests passed!")
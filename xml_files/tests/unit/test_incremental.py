@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental re-chunking of document versions
+Checks that only the chunks of changed subtrees are reported as added,
+that moved chunks keep their IDs, and that unchanged files are not parsed.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.incremental import IncrementalChunker, load_manifest, save_manifest
+from core.chunking import ChunkingConfig
+
+XCCDF = {'document_type': {'type_name': 'SCAP/XCCDF Document'}}
+
+
+def _benchmark(rules):
+    body = ''.join(f'<Rule id="{rule_id}"><title>{title}</title>'
+                   f'<description>{"Check the setting. " * 20}</description></Rule>'
+                   for rule_id, title in rules)
+    return f'<Benchmark id="b"><Group id="g">{body}</Group></Benchmark>'
+
+
+def _run(tmp, text, manifest=None, **options):
+    path = Path(tmp) / "benchmark.xml"
+    path.write_text(text, encoding='utf-8')
+    config = ChunkingConfig(**options) if options else None
+    return IncrementalChunker().chunk_document(str(path), XCCDF, manifest, strategy='hierarchical', config=config)
+
+
+def test_first_run_adds_everything():
+    """Without a manifest every chunk is added"""
+    rules = [(f"r{i}", f"Rule {i}") for i in range(10)]
+    with tempfile.TemporaryDirectory() as tmp:
+        diff = _run(tmp, _benchmark(rules))
+    assert len(diff.added) == len(diff.chunks) == 10
+    assert diff.removed == [] and diff.unchanged == []
+    assert [chunk_id for chunk_id, _ in diff.manifest['chunks']] == diff.added
+
+
+def test_only_changed_chunks_are_added():
+    """An edit, an insertion and a deletion touch only their own chunks"""
+    rules = [(f"r{i}", f"Rule {i}") for i in range(10)]
+    with tempfile.TemporaryDirectory() as tmp:
+        first = _run(tmp, _benchmark(rules))
+        revised = [("new", "Inserted")] + rules[:3] + [("r3", "Renamed")] + rules[4:9]
+        second = _run(tmp, _benchmark(revised), first.manifest)
+
+    ids = [chunk_id for chunk_id, _ in first.manifest['chunks']]
+    assert len(second.added) == 2  # The inserted and the edited rule
+    assert sorted(second.removed) == sorted([ids[3], ids[9]])
+    assert second.unchanged == ids[:3] + ids[4:9]  # Moved chunks keep their IDs
+    assert [chunk.chunk_id for chunk in second.chunks] == second.added
+    assert not set(second.added) & set(ids)
+
+    # The new manifest lists every chunk in order, with navigation to match
+    order = [chunk_id for chunk_id, _ in second.manifest['chunks']]
+    assert order == [second.added[0]] + ids[:3] + [second.added[1]] + ids[4:9]
+    assert second.chunks[1].metadata['previous_chunk'] == ids[2]
+
+    # Kept chunks whose index or neighbours moved carry their new metadata
+    changed = {chunk.chunk_id: chunk.metadata for chunk in second.metadata_changed}
+    assert set(changed) == set(second.unchanged)  # The insertion shifted every index
+    assert changed[ids[2]]['next_chunk'] == second.added[1]
+    assert changed[ids[4]]['previous_chunk'] == second.added[1]
+    assert 'next_chunk' not in changed[ids[8]]
+
+
+def test_edit_updates_neighbour_metadata_only():
+    """Replacing one chunk changes the navigation of its neighbours only"""
+    rules = [(f"r{i}", f"Rule {i}") for i in range(6)]
+    with tempfile.TemporaryDirectory() as tmp:
+        first = _run(tmp, _benchmark(rules))
+        second = _run(tmp, _benchmark(rules[:2] + [("r2", "Renamed")] + rules[3:]), first.manifest)
+
+    ids = [chunk_id for chunk_id, _ in first.manifest['chunks']]
+    assert second.removed == [ids[2]]
+    assert [chunk.chunk_id for chunk in second.metadata_changed] == [ids[1], ids[3]]
+    assert second.metadata_changed[0].metadata['next_chunk'] == second.added[0]
+    assert second.metadata_changed[1].metadata['previous_chunk'] == second.added[0]
+
+
+def test_unchanged_file_is_not_rechunked():
+    """Same file and settings: nothing changes; other settings re-chunk"""
+    text = _benchmark([(f"r{i}", f"Rule {i}") for i in range(5)])
+    with tempfile.TemporaryDirectory() as tmp:
+        first = _run(tmp, text)
+        manifest_path = Path(tmp) / "manifest.json"
+        save_manifest(first.manifest, str(manifest_path))
+        manifest = load_manifest(str(manifest_path))
+        again = _run(tmp, text, manifest)
+        resized = _run(tmp, text, manifest, max_chunk_size=60)
+        assert load_manifest(str(Path(tmp) / "missing.json")) is None
+
+    assert not again.changed and again.chunks == [] and again.metadata_changed == []
+    assert again.unchanged == first.added
+    assert again.manifest['chunks'] == first.manifest['chunks']
+    assert resized.changed and resized.manifest['settings'] != first.manifest['settings']
+
+
+if __name__ == "__main__":
+    print("🧪 Incremental Chunking Test Suite")
+    print("=" * 50)
+    test_first_run_adds_everything()
+    test_only_changed_chunks_are_added()
+    test_edit_updates_neighbour_metadata_only()
+    test_unchanged_file_is_not_rechunked()
+    print("🎉 All incremental chunking tests passed!")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for analysis instrumentation
+Checks phase timing and memory tracking, timings on analyzer results,
+hooks, and percentile aggregation over single and batch runs.
+"""
+
+import sys
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.cache import AnalysisCache
+from core.instrumentation import (Instrumentation, PhaseTimer, NULL_TIMER,
+                                  aggregate_timings, percentile)
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def test_percentile():
+    """Percentiles interpolate between ranks"""
+    values = [4.0, 1.0, 3.0, 2.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 4.0
+    assert percentile(values, 50) == 2.5
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_phase_timer():
+    """Phases accumulate seconds; memory peaks are recorded when tracked"""
+    timer = PhaseTimer(track_memory=True)
+    with timer.phase('build'):
+        data = [str(i) * 10 for i in range(20000)]
+    with timer.phase('build'):
+        pass
+    del data
+
+    timings = timer.timings('TestHandler')
+    assert timings['handler'] == 'TestHandler'
+    assert list(timings['phases']) == ['build']
+    assert timings['phases']['build']['seconds'] > 0
+    assert timings['phases']['build']['peak_bytes'] > 20000 * 10
+    assert timings['total_seconds'] == timings['phases']['build']['seconds']
+
+    with NULL_TIMER.phase('ignored'):
+        pass
+
+
+def test_phase_timer_without_reset_peak():
+    """Before Python 3.9 (no tracemalloc.reset_peak) peaks are still per phase"""
+    reset_peak = getattr(tracemalloc, 'reset_peak', None)
+    if reset_peak is not None:
+        del tracemalloc.reset_peak
+    try:
+        timer = PhaseTimer(track_memory=True)
+        with timer.phase('large'):
+            data = [str(i) * 10 for i in range(20000)]
+        del data
+        with timer.phase('small'):
+            pass
+    finally:
+        if reset_peak is not None:
+            tracemalloc.reset_peak = reset_peak
+
+    phases = timer.timings(None)['phases']
+    assert phases['large']['peak_bytes'] > 20000 * 10
+    assert phases['small']['peak_bytes'] < 20000 * 10
+
+
+def test_analyzer_attaches_timings():
+    """Instrumented results carry per-phase timings; plain results do not"""
+    path = str(SYNTHETIC_DIR / "sitemap" / "urlset.xml")
+    seen = []
+    instrumentation = Instrumentation(hooks=[seen.append])
+    result = XMLDocumentAnalyzer(instrumentation=instrumentation).analyze_document(path)
+
+    timings = result['timings']
+    assert timings['handler'] == result['handler_used'] == 'SitemapHandler'
+    for phase in ('parse', 'detect', 'index', 'analyze', 'extract_key_data'):
+        assert phase in timings['phases'], phase
+    assert seen == [timings]
+    assert instrumentation.documents == 1
+    assert 'timings' not in XMLDocumentAnalyzer().analyze_document(path)
+
+    streamed = XMLDocumentAnalyzer(instrumentation=Instrumentation(),
+                                   streaming_threshold=0).analyze_document(path)
+    assert 'analyze_stream' in streamed['timings']['phases']
+
+
+def test_cache_hits_are_timed():
+    """A cache hit reports the lookup, not the original analysis"""
+    path = str(SYNTHETIC_DIR / "sitemap" / "urlset.xml")
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = XMLDocumentAnalyzer(cache=AnalysisCache(tmp), instrumentation=Instrumentation())
+        first = analyzer.analyze_document(path)
+        second = analyzer.analyze_document(path)
+
+    assert 'cache_store' in first['timings']['phases']
+    assert list(second['timings']['phases']) == ['cache_lookup']
+
+
+def test_report_aggregates_by_handler_and_phase():
+    """Reports give counts and percentiles per handler and phase"""
+    files = sorted(str(p) for p in (SYNTHETIC_DIR / "sitemap").glob("*.xml"))
+    instrumentation = Instrumentation(track_memory=True)
+    analyzer = XMLDocumentAnalyzer(instrumentation=instrumentation)
+    results = [analyzer.analyze_document(path) for path in files]
+
+    report = instrumentation.report(percentiles=(50, 95))
+    total = next(row for row in report if row['handler'] == 'SitemapHandler' and row['phase'] == 'total')
+    assert total['count'] == len(files)
+    assert total['p50_seconds'] <= total['p95_seconds'] <= total['max_seconds']
+    assert 'max_peak_bytes' in next(row for row in report if row['phase'] == 'parse')
+    assert [row['total_seconds'] for row in report] == sorted((row['total_seconds'] for row in report), reverse=True)
+
+    # The same aggregation is available from stored records
+    offline = aggregate_timings(results, percentiles=(50, 95))
+    assert {(row['handler'], row['phase'], row['count']) for row in offline} == \
+           {(row['handler'], row['phase'], row['count']) for row in report}
+
+
+def test_batch_timings_aggregate_on_caller():
+    """Worker timings come back on records and into the caller's report"""
+    files = sorted(str(p) for p in (SYNTHETIC_DIR / "sitemap").glob("*.xml"))
+    instrumentation = Instrumentation()
+    analyzer = XMLDocumentAnalyzer(instrumentation=instrumentation)
+    records = list(analyzer.analyze_many(files, workers=2))
+
+    assert all('timings' in record for record in records)
+    assert instrumentation.documents == len(files)
+
+
+if __name__ == "__main__":
+    print("🧪 Instrumentation Test Suite")
+    print("=" * 50)
+    test_percentile()
+    test_phase_timer()
+    test_phase_timer_without_reset_peak()
+    test_analyzer_attaches_timings()
+    test_cache_hits_are_timed()
+    test_report_aggregates_by_handler_and_phase()
+    test_batch_timings_aggregate_on_caller()
+    print("🎉 All instrumentation tests passed!")
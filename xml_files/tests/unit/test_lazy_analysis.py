@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for lazy SpecializedAnalysis sections
+Checks that analyze_document(sections=...) only computes what was asked for
+and that deferred sections resolve to the same values as a full analysis.
+"""
+
+import sys
+import os
+import pickle
+from dataclasses import asdict
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer, SpecializedAnalysis, Deferred, ANALYSIS_SECTIONS
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def _maven_pom():
+    return next(p for p in sorted(SYNTHETIC_DIR.rglob("*.xml"))
+                if p.read_text(encoding='utf-8', errors='ignore').find('<modelVersion>') != -1)
+
+
+def _count_calls(analyzer, handler_name, method_name):
+    """Wrap a handler method so calls to it are counted"""
+    handler = next(h for h in analyzer.handlers if h.__class__.__name__ == handler_name)
+    original = getattr(handler, method_name)
+    calls = []
+
+    def counted(*args):
+        calls.append(args)
+        return original(*args)
+
+    setattr(handler, method_name, counted)
+    return calls
+
+
+def test_deferred_field_resolves_once():
+    """A Deferred field is computed on first read and memoized"""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'value': 42}
+
+    analysis = SpecializedAnalysis("Test", {}, [], {}, [], Deferred(compute), {})
+
+    assert not analysis.is_computed('structured_data')
+    assert analysis.structured_data == {'value': 42}
+    assert analysis.structured_data == {'value': 42}
+    assert analysis.is_computed('structured_data')
+    assert len(calls) == 1
+
+
+def test_requested_sections_only():
+    """Only requested sections are computed before returning"""
+    analyzer = XMLDocumentAnalyzer()
+    calls = _count_calls(analyzer, 'MavenPOMHandler', 'extract_key_data')
+
+    result = analyzer.analyze_document(str(_maven_pom()), sections=['key_findings'])
+    analysis = result['analysis']
+
+    assert result['handler_used'] == 'MavenPOMHandler'
+    assert analysis.is_computed('key_findings')
+    assert not analysis.is_computed('structured_data')
+    assert calls == []
+
+    assert 'coordinates' in analysis.structured_data
+    assert len(calls) == 1
+
+
+def test_empty_sections_defers_analysis():
+    """sections=[] returns the type without running the handler's analysis"""
+    analyzer = XMLDocumentAnalyzer()
+    calls = _count_calls(analyzer, 'MavenPOMHandler', 'analyze')
+
+    result = analyzer.analyze_document(str(_maven_pom()), sections=[])
+
+    assert result['document_type'].type_name
+    assert calls == []
+    assert not any(result['analysis'].is_computed(s) for s in ANALYSIS_SECTIONS)
+
+    result['analysis'].data_inventory
+    result['analysis'].recommendations
+    assert len(calls) == 1
+
+
+def test_lazy_matches_full_analysis():
+    """Deferred sections resolve to the same values as the default full analysis"""
+    analyzer = XMLDocumentAnalyzer()
+    for path in sorted(SYNTHETIC_DIR.rglob("*.xml"))[:20]:
+        full = analyzer.analyze_document(str(path))
+        if 'error' in full:
+            continue
+        lazy = analyzer.analyze_document(str(path), sections=[])
+
+        assert all(full['analysis'].is_computed(s) for s in ANALYSIS_SECTIONS)
+        assert asdict(lazy['analysis']) == asdict(full['analysis']), path.name
+
+
+def test_pickle_materializes():
+    """Pickling computes pending sections rather than storing callables"""
+    analyzer = XMLDocumentAnalyzer()
+    result = analyzer.analyze_document(str(_maven_pom()), sections=['document_type'])
+
+    restored = pickle.loads(pickle.dumps(result['analysis']))
+
+    assert all(restored.is_computed(s) for s in ANALYSIS_SECTIONS)
+    assert 'coordinates' in restored.structured_data
+
+
+def test_unknown_section_rejected():
+    """Section names are validated"""
+    analyzer = XMLDocumentAnalyzer()
+    try:
+        analyzer.analyze_document(str(_maven_pom()), sections=['everything'])
+    except ValueError:
+        return
+    assert False, "expected ValueError"
+
+
+if __name__ == "__main__":
+    print("🧪 Lazy Analysis Test Suite")
+    print("=" * 50)
+    test_deferred_field_resolves_once()
+    test_requested_sections_only()
+    test_empty_sections_defers_analysis()
+    test_lazy_matches_full_analysis()
+    test_pickle_materializes()
+    test_unknown_section_rejected()
+    print("🎉 All lazy analysis tests passed!")
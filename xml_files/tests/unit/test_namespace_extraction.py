@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for single-pass namespace extraction
+Checks that analyze_document() reports namespaces from parser start-ns
+events: real prefixes, declarations below the root, and re-bound prefixes.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+
+NESTED = """<?xml version="1.0"?>
+<catalog xmlns="urn:example:catalog" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <book>
+    <dc:title>Example</dc:title>
+    <ext:rating xmlns:ext="urn:example:ext">5</ext:rating>
+  </book>
+  <book xmlns:ext="urn:example:other-ext">
+    <ext:rating>4</ext:rating>
+  </book>
+  <unused xmlns:geo="http://www.w3.org/2003/01/geo/wgs84_pos#"/>
+</catalog>
+"""
+
+
+def _parse(text):
+    analyzer = XMLDocumentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.xml"
+        path.write_text(text, encoding='utf-8')
+        return analyzer, analyzer._parse_document(str(path)), analyzer.analyze_document(str(path))
+
+
+def test_prefixes_are_preserved():
+    """Declared prefixes are kept; the default namespace is 'default'"""
+    _, (root, namespaces), _ = _parse(NESTED)
+
+    assert root.tag == '{urn:example:catalog}catalog'
+    assert namespaces['default'] == 'urn:example:catalog'
+    assert namespaces['dc'] == 'http://purl.org/dc/elements/1.1/'
+
+
+def test_nested_and_rebound_declarations():
+    """Declarations below the root are found, re-bound prefixes kept apart"""
+    _, (_, namespaces), _ = _parse(NESTED)
+
+    assert namespaces['ext'] == 'urn:example:ext'
+    assert 'urn:example:other-ext' in namespaces.values()
+    # Declared but never used on an element tag
+    assert 'http://www.w3.org/2003/01/geo/wgs84_pos#' in namespaces.values()
+    assert len(namespaces) == 5
+
+
+def test_analyze_document_reports_parsed_namespaces():
+    """analyze_document() returns the namespaces collected during parsing"""
+    _, (_, namespaces), result = _parse(NESTED)
+
+    assert result['namespaces'] == namespaces
+
+
+def test_no_namespaces():
+    """Documents without declarations report an empty mapping"""
+    _, (root, namespaces), result = _parse('<inventory><item/></inventory>')
+
+    assert root.tag == 'inventory'
+    assert namespaces == {}
+    assert result['namespaces'] == {}
+
+
+if __name__ == "__main__":
+    print("🧪 Namespace Extraction Test Suite")
+    print("=" * 50)
+    test_prefixes_are_preserved()
+    test_nested_and_rebound_declarations()
+    test_analyze_document_reports_parsed_namespaces()
+    test_no_namespaces()
+    print("🎉 All namespace extraction tests passed!")
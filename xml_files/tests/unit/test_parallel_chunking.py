@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel chunking
+Checks that fragments of a file parse to the same positions as the whole
+file, and that parallel chunking across files and top-level subtrees
+gives the same chunks, in the same order, as serial chunking.
+"""
+
+import sys
+import os
+import pickle
+import tempfile
+import dataclasses
+from pathlib import Path
+
+# Add the src and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../benchmarks'))
+
+from core.chunking import ChunkingOrchestrator, ChunkingConfig
+from core.parallel_chunking import ParallelChunkingOrchestrator
+from core.source_map import Fragment, SourceMap
+from core.tokenizers import get_tokenizer
+from generators import generate
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+XCCDF = {'document_type': {'type_name': 'SCAP/XCCDF Document'}}
+
+
+def _as_dicts(chunks):
+    return [dataclasses.asdict(chunk) for chunk in chunks]
+
+
+def test_fragment_positions_match_full_parse():
+    """Children parsed from a fragment have the positions of a full parse"""
+    sample = SYNTHETIC_DIR / "docbook" / "book.xml"
+    with SourceMap(str(sample)) as source:
+        root = source.parse()
+        children = source.root_children()
+        assert [(child.start, child.end, child.line) for child in children] == [
+            source.span(child) + (source.lines(child)[0],) for child in root]
+        expected = [(source.span(e), source.lines(e)) for child in list(root)[1:3] for e in child.iter()]
+        fragment = Fragment(source.root_start, children[1].start, children[3].start, children[1].line)
+
+    with SourceMap(str(sample)) as source:
+        partial = source.parse(fragment)
+        assert partial.tag == root.tag and len(partial) == 2
+        assert [(source.span(e), source.lines(e)) for child in partial for e in child.iter()] == expected
+
+
+def test_subtrees_chunked_in_parallel():
+    """Chunks of a document split into fragments equal serial chunks"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "benchmark.xml"
+        generate('scap', path, 256 * 1024)
+        for config in (None, ChunkingConfig(max_chunk_size=400, source_content=True)):
+            serial = ChunkingOrchestrator().chunk_document(str(path), XCCDF, config=config)
+            orchestrator = ParallelChunkingOrchestrator(workers=2, fragment_bytes=16 * 1024)
+            assert len(orchestrator._plan(str(path), XCCDF, orchestrator._create_chunker(XCCDF, 'auto', config))) > 2
+            parallel = orchestrator.chunk_document(str(path), XCCDF, config=config)
+            assert serial and _as_dicts(parallel) == _as_dicts(serial)
+
+
+def test_documents_chunked_in_input_order():
+    """chunk_many yields every document in input order"""
+    documents = [(str(path), {'document_type': {'type_name': type_name}})
+                 for kind, type_name in (('docbook', 'DocBook Documentation'), ('pom', 'Maven POM'),
+                                         ('scap', 'SCAP/XCCDF Document'))
+                 for path in sorted((SYNTHETIC_DIR / kind).iterdir())[:2]]
+    results = list(ParallelChunkingOrchestrator(workers=2).chunk_many(documents))
+
+    assert [path for path, _ in results] == [path for path, _ in documents]
+    for (path, analysis), (_, chunks) in zip(documents, results):
+        assert _as_dicts(chunks) == _as_dicts(ChunkingOrchestrator().chunk_document(path, analysis))
+
+
+def test_token_counters_pickle():
+    """Token counters can be sent to worker processes with their config"""
+    counter = pickle.loads(pickle.dumps(get_tokenizer('heuristic')))
+    assert counter.count('some words here') == get_tokenizer('heuristic').count('some words here')
+
+
+if __name__ == "__main__":
+    test_fragment_positions_match_full_parse()
+    test_subtrees_chunked_in_parallel()
+    test_documents_chunked_in_input_order()
+    test_token_counters_pickle()
+    print("All parallel chunking tests passed")
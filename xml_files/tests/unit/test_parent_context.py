@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for parent-context breadcrumbs of hierarchical chunks
+Checks that chunks name their real ancestors, that long ancestries and
+labels are capped, and that streamed chunks get the same breadcrumbs.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.chunking import HierarchicalChunking, ChunkingConfig
+
+
+def _chunk(text, stream=False, **options):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.xml"
+        path.write_text(text, encoding='utf-8')
+        chunker = HierarchicalChunking(ChunkingConfig(semantic_boundaries=['section'], **options))
+        if stream:
+            return list(chunker.chunk_document_iter(str(path)))
+        return chunker.chunk_document(str(path))
+
+
+def test_breadcrumbs_name_ancestors():
+    """Ancestors appear root first with their id or name attribute"""
+    text = ('<book xmlns="urn:book" id="guide"><part name="Setup"><chapter>'
+            '<section id="s1"><para>One</para></section>'
+            '<section xml:id="s2"><para>Two</para></section>'
+            '</chapter></part></book>')
+    chunks = _chunk(text)
+    assert [chunk.parent_context for chunk in chunks] == [
+        "book[id=guide] > part[name=Setup] > chapter",
+        "book[id=guide] > part[name=Setup] > chapter",
+    ]
+    assert _chunk(text, stream=True)[1].parent_context == chunks[1].parent_context
+
+    # A root chunk has no ancestors, and context can be turned off
+    assert _chunk('<section id="only"><para>Text</para></section>')[0].parent_context is None
+    assert _chunk(text, include_parent_context=False)[0].parent_context is None
+
+
+def test_breadcrumbs_are_capped():
+    """Deep ancestries keep the nearest ancestors, long labels are shortened"""
+    depth = 20
+    text = ''.join(f'<div id="d{i}">' for i in range(depth))
+    text += '<section><para>Deep</para></section>' + '</div>' * depth
+    context = _chunk(text, max_context_depth=3)[0].parent_context
+    assert context == "... > div[id=d17] > div[id=d18] > div[id=d19]"
+
+    label = 'x' * 500
+    context = _chunk(f'<doc name="{label}"><section><para>Text</para></section></doc>')[0].parent_context
+    assert len(context) < 100 and context.endswith('...]')
+
+
+def test_split_chunks_share_parent_context():
+    """Parts of a split element carry the element's own ancestors"""
+    sections = ''.join(f'<para>{"word " * 40}</para>' for _ in range(10))
+    text = f'<book id="b"><chapter id="c"><section id="big">{sections}</section></chapter></book>'
+    for stream in (False, True):
+        chunks = _chunk(text, stream=stream, max_chunk_size=120)
+        assert len(chunks) > 1
+        assert {chunk.parent_context for chunk in chunks} == {"book[id=b] > chapter[id=c]"}
+
+
+if __name__ == "__main__":
+    print("🧪 Parent Context Test Suite")
+    print("=" * 50)
+    test_breadcrumbs_name_ancestors()
+    test_breadcrumbs_are_capped()
+    test_split_chunks_share_parent_context()
+    print("🎉 All parent context tests passed!")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for pluggable parser backends
+Checks backend selection, that both backends produce the same trees and
+namespaces, and that routing does not depend on the backend. lxml checks
+are skipped when lxml is not installed.
+"""
+
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.parser_backend import (get_backend, available_backends, element_to_string,
+                                 EtreeBackend, BACKEND_ENV_VAR, lxml_etree)
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+DOCUMENT = """<?xml version="1.0"?>
+<!-- leading comment -->
+<catalog xmlns="urn:example:catalog" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <?processing instruction?>
+  <book id="1"><!-- inline comment --><dc:title>One</dc:title></book>
+</catalog>
+"""
+
+
+def _write(tmp, text, name="doc.xml"):
+    path = Path(tmp) / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_backend_selection():
+    """Default is the stdlib backend; names and the env var select others"""
+    previous = os.environ.pop(BACKEND_ENV_VAR, None)
+    try:
+        assert get_backend().name == 'etree'
+        assert get_backend('etree').name == 'etree'
+        backend = EtreeBackend()
+        assert get_backend(backend) is backend
+        assert get_backend('auto').name == ('lxml' if lxml_etree is not None else 'etree')
+
+        os.environ[BACKEND_ENV_VAR] = 'etree'
+        assert XMLDocumentAnalyzer().backend.name == 'etree'
+    finally:
+        os.environ.pop(BACKEND_ENV_VAR, None)
+        if previous is not None:
+            os.environ[BACKEND_ENV_VAR] = previous
+
+    try:
+        get_backend('sax')
+    except ValueError:
+        pass
+    else:
+        assert False, "expected ValueError"
+
+
+def test_etree_backend_parse():
+    """The stdlib backend returns the root and declared namespaces"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, namespaces = get_backend('etree').parse(_write(tmp, DOCUMENT))
+
+    assert root.tag == '{urn:example:catalog}catalog'
+    assert namespaces == {'default': 'urn:example:catalog', 'dc': 'http://purl.org/dc/elements/1.1/'}
+    assert '>One<' in element_to_string(root)
+
+
+def test_parse_errors_are_uniform():
+    """Every backend reports malformed input as ET.ParseError"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, '<root><unclosed></root>')
+        for name in available_backends():
+            try:
+                get_backend(name).parse(path)
+            except ET.ParseError:
+                continue
+            assert False, f"{name} did not raise ParseError"
+
+
+def test_lxml_backend_matches_etree():
+    """lxml trees have the same tags, attributes and text, without comments/PIs"""
+    if lxml_etree is None:
+        print("   ⏭️  lxml not installed - skipped")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, DOCUMENT)
+        etree_root, etree_ns = get_backend('etree').parse(path)
+        lxml_root, lxml_ns = get_backend('lxml').parse(path)
+
+    assert lxml_ns == etree_ns
+    assert [(e.tag, dict(e.attrib), e.text) for e in lxml_root.iter()] == \
+           [(e.tag, dict(e.attrib), e.text) for e in etree_root.iter()]
+    assert all(isinstance(e.tag, str) for e in lxml_root.iter())
+    book = lxml_root.find('{urn:example:catalog}book')
+    assert book.sourceline == 5
+    assert get_backend('lxml').parent(book) is lxml_root
+    assert 'xmlns="urn:example:catalog"' in element_to_string(lxml_root)
+
+
+def test_routing_is_backend_independent():
+    """Every available backend routes the samples to the same handlers"""
+    files = sorted(str(p) for p in SYNTHETIC_DIR.rglob("*.xml"))
+    analyzers = {name: XMLDocumentAnalyzer(backend=name) for name in available_backends()}
+
+    for path in files:
+        results = {name: a.analyze_document(path, sections=[]) for name, a in analyzers.items()}
+        handlers = {r.get('handler_used') for r in results.values()}
+        assert len(handlers) == 1, (path, handlers)
+
+
+if __name__ == "__main__":
+    print("🧪 Parser Backend Test Suite")
+    print("=" * 50)
+    test_backend_selection()
+    test_etree_backend_parse()
+    test_parse_errors_are_uniform()
+    test_lxml_backend_matches_etree()
+    test_routing_is_backend_independent()
+    print("🎉 All parser backend tests passed!")
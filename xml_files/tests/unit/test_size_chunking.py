@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for size-based XMLChunker chunking
+Checks the newline index against direct counts, and that memory-mapped
+chunks end at element boundaries, overlap, keep UTF-8 characters whole
+and report the lines they span.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from xml_document_analysis_framework import NewlineIndex, XMLChunker
+
+
+def _chunk(text, newline='\n', **options):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.xml"
+        path.write_bytes(text.replace('\n', newline).encode('utf-8'))
+        return XMLChunker(**options).chunk_by_size(str(path))
+
+
+def test_newline_index():
+    """Lines from the index equal counting the prefix"""
+    data = b''.join(b'x' * (i % 7) + b'\n' for i in range(50000))
+    index = NewlineIndex(data)
+    for offset in (0, 1, 5, NewlineIndex.BLOCK_SIZE - 1, NewlineIndex.BLOCK_SIZE,
+                   NewlineIndex.BLOCK_SIZE * 2 + 17, len(data) - 1, len(data)):
+        assert index.line(offset) == data[:offset].count(b'\n') + 1, offset
+
+
+def test_chunks_end_at_elements_and_overlap():
+    """Chunks end after an end tag and overlap the next by overlap_size"""
+    text = '<root>\n' + ''.join(f'  <item id="{i}">value {i}</item>\n' for i in range(200)) + '</root>\n'
+    chunks = _chunk(text, max_chunk_size=1000, overlap_size=100)
+    assert len(chunks) > 5
+    for chunk, following in zip(chunks, chunks[1:]):
+        assert chunk.content.endswith('>')
+        assert following.content.startswith(chunk.content[-100:])
+    assert chunks[0].line_range[0] == 1 and chunks[-1].line_range[1] == text.count('\n') + 1
+
+    position = 0
+    for chunk in chunks:
+        start = text.index(chunk.content, max(position - 100, 0))
+        assert chunk.line_range == (text[:start].count('\n') + 1,
+                                    text[:start + len(chunk.content)].count('\n') + 1)
+        assert chunk.size_bytes == len(chunk.content.encode('utf-8'))
+        position = start + len(chunk.content)
+
+
+def test_multibyte_characters_kept_whole():
+    """Windows in bytes never split a UTF-8 character"""
+    text = '<a>héllo→wörld €€€€</a>\n' * 20
+    chunks = _chunk(text, max_chunk_size=7, overlap_size=3)
+    assert all(chunk.content for chunk in chunks)
+    assert text.endswith(chunks[-1].content)
+    assert sum(chunk.size_bytes for chunk in chunks) >= len(text.encode('utf-8'))
+    assert _chunk('', max_chunk_size=7) == []
+
+
+def test_crlf_newlines_normalized():
+    """CRLF files give \\n content and the lines of the text, never splitting a CRLF"""
+    text = '<root>\n' + ''.join(f'  <item id="{i}">value {i}</item>\n' for i in range(200)) + '</root>\n'
+    for max_chunk_size, overlap_size in ((1000, 100), (33, 7)):
+        chunks = _chunk(text, newline='\r\n', max_chunk_size=max_chunk_size, overlap_size=overlap_size)
+        assert len(chunks) > 5
+        position = 0
+        for chunk in chunks:
+            assert '\r' not in chunk.content
+            start = text.index(chunk.content, max(position - overlap_size, 0))
+            assert chunk.line_range == (text[:start].count('\n') + 1,
+                                        text[:start + len(chunk.content)].count('\n') + 1)
+            assert chunk.size_bytes == len(chunk.content.encode('utf-8'))
+            position = start + len(chunk.content)
+        assert position == len(text)
+
+
+def test_chunks_are_generated_lazily():
+    """iter_chunks_by_size yields the chunks of chunk_by_size one at a time"""
+    text = '<root>\n' + '  <item>value</item>\n' * 500 + '</root>\n'
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.xml"
+        path.write_text(text, encoding='utf-8')
+        chunker = XMLChunker(max_chunk_size=500, overlap_size=50)
+        chunks = chunker.iter_chunks_by_size(str(path))
+        first = next(chunks)
+        assert first == chunker.chunk_by_size(str(path))[0]
+        assert [first] + list(chunks) == chunker.chunk_by_size(str(path))
+
+
+if __name__ == "__main__":
+    test_newline_index()
+    test_chunks_end_at_elements_and_overlap()
+    test_multibyte_characters_kept_whole()
+    test_crlf_newlines_normalized()
+    test_chunks_are_generated_lazily()
+    print("All size chunking tests passed")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for sliding window chunking over flat segments
+Checks that chunks hold each part of the document once, that overlap
+repeats only trailing segments, and that oversized leaves are kept.
+"""
+
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.chunking import SlidingWindowChunking, ChunkingConfig
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def _records_document(count=120):
+    records = ''.join(
+        f"<record id='{i}'><name>record {i}</name><value>{'text ' * 20}{i}</value></record>"
+        for i in range(count)
+    )
+    return f"<export><header>nightly export</header>{records}trailing note</export>"
+
+
+def _chunk(document, **config):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.xml"
+        path.write_text(document, encoding='utf-8')
+        return SlidingWindowChunking(ChunkingConfig(**config)).chunk_document(str(path))
+
+
+def _depth(element):
+    return 1 + max((_depth(child) for child in element), default=0)
+
+
+def test_output_is_document_sized():
+    """Without overlap every record lands in exactly one chunk"""
+    document = _records_document()
+    chunks = _chunk(document, max_chunk_size=200, overlap_size=0)
+    combined = '\n'.join(chunk.content for chunk in chunks)
+
+    assert len(chunks) > 1
+    assert len(combined) <= len(document) * 1.05
+    for i in range(120):
+        assert combined.count(f"<record id=\"{i}\">") == 1, i
+    assert combined.count("nightly export") == 1
+    assert combined.count("trailing note") == 1
+    assert all(chunk.token_estimate <= 200 for chunk in chunks)
+
+
+def test_overlap_repeats_trailing_segments():
+    """Consecutive chunks overlap by whole segments and always advance"""
+    chunks = _chunk(_records_document(), max_chunk_size=200, overlap_size=80)
+    ranges = [chunk.metadata['byte_range'] for chunk in chunks]
+
+    for (start, end), (next_start, next_end) in zip(ranges, ranges[1:]):
+        assert start < next_start <= end < next_end
+    assert any(next_start < end for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+
+    # The last chunk reaches the end of the document and is not repeated
+    assert ranges[-1][1] == max(end for _, end in ranges)
+    assert ranges.count(ranges[-1]) == 1
+
+
+def test_byte_ranges_locate_segments():
+    """A chunk's byte range slices its records out of the serialized document"""
+    document = _records_document(20)
+    chunks = _chunk(document, max_chunk_size=100, overlap_size=0)
+    serialized = ET.tostring(ET.fromstring(document), encoding='unicode').encode('utf-8')
+    for chunk in chunks:
+        start, end = chunk.metadata['byte_range']
+        assert serialized[start:end].decode('utf-8').replace('\n', '') == chunk.content.replace('\n', '')
+
+
+def test_oversized_leaf_is_kept():
+    """A leaf larger than the window becomes a chunk of its own"""
+    document = f"<doc><a>small</a><b>{'word ' * 500}</b><c>small</c></doc>"
+    chunks = _chunk(document, max_chunk_size=50, overlap_size=0)
+    assert [chunk.element_path for chunk in chunks] == ['doc/a', 'doc/b', 'doc/c']
+    assert chunks[1].token_estimate > 50
+
+
+def test_namespaced_depths():
+    """Depths count elements, not the slashes in namespace URIs"""
+    sample = sorted((SYNTHETIC_DIR / "xliff").iterdir())[0]
+    chunks = SlidingWindowChunking(ChunkingConfig(max_chunk_size=30, overlap_size=0)).chunk_document(str(sample))
+    depth = _depth(ET.parse(sample).getroot())
+    assert chunks
+    for chunk in chunks:
+        low, high = chunk.metadata['depth_range']
+        assert 0 <= low <= high < depth
+
+
+if __name__ == "__main__":
+    print("🧪 Sliding Window Chunking Test Suite")
+    print("=" * 50)
+    test_output_is_document_sized()
+    test_overlap_repeats_trailing_segments()
+    test_byte_ranges_locate_segments()
+    test_oversized_leaf_is_kept()
+    test_namespaced_depths()
+    print("🎉 All sliding window chunking tests passed!")
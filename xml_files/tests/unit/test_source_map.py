@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for source positions of parsed elements
+Checks that SourceMap builds the same tree as ElementTree with exact byte
+spans and lines, and that chunks carry lines and can be sliced from the
+source.
+"""
+
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.source_map import SourceMap
+from core.chunking import HierarchicalChunking, SlidingWindowChunking, ContentAwareChunking, ChunkingConfig
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+EDGE_CASES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<doc xmlns:x="urn:x">\n'
+    '  <a gt=">" q=\'"/>\'>/></a>\n'
+    '  <!-- comment -->\n'
+    '  <x:b\n'
+    '     id="é"/>tail<c><d/></c>\n'
+    '  <e>&amp;<![CDATA[<raw>]]></e\n'
+    '  >\n'
+    '</doc>\n'
+)
+
+
+def _write(tmp, text, name="doc.xml"):
+    path = Path(tmp) / name
+    path.write_bytes(text.encode('utf-8'))
+    return path
+
+
+def test_spans_and_lines():
+    """Spans cover each element's markup as written, on the right lines"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, EDGE_CASES)
+        raw = path.read_bytes()
+        with SourceMap(str(path)) as source:
+            root = source.parse()
+            assert ET.tostring(root) == ET.tostring(ET.parse(path).getroot())
+            texts = {element.tag.split('}')[-1]: source.text(element) for element in root.iter()}
+            for element in root.iter():
+                start, end = source.span(element)
+                first, last = source.lines(element)
+                assert raw[:start].count(b'\n') + 1 == first
+                assert raw[:end].count(b'\n') + 1 == last
+
+    assert texts['a'] == '<a gt=">" q=\'"/>\'>/></a>'
+    assert texts['b'] == '<x:b\n     id="é"/>'
+    assert texts['d'] == '<d/>'
+    assert texts['c'] == '<c><d/></c>'
+    assert texts['e'] == '<e>&amp;<![CDATA[<raw>]]></e\n  >'
+    assert texts['doc'].startswith('<doc') and texts['doc'].endswith('</doc>')
+
+
+def test_iterparse_and_errors():
+    """Events match ET.iterparse, forget() drops positions, errors are ParseErrors"""
+    sample = sorted((SYNTHETIC_DIR / "scap").iterdir())[0]
+    expected = [(event, element.tag) for event, element in ET.iterparse(sample, events=('start', 'end'))]
+    with SourceMap(str(sample)) as source:
+        events = []
+        for event, element in source.iterparse():
+            events.append((event, element.tag))
+            if event == 'end' and element is not source.root:
+                assert element in source
+                source.forget(element)
+                assert element not in source
+    assert events == expected
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, "<a>\n<b></a>")
+        try:
+            SourceMap(str(path)).parse()
+            assert False, "Expected ParseError"
+        except ET.ParseError as e:
+            assert e.position == (2, 5)
+
+
+def test_chunks_have_lines():
+    """Every strategy records the lines and source bytes of its chunks"""
+    sample = sorted((SYNTHETIC_DIR / "docbook").iterdir())[0]
+    lines = sample.read_text(encoding='utf-8').split('\n')
+    for strategy in (HierarchicalChunking, SlidingWindowChunking, ContentAwareChunking):
+        config = ChunkingConfig(max_chunk_size=60, overlap_size=0, semantic_boundaries=['section'])
+        chunks = strategy(config).chunk_document(str(sample))
+        assert chunks
+        for chunk in chunks:
+            assert 1 <= chunk.start_line <= chunk.end_line <= len(lines), strategy
+            if 'part' not in chunk.metadata:  # Parts of a split code block only have lines
+                start, end = chunk.metadata['source_range']
+                assert start < end
+
+    off = HierarchicalChunking(ChunkingConfig(source_positions=False)).chunk_document(str(sample))
+    assert all(chunk.start_line == 0 and 'source_range' not in chunk.metadata for chunk in off)
+
+
+def test_source_content():
+    """With source_content chunks are slices of the file, formatting and comments kept"""
+    sections = ''.join(f"<section id='s{i}'>\n  <!-- note {i} -->\n  <para>{'word ' * 30}</para>\n</section>\n"
+                       for i in range(6))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, f"<book>\n<chapter>\n{sections}</chapter>\n</book>\n")
+        raw = path.read_text(encoding='utf-8')
+        config = ChunkingConfig(max_chunk_size=60, semantic_boundaries=['section'], source_content=True)
+        chunks = HierarchicalChunking(config).chunk_document(str(path))
+        split = HierarchicalChunking(ChunkingConfig(max_chunk_size=150, semantic_boundaries=['chapter'],
+                                                    source_content=True)).chunk_document(str(path))
+
+    assert len(chunks) == 6
+    for i, chunk in enumerate(chunks):
+        start, end = chunk.metadata['source_range']
+        assert chunk.content == raw[start:end]
+        assert f"<!-- note {i} -->" in chunk.content
+        assert raw.split('\n')[chunk.start_line - 1].startswith(f"<section id='s{i}'>")
+
+    # Parts of a split chunk are wrapped in the parent's tags as written
+    assert len(split) > 1
+    for chunk in split:
+        assert chunk.content.startswith("<chapter><section") and chunk.content.endswith("</section></chapter>")
+        assert ET.fromstring(chunk.content).tag == 'chapter'
+
+
+if __name__ == "__main__":
+    print("🧪 Source Map Test Suite")
+    print("=" * 50)
+    test_spans_and_lines()
+    test_iterparse_and_errors()
+    test_chunks_have_lines()
+    test_source_content()
+    print("🎉 All source map tests passed!")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the SAX XMLStreamHandler
+Checks that schema analysis collects elements, paths, lines and text
+samples, and that the per-element state stays bounded on large inputs.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from xml_document_analysis_framework import XMLAgentFramework
+
+
+def _analyze(text):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.xml"
+        path.write_text(text, encoding='utf-8')
+        return XMLAgentFramework().analyze_document(str(path))
+
+
+def test_schema_analysis():
+    """Namespaced documents are analyzed with paths, lines and samples"""
+    schema = _analyze('<feed xmlns="http://www.w3.org/2005/Atom">\n'
+                      '  <entry id="1">\n    <title>  First  </title>\n  </entry>\n'
+                      '  <entry id="2"><title>Second</title></entry>\n</feed>\n')
+    assert schema.root_element == 'feed'
+    assert schema.namespaces == {'default': 'http://www.w3.org/2005/Atom'}
+    assert schema.document_type == 'RSS'
+
+    title = schema.elements['title']
+    assert title.count == 2 and title.namespace == 'http://www.w3.org/2005/Atom'
+    assert title.paths == {'feed/entry/title'}
+    assert title.line_numbers == [3, 5]
+    assert title.text_samples == ['First', 'Second']
+    assert schema.elements['entry'].attributes == {'id': {'1', '2'}}
+
+
+def test_state_is_bounded():
+    """Many elements and long texts keep fixed-size samples"""
+    count = 20000
+    items = ''.join(f'<item n="{i % 3}"><name>{"word " * 100}</name></item>\n' for i in range(count))
+    schema = _analyze(f'<list>\n{items}</list>\n')
+
+    item = schema.elements['item']
+    assert item.count == count
+    assert len(item.line_numbers) == 20
+    assert all(2 <= line <= count + 1 for line in item.line_numbers)
+    assert item.line_numbers == sorted(item.line_numbers)
+    # A uniform sample is spread over the document, not just its start
+    assert item.line_numbers[-1] > count // 2
+    assert len(schema.elements['name'].text_samples) == 5
+    assert all(len(text) <= 200 for text in schema.elements['name'].text_samples)
+
+
+def test_self_nesting_structure():
+    """Tags nested in themselves are not expanded again in the structure tree"""
+    schema = _analyze('<book><chapter><section><title>A</title>'
+                      '<section><title>B</title><section/></section></section></chapter></book>\n')
+    section = schema.structure_tree['book']['children']['chapter']['children']['section']
+    assert section['count'] == 3
+    assert section['children']['section'] == {'recursive': True}
+    assert 'title' in section['children']
+
+
+if __name__ == "__main__":
+    test_schema_analysis()
+    test_state_is_bounded()
+    test_self_nesting_structure()
+    print("All stream handler tests passed")
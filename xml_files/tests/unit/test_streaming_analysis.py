@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming analysis
+Checks RecordStream record iteration and release, and that streaming
+handlers produce the same inventory and quality as tree analysis while
+other handlers fall back to a full parse.
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.analyzer import XMLDocumentAnalyzer
+from core.streaming import RecordStream
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+SECTIONS = ['document_type', 'data_inventory', 'quality_metrics']
+
+JUNIT = """<?xml version="1.0"?>
+<testsuites tests="3" failures="1" errors="0" skipped="1" time="4.0">
+  <testsuite name="A" tests="3" failures="1" errors="0" skipped="1" time="4.0">
+    <testcase name="t1" classname="A" time="0.5"/>
+    <testcase name="t2" classname="A" time="3.5"><failure message="expected 1" type="AssertionError">trace</failure></testcase>
+    <testcase name="t3" classname="A" time="0.0"><skipped message="later"/></testcase>
+  </testsuite>
+</testsuites>
+"""
+
+TESTNG = """<?xml version="1.0"?>
+<testng-results total="2" passed="1" failed="1" skipped="0">
+  <suite name="S1" duration-ms="1700">
+    <test name="T1" duration-ms="1700">
+      <class name="C">
+        <test-method name="m1" signature="m1()" status="PASS" duration-ms="1500"/>
+        <test-method name="m2" signature="m2()" status="FAIL" duration-ms="200"><exception class="java.lang.AssertionError"><message>boom</message></exception></test-method>
+      </class>
+    </test>
+  </suite>
+</testng-results>
+"""
+
+SERVICENOW = """<?xml version="1.0"?>
+<unload unload_date="2024-01-01 10:00:00">
+<incident action="INSERT_OR_UPDATE">
+<number>INC0001</number><state>7</state><priority>2</priority><short_description>Disk full</short_description>
+<opened_at>2024-01-01 08:00:00</opened_at><resolved_at>2024-01-01 09:30:00</resolved_at>
+</incident>
+<sys_journal_field><element>comments</element><sys_created_by>pat</sys_created_by><sys_created_on>2024-01-01 08:05:00</sys_created_on><value>Looking</value></sys_journal_field>
+<sys_journal_field><element>work_notes</element><sys_created_by>sam</sys_created_by><sys_created_on>2024-01-01 09:00:00</sys_created_on><value>Cleaned</value></sys_journal_field>
+<sys_attachment><file_name>a.png</file_name><content_type>image/png</content_type><size_bytes>1200</size_bytes></sys_attachment>
+</unload>
+"""
+
+
+def _write(tmp, text, name):
+    path = Path(tmp) / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def _sections(result):
+    analysis = result['analysis']
+    return {name: json.dumps(getattr(analysis, name), sort_keys=True, default=str) for name in SECTIONS}
+
+
+def _key_paths(value, prefix=''):
+    """Paths of every dict key in nested dicts"""
+    if not isinstance(value, dict):
+        return set()
+    paths = set()
+    for key, item in value.items():
+        path = f"{prefix}/{key}"
+        paths |= {path} | _key_paths(item, path)
+    return paths
+
+
+def test_record_stream_yields_and_releases():
+    """Records are yielded whole and detached; statistics cover every element"""
+    count = 20000
+    urls = ''.join(f'<url><loc>https://example.com/{i}</loc></url>' for i in range(count))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>',
+                      'sitemap.xml')
+        stream = RecordStream(path, record_names=['url'])
+        locs = []
+        retained = 0
+        for record in stream:
+            locs.append(record[0].text)
+            retained = max(retained, len(stream.root))
+
+    assert locs[0] == 'https://example.com/0' and len(locs) == count
+    # Only records parsed ahead of the consumer (one read buffer) are held
+    assert retained < count // 10
+    assert len(stream.root) == 0
+    assert stream.records == count
+    assert stream.element_counts['loc'] == count
+    assert stream.total_elements == 2 * count + 1
+    assert stream.max_depth == 2
+    assert stream.namespaces == {'default': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+
+def test_record_stream_outermost_records():
+    """Matches inside a record belong to it rather than being yielded separately"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write(tmp, '<r><a><a/><b/></a><c><a/></c></r>', 'nested.xml')
+        starts = []
+        stream = RecordStream(path, record_names=['a'],
+                              on_start=lambda elem, depth: starts.append((elem.tag, depth)))
+        records = [(record.tag, len(record), stream.depth) for record in stream]
+
+    assert records == [('a', 2, 1), ('a', 0, 2)]
+    assert starts == [('r', 0), ('a', 1), ('a', 2), ('b', 2), ('c', 1), ('a', 2)]
+
+    try:
+        RecordStream(path)
+    except ValueError:
+        pass
+    else:
+        assert False, "expected ValueError"
+
+
+def test_streaming_matches_tree_analysis():
+    """Streaming handlers agree with tree analysis on inventory and quality"""
+    files = sorted(str(p) for p in (SYNTHETIC_DIR / "sitemap").glob("*.xml"))
+    files += sorted(str(p) for p in (SYNTHETIC_DIR / "gpx").glob("*.gpx"))
+    files += sorted(str(p) for p in (SYNTHETIC_DIR / "scap").glob("*.xml"))
+
+    streaming = XMLDocumentAnalyzer(streaming_threshold=0)
+    tree = XMLDocumentAnalyzer(streaming_threshold=None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files += [_write(tmp, JUNIT, 'junit.xml'), _write(tmp, TESTNG, 'testng.xml'),
+                  _write(tmp, SERVICENOW, 'incident.xml')]
+        for path in files:
+            streamed = streaming.analyze_document(path)
+            parsed = tree.analyze_document(path)
+            assert streamed['analysis_mode'] == 'streaming', path
+            assert 'analysis_mode' not in parsed
+            assert streamed['handler_used'] == parsed['handler_used']
+            assert streamed['namespaces'] == parsed['namespaces'], path
+            assert _sections(streamed) == _sections(parsed), path
+
+
+def test_streaming_sitemap_findings():
+    """Streamed sitemap findings have the tree's sections, counted over every entry"""
+    entries = ''.join(f'<sitemap><loc>https://example.com/s{i}.xml</loc>'
+                      + (f'<lastmod>2024-01-{i % 28 + 1:02d}</lastmod>' if i % 2 else '') + '</sitemap>'
+                      for i in range(2500))
+    sections = ['seo_analysis', 'quality_indicators', 'accessibility_analysis', 'performance_analysis',
+                'compliance_analysis', 'security_analysis', 'optimization_opportunities']
+    with tempfile.TemporaryDirectory() as tmp:
+        index = _write(tmp, f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}'
+                            '</sitemapindex>', 'index.xml')
+        for path in [index] + sorted(str(p) for p in (SYNTHETIC_DIR / "sitemap").glob("*.xml")):
+            streamed = XMLDocumentAnalyzer(streaming_threshold=0).analyze_document(path)['analysis']
+            parsed = XMLDocumentAnalyzer(streaming_threshold=None).analyze_document(path)['analysis']
+            for section in ('key_findings', 'structured_data'):
+                assert _key_paths(getattr(streamed, section)) == _key_paths(getattr(parsed, section)), (
+                    path, section, _key_paths(getattr(streamed, section)) ^ _key_paths(getattr(parsed, section)))
+            for name in sections:
+                assert streamed.key_findings[name] == parsed.key_findings[name], (path, name)
+            if path == index:
+                assert streamed.data_inventory['last_modified_entries'] == 1250
+            assert streamed.data_inventory == parsed.data_inventory, path
+
+
+def test_non_streaming_handler_falls_back():
+    """Handlers without streaming support are analyzed from the full tree"""
+    path = str(SYNTHETIC_DIR / "gpx" / "cycling_route.gpx")
+    with tempfile.TemporaryDirectory() as tmp:
+        pom = _write(tmp, '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+                          '<modelVersion>4.0.0</modelVersion><artifactId>demo</artifactId></project>',
+                     'pom.xml')
+        analyzer = XMLDocumentAnalyzer(streaming_threshold=0)
+        result = analyzer.analyze_document(pom)
+
+    assert result['handler_used'] == 'MavenPOMHandler'
+    # The handler chosen from the prefix is reused rather than detected again
+    assert analyzer.detection_stats.documents == 1
+    assert 'analysis_mode' not in result
+    assert 'analysis_mode' not in XMLDocumentAnalyzer().analyze_document(path)
+
+
+def test_streaming_sections_deferred():
+    """sections=[] defers the streaming pass until a section is read"""
+    path = str(SYNTHETIC_DIR / "sitemap" / "urlset.xml")
+    result = XMLDocumentAnalyzer(streaming_threshold=0).analyze_document(path, sections=[])
+
+    assert result['analysis_mode'] == 'streaming'
+    analysis = result['analysis']
+    assert not any(analysis.is_computed(name) for name in SECTIONS)
+    assert analysis.data_inventory['urls'] > 0
+
+
+if __name__ == "__main__":
+    print("🧪 Streaming Analysis Test Suite")
+    print("=" * 50)
+    test_record_stream_yields_and_releases()
+    test_record_stream_outermost_records()
+    test_streaming_matches_tree_analysis()
+    test_streaming_sitemap_findings()
+    test_non_streaming_handler_falls_back()
+    test_streaming_sections_deferred()
+    print("🎉 All streaming analysis tests passed!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the subtree size table used by hierarchical chunking
+Checks that the one-pass sizes match ElementTree serialization and that
+each emitted chunk is serialized exactly once.
+"""
+
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.chunking import SubtreeSizes, HierarchicalChunking, ChunkingConfig
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+def _serialize(element):
+    return ET.tostring(element, encoding='unicode')
+
+
+def test_sizes_match_serialization():
+    """Words and the kept serialization match ET.tostring on sample documents"""
+    samples = [SYNTHETIC_DIR / "scap", SYNTHETIC_DIR / "xliff", SYNTHETIC_DIR / "svg", SYNTHETIC_DIR / "pom"]
+    for directory in samples:
+        for path in sorted(directory.iterdir())[:2]:
+            root = ET.parse(path).getroot()
+            sizes = SubtreeSizes(root)
+            assert sizes.serialized() == _serialize(root), path
+            assert sizes[root].byte_size == len(_serialize(root).encode('utf-8')), path
+            for element in root.iter():
+                assert sizes.words(element) == len(_serialize(element).split()), (path, element.tag)
+
+
+def test_sizes_handle_edge_cases():
+    """Comments, processing instructions, tails, escaping and non-ASCII text"""
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True, insert_pis=True))
+    root = ET.fromstring(
+        '<a xmlns:x="urn:x">lead<b x:q="1&#9;2 3">y<!-- c d --><?pi z w?>é tail</b>w'
+        '<c/>  <x:d xml:lang="en">&lt;é&gt;</x:d> </a>', parser=parser)
+    sizes = SubtreeSizes(root)
+    assert sizes.serialized() == _serialize(root)
+    for element in root.iter():
+        assert sizes.words(element) == len(_serialize(element).split()), element.tag
+
+    plain = ET.fromstring('<a><b>x y</b> <c d="1"/>ü</a>')
+    sizes = SubtreeSizes(plain)
+    for element in plain.iter():
+        assert sizes[element].byte_size == len(_serialize(element).encode('utf-8')), element.tag
+
+
+def test_each_chunk_serialized_once():
+    """Large boundaries are split without serializing them or their children"""
+    paragraphs = ''.join(f"<para>{'word ' * 40}{i}</para>" for i in range(60))
+    document = f"<doc><section id='a'>{paragraphs}</section><section id='b'><para>short</para></section></doc>"
+    config = ChunkingConfig(max_chunk_size=300, semantic_boundaries=['section'])
+
+    calls = []
+    original = ET.tostring
+
+    def counting_tostring(element, *args, **kwargs):
+        calls.append(element)
+        return original(element, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.xml"
+        path.write_text(document, encoding='utf-8')
+        ET.tostring = counting_tostring
+        try:
+            chunks = HierarchicalChunking(config).chunk_document(str(path))
+        finally:
+            ET.tostring = original
+
+    # Section 'a' splits into wrapper chunks; section 'b' fits whole
+    assert len(chunks) > 2
+    assert all(chunk.token_estimate <= config.max_chunk_size for chunk in chunks)
+    assert len(calls) == len(chunks) - 1
+    assert chunks[-1].content == "<section id=\"b\"><para>short</para></section>"
+
+
+if __name__ == "__main__":
+    print("🧪 Subtree Size Table Test Suite")
+    print("=" * 50)
+    test_sizes_match_serialization()
+    test_sizes_handle_edge_cases()
+    test_each_chunk_serialized_once()
+    print("🎉 All subtree size table tests passed!")
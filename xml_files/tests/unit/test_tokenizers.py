@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the pluggable token counters used to size chunks
+Checks counter selection, memoization, the markup-aware default and that
+estimates from the size table match counting the serialized text.
+"""
+
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from core.tokenizers import (get_tokenizer, available_tokenizers, TokenCounter,
+                             HeuristicTokenCounter, WordTokenCounter, TiktokenCounter)
+from core.chunking import SubtreeSizes, HierarchicalChunking, SlidingWindowChunking, ChunkingConfig
+
+SYNTHETIC_DIR = Path(__file__).parent.parent.parent / "sample_data" / "test_files_synthetic" / "small"
+
+
+class LetterCounter(TokenCounter):
+    """Counts non-space characters, without size estimates"""
+
+    name = 'letters'
+    sized = False
+
+    def _count(self, text):
+        return len(text) - text.count(' ')
+
+
+def test_get_tokenizer():
+    """Names, instances, 'auto' and unknown names"""
+    assert isinstance(get_tokenizer(), HeuristicTokenCounter)
+    assert get_tokenizer('heuristic') is get_tokenizer()
+    assert isinstance(get_tokenizer('words'), WordTokenCounter)
+    counter = LetterCounter()
+    assert get_tokenizer(counter) is counter
+
+    if 'tiktoken' in available_tokenizers():
+        assert isinstance(get_tokenizer('auto'), TiktokenCounter)
+    else:
+        assert get_tokenizer('auto') is get_tokenizer('heuristic')
+        try:
+            TiktokenCounter()
+            assert False, "Expected ImportError without tiktoken"
+        except ImportError:
+            pass
+
+    try:
+        get_tokenizer('bpe')
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_counts_are_memoized():
+    """Counting the same text again is a cache hit"""
+    counter = HeuristicTokenCounter()
+    text = "<item>" + "word " * 50 + "</item>"
+    assert counter.count(text) == counter.count(text)
+    info = counter.count.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_markup_counts_more_than_words():
+    """Tag-heavy XML is not sized as a handful of words"""
+    markup = '<rule id="xccdf_org.ssgproject.content_rule_accounts_password_minlen" severity="medium"/>'
+    prose = "The password must be at least fourteen characters long and include digits."
+    heuristic, words = get_tokenizer('heuristic'), get_tokenizer('words')
+    assert words.count(markup) == 3
+    assert heuristic.count(markup) == len(markup) // 4
+    assert words.count(prose) <= heuristic.count(prose) <= words.count(prose) * 1.25
+
+
+def test_sized_estimates_match_counting():
+    """Estimates from the size table equal counting each serialized element"""
+    counter = get_tokenizer('heuristic')
+    chunker = HierarchicalChunking(ChunkingConfig())
+    for directory in (SYNTHETIC_DIR / "scap", SYNTHETIC_DIR / "xliff", SYNTHETIC_DIR / "svg"):
+        for path in sorted(directory.iterdir())[:2]:
+            root = ET.parse(path).getroot()
+            sizes = SubtreeSizes(root)
+            for element in root.iter():
+                serialized = ET.tostring(element, encoding='unicode')
+                assert sizes.standalone_bytes(element) == len(serialized.encode('utf-8')), (path, element.tag)
+                assert chunker.estimate_element_tokens(sizes, element) == counter.count(serialized)
+
+
+def test_config_selects_tokenizer():
+    """Chunk estimates and boundaries follow the configured counter"""
+    records = ''.join(f'<record id="r{i}" type="measurement" unit="mm">{i}</record>' for i in range(200))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "records.xml"
+        path.write_text(f"<records>{records}</records>", encoding='utf-8')
+        for tokenizer in ('words', 'heuristic', LetterCounter()):
+            for strategy in (HierarchicalChunking, SlidingWindowChunking):
+                config = ChunkingConfig(max_chunk_size=300, overlap_size=0,
+                                        semantic_boundaries=['records'], tokenizer=tokenizer)
+                chunks = strategy(config).chunk_document(str(path))
+                counter = get_tokenizer(tokenizer)
+                assert len(chunks) > 1, (tokenizer, strategy)
+                for chunk in chunks:
+                    assert chunk.token_estimate <= 300
+                    assert chunk.token_estimate == counter.count(chunk.content), (tokenizer, strategy)
+
+
+if __name__ == "__main__":
+    print("🧪 Token Counter Test Suite")
+    print("=" * 50)
+    test_get_tokenizer()
+    test_counts_are_memoized()
+    test_markup_counts_more_than_words()
+    test_sized_estimates_match_counting()
+    test_config_selects_tokenizer()
+    print("🎉 All token counter tests passed!")